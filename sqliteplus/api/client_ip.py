@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import ipaddress
-import os
-from typing import Iterable
+import threading
+from bisect import bisect_right
+from functools import lru_cache
 
 from fastapi import Request
 
+from sqliteplus.core.settings import get_settings
 
-_TRUSTED_PROXIES_ENV = "TRUSTED_PROXIES"
+_REMOTE_ADDR_CACHE_SIZE = 4096
+_FORWARDED_CACHE_SIZE = 4096
 
 
 def _parse_trusted_proxies(raw_value: str | None) -> tuple[ipaddress._BaseNetwork, ...]:
@@ -35,12 +38,91 @@ def _extract_remote_addr(request: Request) -> str:
     return "unknown"
 
 
-def _is_trusted_proxy(remote_addr: str, trusted_proxies: Iterable[ipaddress._BaseNetwork]) -> bool:
-    try:
-        remote_ip = ipaddress.ip_address(remote_addr)
-    except ValueError:
-        return False
-    return any(remote_ip in network for network in trusted_proxies)
+class TrustedProxyMatcher:
+    """Comprueba si una IP pertenece a ``TRUSTED_PROXIES`` sin recorrer la lista.
+
+    Las redes se fusionan al construir el objeto en intervalos disjuntos y
+    ordenados por versión de IP, de modo que cada consulta es una búsqueda
+    binaria: O(log n) comparaciones de enteros, acotadas por la longitud del
+    prefijo, aunque la lista tenga miles de rangos de una CDN. Las direcciones
+    remotas ya resueltas se recuerdan en una caché acotada.
+    """
+
+    def __init__(self, networks: tuple[ipaddress._BaseNetwork, ...] = ()) -> None:
+        self.networks = networks
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version in (4, 6):
+            intervals = sorted(
+                (int(network.network_address), int(network.broadcast_address))
+                for network in networks
+                if network.version == version
+            )
+            starts: list[int] = []
+            ends: list[int] = []
+            for start, end in intervals:
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                    continue
+                starts.append(start)
+                ends.append(end)
+            if starts:
+                self._starts[version] = starts
+                self._ends[version] = ends
+        self._remote_cache: dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def _contains_ip(self, remote_ip: ipaddress._BaseAddress) -> bool:
+        starts = self._starts.get(remote_ip.version)
+        if not starts:
+            return False
+        value = int(remote_ip)
+        index = bisect_right(starts, value) - 1
+        return index >= 0 and value <= self._ends[remote_ip.version][index]
+
+    def contains(self, remote_addr: str) -> bool:
+        if not self._starts:
+            return False
+        cached = self._remote_cache.get(remote_addr)
+        if cached is not None:
+            return cached
+        try:
+            trusted = self._contains_ip(ipaddress.ip_address(remote_addr))
+        except ValueError:
+            trusted = False
+        with self._lock:
+            if len(self._remote_cache) >= _REMOTE_ADDR_CACHE_SIZE:
+                self._remote_cache.clear()
+            self._remote_cache[remote_addr] = trusted
+        return trusted
+
+
+_matcher_lock = threading.Lock()
+_matcher_state: tuple[str | None, TrustedProxyMatcher] = (None, TrustedProxyMatcher())
+
+
+def get_trusted_proxy_matcher(raw_value: str | None = None) -> TrustedProxyMatcher:
+    """Devuelve el *matcher* de ``raw_value`` (por defecto, ``TRUSTED_PROXIES`` de la configuración).
+
+    Solo se reconstruye cuando cambia el valor de la configuración.
+    """
+
+    if raw_value is None:
+        raw_value = get_settings().trusted_proxies
+    global _matcher_state
+    cached_raw, matcher = _matcher_state
+    if raw_value == cached_raw:
+        return matcher
+    with _matcher_lock:
+        cached_raw, matcher = _matcher_state
+        if raw_value != cached_raw:
+            matcher = TrustedProxyMatcher(_parse_trusted_proxies(raw_value))
+            _matcher_state = (raw_value, matcher)
+            _resolve_forwarded_ip.cache_clear()
+    return matcher
 
 
 def _normalize_ip_candidate(value: str) -> str | None:
@@ -89,26 +171,25 @@ def _ip_from_forwarded(header_value: str | None) -> str | None:
     return None
 
 
+@lru_cache(maxsize=_FORWARDED_CACHE_SIZE)
+def _resolve_forwarded_ip(forwarded: str | None, x_forwarded_for: str | None) -> str | None:
+    return _ip_from_forwarded(forwarded) or _ip_from_x_forwarded_for(x_forwarded_for)
+
+
 def get_client_ip(request: Request) -> str:
     """Resuelve IP de cliente de forma segura detrás de proxies confiables.
 
     - Por defecto no confía en cabeceras de forwarding.
     - Solo evalúa `Forwarded`/`X-Forwarded-For` si la IP remota (`REMOTE_ADDR`)
       pertenece a `TRUSTED_PROXIES`.
+    - La lista de proxies se compila una vez por valor de la variable y el
+      análisis de cabeceras se recuerda para valores repetidos.
     """
 
     remote_addr = _extract_remote_addr(request)
-    trusted_proxies = _parse_trusted_proxies(os.getenv(_TRUSTED_PROXIES_ENV))
-
-    if not _is_trusted_proxy(remote_addr, trusted_proxies):
+    if not get_trusted_proxy_matcher().contains(remote_addr):
         return remote_addr
 
-    forwarded_ip = _ip_from_forwarded(request.headers.get("forwarded"))
-    if forwarded_ip:
-        return forwarded_ip
-
-    xff_ip = _ip_from_x_forwarded_for(request.headers.get("x-forwarded-for"))
-    if xff_ip:
-        return xff_ip
-
-    return remote_addr
+    headers = request.headers
+    forwarded_ip = _resolve_forwarded_ip(headers.get("forwarded"), headers.get("x-forwarded-for"))
+    return forwarded_ip or remote_addr
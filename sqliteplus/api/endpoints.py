@@ -19,25 +19,50 @@ from concurrent.futures import ThreadPoolExecutor
 
 import aiosqlite
 from sqlite3 import OperationalError
-from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
-from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, BackgroundTasks
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
 from sqliteplus.core.db import db_manager
+from sqliteplus.core.settings import get_settings
 from sqliteplus.core.schemas import (
     CreateTableSchema,
     InsertDataSchema,
+    InsertRowsSchema,
     is_valid_sqlite_identifier,
     escape_sqlite_identifier,
 )
 from sqliteplus.auth.jwt import generate_jwt, verify_jwt
+from sqliteplus.auth.password_pool import (
+    PasswordPoolError,
+    PasswordVerificationPool,
+    password_pool,
+)
 from sqliteplus.auth.users import get_user_service, UserSourceError
 from sqliteplus.auth.rate_limit import LoginRateLimiter, login_rate_limiter
-from sqliteplus.utils.json_serialization import normalize_json_value
+from sqliteplus.utils.json_serialization import build_row_normalizer
 from sqliteplus.api.client_ip import get_client_ip
+from sqliteplus.api.responses import (
+    MSGPACK_MEDIA_TYPE,
+    FastJSONResponse,
+    MsgPackResponse,
+    msgpack_available,
+)
+from sqliteplus.utils.change_log import MAX_BATCH_SIZE as MAX_CHANGE_BATCH
+from sqliteplus.utils.columnar_export import COLUMNAR_FORMATS, pyarrow_available
+from sqliteplus.utils.incremental_export import ROWID_KEYS, decode_watermark, encode_watermark
 from sqliteplus.utils.replication_sync import SQLiteReplication
+from sqliteplus.utils.blob_stream import (
+    BlobNotFoundError,
+    UnsatisfiableRangeError,
+    open_blob,
+    parse_byte_range,
+)
+from sqliteplus.utils.sqliteplus_sync import SQLitePlusCipherError
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +70,10 @@ def get_login_rate_limiter() -> LoginRateLimiter:
     return login_rate_limiter
 
 
+def get_password_pool() -> PasswordVerificationPool:
+    return password_pool
+
+
 def build_safe_http_error(
     *,
     status_code: int,
@@ -73,25 +102,93 @@ def _normalize_rows_response(
     nombre.
     """
 
-    normalized_rows = [
-        [normalize_json_value(value) for value in row]
-        for row in rows
-    ]
-
-    normalized_columns = list(column_names or [])
-    if not normalized_columns and normalized_rows:
-        normalized_columns = [
-            f"columna {index + 1}" for index in range(len(normalized_rows[0]))
-        ]
+    normalized_rows = build_row_normalizer(column_names, sample_rows=rows)(rows)
 
     normalized_response = {
-        "columns": normalized_columns,
+        "columns": _response_columns(column_names, rows),
         "rows": normalized_rows,
     }
     normalized_response["data"] = normalized_rows
     return normalized_response
 
 
+def _response_columns(
+    column_names: Sequence[str] | None,
+    rows: Sequence[Sequence[object]],
+) -> list[str]:
+    normalized_columns = list(column_names or [])
+    if not normalized_columns and rows:
+        normalized_columns = [f"columna {index + 1}" for index in range(len(rows[0]))]
+    return normalized_columns
+
+
+def _columnar_rows_response(
+    column_names: Sequence[str] | None,
+    rows: Sequence[Sequence[object]],
+) -> dict[str, object]:
+    """Agrupa los valores por columna: ``{"columns": [...], "data": {"col": [...]}}``."""
+
+    columns = _response_columns(column_names, rows)
+    values = build_row_normalizer(columns, sample_rows=rows).columns(rows)
+    return {"columns": columns, "data": dict(zip(columns, values))}
+
+
+def _binary_rows_response(
+    column_names: Sequence[str] | None,
+    rows: Sequence[Sequence[object]],
+) -> dict[str, list]:
+    """Como ``_normalize_rows_response`` pero con los BLOB como binarios y sin alias ``data``."""
+
+    return {
+        "columns": _response_columns(column_names, rows),
+        "rows": build_row_normalizer(column_names, sample_rows=rows, binary=True)(rows),
+    }
+
+
+_FETCH_FORMATS = {
+    "json": "application/json",
+    "columnar": "application/vnd.sqliteplus.columnar+json",
+    "msgpack": MSGPACK_MEDIA_TYPE,
+}
+_FETCH_MEDIA_TYPES = {
+    **{media_type: name for name, media_type in _FETCH_FORMATS.items()},
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/*": "json",
+    "*/*": "json",
+}
+
+
+def _negotiate_fetch_format(accept: str | None) -> str:
+    """Elige el formato de ``/fetch`` según la cabecera ``Accept``.
+
+    Se recorren los tipos por ``q`` descendente; MessagePack solo se ofrece si
+    el servidor tiene el paquete. Sin coincidencias se responde en JSON.
+    """
+
+    offers = []
+    for index, part in enumerate((accept or "").split(",")):
+        media_type, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            offers.append((-quality, index, media_type.strip().lower()))
+
+    for _, _, media_type in sorted(offers):
+        fetch_format = _FETCH_MEDIA_TYPES.get(media_type)
+        if fetch_format == "msgpack" and not msgpack_available():
+            continue
+        if fetch_format is not None:
+            return fetch_format
+    return "json"
+
+
 def _map_sql_error(exc: Exception, table_name: str) -> HTTPException:
     """Mapea errores operacionales de SQLite a respuestas HTTP apropiadas."""
 
@@ -176,11 +273,12 @@ async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     rate_limiter: LoginRateLimiter = Depends(get_login_rate_limiter),
+    verification_pool: PasswordVerificationPool = Depends(get_password_pool),
 ):
     client_ip = get_client_ip(request)
     username = form_data.username or None
 
-    if rate_limiter.is_blocked(ip=client_ip, username=username):
+    if await rate_limiter.is_blocked_async(ip=client_ip, username=username):
         logger.warning(
             "Intento de autenticación bloqueado por rate limit",
             extra={"context": {"username": username, "client_ip": client_ip}},
@@ -202,19 +300,20 @@ async def login(
         ) from exc
 
     try:
-        if user_service.verify_credentials(form_data.username, form_data.password):
-            try:
-                token = generate_jwt(form_data.username)
-            except RuntimeError as exc:
-                raise build_safe_http_error(
-                    status_code=500,
-                    public_detail="No se pudo generar el token de autenticación",
-                    log_message="Fallo al generar JWT para el usuario '%s'" % form_data.username,
-                    exc=exc,
-                    username=form_data.username,
-                ) from exc
-            rate_limiter.register_success(ip=client_ip, username=username)
-            return {"access_token": token, "token_type": "bearer"}
+        credentials_ok = await verification_pool.verify(
+            user_service, form_data.username, form_data.password
+        )
+    except PasswordPoolError as exc:
+        logger.warning(
+            "Verificación de credenciales rechazada por saturación: %s",
+            exc,
+            extra={"context": {"username": username, "client_ip": client_ip}},
+        )
+        raise HTTPException(
+            status_code=503,
+            detail="El servicio de autenticación está ocupado; inténtalo de nuevo",
+            headers={"Retry-After": "1"},
+        ) from exc
     except UserSourceError as exc:
         raise build_safe_http_error(
             status_code=500,
@@ -224,7 +323,21 @@ async def login(
             username=form_data.username,
         ) from exc
 
-    rate_limiter.register_failure(ip=client_ip, username=username)
+    if credentials_ok:
+        try:
+            token = generate_jwt(form_data.username)
+        except RuntimeError as exc:
+            raise build_safe_http_error(
+                status_code=500,
+                public_detail="No se pudo generar el token de autenticación",
+                log_message="Fallo al generar JWT para el usuario '%s'" % form_data.username,
+                exc=exc,
+                username=form_data.username,
+            ) from exc
+        await rate_limiter.register_success_async(ip=client_ip, username=username)
+        return {"access_token": token, "token_type": "bearer"}
+
+    await rate_limiter.register_failure_async(ip=client_ip, username=username)
     logger.warning(
         "Intento de autenticación fallido",
         extra={"context": {"username": username, "client_ip": client_ip}},
@@ -288,11 +401,56 @@ async def insert_data(db_name: str, table_name: str, schema: InsertDataSchema, u
     return {"message": "Datos insertados", "row_id": row_id}
 
 
-@router.get("/databases/{db_name:path}/fetch", tags=["Operaciones CRUD"], summary="Consultar datos", description="Recupera todos los registros de una tabla.")
-async def fetch_data(db_name: str, table_name: str, user: str = Depends(verify_jwt)):
+@router.post("/databases/{db_name:path}/insert_many", tags=["Operaciones CRUD"], summary="Insertar varias filas", description="Inserta en una transacción varias filas con las mismas columnas.")
+async def insert_many_data(db_name: str, table_name: str, schema: InsertRowsSchema, user: str = Depends(verify_jwt)):
     if not is_valid_sqlite_identifier(table_name):
         raise HTTPException(status_code=400, detail="Nombre de tabla inválido")
 
+    escaped_columns = ", ".join(f'"{escape_sqlite_identifier(column)}"' for column in schema.columns)
+    placeholders = ", ".join(["?"] * len(schema.columns))
+    query = (
+        f'INSERT INTO "{escape_sqlite_identifier(table_name)}" ({escaped_columns}) '
+        f"VALUES ({placeholders})"
+    )
+    try:
+        row_count = await db_manager.execute_many(db_name, query, schema.params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except aiosqlite.IntegrityError as exc:
+        raise _map_insert_integrity_error(exc, table_name) from exc
+    except (OperationalError, aiosqlite.OperationalError) as exc:
+        raise _map_sql_error(exc, table_name) from exc
+    return {"message": "Datos insertados", "row_count": row_count}
+
+
+@router.get(
+    "/databases/{db_name:path}/fetch",
+    tags=["Operaciones CRUD"],
+    summary="Consultar datos",
+    description=(
+        "Recupera todos los registros de una tabla. El formato se negocia con `Accept` "
+        "(JSON por filas, JSON columnar o MessagePack) o se fija con `format`."
+    ),
+)
+async def fetch_data(
+    request: Request,
+    db_name: str,
+    table_name: str,
+    fetch_format: str | None = Query(None, alias="format", description="json, columnar o msgpack"),
+    user: str = Depends(verify_jwt),
+):
+    if not is_valid_sqlite_identifier(table_name):
+        raise HTTPException(status_code=400, detail="Nombre de tabla inválido")
+
+    if fetch_format is None:
+        fetch_format = _negotiate_fetch_format(request.headers.get("accept"))
+    else:
+        fetch_format = fetch_format.strip().lower()
+        if fetch_format not in _FETCH_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Formato de consulta no soportado: {fetch_format}")
+        if fetch_format == "msgpack" and not msgpack_available():
+            raise HTTPException(status_code=501, detail="El formato msgpack requiere msgpack en el servidor")
+
     query = f'SELECT * FROM "{escape_sqlite_identifier(table_name)}"'
     try:
         column_names, rows = await db_manager.fetch_query_with_columns(db_name, query)
@@ -301,7 +459,92 @@ async def fetch_data(db_name: str, table_name: str, user: str = Depends(verify_j
     except (OperationalError, aiosqlite.OperationalError) as exc:
         raise _map_sql_error(exc, table_name) from exc
 
-    return _normalize_rows_response(column_names, rows)
+    # Las filas ya están normalizadas: se devuelve la respuesta sin pasar por ``jsonable_encoder``.
+    headers = {"Vary": "Accept"}
+    if fetch_format == "msgpack":
+        return MsgPackResponse(_binary_rows_response(column_names, rows), headers=headers)
+    if fetch_format == "columnar":
+        return FastJSONResponse(
+            _columnar_rows_response(column_names, rows),
+            media_type=_FETCH_FORMATS["columnar"],
+            headers=headers,
+        )
+    return FastJSONResponse(_normalize_rows_response(column_names, rows), headers=headers)
+
+
+@router.get(
+    "/databases/{db_name:path}/blob/{table_name}/{column}/{rowid}",
+    tags=["Operaciones CRUD"],
+    summary="Descargar un BLOB",
+    description=(
+        "Transmite por tramos el valor de `column` en la fila `rowid` sin cargarlo entero en memoria. "
+        "Admite la cabecera `Range` (un único rango de bytes)."
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_blob(
+    request: Request,
+    db_name: str,
+    table_name: str,
+    column: str,
+    rowid: int,
+    user: str = Depends(verify_jwt),
+):
+    if not is_valid_sqlite_identifier(table_name):
+        raise HTTPException(status_code=400, detail="Nombre de tabla inválido")
+    if not is_valid_sqlite_identifier(column):
+        raise HTTPException(status_code=400, detail="Nombre de columna inválido")
+
+    try:
+        db_path = db_manager.get_database_path(db_name)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if not db_path.exists():
+        raise HTTPException(status_code=404, detail=f"Base de datos '{db_name}' no encontrada")
+
+    cipher_key = get_settings().db_key
+    if cipher_key is not None and not cipher_key.strip():
+        cipher_key = None
+    try:
+        reader = await run_in_threadpool(
+            open_blob, db_path, table_name, column, rowid, cipher_key=cipher_key
+        )
+    except BlobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except SQLitePlusCipherError as exc:
+        raise HTTPException(status_code=503, detail="Base de datos no disponible") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except OperationalError as exc:
+        raise _map_sql_error(exc, table_name) from exc
+
+    headers = {"Accept-Ranges": "bytes"}
+    try:
+        byte_range = parse_byte_range(request.headers.get("range"), reader.size)
+    except UnsatisfiableRangeError as exc:
+        reader.close()
+        raise HTTPException(
+            status_code=416,
+            detail="Rango no satisfacible",
+            headers={**headers, "Content-Range": f"bytes */{reader.size}"},
+        ) from exc
+
+    status_code = 200
+    start, end = 0, reader.size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{reader.size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        iterate_in_threadpool(reader.iter_range(start, end + 1)),
+        status_code=status_code,
+        media_type="application/octet-stream",
+        headers=headers,
+        # Cierra la conexión aunque el cliente corte la descarga a medias.
+        background=BackgroundTask(reader.close),
+    )
 
 
 @router.delete("/databases/{db_name:path}/drop_table", tags=["Gestión de Base de Datos"], summary="Eliminar tabla", description="Elimina una tabla de la base de datos.")
@@ -358,35 +601,116 @@ async def backup_database(
     )
 
 
-@router.get("/databases/{db_name:path}/export/{table_name}", tags=["Herramientas"], summary="Exportar tabla a CSV", description="Exporta el contenido de una tabla a formato CSV.")
+_EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+
+@router.get(
+    "/databases/{db_name:path}/export/{table_name}",
+    tags=["Herramientas"],
+    summary="Exportar tabla",
+    description=(
+        "Exporta el contenido de una tabla a CSV (por defecto), JSON, Parquet o Arrow IPC. "
+        "Los formatos columnares requieren `pyarrow` en el servidor. Con `incremental=true` "
+        "solo se exportan las filas posteriores a la marca de agua recibida en `since`."
+    ),
+)
 async def export_table_csv(
     db_name: str,
     table_name: str,
     background_tasks: BackgroundTasks,
+    export_format: str = Query("csv", alias="format"),
+    incremental: bool = False,
+    key: str | None = None,
+    since: str | None = None,
     user: str = Depends(verify_jwt),
 ):
     if not is_valid_sqlite_identifier(table_name):
         raise HTTPException(status_code=400, detail="Nombre de tabla inválido")
 
+    since_value = None
+    if since is not None:
+        if not incremental:
+            raise HTTPException(status_code=400, detail="'since' requiere incremental=true")
+        try:
+            since_key, since_value = decode_watermark(since)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        requested_key = (key or since_key).strip()
+        if requested_key != since_key and not (
+            requested_key.lower() in ROWID_KEYS and since_key.lower() in ROWID_KEYS
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"La marca de agua se generó con la clave '{since_key}', no con '{requested_key}'",
+            )
+        key = since_key
+
+    export_format = export_format.strip().lower()
+    if export_format not in _EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato de exportación no soportado: {export_format}",
+        )
+    if export_format in COLUMNAR_FORMATS and not pyarrow_available():
+        raise HTTPException(
+            status_code=501,
+            detail=f"El formato {export_format} requiere pyarrow en el servidor",
+        )
+
     try:
         db_path = db_manager.get_database_path(db_name)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    # Definimos una ruta temporal para el CSV
+    # Definimos una ruta temporal para el archivo exportado
     import tempfile
-    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+    with tempfile.NamedTemporaryFile(suffix=f".{export_format}", delete=False) as tmp:
         output_file = tmp.name
 
     loop = asyncio.get_running_loop()
+    headers: dict[str, str] = {}
     try:
         # Reutilizamos la lógica robusta de exportación de SQLiteReplication
-        await loop.run_in_executor(
-            None,
-            lambda: SQLiteReplication(db_path=db_path).export_to_csv(
-                table_name, output_file, overwrite=True
+        if incremental:
+            # La marca no se guarda en el servidor: el cliente la conserva y la
+            # devuelve en ``since`` solo cuando ha recibido el archivo completo.
+            result = await loop.run_in_executor(
+                None,
+                lambda: SQLiteReplication(db_path=db_path).export_incremental(
+                    table_name,
+                    output_file,
+                    key=key or "rowid",
+                    since=since_value,
+                    persist=False,
+                    format=export_format,
+                    overwrite=True,
+                ),
+            )
+            headers = {
+                "X-SQLitePlus-Rows": str(result.rows),
+                "X-SQLitePlus-Watermark": (
+                    "" if result.watermark is None else encode_watermark(result.key, result.watermark)
+                ),
+            }
+        elif export_format == "csv":
+            await loop.run_in_executor(
+                None,
+                lambda: SQLiteReplication(db_path=db_path).export_to_csv(
+                    table_name, output_file, overwrite=True
+                )
+            )
+        else:
+            await loop.run_in_executor(
+                None,
+                lambda: SQLiteReplication(db_path=db_path).export_table(
+                    table_name, output_file, format=export_format, overwrite=True
+                )
             )
-        )
     except RuntimeError as exc:
         _cleanup_temp_file(output_file)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -403,6 +727,63 @@ async def export_table_csv(
     background_tasks.add_task(_cleanup_temp_file, output_file)
     return FileResponse(
         output_file,
-        media_type="text/csv",
-        filename=f"{table_name}.csv"
+        media_type=_EXPORT_MEDIA_TYPES[export_format],
+        filename=f"{table_name}.{export_format}",
+        headers=headers,
     )
+
+
+@router.get(
+    "/databases/{db_name:path}/changes",
+    tags=["Herramientas"],
+    summary="Leer el registro de cambios",
+    description=(
+        "Devuelve por lotes los cambios capturados por CDC con secuencia mayor que `since`. "
+        "Usa `last_seq` como `since` de la siguiente petición mientras `has_more` sea verdadero."
+    ),
+)
+async def read_changes(
+    db_name: str,
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=MAX_CHANGE_BATCH),
+    table: list[str] | None = Query(None),
+    user: str = Depends(verify_jwt),
+):
+    for table_name in table or []:
+        if not is_valid_sqlite_identifier(table_name):
+            raise HTTPException(status_code=400, detail="Nombre de tabla inválido")
+
+    try:
+        db_path = db_manager.get_database_path(db_name)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    loop = asyncio.get_running_loop()
+    try:
+        batch = await loop.run_in_executor(
+            None,
+            lambda: SQLiteReplication(db_path=db_path).read_changes(
+                since, limit=limit, tables=table
+            ),
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=f"Base de datos '{db_name}' no encontrada") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    except Exception as exc:
+        raise build_safe_http_error(
+            status_code=500,
+            public_detail="No se pudo leer el registro de cambios",
+            log_message=f"Error al leer el registro de cambios de '{db_name}'",
+            exc=exc,
+            db_name=db_name,
+        ) from exc
+
+    return {
+        "changes": [change.as_dict() for change in batch.changes],
+        "last_seq": batch.last_seq,
+        "has_more": batch.has_more,
+        "truncated": batch.truncated,
+    }
@@ -0,0 +1,220 @@
+"""Límites *token bucket* para los endpoints de datos (``/databases/...``).
+
+``DataRateLimitMiddleware`` se coloca delante de la aplicación y retira una
+ficha de hasta tres cubos por petición: el del sujeto del JWT, el de la IP
+cliente y el de la base de datos. Si alguno está vacío responde ``429`` con
+``Retry-After`` sin llegar al endpoint. Los cubos viven en los mismos
+almacenes que el *rate limit* de ``/token`` (memoria, SQLite o Redis); con el
+almacén en memoria todo ocurre en el bucle de eventos, sin hilos ni E/S.
+
+Se configura por ruta con ``SQLITEPLUS_DATA_RATE_LIMITS``, un objeto JSON cuyas
+claves son la acción de la ruta (``fetch``, ``export``, ``insert``...) o
+``default`` y cuyos valores indican una regla por ámbito::
+
+    {"default": {"subject": "20/s", "ip": "50/s:100"}, "export": {"subject": "10/m"}}
+
+Cada regla es ``<fichas>/<s|m|h>`` con una capacidad opcional tras ``:`` (por
+defecto, las fichas del periodo). Una ruta con entrada propia no hereda las
+reglas de ``default``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request
+
+from sqliteplus.api.client_ip import get_client_ip
+from sqliteplus.auth.jwt import verify_jwt
+from sqliteplus.auth.rate_limit import create_store_from_env
+from sqliteplus.auth.rate_limit_store import AsyncRateLimitStore, RateLimitStore
+
+_DATA_RATE_LIMITS_ENV = "SQLITEPLUS_DATA_RATE_LIMITS"
+DATA_ACTIONS = ("create_table", "insert_many", "insert", "fetch", "blob", "drop_table", "backup", "export", "changes")
+RATE_LIMIT_SCOPES = ("subject", "ip", "database")
+_PERIODS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+_RULE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*/\s*([smh])\s*(?::\s*(\d+(?:\.\d+)?)\s*)?$")
+
+
+@dataclass(frozen=True)
+class TokenBucketRule:
+    """Cubo que se rellena a ``rate`` fichas por segundo hasta ``burst``."""
+
+    rate: float
+    burst: float
+
+
+@dataclass(frozen=True)
+class RouteRateLimit:
+    subject: TokenBucketRule | None = None
+    ip: TokenBucketRule | None = None
+    database: TokenBucketRule | None = None
+
+
+def parse_token_bucket_rule(value: str) -> TokenBucketRule:
+    match = _RULE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Regla de límite inválida: {value!r} (se espera '<fichas>/<s|m|h>[:capacidad]')")
+    tokens = float(match.group(1))
+    burst = float(match.group(3)) if match.group(3) else tokens
+    if tokens <= 0 or burst < 1:
+        raise ValueError(f"Regla de límite inválida: {value!r} (fichas > 0 y capacidad >= 1)")
+    return TokenBucketRule(rate=tokens / _PERIODS[match.group(2)], burst=burst)
+
+
+def parse_route_limits(raw_value: str | Mapping[str, Mapping[str, str]]) -> dict[str, RouteRateLimit]:
+    config = json.loads(raw_value) if isinstance(raw_value, str) else raw_value
+    if not isinstance(config, Mapping):
+        raise TypeError("La configuración de límites debe ser un objeto JSON")
+
+    routes: dict[str, RouteRateLimit] = {}
+    for route, scopes in config.items():
+        if route != "default" and route not in DATA_ACTIONS:
+            raise ValueError(f"Ruta desconocida en la configuración de límites: {route!r}")
+        if not isinstance(scopes, Mapping):
+            raise TypeError(f"Las reglas de {route!r} deben ser un objeto JSON")
+        unknown = set(scopes) - set(RATE_LIMIT_SCOPES)
+        if unknown:
+            raise ValueError(f"Ámbitos desconocidos en {route!r}: {', '.join(sorted(unknown))}")
+        routes[route] = RouteRateLimit(
+            **{scope: parse_token_bucket_rule(rule) for scope, rule in scopes.items()}
+        )
+    return routes
+
+
+class DataRateLimitMiddleware:
+    """Middleware ASGI que aplica ``routes`` a las rutas de datos."""
+
+    def __init__(
+        self,
+        app,
+        *,
+        routes: Mapping[str, RouteRateLimit],
+        store: RateLimitStore | AsyncRateLimitStore | None = None,
+    ) -> None:
+        self.app = app
+        self.routes = dict(routes)
+        if store is None:
+            store = create_store_from_env()
+        self.store = store.as_async() if isinstance(store, RateLimitStore) else store
+        self._path_pattern = re.compile(
+            r"^/databases/(?P<db>.+?)/(?P<action>" + "|".join(DATA_ACTIONS) + r")(?:/|$)"
+        )
+        self.allowed_total = 0
+        self.limited_total = 0
+        self.limited_by_scope = {scope: 0 for scope in RATE_LIMIT_SCOPES}
+
+    def _resolve_subject(self, request: Request) -> str | None:
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        try:
+            # ``verify_jwt`` usa la caché de tokens verificados: el endpoint no vuelve a decodificarlo.
+            return verify_jwt(token.strip())
+        except HTTPException:
+            # Sin sujeto válido el endpoint responderá 401; aquí solo cuentan IP y base.
+            return None
+
+    async def __call__(self, scope, receive, send):
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+
+        match = self._path_pattern.match(scope.get("path", ""))
+        if match is None:
+            await self.app(scope, receive, send)
+            return
+
+        action = match.group("action")
+        route = action if action in self.routes else "default"
+        limits = self.routes.get(route)
+        if limits is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        checks: list[tuple[str, TokenBucketRule, str]] = []
+        if limits.ip is not None:
+            checks.append(("ip", limits.ip, get_client_ip(request)))
+        if limits.subject is not None:
+            subject = self._resolve_subject(request)
+            if subject is not None:
+                checks.append(("subject", limits.subject, subject))
+        if limits.database is not None:
+            checks.append(("database", limits.database, match.group("db")))
+
+        now = time.time()
+        for scope_name, rule, value in checks:
+            wait = await self.store.consume_token(
+                bucket=f"{route}:{scope_name}:{value}",
+                rate=rule.rate,
+                capacity=rule.burst,
+                now=now,
+            )
+            if wait > 0:
+                self.limited_total += 1
+                self.limited_by_scope[scope_name] += 1
+                await self._reject(send, scope_name, wait)
+                return
+
+        self.allowed_total += 1
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(send, scope_name: str, wait: float) -> None:
+        body = json.dumps(
+            {"detail": "Demasiadas peticiones; inténtalo más tarde", "scope": scope_name},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"retry-after", str(max(1, math.ceil(wait))).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def metrics_snapshot(self) -> dict[str, object]:
+        return {
+            "allowed_total": self.allowed_total,
+            "limited_total": self.limited_total,
+            "limited_by_scope": dict(self.limited_by_scope),
+        }
+
+
+def install_data_rate_limiter(app) -> None:
+    """Añade ``DataRateLimitMiddleware`` si ``SQLITEPLUS_DATA_RATE_LIMITS`` está definida."""
+
+    raw_value = os.environ.get(_DATA_RATE_LIMITS_ENV, "").strip()
+    if not raw_value:
+        return
+    try:
+        routes = parse_route_limits(raw_value)
+    except (TypeError, ValueError) as exc:
+        raise RuntimeError(f"{_DATA_RATE_LIMITS_ENV} no es válida: {exc}") from exc
+    app.add_middleware(DataRateLimitMiddleware, routes=routes)
+
+
+__all__ = [
+    "DATA_ACTIONS",
+    "DataRateLimitMiddleware",
+    "RouteRateLimit",
+    "TokenBucketRule",
+    "install_data_rate_limiter",
+    "parse_route_limits",
+    "parse_token_bucket_rule",
+]
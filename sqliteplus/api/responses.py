@@ -0,0 +1,165 @@
+"""Respuesta JSON con codificador rápido opcional.
+
+``FastJSONResponse`` serializa con ``orjson`` o ``msgspec`` si están instalados
+y, si no, con ``json`` de la biblioteca estándar con los mismos parámetros que
+``JSONResponse`` de Starlette. Los tres producen el mismo documento para los
+valores que devuelve ``normalize_json_value`` (``str``, ``int``, ``float``,
+``bool`` y ``None`` dentro de listas y diccionarios).
+
+El codificador se elige al importar el módulo según ``SQLITEPLUS_JSON_BACKEND``
+(``auto`` por defecto, ``orjson``, ``msgspec`` o ``json``) y puede cambiarse
+después con ``select_json_backend``.
+
+``MsgPackResponse`` serializa en MessagePack con ``msgpack`` (o ``msgspec``),
+ambos opcionales; los ``bytes`` viajan como binarios sin codificar.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import json
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+logger = logging.getLogger(__name__)
+
+_JSON_BACKEND_ENV = "SQLITEPLUS_JSON_BACKEND"
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def _stdlib_encoder() -> Callable[[Any], bytes]:
+    def dumps(content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    return dumps
+
+
+def _orjson_encoder() -> Callable[[Any], bytes]:
+    import orjson
+
+    return orjson.dumps
+
+
+def _msgspec_encoder() -> Callable[[Any], bytes]:
+    import msgspec
+
+    return msgspec.json.Encoder().encode
+
+
+_ENCODER_FACTORIES: dict[str, Callable[[], Callable[[Any], bytes]]] = {
+    "orjson": _orjson_encoder,
+    "msgspec": _msgspec_encoder,
+    "json": _stdlib_encoder,
+}
+
+_backend_name = "json"
+_dumps: Callable[[Any], bytes] = _stdlib_encoder()
+
+
+def select_json_backend(name: str | None = None) -> str:
+    """Activa el codificador ``name`` (o el de ``SQLITEPLUS_JSON_BACKEND``).
+
+    Con ``auto`` se usa el primero disponible de ``orjson``, ``msgspec`` y
+    ``json``. Un codificador pedido de forma explícita que no esté instalado
+    provoca ``RuntimeError``. Devuelve el nombre del codificador activo.
+    """
+
+    global _backend_name, _dumps
+    requested = (name if name is not None else os.environ.get(_JSON_BACKEND_ENV, "")).strip().lower() or "auto"
+    if requested != "auto" and requested not in JSON_BACKENDS:
+        raise ValueError(
+            f"Codificador JSON desconocido: {requested!r} (usa auto, {', '.join(JSON_BACKENDS)})"
+        )
+
+    candidates = JSON_BACKENDS if requested == "auto" else (requested,)
+    for candidate in candidates:
+        try:
+            encoder = _ENCODER_FACTORIES[candidate]()
+        except ImportError as exc:
+            if requested != "auto":
+                raise RuntimeError(f"El codificador JSON {candidate!r} no está instalado") from exc
+            continue
+        _backend_name, _dumps = candidate, encoder
+        logger.debug("Codificador JSON de las respuestas: %s", candidate)
+        return candidate
+    raise RuntimeError("No hay ningún codificador JSON disponible")  # pragma: no cover - json siempre existe
+
+
+def get_json_backend() -> str:
+    return _backend_name
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serializa ``content`` con el codificador activo."""
+
+    return _dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` que serializa con el codificador activo.
+
+    Devolverla directamente desde un endpoint evita además el paso de
+    ``jsonable_encoder`` de FastAPI, útil cuando el contenido ya está
+    normalizado (por ejemplo, las filas de ``/fetch``).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+def msgpack_available() -> bool:
+    """Indica si ``msgpack`` o ``msgspec`` pueden importarse en el entorno actual."""
+
+    return any(importlib.util.find_spec(name) is not None for name in ("msgpack", "msgspec"))
+
+
+@functools.lru_cache(maxsize=1)
+def _msgpack_encoder() -> Callable[[Any], bytes]:
+    try:
+        import msgpack
+    except ImportError:
+        try:
+            import msgspec
+        except ImportError as exc:
+            raise RuntimeError(
+                "El formato MessagePack requiere el paquete opcional 'msgpack'. "
+                "Instálalo con: pip install \"sqliteplus-enhanced[msgpack]\""
+            ) from exc
+        return msgspec.msgpack.Encoder().encode
+    return functools.partial(msgpack.packb, use_bin_type=True)
+
+
+class MsgPackResponse(Response):
+    """Respuesta MessagePack; requiere ``msgpack`` o ``msgspec``."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return _msgpack_encoder()(content)
+
+
+select_json_backend()
+
+
+__all__ = [
+    "JSON_BACKENDS",
+    "MSGPACK_MEDIA_TYPE",
+    "FastJSONResponse",
+    "MsgPackResponse",
+    "dumps_json",
+    "get_json_backend",
+    "msgpack_available",
+    "select_json_backend",
+]
@@ -0,0 +1,180 @@
+"""Detección de cambios en archivos sin tocar el sistema de archivos en cada consulta.
+
+En Linux se usa ``inotify`` sobre el directorio que contiene el archivo. Vigilar
+el directorio, y no el archivo, permite detectar también los reemplazos
+atómicos por renombrado, que es como la mayoría de editores y gestores de
+secretos escriben. ``has_changes`` solo hace una lectura no bloqueante del
+descriptor de ``inotify``; los eventos se encolan en el núcleo en el mismo
+momento de la escritura, así que no hay hilos ni retardos.
+
+En otras plataformas, o si ``inotify`` no está disponible, se recurre a
+``stat()`` como mucho una vez cada ``poll_interval`` segundos.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FileSignature = tuple[str, int, int]
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_READ_SIZE = 64 * 1024
+
+
+def file_signature(path: Path) -> FileSignature:
+    stat_result = path.stat()
+    return (str(path), int(stat_result.st_mtime_ns), stat_result.st_size)
+
+
+class FileWatcher(ABC):
+    """Indica si el archivo vigilado pudo cambiar desde la última sincronización."""
+
+    @abstractmethod
+    def has_changes(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def mark_synced(self, signature: FileSignature | None) -> None:
+        """Registra que el contenido con ``signature`` ya está cargado."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Libera los recursos del vigilante."""
+
+
+class InotifyFileWatcher(FileWatcher):
+    """Vigilante basado en ``inotify`` sobre los directorios de ``paths``."""
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        try:
+            directories = {str(path.parent) for path in paths}
+            for directory in sorted(directories):
+                wd = libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK)
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno), directory)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd: int | None = fd
+        self._pending = False
+
+    def has_changes(self) -> bool:
+        fd = self._fd
+        if fd is None:
+            return True
+        while True:
+            try:
+                data = os.read(fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                # Si el descriptor deja de ser utilizable se fuerza la recarga.
+                self._pending = True
+                break
+            if not data:
+                break
+            self._pending = True
+        return self._pending
+
+    def mark_synced(self, signature: FileSignature | None) -> None:
+        self._pending = False
+
+    def close(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+
+class PollingFileWatcher(FileWatcher):
+    """Vigilante que compara la firma del archivo como mucho cada ``poll_interval`` s."""
+
+    def __init__(self, path: Path, poll_interval: float) -> None:
+        self.path = path
+        self.poll_interval = max(0.0, poll_interval)
+        self._signature: FileSignature | None = None
+        self._last_check = float("-inf")
+        self._pending = True
+
+    def has_changes(self) -> bool:
+        if self._pending:
+            return True
+        now = time.monotonic()
+        if now - self._last_check < self.poll_interval:
+            return False
+        self._last_check = now
+        try:
+            signature = file_signature(self.path)
+        except OSError:
+            signature = None
+        if signature != self._signature:
+            self._pending = True
+        return self._pending
+
+    def mark_synced(self, signature: FileSignature | None) -> None:
+        self._signature = signature
+        self._last_check = time.monotonic()
+        self._pending = False
+
+
+def create_file_watcher(paths: Iterable[Path], *, poll_interval: float) -> FileWatcher:
+    """Crea el mejor vigilante disponible para el primer archivo de ``paths``.
+
+    ``paths`` puede incluir la ruta tal y como se configuró y la ruta resuelta,
+    para seguir también los enlaces simbólicos que se sustituyen al rotar secretos.
+    """
+
+    candidates = list(dict.fromkeys(paths))
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyFileWatcher(candidates)
+        except (OSError, AttributeError) as exc:
+            logger.debug("inotify no disponible (%s); se usa sondeo por mtime", exc)
+    return PollingFileWatcher(candidates[-1], poll_interval)
+
+
+__all__ = [
+    "FileSignature",
+    "FileWatcher",
+    "InotifyFileWatcher",
+    "PollingFileWatcher",
+    "create_file_watcher",
+    "file_signature",
+]
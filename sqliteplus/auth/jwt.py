@@ -1,30 +1,32 @@
+from collections import OrderedDict
+from collections.abc import Hashable
 from datetime import datetime, timedelta, timezone
+import hashlib
 import os
+import threading
+import time
 from typing import Final
 
 import jwt
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 
+from sqliteplus.core.settings import Settings, get_settings
+
 # Configuración de seguridad
-_SECRET_KEY_ENV: Final[str] = "SECRET_KEY"
-_JWT_ISSUER_ENV: Final[str] = "JWT_ISSUER"
-_JWT_AUDIENCE_ENV: Final[str] = "JWT_AUDIENCE"
-_JWT_STRICT_CLAIMS_ENV: Final[str] = "JWT_STRICT_CLAIMS"
+_JWT_CACHE_SIZE_ENV: Final[str] = "SQLITEPLUS_JWT_CACHE_SIZE"
+_DEFAULT_JWT_CACHE_SIZE: Final[int] = 1024
 ALGORITHM = "HS256"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
-def _is_truthy(value: str | None) -> bool:
-    return (value or "").strip().lower() in {"1", "true", "yes", "on"}
-
+def _requires_strict_claims(settings: Settings | None = None) -> bool:
+    return (settings or get_settings()).jwt_strict_claims
 
-def _requires_strict_claims() -> bool:
-    return _is_truthy(os.getenv(_JWT_STRICT_CLAIMS_ENV))
 
-
-def _get_issuer_and_audience() -> tuple[str | None, str | None]:
-    return (os.getenv(_JWT_ISSUER_ENV), os.getenv(_JWT_AUDIENCE_ENV))
+def _get_issuer_and_audience(settings: Settings | None = None) -> tuple[str | None, str | None]:
+    settings = settings or get_settings()
+    return (settings.jwt_issuer, settings.jwt_audience)
 
 
 def _has_basic_entropy(secret_key: str) -> bool:
@@ -40,10 +42,18 @@ def _has_basic_entropy(secret_key: str) -> bool:
     return unique_chars >= 12 and categories >= 3
 
 
-def _get_secret_key() -> str:
-    """Obtiene la clave secreta desde el entorno o levanta un error descriptivo."""
+# Última clave que superó la validación; evita repetir la comprobación de entropía.
+_validated_secret_key: str | None = None
+
 
-    secret_key = os.getenv(_SECRET_KEY_ENV)
+def _get_secret_key(settings: Settings | None = None) -> str:
+    """Obtiene la clave secreta configurada o levanta un error descriptivo."""
+
+    global _validated_secret_key
+
+    secret_key = (settings or get_settings()).secret_key
+    if secret_key and secret_key == _validated_secret_key:
+        return secret_key
     if not secret_key:
         raise RuntimeError(
             "SECRET_KEY debe definirse en el entorno antes de iniciar la aplicación"
@@ -57,6 +67,7 @@ def _get_secret_key() -> str:
             "SECRET_KEY no tiene suficiente entropía; usa una clave aleatoria segura"
         )
 
+    _validated_secret_key = secret_key
     return secret_key
 
 
@@ -69,8 +80,9 @@ def get_secret_key() -> str:
 def generate_jwt(username: str):
     now = datetime.now(timezone.utc)
     expiration = now + timedelta(hours=1)
-    issuer, audience = _get_issuer_and_audience()
-    strict_claims = _requires_strict_claims()
+    settings = get_settings()
+    issuer, audience = _get_issuer_and_audience(settings)
+    strict_claims = _requires_strict_claims(settings)
 
     if strict_claims and (not issuer or not audience):
         raise RuntimeError(
@@ -88,16 +100,131 @@ def generate_jwt(username: str):
     if audience:
         payload["aud"] = audience
 
-    secret_key = _get_secret_key()
+    secret_key = _get_secret_key(settings)
     return jwt.encode(payload, secret_key, algorithm=ALGORITHM)
 
 
+class VerifiedTokenCache:
+    """Caché LRU acotada de tokens ya verificados.
+
+    La clave es el SHA-256 del token y el valor, el sujeto verificado junto a
+    su ``exp``. Cada entrada se descarta al expirar el token. La caché entera
+    se vacía cuando cambia la configuración de verificación (clave secreta,
+    emisor, audiencia o modo estricto), de modo que rotar ``SECRET_KEY``
+    invalida al instante los tokens firmados con la clave anterior.
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_JWT_CACHE_SIZE) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._fingerprint: Hashable = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def _sync_fingerprint(self, fingerprint: Hashable) -> None:
+        if fingerprint != self._fingerprint:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._fingerprint = fingerprint
+
+    def get(self, token: str, fingerprint: Hashable, now: float) -> str | None:
+        if self.max_entries == 0:
+            return None
+        digest = self._digest(token)
+        with self._lock:
+            self._sync_fingerprint(fingerprint)
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            subject, expires_at = entry
+            if now >= expires_at:
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return subject
+
+    def put(self, token: str, fingerprint: Hashable, subject: str, expires_at: float) -> None:
+        if self.max_entries == 0:
+            return
+        digest = self._digest(token)
+        with self._lock:
+            self._sync_fingerprint(fingerprint)
+            self._entries[digest] = (subject, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fingerprint = None
+
+    def reset(self, *, max_entries: int | None = None) -> None:
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(0, max_entries)
+            self._entries.clear()
+            self._fingerprint = None
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def metrics_snapshot(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _cache_size_from_env() -> int:
+    raw_value = os.getenv(_JWT_CACHE_SIZE_ENV)
+    if raw_value is None or not raw_value.strip():
+        return _DEFAULT_JWT_CACHE_SIZE
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        return _DEFAULT_JWT_CACHE_SIZE
+
+
+verified_token_cache = VerifiedTokenCache(_cache_size_from_env())
+
+
+def reset_jwt_cache(*, max_entries: int | None = None) -> None:
+    verified_token_cache.reset(max_entries=max_entries)
+
+
+def get_jwt_cache_metrics() -> dict[str, object]:
+    return verified_token_cache.metrics_snapshot()
+
+
 def verify_jwt(token: str = Depends(oauth2_scheme)) -> str:
     """
     Verifica y decodifica el token JWT. Devuelve el nombre de usuario.
     """
+    # Una sola instantánea por petición: clave, emisor y audiencia siempre coherentes.
+    settings = get_settings()
     try:
-        secret_key = _get_secret_key()
+        secret_key = _get_secret_key(settings)
     except RuntimeError as exc:
         raise HTTPException(
             status_code=500,
@@ -105,10 +232,14 @@ def verify_jwt(token: str = Depends(oauth2_scheme)) -> str:
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
 
-    try:
-        issuer, audience = _get_issuer_and_audience()
-        strict_claims = _requires_strict_claims()
+    issuer, audience = _get_issuer_and_audience(settings)
+    strict_claims = _requires_strict_claims(settings)
+    fingerprint = (secret_key, issuer, audience, strict_claims)
+    cached_subject = verified_token_cache.get(token, fingerprint, time.time())
+    if cached_subject is not None:
+        return cached_subject
 
+    try:
         required_claims = ["sub", "exp", "iat", "nbf"]
         if strict_claims:
             required_claims.extend(["iss", "aud"])
@@ -136,6 +267,7 @@ def verify_jwt(token: str = Depends(oauth2_scheme)) -> str:
                 detail="Token inválido: sujeto no disponible",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        verified_token_cache.put(token, fingerprint, subject, float(payload["exp"]))
         return subject
     except jwt.ExpiredSignatureError:
         raise HTTPException(
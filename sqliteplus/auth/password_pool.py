@@ -0,0 +1,241 @@
+"""Verificación de contraseñas ``bcrypt`` fuera del bucle de eventos.
+
+``password_pool`` ejecuta las comprobaciones de ``/token`` en un *pool* de hilos
+acotado (``SQLITEPLUS_LOGIN_WORKERS``) con una cola limitada
+(``SQLITEPLUS_LOGIN_QUEUE_SIZE``) y un plazo de espera en cola
+(``SQLITEPLUS_LOGIN_QUEUE_TIMEOUT``). Cuando se supera la capacidad la petición
+se rechaza con ``PasswordPoolSaturatedError`` en lugar de acumularse.
+``get_password_pool_metrics`` expone latencias y saturación.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from sqliteplus.auth.users import UserCredentialsService
+
+logger = logging.getLogger(__name__)
+
+_WORKERS_ENV = "SQLITEPLUS_LOGIN_WORKERS"
+_QUEUE_SIZE_ENV = "SQLITEPLUS_LOGIN_QUEUE_SIZE"
+_QUEUE_TIMEOUT_ENV = "SQLITEPLUS_LOGIN_QUEUE_TIMEOUT"
+_LATENCY_SAMPLES = 1024
+
+
+class PasswordPoolError(RuntimeError):
+    """Error base cuando el pool de verificación no puede atender una petición."""
+
+
+class PasswordPoolSaturatedError(PasswordPoolError):
+    """Se alcanzó el máximo de verificaciones en curso más las encoladas."""
+
+
+class PasswordPoolTimeoutError(PasswordPoolError):
+    """La verificación esperó en cola más de lo permitido sin llegar a ejecutarse."""
+
+
+class PasswordVerificationPool:
+    """Pool acotado de hilos para ejecutar ``bcrypt.checkpw`` fuera del bucle de eventos.
+
+    ``bcrypt`` libera el GIL mientras calcula el hash, así que unos pocos hilos
+    bastan para que los inicios de sesión concurrentes no bloqueen al resto de
+    endpoints. ``max_workers`` limita las verificaciones simultáneas y
+    ``max_queue`` las que pueden esperar turno; por encima de ese total la
+    petición se rechaza de inmediato. Una petición encolada que no empieza antes
+    de ``queue_timeout`` segundos se cancela sin llegar a calcular el hash
+    (``0`` desactiva el plazo).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        max_queue: int = 32,
+        queue_timeout: float = 5.0,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = max(0.0, queue_timeout)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.submitted_total = 0
+        self.completed_total = 0
+        self.rejected_total = 0
+        self.timed_out_total = 0
+        self.peak_in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._queue_waits: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="sqliteplus-bcrypt"
+                )
+            return self._executor
+
+    def _run(
+        self,
+        service: UserCredentialsService,
+        username: str,
+        password: str,
+        enqueued_at: float,
+    ) -> bool:
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._queue_waits.append(started - enqueued_at)
+        try:
+            return service.verify_credentials(username, password)
+        finally:
+            with self._lock:
+                self._running = max(0, self._running - 1)
+
+    async def verify(self, service: UserCredentialsService, username: str, password: str) -> bool:
+        """Verifica las credenciales en el pool sin bloquear el bucle de eventos."""
+
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected_total += 1
+                raise PasswordPoolSaturatedError(
+                    "El pool de verificación de contraseñas está saturado"
+                )
+            self._in_flight += 1
+            self.submitted_total += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+
+        enqueued_at = time.perf_counter()
+        try:
+            future = self._get_executor().submit(self._run, service, username, password, enqueued_at)
+            wrapped = asyncio.wrap_future(future)
+            try:
+                # ``shield`` evita que el vencimiento del plazo cancele una verificación ya iniciada.
+                return await asyncio.wait_for(asyncio.shield(wrapped), self.queue_timeout or None)
+            except asyncio.TimeoutError:
+                if future.cancel():
+                    with self._lock:
+                        self.timed_out_total += 1
+                    raise PasswordPoolTimeoutError(
+                        "La verificación de credenciales superó el tiempo máximo de espera en cola"
+                    ) from None
+                return await wrapped
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+        finally:
+            elapsed = time.perf_counter() - enqueued_at
+            with self._lock:
+                self._in_flight = max(0, self._in_flight - 1)
+                self.completed_total += 1
+                self._latencies.append(elapsed)
+
+    def metrics_snapshot(self) -> dict[str, object]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            queue_waits = list(self._queue_waits)
+            in_flight = self._in_flight
+            running = self._running
+            snapshot: dict[str, object] = {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_timeout_seconds": self.queue_timeout,
+                "in_flight": in_flight,
+                "running": running,
+                "queued": max(0, in_flight - running),
+                "saturation": in_flight / self.capacity,
+                "peak_in_flight": self.peak_in_flight,
+                "submitted_total": self.submitted_total,
+                "completed_total": self.completed_total,
+                "rejected_total": self.rejected_total,
+                "timed_out_total": self.timed_out_total,
+            }
+        snapshot["latency_ms"] = _summarize(latencies)
+        snapshot["queue_wait_ms"] = _summarize(sorted(queue_waits))
+        return snapshot
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def reset(
+        self,
+        *,
+        max_workers: int | None = None,
+        max_queue: int | None = None,
+        queue_timeout: float | None = None,
+    ) -> None:
+        self.shutdown()
+        with self._lock:
+            if max_workers is not None:
+                self.max_workers = max(1, max_workers)
+            if max_queue is not None:
+                self.max_queue = max(0, max_queue)
+            if queue_timeout is not None:
+                self.queue_timeout = max(0.0, queue_timeout)
+            self._in_flight = 0
+            self._running = 0
+            self._reset_counters()
+
+
+def _summarize(sorted_samples: list[float]) -> dict[str, float]:
+    if not sorted_samples:
+        return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    def percentile(fraction: float) -> float:
+        index = min(len(sorted_samples) - 1, round(fraction * (len(sorted_samples) - 1)))
+        return sorted_samples[index] * 1000
+
+    return {
+        "count": len(sorted_samples),
+        "avg": sum(sorted_samples) / len(sorted_samples) * 1000,
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": sorted_samples[-1] * 1000,
+    }
+
+
+def _read_number(env_name: str, default: float, cast: type) -> float:
+    raw_value = os.getenv(env_name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return cast(raw_value)
+    except ValueError:
+        logger.warning("Valor inválido para %s: %r; se usa %s", env_name, raw_value, default)
+        return default
+
+
+def _create_pool_from_env() -> PasswordVerificationPool:
+    return PasswordVerificationPool(
+        max_workers=int(_read_number(_WORKERS_ENV, min(4, os.cpu_count() or 1), int)),
+        max_queue=int(_read_number(_QUEUE_SIZE_ENV, 32, int)),
+        queue_timeout=_read_number(_QUEUE_TIMEOUT_ENV, 5.0, float),
+    )
+
+
+password_pool = _create_pool_from_env()
+
+
+def reset_password_pool(**kwargs: float) -> None:
+    password_pool.reset(**kwargs)
+
+
+def get_password_pool_metrics() -> dict[str, object]:
+    return password_pool.metrics_snapshot()
@@ -1,12 +1,24 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime, timezone
 import json
 import logging
 import os
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, Tuple
+from urllib.parse import quote
+
+from sqliteplus.core.settings import get_settings
+from sqliteplus.utils.crypto_sqlite import SQLitePlusCipherError, apply_cipher_key
 
 logger = logging.getLogger(__name__)
 
+USERS_DB_ENV = "SQLITEPLUS_USERS_DB"
+USERS_DB_KEY_ENV = "SQLITEPLUS_USERS_DB_KEY"
+USERS_TABLE = "users"
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$", "compatbcrypt$")
+
 
 class UserSourceError(RuntimeError):
     """Señala problemas para cargar la fuente de usuarios."""
@@ -16,15 +28,19 @@ class UserProvider(ABC):
     """Interfaz para obtener credenciales de usuarios."""
 
     @abstractmethod
-    def get_users(self) -> Dict[str, str]:
+    def get_users(self) -> dict[str, str]:
         """Devuelve un diccionario {username: bcrypt_hash}."""
         pass
 
     @abstractmethod
-    def get_source_signature(self) -> Tuple[str, int, int] | None:
+    def get_source_signature(self) -> tuple[str, int, int] | None:
         """Devuelve una firma para detectar cambios en la fuente."""
         pass
 
+    def get_password_hash(self, username: str) -> str | None:
+        """Devuelve el hash de ``username`` o ``None`` si no existe."""
+        return self.get_users().get(username)
+
 
 class JsonFileUserProvider(UserProvider):
     """Proveedor que lee usuarios desde un archivo JSON especificado en el entorno."""
@@ -33,7 +49,7 @@ class JsonFileUserProvider(UserProvider):
         self.path = self._resolve_users_file_path()
 
     def _resolve_users_file_path(self) -> Path:
-        users_file = os.getenv("SQLITEPLUS_USERS_FILE")
+        users_file = get_settings().users_file
         if not users_file:
             raise UserSourceError("La variable de entorno 'SQLITEPLUS_USERS_FILE' no está definida")
 
@@ -64,7 +80,7 @@ class JsonFileUserProvider(UserProvider):
             weak_mask = 0o077
             weak_bits = mode & weak_mask
             if weak_bits:
-                allow_weak_perms = os.getenv("SQLITEPLUS_ALLOW_WEAK_USERS_FILE_PERMS") == "1"
+                allow_weak_perms = get_settings().allow_weak_users_file_perms
                 message = (
                     "Permisos inseguros en el archivo de usuarios: "
                     f"{path} tiene modo {mode:03o}; usa chmod 600 para restringir acceso. "
@@ -78,7 +94,7 @@ class JsonFileUserProvider(UserProvider):
 
         return path
 
-    def get_users(self) -> Dict[str, str]:
+    def get_users(self) -> dict[str, str]:
         try:
             raw_content = self.path.read_text(encoding="utf-8")
         except OSError as exc:
@@ -96,10 +112,199 @@ class JsonFileUserProvider(UserProvider):
 
         return {str(key): str(value) for key, value in data.items()}
 
-    def get_source_signature(self) -> Tuple[str, int, int]:
+    def get_source_signature(self) -> tuple[str, int, int]:
         try:
             stat_result = self.path.stat()
         except OSError as exc:
             raise UserSourceError(f"No se puede acceder al archivo de usuarios: {exc}") from exc
 
         return (str(self.path), int(stat_result.st_mtime_ns), stat_result.st_size)
+
+
+def is_password_hash(value: str) -> bool:
+    """Indica si ``value`` tiene el formato de un hash bcrypt admitido."""
+
+    return isinstance(value, str) and value.startswith(_BCRYPT_PREFIXES)
+
+
+def _resolve_users_db_path(db_path: str | os.PathLike[str] | None) -> Path:
+    raw_path = db_path if db_path is not None else get_settings().users_db
+    if not raw_path:
+        raise UserSourceError(f"La variable de entorno '{USERS_DB_ENV}' no está definida")
+    return Path(raw_path).expanduser()
+
+
+def connect_user_store(
+    db_path: str | os.PathLike[str] | None = None,
+    *,
+    cipher_key: str | None = None,
+    read_only: bool = False,
+) -> sqlite3.Connection:
+    """Abre la base de usuarios aplicando la clave SQLCipher si se indica."""
+
+    path = _resolve_users_db_path(db_path)
+    if read_only:
+        if not path.is_file():
+            raise UserSourceError(f"La base de usuarios '{path}' no existe")
+        uri = f"file:{quote(str(path.resolve()))}?mode=ro"
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(path), check_same_thread=False)
+    try:
+        apply_cipher_key(connection, cipher_key)
+        if not read_only:
+            connection.execute("PRAGMA journal_mode=WAL")
+            # ``WITHOUT ROWID`` guarda cada fila en el propio índice de la clave primaria.
+            connection.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS "{USERS_TABLE}" (
+                    username TEXT PRIMARY KEY NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            connection.commit()
+    except (sqlite3.Error, SQLitePlusCipherError) as exc:
+        connection.close()
+        raise UserSourceError(f"No se pudo abrir la base de usuarios '{path}': {exc}") from exc
+    return connection
+
+
+def upsert_users(
+    connection: sqlite3.Connection,
+    users: Iterable[tuple[str, str]],
+    *,
+    replace: bool = True,
+    batch_size: int = 5000,
+) -> int:
+    """Inserta (o actualiza con ``replace``) pares usuario/hash en una sola transacción.
+
+    Devuelve el número de filas escritas. Los hashes deben ser bcrypt; una
+    contraseña en claro se rechaza con ``ValueError`` antes de escribir nada.
+    """
+
+    conflict = (
+        "ON CONFLICT (username) DO UPDATE SET "
+        "password_hash = excluded.password_hash, updated_at = excluded.updated_at"
+        if replace
+        else "ON CONFLICT (username) DO NOTHING"
+    )
+    statement = (
+        f'INSERT INTO "{USERS_TABLE}" (username, password_hash, updated_at) '
+        f"VALUES (?, ?, ?) {conflict}"
+    )
+    now = datetime.now(timezone.utc).isoformat()
+    written = 0
+    batch: list[tuple[str, str, str]] = []
+    with connection:
+        for index, (username, password_hash) in enumerate(users, start=1):
+            username = str(username).strip()
+            if not username:
+                raise ValueError(f"Registro {index}: el nombre de usuario está vacío")
+            if not is_password_hash(password_hash):
+                raise ValueError(
+                    f"Registro {index} ('{username}'): el valor no es un hash bcrypt. "
+                    "Genera uno con 'python -m sqliteplus.auth.users hash'."
+                )
+            batch.append((username, password_hash, now))
+            if len(batch) >= batch_size:
+                written += connection.executemany(statement, batch).rowcount
+                batch.clear()
+        if batch:
+            written += connection.executemany(statement, batch).rowcount
+    return written
+
+
+class SQLiteUserProvider(UserProvider):
+    """Proveedor respaldado por una tabla SQLite indexada por nombre de usuario.
+
+    Cada inicio de sesión hace una búsqueda puntual por clave primaria en lugar
+    de cargar todos los usuarios en memoria, así que el coste no depende del
+    número de cuentas y los cambios hechos con ``python -m sqliteplus.auth.users``
+    se ven al instante. La base se abre en solo lectura; si se define
+    ``SQLITEPLUS_USERS_DB_KEY`` se aplica como clave SQLCipher.
+    """
+
+    def __init__(
+        self,
+        db_path: str | os.PathLike[str] | None = None,
+        *,
+        cipher_key: str | None = None,
+    ) -> None:
+        self.path = _resolve_users_db_path(db_path)
+        self.cipher_key = cipher_key if cipher_key is not None else get_settings().users_db_key
+        self._lock = threading.Lock()
+        self._connection = connect_user_store(self.path, cipher_key=self.cipher_key, read_only=True)
+        try:
+            self._connection.execute(f'SELECT 1 FROM "{USERS_TABLE}" LIMIT 0')
+        except sqlite3.Error as exc:
+            self.close()
+            raise UserSourceError(
+                f"La base '{self.path}' no contiene la tabla de usuarios; "
+                "créala con 'python -m sqliteplus.auth.users init'"
+            ) from exc
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            if self._connection is None:
+                raise UserSourceError("El proveedor de usuarios SQLite está cerrado")
+            try:
+                return self._connection.execute(sql, params).fetchall()
+            except sqlite3.Error as exc:
+                raise UserSourceError(f"No se pudo consultar la base de usuarios: {exc}") from exc
+
+    def get_password_hash(self, username: str) -> str | None:
+        rows = self._query(
+            f'SELECT password_hash FROM "{USERS_TABLE}" WHERE username = ?', (username,)
+        )
+        return rows[0][0] if rows else None
+
+    def get_users(self) -> dict[str, str]:
+        return dict(self._query(f'SELECT username, password_hash FROM "{USERS_TABLE}"'))
+
+    def count(self) -> int:
+        return self._query(f'SELECT count(*) FROM "{USERS_TABLE}"')[0][0]
+
+    def usernames(self) -> list[str]:
+        return [row[0] for row in self._query(f'SELECT username FROM "{USERS_TABLE}" ORDER BY username')]
+
+    def get_source_signature(self) -> tuple[str, int, int]:
+        try:
+            stat_result = self.path.stat()
+        except OSError as exc:
+            raise UserSourceError(f"No se puede acceder a la base de usuarios: {exc}") from exc
+        return (str(self.path), int(stat_result.st_mtime_ns), stat_result.st_size)
+
+    def close(self) -> None:
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+class ProviderUserMapping(Mapping):
+    """Vista de solo lectura que resuelve cada usuario con una búsqueda puntual."""
+
+    def __init__(self, provider: UserProvider) -> None:
+        self.provider = provider
+
+    def __getitem__(self, username: str) -> str:
+        password_hash = self.provider.get_password_hash(username)
+        if password_hash is None:
+            raise KeyError(username)
+        return password_hash
+
+    def get(self, username, default=None):
+        password_hash = self.provider.get_password_hash(username)
+        return default if password_hash is None else password_hash
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.provider.get_users())
+
+    def __len__(self) -> int:
+        return len(self.provider.get_users())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({type(self.provider).__name__})"
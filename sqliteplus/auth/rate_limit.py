@@ -4,6 +4,7 @@ import os
 import time
 
 from sqliteplus.auth.rate_limit_store import (
+    AsyncRateLimitStore,
     RateLimitConfig,
     RateLimitStore,
     create_rate_limit_store,
@@ -11,7 +12,12 @@ from sqliteplus.auth.rate_limit_store import (
 
 
 class LoginRateLimiter:
-    """Rate limiter para proteger el endpoint /token desacoplado del almacenamiento."""
+    """Rate limiter para proteger el endpoint /token desacoplado del almacenamiento.
+
+    Los métodos ``*_async`` usan la vista asíncrona del almacén (``store.as_async()``
+    o ``async_store``) y son los que llama el endpoint, para que una consulta a
+    Redis o SQLite no detenga el bucle de eventos.
+    """
 
     def __init__(
         self,
@@ -26,6 +32,7 @@ class LoginRateLimiter:
         max_metrics_keys: int = 1024,
         prune_every_ops: int | None = None,
         store: RateLimitStore | None = None,
+        async_store: AsyncRateLimitStore | None = None,
     ) -> None:
         self.max_attempts = max_attempts
         self.window_seconds = window_seconds
@@ -36,7 +43,8 @@ class LoginRateLimiter:
         self.max_states = max_states
         self.max_metrics_keys = max(1, max_metrics_keys)
         self.prune_every_ops = prune_every_ops
-        self._store = store or _create_store_from_env()
+        self._store = store or create_store_from_env()
+        self._async_store = async_store or self._store.as_async()
 
     def _config(self) -> RateLimitConfig:
         return RateLimitConfig(
@@ -65,6 +73,21 @@ class LoginRateLimiter:
     def metrics_snapshot(self) -> dict[str, object]:
         return self._store.metrics_snapshot(config=self._config(), now=time.time())
 
+    async def is_blocked_async(self, *, ip: str, username: str | None, now: float | None = None) -> bool:
+        current = now if now is not None else time.time()
+        return await self._async_store.is_blocked(ip=ip, username=username, config=self._config(), now=current)
+
+    async def register_failure_async(self, *, ip: str, username: str | None, now: float | None = None) -> None:
+        current = now if now is not None else time.time()
+        await self._async_store.register_failure(ip=ip, username=username, config=self._config(), now=current)
+
+    async def register_success_async(self, *, ip: str, username: str | None, now: float | None = None) -> None:
+        current = now if now is not None else time.time()
+        await self._async_store.register_success(ip=ip, username=username, config=self._config(), now=current)
+
+    async def metrics_snapshot_async(self) -> dict[str, object]:
+        return await self._async_store.metrics_snapshot(config=self._config(), now=time.time())
+
     def reset(
         self,
         *,
@@ -78,6 +101,7 @@ class LoginRateLimiter:
         max_metrics_keys: int | None = None,
         prune_every_ops: int | None = None,
         store: RateLimitStore | None = None,
+        async_store: AsyncRateLimitStore | None = None,
     ) -> None:
         if max_attempts is not None:
             self.max_attempts = max_attempts
@@ -99,15 +123,20 @@ class LoginRateLimiter:
         if prune_every_ops is not None:
             self.prune_every_ops = prune_every_ops
 
-        self._store = store or self._store
+        if store is not None:
+            self._store = store
+            self._async_store = async_store or store.as_async()
+        elif async_store is not None:
+            self._async_store = async_store
         self._store.reset()
 
 
 
-def _create_store_from_env() -> RateLimitStore:
+def create_store_from_env() -> RateLimitStore:
     backend = os.getenv("SQLITEPLUS_RATE_LIMIT_BACKEND", "memory")
     redis_url = os.getenv("SQLITEPLUS_RATE_LIMIT_REDIS_URL")
-    return create_rate_limit_store(backend=backend, redis_url=redis_url)
+    sqlite_path = os.getenv("SQLITEPLUS_RATE_LIMIT_SQLITE_PATH")
+    return create_rate_limit_store(backend=backend, redis_url=redis_url, sqlite_path=sqlite_path)
 
 
 login_rate_limiter = LoginRateLimiter()
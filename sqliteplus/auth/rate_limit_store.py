@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import heapq
 import logging
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from collections import OrderedDict, deque
-from dataclasses import dataclass, field
-from typing import Deque
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import MutableSequence
 
 logger = logging.getLogger(__name__)
 
@@ -22,20 +27,37 @@ class RateLimitConfig:
     max_metrics_keys: int = 1024
 
 
-@dataclass
+@dataclass(slots=True)
 class AttemptState:
-    failures: Deque[float] = field(default_factory=deque)
+    """Estado de una IP o usuario en ``InMemoryRateLimitStore``.
+
+    ``counts`` es un anillo de contadores, uno por franja de la ventana, que
+    solo existe mientras hay fallos sin bloquear; ``head`` es el índice
+    absoluto de la franja más reciente. ``scheduled_at`` es el vencimiento con
+    el que el estado figura en el montículo de caducidad.
+    """
+
+    counts: MutableSequence[int] | None = None
+    head: int = 0
     blocked_until: float = 0.0
     penalty_level: int = 0
     last_seen: float = 0.0
+    scheduled_at: float | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricState:
     failures: int = 0
     last_seen: float = 0.0
 
 
+@dataclass(slots=True)
+class TokenBucketState:
+    tokens: float
+    updated: float
+    full_at: float
+
+
 class RateLimitStore(ABC):
     @abstractmethod
     def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
@@ -57,11 +79,166 @@ class RateLimitStore(ABC):
     def reset(self) -> None:
         raise NotImplementedError
 
+    def consume_token(self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0) -> float:
+        """Retira ``cost`` fichas del *token bucket* ``bucket`` si hay suficientes.
+
+        El cubo se rellena a ``rate`` fichas por segundo hasta ``capacity`` y
+        nace lleno. Devuelve ``0.0`` si se conceden las fichas o, si no, los
+        segundos que faltan para que las haya.
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} no admite token buckets")
+
+    def as_async(self) -> AsyncRateLimitStore:
+        """Devuelve una vista asíncrona del almacén para usarla desde el bucle de eventos.
+
+        Por defecto cada operación se ejecuta en un hilo con ``asyncio.to_thread``;
+        los almacenes que no bloquean o que tienen cliente asíncrono propio lo sustituyen.
+        """
+
+        return ThreadedAsyncRateLimitStore(self)
+
+
+class AsyncRateLimitStore(ABC):
+    """Variante asíncrona de ``RateLimitStore`` para el camino de ``/token``."""
+
+    @abstractmethod
+    async def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def register_failure(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def register_success(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reset(self) -> None:
+        raise NotImplementedError
+
+    async def consume_token(
+        self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0
+    ) -> float:
+        raise NotImplementedError(f"{type(self).__name__} no admite token buckets")
+
+
+class InlineAsyncRateLimitStore(AsyncRateLimitStore):
+    """Llama directamente a un almacén síncrono que nunca bloquea (en memoria)."""
+
+    def __init__(self, store: RateLimitStore) -> None:
+        self.store = store
+
+    async def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
+        return self.store.is_blocked(ip=ip, username=username, config=config, now=now)
+
+    async def register_failure(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        self.store.register_failure(ip=ip, username=username, config=config, now=now)
+
+    async def register_success(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        self.store.register_success(ip=ip, username=username, config=config, now=now)
+
+    async def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
+        return self.store.metrics_snapshot(config=config, now=now)
+
+    async def reset(self) -> None:
+        self.store.reset()
+
+    async def consume_token(
+        self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0
+    ) -> float:
+        return self.store.consume_token(bucket=bucket, rate=rate, capacity=capacity, now=now, cost=cost)
+
+
+class ThreadedAsyncRateLimitStore(AsyncRateLimitStore):
+    """Ejecuta en un hilo un almacén síncrono con E/S bloqueante (SQLite, Redis síncrono)."""
+
+    def __init__(self, store: RateLimitStore) -> None:
+        self.store = store
+
+    async def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
+        return await asyncio.to_thread(self.store.is_blocked, ip=ip, username=username, config=config, now=now)
+
+    async def register_failure(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        await asyncio.to_thread(self.store.register_failure, ip=ip, username=username, config=config, now=now)
+
+    async def register_success(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        await asyncio.to_thread(self.store.register_success, ip=ip, username=username, config=config, now=now)
+
+    async def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
+        return await asyncio.to_thread(self.store.metrics_snapshot, config=config, now=now)
+
+    async def reset(self) -> None:
+        await asyncio.to_thread(self.store.reset)
+
+    async def consume_token(
+        self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0
+    ) -> float:
+        return await asyncio.to_thread(
+            self.store.consume_token, bucket=bucket, rate=rate, capacity=capacity, now=now, cost=cost
+        )
+
+
+def _new_counters(size: int, max_attempts: int) -> MutableSequence[int]:
+    # Cada franja cuenta como mucho ``max_attempts - 1`` fallos antes de que el bloqueo la vacíe.
+    if max_attempts <= 256:
+        return bytearray(size)
+    return array("I", bytes(4 * size))
+
 
 class InMemoryRateLimitStore(RateLimitStore):
-    def __init__(self) -> None:
+    """Almacén en memoria de un único proceso.
+
+    Los fallos de cada clave se cuentan en ``window_buckets`` franjas de
+    ``window_seconds / window_buckets`` segundos en lugar de guardar cada
+    instante, así que el coste por clave es fijo por muchos intentos que
+    reciba. Un fallo sigue contando mientras su franja esté en la ventana, es
+    decir, como mucho una franja más que con instantes exactos.
+
+    La caducidad se programa en un montículo por tipo de clave y la purga solo
+    visita las entradas vencidas en lugar de recorrer todos los estados. Estados
+    y métricas se guardan en orden de último uso, de modo que los desalojos por
+    ``max_states`` y ``max_metrics_keys`` toman los más antiguos del principio.
+    Cada operación saca como mucho ``prune_batch_size`` entradas por montículo,
+    para que ninguna petición pague sola la caducidad de un ataque entero.
+
+    Los *token buckets* también se guardan en orden de último uso: un cubo que
+    ya se habría rellenado equivale a no tener cubo, así que se descartan desde
+    el principio y, por encima de ``max_buckets``, se descartan los más antiguos.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_buckets: int = 16,
+        prune_batch_size: int = 1024,
+        max_buckets: int = 100_000,
+    ) -> None:
+        self.window_buckets = max(1, window_buckets)
+        self.prune_batch_size = max(1, prune_batch_size)
+        self.max_buckets = max(1, max_buckets)
+        self._buckets: dict[str, TokenBucketState] = {}
         self._ip_states: dict[str, AttemptState] = {}
         self._user_states: dict[str, AttemptState] = {}
+        self._ip_expiry: list[tuple[float, str]] = []
+        self._user_expiry: list[tuple[float, str]] = []
         self.failed_attempts_total = 0
         self.failed_attempts_ip_total = 0
         self.failed_attempts_user_total = 0
@@ -90,10 +267,54 @@ class InMemoryRateLimitStore(RateLimitStore):
             metrics.popitem(last=False)
             self.metrics_dropped_total += 1
 
-    def _purge_window(self, state: AttemptState, *, now: float, config: RateLimitConfig) -> None:
-        lower_bound = now - config.window_seconds
-        while state.failures and state.failures[0] < lower_bound:
-            state.failures.popleft()
+    def _bucket_seconds(self, config: RateLimitConfig) -> float:
+        return config.window_seconds / self.window_buckets or 1e-9
+
+    def _purge_window(self, state: AttemptState, *, now: float, config: RateLimitConfig) -> int:
+        """Vacía las franjas que salieron de la ventana y devuelve los fallos vigentes."""
+
+        counts = state.counts
+        if counts is None:
+            return 0
+        current = int(now // self._bucket_seconds(config))
+        gap = current - state.head
+        if gap > 0:
+            size = len(counts)
+            for index in range(state.head + 1, state.head + 1 + min(gap, size)):
+                counts[index % size] = 0
+            state.head = current
+        failures = sum(counts)
+        if not failures:
+            state.counts = None
+        return failures
+
+    def _expires_at(self, state: AttemptState, *, config: RateLimitConfig) -> float:
+        deadline = max(state.last_seen + config.state_ttl_seconds, state.blocked_until)
+        if state.counts is not None:
+            deadline = max(deadline, (state.head + self.window_buckets) * self._bucket_seconds(config))
+        return deadline
+
+    def _schedule(
+        self,
+        expiry: list[tuple[float, str]],
+        key: str,
+        state: AttemptState,
+        *,
+        config: RateLimitConfig,
+    ) -> None:
+        # La entrada del montículo solo tiene que ser una cota inferior: si el estado se prolonga,
+        # la purga lo reprograma al sacarla. Solo hace falta una nueva si el vencimiento se adelanta.
+        deadline = self._expires_at(state, config=config)
+        if state.scheduled_at is None or deadline < state.scheduled_at:
+            state.scheduled_at = deadline
+            heapq.heappush(expiry, (deadline, key))
+
+    @staticmethod
+    def _touch(states: dict[str, AttemptState], key: str) -> AttemptState | None:
+        state = states.pop(key, None)
+        if state is not None:
+            states[key] = state
+        return state
 
     def _is_state_blocked(self, state: AttemptState, *, now: float, config: RateLimitConfig) -> bool:
         state.last_seen = now
@@ -102,70 +323,90 @@ class InMemoryRateLimitStore(RateLimitStore):
 
     def _register_failure_state(self, state: AttemptState, *, now: float, config: RateLimitConfig) -> bool:
         state.last_seen = now
-        self._purge_window(state, now=now, config=config)
-        state.failures.append(now)
+        failures = self._purge_window(state, now=now, config=config) + 1
+        if state.counts is None:
+            state.counts = _new_counters(self.window_buckets, config.max_attempts)
+            state.head = int(now // self._bucket_seconds(config))
+        state.counts[state.head % self.window_buckets] += 1
 
-        if len(state.failures) >= config.max_attempts:
+        if failures >= config.max_attempts:
             state.penalty_level += 1
             duration = min(
                 config.base_block_seconds * (2 ** (state.penalty_level - 1)),
                 config.max_block_seconds,
             )
             state.blocked_until = max(state.blocked_until, now + duration)
-            state.failures.clear()
+            state.counts = None
             return True
         return False
 
-    def _prune_state_dict(self, states: dict[str, AttemptState], *, now: float, config: RateLimitConfig) -> None:
+    def _prune_state_dict(
+        self,
+        states: dict[str, AttemptState],
+        expiry: list[tuple[float, str]],
+        *,
+        now: float,
+        config: RateLimitConfig,
+    ) -> None:
         ttl_cutoff = now - config.state_ttl_seconds
-        stale_keys: list[str] = []
-        for key, state in states.items():
-            self._purge_window(state, now=now, config=config)
-            if state.blocked_until <= now and not state.failures and state.last_seen < ttl_cutoff:
-                stale_keys.append(key)
-
-        for key in stale_keys:
-            states.pop(key, None)
+        rescheduled: list[tuple[str, AttemptState]] = []
+        budget = self.prune_batch_size
+        while budget and expiry and expiry[0][0] <= now:
+            budget -= 1
+            deadline, key = heapq.heappop(expiry)
+            state = states.get(key)
+            if state is None or state.scheduled_at != deadline:
+                # Entrada de un estado ya desalojado o sustituida por otra más temprana.
+                continue
+            state.scheduled_at = None
+            stale = state.blocked_until <= now and state.last_seen < ttl_cutoff
+            if stale and not self._purge_window(state, now=now, config=config):
+                del states[key]
+            else:
+                rescheduled.append((key, state))
+        for key, state in rescheduled:
+            self._schedule(expiry, key, state, config=config)
 
         if config.max_states is None or len(states) <= config.max_states:
             return
 
-        candidates = [
-            (key, state.last_seen)
-            for key, state in states.items()
-            if state.blocked_until <= now
-        ]
-        candidates.sort(key=lambda item: item[1])
-
         overflow = len(states) - config.max_states
-        for key, _ in candidates[:overflow]:
-            states.pop(key, None)
+        victims: list[str] = []
+        for key, state in states.items():
+            if state.blocked_until <= now:
+                victims.append(key)
+                if len(victims) >= overflow:
+                    break
+        for key in victims:
+            del states[key]
 
     def _prune_metrics(self, metrics: OrderedDict[str, MetricState], *, now: float, config: RateLimitConfig) -> None:
         ttl_cutoff = now - config.metrics_ttl_seconds
-        stale_keys = [key for key, state in metrics.items() if state.last_seen < ttl_cutoff]
-        for key in stale_keys:
-            metrics.pop(key, None)
+        while metrics:
+            oldest = next(iter(metrics.values()))
+            if oldest.last_seen >= ttl_cutoff:
+                break
+            metrics.popitem(last=False)
 
         while len(metrics) > config.max_metrics_keys:
             metrics.popitem(last=False)
             self.metrics_dropped_total += 1
 
     def _prune(self, *, now: float, config: RateLimitConfig) -> None:
-        self._prune_state_dict(self._ip_states, now=now, config=config)
-        self._prune_state_dict(self._user_states, now=now, config=config)
+        self._prune_state_dict(self._ip_states, self._ip_expiry, now=now, config=config)
+        self._prune_state_dict(self._user_states, self._user_expiry, now=now, config=config)
         self._prune_metrics(self._metrics_by_ip, now=now, config=config)
         self._prune_metrics(self._metrics_by_user, now=now, config=config)
 
     def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
         self._prune(now=now, config=config)
         blocked = False
-        ip_state = self._ip_states.get(ip)
+        ip_state = self._touch(self._ip_states, ip)
         if ip_state and self._is_state_blocked(ip_state, now=now, config=config):
             blocked = True
 
         if username:
-            user_state = self._user_states.get(username)
+            user_state = self._touch(self._user_states, username)
             if user_state and self._is_state_blocked(user_state, now=now, config=config):
                 blocked = True
 
@@ -173,6 +414,22 @@ class InMemoryRateLimitStore(RateLimitStore):
             self.blocked_requests_total += 1
         return blocked
 
+    def _register_failure_for_key(
+        self,
+        states: dict[str, AttemptState],
+        expiry: list[tuple[float, str]],
+        key: str,
+        *,
+        now: float,
+        config: RateLimitConfig,
+    ) -> bool:
+        state = self._touch(states, key)
+        if state is None:
+            state = states[key] = AttemptState()
+        limited = self._register_failure_state(state, now=now, config=config)
+        self._schedule(expiry, key, state, config=config)
+        return limited
+
     def register_failure(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
         self._prune(now=now, config=config)
         self.failed_attempts_total += 1
@@ -192,33 +449,34 @@ class InMemoryRateLimitStore(RateLimitStore):
                 max_metrics_keys=config.max_metrics_keys,
             )
 
-        ip_state = self._ip_states.setdefault(ip, AttemptState())
-        ip_limited = self._register_failure_state(ip_state, now=now, config=config)
+        ip_limited = self._register_failure_for_key(
+            self._ip_states, self._ip_expiry, ip, now=now, config=config
+        )
 
         user_limited = False
         if username:
-            user_state = self._user_states.setdefault(username, AttemptState())
-            user_limited = self._register_failure_state(user_state, now=now, config=config)
+            user_limited = self._register_failure_for_key(
+                self._user_states, self._user_expiry, username, now=now, config=config
+            )
 
         if ip_limited or user_limited:
             self.rate_limit_triggered_total += 1
 
     def register_success(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
         self._prune(now=now, config=config)
-        ip_state = self._ip_states.get(ip)
-        if ip_state:
-            ip_state.failures.clear()
-            ip_state.penalty_level = 0
-            ip_state.blocked_until = 0.0
-            ip_state.last_seen = now
-
-        if username:
-            user_state = self._user_states.get(username)
-            if user_state:
-                user_state.failures.clear()
-                user_state.penalty_level = 0
-                user_state.blocked_until = 0.0
-                user_state.last_seen = now
+        for states, expiry, key in (
+            (self._ip_states, self._ip_expiry, ip),
+            (self._user_states, self._user_expiry, username),
+        ):
+            if not key:
+                continue
+            state = self._touch(states, key)
+            if state:
+                state.counts = None
+                state.penalty_level = 0
+                state.blocked_until = 0.0
+                state.last_seen = now
+                self._schedule(expiry, key, state, config=config)
 
     def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
         return {
@@ -242,9 +500,45 @@ class InMemoryRateLimitStore(RateLimitStore):
             "failed_by_user": {key: state.failures for key, state in self._metrics_by_user.items()},
         }
 
+    def consume_token(self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0) -> float:
+        buckets = self._buckets
+        state = buckets.pop(bucket, None)
+        if state is None:
+            tokens = capacity
+            state = TokenBucketState(tokens, now, now)
+        else:
+            tokens = min(capacity, state.tokens + max(0.0, now - state.updated) * rate)
+
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        state.tokens = tokens
+        state.updated = now
+        state.full_at = now + (capacity - tokens) / rate
+        buckets[bucket] = state
+
+        # Cada llamada añade como mucho un cubo y descarta hasta dos del principio: la purga se amortiza.
+        for _ in range(2):
+            oldest_key = next(iter(buckets), None)
+            if oldest_key is None:
+                break
+            if buckets[oldest_key].full_at > now and len(buckets) <= self.max_buckets:
+                break
+            del buckets[oldest_key]
+        return wait
+
+    def as_async(self) -> AsyncRateLimitStore:
+        # Todas las operaciones son de CPU y muy cortas: saltar a otro hilo costaría más que ellas.
+        return InlineAsyncRateLimitStore(self)
+
     def reset(self) -> None:
+        self._buckets.clear()
         self._ip_states.clear()
         self._user_states.clear()
+        self._ip_expiry.clear()
+        self._user_expiry.clear()
         self.failed_attempts_total = 0
         self.failed_attempts_ip_total = 0
         self.failed_attempts_user_total = 0
@@ -255,19 +549,136 @@ class InMemoryRateLimitStore(RateLimitStore):
         self.metrics_dropped_total = 0
 
 
-class RedisRateLimitStore(RateLimitStore):
-    def __init__(self, redis_url: str, *, namespace: str = "sqliteplus:rate_limit") -> None:
-        try:
-            import redis
-        except ImportError as exc:  # pragma: no cover - dependencia opcional
-            raise RuntimeError("Redis backend requires redis package") from exc
-
-        self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
-        self._namespace = namespace
+_REDIS_REGISTER_FAILURE = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local max_attempts = tonumber(ARGV[3])
+local base_block = tonumber(ARGV[4])
+local max_block = tonumber(ARGV[5])
+local state_ttl = tonumber(ARGV[6])
+local metrics_ttl = tonumber(ARGV[7])
+local max_metrics = tonumber(ARGV[8])
+local counters = KEYS[1]
+
+local function forget(hash_key, seen_key, members)
+    for _, member in ipairs(members) do
+        redis.call('ZREM', seen_key, member)
+        redis.call('HDEL', hash_key, member)
+    end
+end
+
+local function record_metric(hash_key, seen_key, member)
+    redis.call('HINCRBY', hash_key, member, 1)
+    redis.call('ZADD', seen_key, now, member)
+    forget(hash_key, seen_key, redis.call('ZRANGEBYSCORE', seen_key, '-inf', '(' .. (now - metrics_ttl)))
+    local overflow = redis.call('ZCARD', seen_key) - max_metrics
+    if overflow > 0 then
+        local oldest = redis.call('ZRANGE', seen_key, 0, overflow - 1)
+        forget(hash_key, seen_key, oldest)
+        redis.call('HINCRBY', counters, 'metrics_dropped_total', #oldest)
+    end
+end
+
+local function register(state_key, failures_key)
+    local lower_bound = now - window
+    while true do
+        local first = redis.call('LINDEX', failures_key, 0)
+        if not first or tonumber(first) >= lower_bound then
+            break
+        end
+        redis.call('LPOP', failures_key)
+    end
+    local failures = redis.call('RPUSH', failures_key, ARGV[1])
+    local blocked_until = tonumber(redis.call('HGET', state_key, 'blocked_until') or '0')
+    local limited = 0
+    if failures >= max_attempts then
+        local level = redis.call('HINCRBY', state_key, 'penalty_level', 1)
+        blocked_until = math.max(blocked_until, now + math.min(base_block * 2 ^ (level - 1), max_block))
+        redis.call('HSET', state_key, 'blocked_until', tostring(blocked_until))
+        redis.call('DEL', failures_key)
+        limited = 1
+    else
+        redis.call('EXPIRE', failures_key, math.max(1, math.ceil(window)))
+    end
+    redis.call('HSET', state_key, 'last_seen', ARGV[1])
+    local ttl = math.max(state_ttl, window, blocked_until - now)
+    redis.call('EXPIRE', state_key, math.max(1, math.ceil(ttl)))
+    return limited
+end
+
+redis.call('HINCRBY', counters, 'failed_attempts_total', 1)
+redis.call('HINCRBY', counters, 'failed_attempts_ip_total', 1)
+record_metric(KEYS[2], KEYS[3], ARGV[9])
+local limited = register(KEYS[4], KEYS[5])
+if #KEYS > 5 then
+    redis.call('HINCRBY', counters, 'failed_attempts_user_total', 1)
+    record_metric(KEYS[6], KEYS[7], ARGV[10])
+    limited = math.max(limited, register(KEYS[8], KEYS[9]))
+end
+if limited == 1 then
+    redis.call('HINCRBY', counters, 'rate_limit_triggered_total', 1)
+end
+return limited
+"""
+
+_REDIS_IS_BLOCKED = """
+local now = tonumber(ARGV[1])
+for index = 2, #KEYS do
+    local blocked_until = redis.call('HGET', KEYS[index], 'blocked_until')
+    if blocked_until and tonumber(blocked_until) > now then
+        redis.call('HINCRBY', KEYS[1], 'blocked_requests_total', 1)
+        return 1
+    end
+end
+return 0
+"""
+
+_REDIS_REGISTER_SUCCESS = """
+for index = 1, #KEYS, 2 do
+    if redis.call('EXISTS', KEYS[index]) == 1 then
+        redis.call('HSET', KEYS[index], 'blocked_until', '0', 'penalty_level', '0', 'last_seen', ARGV[1])
+        redis.call('EXPIRE', KEYS[index], ARGV[2])
+    end
+    redis.call('DEL', KEYS[index + 1])
+end
+return 0
+"""
+
+
+_REDIS_CONSUME_TOKEN = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = capacity
+if state[1] then
+    tokens = math.min(capacity, tonumber(state[1]) + math.max(0, now - tonumber(state[2])) * rate)
+end
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', ARGV[3])
+redis.call('EXPIRE', KEYS[1], math.max(1, math.ceil((capacity - tokens) / rate)))
+-- Los números de Lua se truncan a entero al volver a Redis: el tiempo de espera viaja como texto.
+return tostring(wait)
+"""
+
+
+class _RedisRateLimitKeys:
+    """Claves y argumentos de los scripts compartidos por los clientes Redis síncrono y asíncrono."""
+
+    _namespace: str
 
     def _state_key(self, kind: str, key: str) -> str:
         return f"{self._namespace}:state:{kind}:{key}"
 
+    def _failures_key(self, kind: str, key: str) -> str:
+        return f"{self._namespace}:failures:{kind}:{key}"
+
     def _metrics_hash_key(self, kind: str) -> str:
         return f"{self._namespace}:metrics:{kind}"
 
@@ -277,123 +688,75 @@ class RedisRateLimitStore(RateLimitStore):
     def _counter_key(self) -> str:
         return f"{self._namespace}:counters"
 
+    def _bucket_key(self, bucket: str) -> str:
+        return f"{self._namespace}:bucket:{bucket}"
+
     def _all_keys_pattern(self) -> str:
         return f"{self._namespace}:*"
 
-    def _load_state(self, kind: str, key: str, now: float, config: RateLimitConfig) -> dict[str, object]:
-        state_key = self._state_key(kind, key)
-        payload = self._redis.get(state_key)
-        if not payload:
-            return {"failures": [], "blocked_until": 0.0, "penalty_level": 0, "last_seen": now}
-        state = json.loads(payload)
-        failures = [ts for ts in state.get("failures", []) if ts >= (now - config.window_seconds)]
-        return {
-            "failures": failures,
-            "blocked_until": float(state.get("blocked_until", 0.0)),
-            "penalty_level": int(state.get("penalty_level", 0)),
-            "last_seen": float(state.get("last_seen", now)),
-        }
-
-    def _save_state(self, kind: str, key: str, state: dict[str, object], config: RateLimitConfig) -> None:
-        state_key = self._state_key(kind, key)
-        ttl_seconds = max(1, config.state_ttl_seconds)
-        self._redis.setex(state_key, ttl_seconds, json.dumps(state))
-
-    def _update_metric(self, kind: str, key: str, now: float, config: RateLimitConfig) -> None:
-        hash_key = self._metrics_hash_key(kind)
-        seen_key = self._metrics_seen_key(kind)
-        self._redis.hincrby(hash_key, key, 1)
-        self._redis.zadd(seen_key, {key: now})
-        ttl_cutoff = now - config.metrics_ttl_seconds
-        stale_keys = self._redis.zrangebyscore(seen_key, "-inf", ttl_cutoff)
-        if stale_keys:
-            self._redis.zrem(seen_key, *stale_keys)
-            self._redis.hdel(hash_key, *stale_keys)
-
-        metric_size = self._redis.zcard(seen_key)
-        if metric_size > config.max_metrics_keys:
-            overflow = metric_size - config.max_metrics_keys
-            old_keys = self._redis.zrange(seen_key, 0, overflow - 1)
-            if old_keys:
-                self._redis.zrem(seen_key, *old_keys)
-                self._redis.hdel(hash_key, *old_keys)
-                self._redis.hincrby(self._counter_key(), "metrics_dropped_total", len(old_keys))
-
-    def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
-        blocked = False
-        for kind, key in (("ip", ip), ("user", username)):
-            if not key:
-                continue
-            state = self._load_state(kind, key, now, config)
-            if state["blocked_until"] > now:
-                blocked = True
-                break
-
-        if blocked:
-            self._redis.hincrby(self._counter_key(), "blocked_requests_total", 1)
-        return blocked
-
-    def _register_failure_for_key(self, kind: str, key: str, now: float, config: RateLimitConfig) -> bool:
-        state = self._load_state(kind, key, now, config)
-        failures = state["failures"]
-        failures.append(now)
-        state["last_seen"] = now
-        limited = False
-        if len(failures) >= config.max_attempts:
-            penalty_level = int(state["penalty_level"]) + 1
-            state["penalty_level"] = penalty_level
-            duration = min(config.base_block_seconds * (2 ** (penalty_level - 1)), config.max_block_seconds)
-            state["blocked_until"] = max(float(state["blocked_until"]), now + duration)
-            state["failures"] = []
-            limited = True
-        else:
-            state["failures"] = failures
-        self._save_state(kind, key, state, config)
-        return limited
-
-    def register_failure(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
-        self._redis.hincrby(self._counter_key(), "failed_attempts_total", 1)
-        self._redis.hincrby(self._counter_key(), "failed_attempts_ip_total", 1)
-        self._update_metric("ip", ip, now, config)
-        ip_limited = self._register_failure_for_key("ip", ip, now, config)
-        user_limited = False
+    def _is_blocked_call(self, ip: str, username: str | None, now: float) -> tuple[list[str], list[object]]:
+        keys = [self._counter_key(), self._state_key("ip", ip)]
         if username:
-            self._redis.hincrby(self._counter_key(), "failed_attempts_user_total", 1)
-            self._update_metric("user", username, now, config)
-            user_limited = self._register_failure_for_key("user", username, now, config)
-
-        if ip_limited or user_limited:
-            self._redis.hincrby(self._counter_key(), "rate_limit_triggered_total", 1)
-
-    def register_success(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
-        for kind, key in (("ip", ip), ("user", username)):
-            if not key:
-                continue
-            state = self._load_state(kind, key, now, config)
-            state["failures"] = []
-            state["blocked_until"] = 0.0
-            state["penalty_level"] = 0
-            state["last_seen"] = now
-            self._save_state(kind, key, state, config)
-
-    def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
-        counter_key = self._counter_key()
-        with self._redis.pipeline(transaction=True) as pipe:
-            pipe.hgetall(counter_key)
-            pipe.hgetall(self._metrics_hash_key("ip"))
-            pipe.hgetall(self._metrics_hash_key("user"))
-            pipe.keys(self._state_key("ip", "*"))
-            pipe.keys(self._state_key("user", "*"))
-            counters, metrics_ip, metrics_user, ip_states, user_states = pipe.execute()
+            keys.append(self._state_key("user", username))
+        return keys, [now]
+
+    def _register_failure_call(
+        self, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> tuple[list[str], list[object]]:
+        keys = [
+            self._counter_key(),
+            self._metrics_hash_key("ip"),
+            self._metrics_seen_key("ip"),
+            self._state_key("ip", ip),
+            self._failures_key("ip", ip),
+        ]
+        if username:
+            keys.extend(
+                [
+                    self._metrics_hash_key("user"),
+                    self._metrics_seen_key("user"),
+                    self._state_key("user", username),
+                    self._failures_key("user", username),
+                ]
+            )
+        args: list[object] = [
+            now,
+            config.window_seconds,
+            config.max_attempts,
+            config.base_block_seconds,
+            config.max_block_seconds,
+            config.state_ttl_seconds,
+            config.metrics_ttl_seconds,
+            config.max_metrics_keys,
+            ip,
+            username or "",
+        ]
+        return keys, args
 
+    def _register_success_call(
+        self, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> tuple[list[str], list[object]]:
+        keys = [self._state_key("ip", ip), self._failures_key("ip", ip)]
+        if username:
+            keys.extend([self._state_key("user", username), self._failures_key("user", username)])
+        return keys, [now, max(1, config.state_ttl_seconds)]
+
+    @staticmethod
+    def _build_snapshot(
+        counters: dict[str, str],
+        metrics_ip: dict[str, str],
+        metrics_user: dict[str, str],
+        ip_states_size: int,
+        user_states_size: int,
+    ) -> dict[str, object]:
         return {
             "failed_attempts_total": int(counters.get("failed_attempts_total", 0)),
             "failed_attempts_ip_total": int(counters.get("failed_attempts_ip_total", 0)),
             "failed_attempts_user_total": int(counters.get("failed_attempts_user_total", 0)),
             "blocked_requests_total": int(counters.get("blocked_requests_total", 0)),
             "rate_limit_triggered_total": int(counters.get("rate_limit_triggered_total", 0)),
-            "ip_states_size": len(ip_states),
-            "user_states_size": len(user_states),
+            "ip_states_size": ip_states_size,
+            "user_states_size": user_states_size,
             "retained_failed_by_ip": {key: int(value) for key, value in metrics_ip.items()},
             "retained_failed_by_user": {key: int(value) for key, value in metrics_user.items()},
             "metrics_ip_size": len(metrics_ip),
@@ -403,14 +766,553 @@ class RedisRateLimitStore(RateLimitStore):
             "failed_by_user": {key: int(value) for key, value in metrics_user.items()},
         }
 
+
+class RedisRateLimitStore(_RedisRateLimitKeys, RateLimitStore):
+    """Almacén compartido en Redis con un viaje de ida y vuelta por operación.
+
+    Cada transición de estado (fallo, éxito, consulta de bloqueo) es un script
+    Lua que Redis ejecuta de forma atómica, así que dos *workers* no pueden
+    perder actualizaciones del otro. Los scripts se envían con ``EVALSHA`` y
+    solo se retransmiten completos si el servidor no los tiene en caché.
+
+    El estado de cada clave es un hash con ``blocked_until``, ``penalty_level``
+    y ``last_seen`` más una lista con los instantes de los fallos en la
+    ventana. Recorrer el espacio de claves (métricas y ``reset``) usa ``SCAN``
+    incremental en lugar de ``KEYS`` para no bloquear el servidor.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        *,
+        namespace: str = "sqliteplus:rate_limit",
+        client=None,
+        scan_count: int = 500,
+    ) -> None:
+        if client is None:
+            try:
+                import redis
+            except ImportError as exc:  # pragma: no cover - dependencia opcional
+                raise RuntimeError("Redis backend requires redis package") from exc
+            if not redis_url:
+                raise ValueError("Se necesita redis_url o un cliente Redis")
+            client = redis.Redis.from_url(redis_url, decode_responses=True)
+
+        self._redis = client
+        self._redis_url = redis_url
+        self._namespace = namespace
+        self._scan_count = max(1, scan_count)
+        self._register_failure_script = client.register_script(_REDIS_REGISTER_FAILURE)
+        self._is_blocked_script = client.register_script(_REDIS_IS_BLOCKED)
+        self._register_success_script = client.register_script(_REDIS_REGISTER_SUCCESS)
+        self._consume_token_script = client.register_script(_REDIS_CONSUME_TOKEN)
+        # Cargarlos por adelantado evita el ``NOSCRIPT`` + ``SCRIPT LOAD`` en la primera petición.
+        for script in (
+            self._register_failure_script,
+            self._is_blocked_script,
+            self._register_success_script,
+            self._consume_token_script,
+        ):
+            client.script_load(script.script)
+
+    def as_async(self) -> AsyncRateLimitStore:
+        if not self._redis_url:
+            return ThreadedAsyncRateLimitStore(self)
+        return AsyncRedisRateLimitStore(self._redis_url, namespace=self._namespace, scan_count=self._scan_count)
+
+    def _count_keys(self, pattern: str) -> int:
+        return sum(1 for _ in self._redis.scan_iter(match=pattern, count=self._scan_count))
+
+    def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
+        keys, args = self._is_blocked_call(ip, username, now)
+        return bool(self._is_blocked_script(keys=keys, args=args))
+
+    def register_failure(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
+        keys, args = self._register_failure_call(ip, username, config, now)
+        self._register_failure_script(keys=keys, args=args)
+
+    def register_success(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
+        keys, args = self._register_success_call(ip, username, config, now)
+        self._register_success_script(keys=keys, args=args)
+
+    def consume_token(self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0) -> float:
+        return float(self._consume_token_script(keys=[self._bucket_key(bucket)], args=[rate, capacity, now, cost]))
+
+    def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
+        with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(self._counter_key())
+            pipe.hgetall(self._metrics_hash_key("ip"))
+            pipe.hgetall(self._metrics_hash_key("user"))
+            counters, metrics_ip, metrics_user = pipe.execute()
+
+        return self._build_snapshot(
+            counters,
+            metrics_ip,
+            metrics_user,
+            self._count_keys(self._state_key("ip", "*")),
+            self._count_keys(self._state_key("user", "*")),
+        )
+
     def reset(self) -> None:
-        keys = self._redis.keys(self._all_keys_pattern())
-        if keys:
-            self._redis.delete(*keys)
+        batch: list[str] = []
+        for key in self._redis.scan_iter(match=self._all_keys_pattern(), count=self._scan_count):
+            batch.append(key)
+            if len(batch) >= self._scan_count:
+                self._redis.delete(*batch)
+                batch.clear()
+        if batch:
+            self._redis.delete(*batch)
 
 
-def create_rate_limit_store(backend: str | None, redis_url: str | None) -> RateLimitStore:
+class AsyncRedisRateLimitStore(_RedisRateLimitKeys, AsyncRateLimitStore):
+    """Mismos scripts y claves que ``RedisRateLimitStore`` sobre ``redis.asyncio``.
+
+    Las llamadas a Redis se esperan en el bucle de eventos en lugar de
+    bloquearlo, y ambos clientes pueden convivir sobre el mismo espacio de nombres.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        *,
+        namespace: str = "sqliteplus:rate_limit",
+        client=None,
+        scan_count: int = 500,
+    ) -> None:
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as exc:  # pragma: no cover - dependencia opcional
+                raise RuntimeError("Redis backend requires redis package") from exc
+            if not redis_url:
+                raise ValueError("Se necesita redis_url o un cliente Redis")
+            client = redis_asyncio.Redis.from_url(redis_url, decode_responses=True)
+
+        self._redis = client
+        self._namespace = namespace
+        self._scan_count = max(1, scan_count)
+        self._register_failure_script = client.register_script(_REDIS_REGISTER_FAILURE)
+        self._is_blocked_script = client.register_script(_REDIS_IS_BLOCKED)
+        self._register_success_script = client.register_script(_REDIS_REGISTER_SUCCESS)
+        self._consume_token_script = client.register_script(_REDIS_CONSUME_TOKEN)
+
+    async def _count_keys(self, pattern: str) -> int:
+        count = 0
+        async for _ in self._redis.scan_iter(match=pattern, count=self._scan_count):
+            count += 1
+        return count
+
+    async def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
+        keys, args = self._is_blocked_call(ip, username, now)
+        return bool(await self._is_blocked_script(keys=keys, args=args))
+
+    async def register_failure(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        keys, args = self._register_failure_call(ip, username, config, now)
+        await self._register_failure_script(keys=keys, args=args)
+
+    async def register_success(
+        self, *, ip: str, username: str | None, config: RateLimitConfig, now: float
+    ) -> None:
+        keys, args = self._register_success_call(ip, username, config, now)
+        await self._register_success_script(keys=keys, args=args)
+
+    async def consume_token(
+        self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0
+    ) -> float:
+        wait = await self._consume_token_script(keys=[self._bucket_key(bucket)], args=[rate, capacity, now, cost])
+        return float(wait)
+
+    async def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(self._counter_key())
+            pipe.hgetall(self._metrics_hash_key("ip"))
+            pipe.hgetall(self._metrics_hash_key("user"))
+            counters, metrics_ip, metrics_user = await pipe.execute()
+
+        return self._build_snapshot(
+            counters,
+            metrics_ip,
+            metrics_user,
+            await self._count_keys(self._state_key("ip", "*")),
+            await self._count_keys(self._state_key("user", "*")),
+        )
+
+    async def reset(self) -> None:
+        batch: list[str] = []
+        async for key in self._redis.scan_iter(match=self._all_keys_pattern(), count=self._scan_count):
+            batch.append(key)
+            if len(batch) >= self._scan_count:
+                await self._redis.delete(*batch)
+                batch.clear()
+        if batch:
+            await self._redis.delete(*batch)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit_state (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    penalty_level INTEGER NOT NULL DEFAULT 0,
+    last_seen REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rate_limit_state_expires ON rate_limit_state (expires_at);
+CREATE TABLE IF NOT EXISTS rate_limit_failures (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rate_limit_failures_key ON rate_limit_failures (kind, key, ts);
+CREATE INDEX IF NOT EXISTS rate_limit_failures_ts ON rate_limit_failures (ts);
+CREATE TABLE IF NOT EXISTS rate_limit_metrics (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    failures INTEGER NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rate_limit_metrics_seen ON rate_limit_metrics (kind, last_seen);
+CREATE TABLE IF NOT EXISTS rate_limit_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    granted INTEGER NOT NULL,
+    full_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rate_limit_buckets_full ON rate_limit_buckets (full_at);
+"""
+
+_COUNTER_NAMES = (
+    "failed_attempts_total",
+    "failed_attempts_ip_total",
+    "failed_attempts_user_total",
+    "blocked_requests_total",
+    "rate_limit_triggered_total",
+    "metrics_dropped_total",
+)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """Almacén compartido en una base SQLite en modo WAL.
+
+    Pensado para despliegues con varios *workers* en la misma máquina: todos
+    abren el mismo archivo y ven los mismos bloqueos sin necesidad de Redis.
+    Cada operación de escritura es una única transacción ``BEGIN IMMEDIATE``
+    cuyos cambios de estado se hacen con ``INSERT ... ON CONFLICT DO UPDATE``,
+    de modo que dos procesos nunca pisan el contador del otro.
+
+    Las filas caducadas se localizan por índice (``expires_at`` y ``ts``) y se
+    borran en lotes de como mucho ``prune_batch_size`` filas, como mucho una
+    vez cada ``prune_interval`` segundos, para que ninguna petición pague una
+    purga completa.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        busy_timeout: float = 5.0,
+        prune_interval: float = 1.0,
+        prune_batch_size: int = 500,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.prune_interval = max(0.0, prune_interval)
+        self.prune_batch_size = max(1, prune_batch_size)
+        self._lock = threading.Lock()
+        self._last_prune = float("-inf")
+        self._last_bucket_prune = float("-inf")
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.db_path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, operation, *args):
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = operation(conn, *args)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    @staticmethod
+    def _increment(conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO rate_limit_counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def _prune(self, conn: sqlite3.Connection, *, now: float, config: RateLimitConfig) -> None:
+        if now - self._last_prune < self.prune_interval:
+            return
+        batch = self.prune_batch_size
+        removed = conn.execute(
+            "DELETE FROM rate_limit_failures WHERE rowid IN "
+            "(SELECT rowid FROM rate_limit_failures WHERE ts < ? LIMIT ?)",
+            (now - config.window_seconds, batch),
+        ).rowcount
+        removed = max(
+            removed,
+            conn.execute(
+                "DELETE FROM rate_limit_state WHERE (kind, key) IN "
+                "(SELECT kind, key FROM rate_limit_state WHERE expires_at < ? LIMIT ?)",
+                (now, batch),
+            ).rowcount,
+        )
+        for kind in ("ip", "user"):
+            removed = max(
+                removed,
+                conn.execute(
+                    "DELETE FROM rate_limit_metrics WHERE kind = ? AND key IN "
+                    "(SELECT key FROM rate_limit_metrics WHERE kind = ? AND last_seen < ? LIMIT ?)",
+                    (kind, kind, now - config.metrics_ttl_seconds, batch),
+                ).rowcount,
+            )
+            if config.max_states is not None:
+                self._evict_states(conn, kind, now=now, max_states=config.max_states)
+        # Si algún lote se llenó queda trabajo pendiente: la siguiente operación sigue purgando.
+        self._last_prune = float("-inf") if removed >= batch else now
+
+    @staticmethod
+    def _evict_states(conn: sqlite3.Connection, kind: str, *, now: float, max_states: int) -> None:
+        (size,) = conn.execute("SELECT count(*) FROM rate_limit_state WHERE kind = ?", (kind,)).fetchone()
+        overflow = size - max_states
+        if overflow <= 0:
+            return
+        conn.execute(
+            "DELETE FROM rate_limit_state WHERE kind = ? AND key IN "
+            "(SELECT key FROM rate_limit_state WHERE kind = ? AND blocked_until <= ? "
+            "ORDER BY last_seen LIMIT ?)",
+            (kind, kind, now, overflow),
+        )
+
+    def _record_metric_failure(
+        self, conn: sqlite3.Connection, kind: str, key: str, *, now: float, config: RateLimitConfig
+    ) -> None:
+        conn.execute(
+            "INSERT INTO rate_limit_metrics (kind, key, failures, last_seen) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT (kind, key) DO UPDATE SET failures = failures + 1, last_seen = excluded.last_seen",
+            (kind, key, now),
+        )
+        (size,) = conn.execute("SELECT count(*) FROM rate_limit_metrics WHERE kind = ?", (kind,)).fetchone()
+        overflow = size - config.max_metrics_keys
+        if overflow > 0:
+            dropped = conn.execute(
+                "DELETE FROM rate_limit_metrics WHERE kind = ? AND key IN "
+                "(SELECT key FROM rate_limit_metrics WHERE kind = ? ORDER BY last_seen LIMIT ?)",
+                (kind, kind, overflow),
+            ).rowcount
+            self._increment(conn, "metrics_dropped_total", dropped)
+
+    @staticmethod
+    def _register_failure_for_key(
+        conn: sqlite3.Connection, kind: str, key: str, *, now: float, config: RateLimitConfig
+    ) -> bool:
+        conn.execute(
+            "DELETE FROM rate_limit_failures WHERE kind = ? AND key = ? AND ts < ?",
+            (kind, key, now - config.window_seconds),
+        )
+        conn.execute("INSERT INTO rate_limit_failures (kind, key, ts) VALUES (?, ?, ?)", (kind, key, now))
+        (failures,) = conn.execute(
+            "SELECT count(*) FROM rate_limit_failures WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        ttl_expiry = now + max(config.state_ttl_seconds, config.window_seconds)
+
+        if failures < config.max_attempts:
+            conn.execute(
+                "INSERT INTO rate_limit_state (kind, key, last_seen, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (kind, key) DO UPDATE SET last_seen = excluded.last_seen, "
+                "expires_at = max(excluded.expires_at, blocked_until)",
+                (kind, key, now, ttl_expiry),
+            )
+            return False
+
+        first_block = now + min(config.base_block_seconds, config.max_block_seconds)
+        # ``penalty_level`` en el SET es el valor anterior: el nuevo nivel es ``penalty_level + 1``.
+        conn.execute(
+            "INSERT INTO rate_limit_state (kind, key, blocked_until, penalty_level, last_seen, expires_at) "
+            "VALUES (:kind, :key, :first_block, 1, :now, max(:ttl_expiry, :first_block)) "
+            "ON CONFLICT (kind, key) DO UPDATE SET "
+            "penalty_level = penalty_level + 1, "
+            "blocked_until = max(blocked_until, :now + min(:base * (1 << min(penalty_level, 62)), :max_block)), "
+            "last_seen = :now, "
+            "expires_at = max(:ttl_expiry, blocked_until, "
+            ":now + min(:base * (1 << min(penalty_level, 62)), :max_block))",
+            {
+                "kind": kind,
+                "key": key,
+                "now": now,
+                "first_block": first_block,
+                "ttl_expiry": ttl_expiry,
+                "base": config.base_block_seconds,
+                "max_block": config.max_block_seconds,
+            },
+        )
+        conn.execute("DELETE FROM rate_limit_failures WHERE kind = ? AND key = ?", (kind, key))
+        return True
+
+    def _register_failure(
+        self, conn: sqlite3.Connection, ip: str, username: str | None, now: float, config: RateLimitConfig
+    ) -> None:
+        self._prune(conn, now=now, config=config)
+        self._increment(conn, "failed_attempts_total")
+        self._increment(conn, "failed_attempts_ip_total")
+        self._record_metric_failure(conn, "ip", ip, now=now, config=config)
+        limited = self._register_failure_for_key(conn, "ip", ip, now=now, config=config)
+        if username:
+            self._increment(conn, "failed_attempts_user_total")
+            self._record_metric_failure(conn, "user", username, now=now, config=config)
+            limited = self._register_failure_for_key(conn, "user", username, now=now, config=config) or limited
+        if limited:
+            self._increment(conn, "rate_limit_triggered_total")
+
+    def _register_success(
+        self, conn: sqlite3.Connection, ip: str, username: str | None, now: float, config: RateLimitConfig
+    ) -> None:
+        self._prune(conn, now=now, config=config)
+        for kind, key in (("ip", ip), ("user", username)):
+            if not key:
+                continue
+            conn.execute(
+                "UPDATE rate_limit_state SET blocked_until = 0, penalty_level = 0, last_seen = ?, "
+                "expires_at = ? WHERE kind = ? AND key = ?",
+                (now, now + config.state_ttl_seconds, kind, key),
+            )
+            conn.execute("DELETE FROM rate_limit_failures WHERE kind = ? AND key = ?", (kind, key))
+
+    def is_blocked(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> bool:
+        if now - self._last_prune >= self.prune_interval:
+            self._write(lambda conn: self._prune(conn, now=now, config=config))
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM rate_limit_state WHERE blocked_until > ? AND "
+                "((kind = 'ip' AND key = ?) OR (kind = 'user' AND key = ?)) LIMIT 1",
+                (now, ip, username or ""),
+            ).fetchone()
+        if row is None:
+            return False
+        self._write(self._increment, "blocked_requests_total")
+        return True
+
+    def register_failure(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
+        self._write(self._register_failure, ip, username, now, config)
+
+    def register_success(self, *, ip: str, username: str | None, config: RateLimitConfig, now: float) -> None:
+        self._write(self._register_success, ip, username, now, config)
+
+    def metrics_snapshot(self, *, config: RateLimitConfig, now: float) -> dict[str, object]:
+        with self._lock:
+            conn = self._conn
+            # Una sola transacción de lectura para que todas las cifras sean del mismo instante.
+            conn.execute("BEGIN")
+            try:
+                counters = dict(conn.execute("SELECT name, value FROM rate_limit_counters"))
+                sizes = dict(conn.execute("SELECT kind, count(*) FROM rate_limit_state GROUP BY kind"))
+                metrics: dict[str, dict[str, int]] = {"ip": {}, "user": {}}
+                for kind, key, failures in conn.execute(
+                    "SELECT kind, key, failures FROM rate_limit_metrics ORDER BY kind, last_seen"
+                ):
+                    metrics.setdefault(kind, {})[key] = failures
+            finally:
+                conn.execute("COMMIT")
+
+        snapshot: dict[str, object] = {name: int(counters.get(name, 0)) for name in _COUNTER_NAMES}
+        snapshot.update(
+            {
+                "ip_states_size": sizes.get("ip", 0),
+                "user_states_size": sizes.get("user", 0),
+                "retained_failed_by_ip": dict(metrics["ip"]),
+                "retained_failed_by_user": dict(metrics["user"]),
+                "metrics_ip_size": len(metrics["ip"]),
+                "metrics_user_size": len(metrics["user"]),
+                "failed_by_ip": metrics["ip"],
+                "failed_by_user": metrics["user"],
+            }
+        )
+        return snapshot
+
+    def consume_token(self, *, bucket: str, rate: float, capacity: float, now: float, cost: float = 1.0) -> float:
+        params = {"bucket": bucket, "rate": rate, "capacity": capacity, "now": now, "cost": cost}
+        with self._lock:
+            conn = self._conn
+            if now - self._last_bucket_prune >= self.prune_interval:
+                # Un cubo que ya se habría rellenado equivale a no tenerlo.
+                removed = conn.execute(
+                    "DELETE FROM rate_limit_buckets WHERE bucket IN "
+                    "(SELECT bucket FROM rate_limit_buckets WHERE full_at <= ? LIMIT ?)",
+                    (now, self.prune_batch_size),
+                ).rowcount
+                self._last_bucket_prune = float("-inf") if removed >= self.prune_batch_size else now
+            # En ``DO UPDATE`` las columnas valen lo anterior: ``refill`` es el saldo tras rellenar.
+            refill = "min(:capacity, tokens + max(0.0, :now - updated) * :rate)"
+            tokens, granted = conn.execute(
+                "INSERT INTO rate_limit_buckets (bucket, tokens, updated, granted, full_at) "
+                "VALUES (:bucket, :capacity - :cost, :now, 1, :now + :cost / :rate) "
+                "ON CONFLICT (bucket) DO UPDATE SET "
+                f"tokens = CASE WHEN {refill} >= :cost THEN {refill} - :cost ELSE {refill} END, "
+                f"granted = {refill} >= :cost, "
+                "updated = :now, "
+                f"full_at = :now + (:capacity - CASE WHEN {refill} >= :cost THEN {refill} - :cost "
+                f"ELSE {refill} END) / :rate "
+                "RETURNING tokens, granted",
+                params,
+            ).fetchone()
+        return 0.0 if granted else (cost - tokens) / rate
+
+    def reset(self) -> None:
+        def _clear(conn: sqlite3.Connection) -> None:
+            for table in (
+                "rate_limit_state",
+                "rate_limit_failures",
+                "rate_limit_metrics",
+                "rate_limit_counters",
+                "rate_limit_buckets",
+            ):
+                conn.execute(f"DELETE FROM {table}")
+
+        self._write(_clear)
+        self._last_prune = float("-inf")
+        self._last_bucket_prune = float("-inf")
+
+
+def create_rate_limit_store(
+    backend: str | None,
+    redis_url: str | None,
+    sqlite_path: str | None = None,
+) -> RateLimitStore:
     normalized = (backend or "memory").strip().lower()
+    if normalized == "sqlite":
+        if not sqlite_path:
+            logger.warning("SQLite rate limit backend seleccionado sin SQLITEPLUS_RATE_LIMIT_SQLITE_PATH; se usa memoria.")
+            return InMemoryRateLimitStore()
+        try:
+            return SQLiteRateLimitStore(sqlite_path)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("No se pudo inicializar backend SQLite (%s); se usa memoria.", exc)
+            return InMemoryRateLimitStore()
     if normalized == "redis":
         if not redis_url:
             logger.warning("Redis rate limit backend seleccionado sin SQLITEPLUS_RATE_LIMIT_REDIS_URL; se usa memoria.")
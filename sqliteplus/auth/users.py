@@ -14,17 +14,34 @@ if __name__ == "__main__" and __package__ in {None, ""}:
     raise SystemExit()
 
 import argparse
+import csv
 import getpass
 import importlib
+import json
 import logging
+import os
 import sys
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import closing
 from dataclasses import dataclass
 from pathlib import Path
 from types import ModuleType
-from typing import Dict, Tuple
 
-from sqliteplus.auth.providers import JsonFileUserProvider, UserSourceError
+from sqliteplus.auth.file_watch import FileWatcher, create_file_watcher
+from sqliteplus.auth.providers import (
+    USERS_DB_ENV,
+    USERS_DB_KEY_ENV,
+    USERS_TABLE,
+    JsonFileUserProvider,
+    ProviderUserMapping,
+    SQLiteUserProvider,
+    UserSourceError,
+    connect_user_store,
+    upsert_users,
+)
 from sqliteplus._compat import ensure_bcrypt
+from sqliteplus.core.settings import get_settings
 
 
 def _build_bcrypt_adapter() -> ModuleType:
@@ -83,11 +100,13 @@ _DUMMY_BCRYPT_HASH = (
 class UserCredentialsService:
     """Servicio que valida credenciales de usuario contra contraseñas hasheadas."""
 
-    users: Dict[str, str]
+    users: Mapping[str, str]
 
     @classmethod
     def from_env(cls) -> "UserCredentialsService":
-        """Crea el servicio leyendo la ruta configurada en ``SQLITEPLUS_USERS_FILE``."""
+        """Crea el servicio desde ``SQLITEPLUS_USERS_DB`` o ``SQLITEPLUS_USERS_FILE``."""
+        if get_settings().users_db:
+            return cls(users=ProviderUserMapping(SQLiteUserProvider()))
         provider = JsonFileUserProvider()
         return cls(users=provider.get_users())
 
@@ -118,46 +137,99 @@ class UserCredentialsService:
 
 
 _cached_service: UserCredentialsService | None = None
-_cached_source_signature: Tuple[str, int, int] | None = None
+_cached_source_signature: tuple[str, int, int] | None = None
+_watcher: FileWatcher | None = None
+_watched_setting: tuple[str | None, str | None] | None = None
+_sqlite_provider: SQLiteUserProvider | None = None
+_reload_lock = threading.Lock()
+
+
+def _close_sources() -> None:
+    global _watcher, _sqlite_provider
+    if _watcher is not None:
+        _watcher.close()
+    if _sqlite_provider is not None:
+        _sqlite_provider.close()
+    _watcher = None
+    _sqlite_provider = None
+
+
+def _refresh_user_service(*, force: bool) -> UserCredentialsService:
+    """Recarga el servicio si la fuente cambió. Debe llamarse con ``_reload_lock``."""
+
+    global _cached_service, _cached_source_signature, _watcher, _watched_setting, _sqlite_provider
+
+    settings = get_settings()
+    setting = settings.users_source
+    users_db, users_file = setting
+    if users_db:
+        # Las búsquedas son puntuales contra la base: no hay mapa que recargar.
+        if force or _sqlite_provider is None or setting != _watched_setting:
+            provider = SQLiteUserProvider(users_db)
+            _close_sources()
+            _sqlite_provider, _watched_setting = provider, setting
+            _cached_service = UserCredentialsService(users=ProviderUserMapping(provider))
+            _cached_source_signature = None
+        return _cached_service
 
+    provider = JsonFileUserProvider()
+    if _watcher is None or setting != _watched_setting:
+        # El vigilante se crea antes de leer para no perder escrituras intermedias.
+        watcher = create_file_watcher(
+            [Path(users_file or "").expanduser(), provider.path],
+            poll_interval=settings.users_poll_interval,
+        )
+        _close_sources()
+        _watcher, _watched_setting = watcher, setting
+        force = True
+
+    _watcher.has_changes()
+    source_signature = provider.get_source_signature()
+    if force or _cached_service is None or source_signature != _cached_source_signature:
+        # Se construye el servicio completo y después se publica con una sola asignación.
+        _cached_service = UserCredentialsService(users=provider.get_users())
+    _cached_source_signature = source_signature
+    _watcher.mark_synced(source_signature)
+    return _cached_service
 
-def get_user_service() -> UserCredentialsService:
-    """Obtiene (con caché) el servicio configurado de credenciales."""
 
-    global _cached_service, _cached_source_signature
+def get_user_service() -> UserCredentialsService:
+    """Obtiene (con caché) el servicio configurado de credenciales.
 
-    provider = JsonFileUserProvider()
-    source_signature = provider.get_source_signature()
+    Mientras el archivo no cambie, la consulta no accede al sistema de archivos:
+    un vigilante (``inotify`` o sondeo por ``mtime`` limitado por
+    ``SQLITEPLUS_USERS_POLL_INTERVAL``) avisa cuando hay que recargar.
+    """
 
-    if _cached_service is None or _cached_source_signature != source_signature:
-        users = provider.get_users()
-        _cached_service = UserCredentialsService(users=users)
-        _cached_source_signature = source_signature
+    service = _cached_service
+    watcher = _watcher
+    if (
+        service is not None
+        and get_settings().users_source == _watched_setting
+        and (watcher is None or not watcher.has_changes())
+    ):
+        return service
 
-    return _cached_service
+    with _reload_lock:
+        return _refresh_user_service(force=False)
 
 
 def reload_user_service() -> UserCredentialsService:
     """Fuerza la recarga inmediata del servicio de credenciales desde el archivo."""
 
-    global _cached_service, _cached_source_signature
-
-    provider = JsonFileUserProvider()
-    users = provider.get_users()
-    source_signature = provider.get_source_signature()
-
-    service = UserCredentialsService(users=users)
-    _cached_service = service
-    _cached_source_signature = source_signature
-    return service
+    with _reload_lock:
+        return _refresh_user_service(force=True)
 
 
 def reset_user_service_cache() -> None:
     """Reinicia la caché del servicio para pruebas o recarga de configuración."""
 
-    global _cached_service, _cached_source_signature
-    _cached_service = None
-    _cached_source_signature = None
+    global _cached_service, _cached_source_signature, _watched_setting
+    with _reload_lock:
+        _close_sources()
+        _cached_service = None
+        _cached_source_signature = None
+        _watched_setting = None
 
 
 def _build_cli_parser() -> argparse.ArgumentParser:
@@ -183,9 +255,95 @@ def _build_cli_parser() -> argparse.ArgumentParser:
         help="Número de rondas de bcrypt. Debe ser un entero entre 4 y 31 (por defecto: 12).",
     )
 
+    store_options = argparse.ArgumentParser(add_help=False)
+    store_options.add_argument(
+        "--db",
+        default=os.getenv(USERS_DB_ENV),
+        help=f"Base SQLite de usuarios (por defecto: ${USERS_DB_ENV}).",
+    )
+    store_options.add_argument(
+        "--ask-key",
+        action="store_true",
+        help=f"Solicita la clave SQLCipher en lugar de leer ${USERS_DB_KEY_ENV}.",
+    )
+
+    subparsers.add_parser(
+        "init", parents=[store_options], help="Crea la base SQLite de usuarios si no existe."
+    )
+
+    add_parser = subparsers.add_parser(
+        "add", parents=[store_options], help="Crea o actualiza un usuario en la base SQLite."
+    )
+    add_parser.add_argument("username", help="Nombre del usuario.")
+    add_parser.add_argument(
+        "password",
+        nargs="?",
+        help="Contraseña en texto plano. Si se omite se solicitará mediante getpass.",
+    )
+    add_parser.add_argument("-r", "--rounds", type=int, default=12, help="Rondas de bcrypt (4-31).")
+
+    remove_parser = subparsers.add_parser(
+        "remove", parents=[store_options], help="Elimina un usuario de la base SQLite."
+    )
+    remove_parser.add_argument("username", help="Nombre del usuario.")
+
+    subparsers.add_parser(
+        "list", parents=[store_options], help="Lista los usuarios de la base SQLite."
+    )
+
+    import_parser = subparsers.add_parser(
+        "import",
+        parents=[store_options],
+        help="Importa hashes desde un JSON {usuario: hash} o un CSV username,password_hash.",
+    )
+    import_parser.add_argument("source", help="Archivo .json o .csv con usuarios y hashes bcrypt.")
+    import_parser.add_argument(
+        "--keep-existing",
+        action="store_true",
+        help="No sobrescribe los usuarios que ya existen en la base.",
+    )
+
     return parser
 
 
+def _read_user_records(source: Path) -> Iterator[tuple[str, str]]:
+    """Lee pares (usuario, hash) de un JSON como el de ``SQLITEPLUS_USERS_FILE`` o de un CSV."""
+
+    if source.suffix.lower() == ".csv":
+        with source.open(encoding="utf-8", newline="") as handle:
+            reader = csv.DictReader(handle)
+            missing = {"username", "password_hash"} - set(reader.fieldnames or ())
+            if missing:
+                raise SystemExit(
+                    "El CSV debe tener las columnas username y password_hash "
+                    f"(faltan: {', '.join(sorted(missing))})"
+                )
+            for row in reader:
+                yield row["username"], row["password_hash"]
+        return
+
+    try:
+        data = json.loads(source.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise SystemExit(f"El archivo '{source}' no contiene JSON válido: {exc}") from exc
+    if not isinstance(data, dict):
+        raise SystemExit("El JSON debe ser un objeto {usuario: hash}")
+    for username, password_hash in data.items():
+        yield str(username), str(password_hash)
+
+
+def _open_store(args: argparse.Namespace):
+    if not args.db:
+        raise SystemExit(f"Indica --db o define {USERS_DB_ENV}")
+    cipher_key = (
+        getpass.getpass("Clave SQLCipher: ") if args.ask_key else os.getenv(USERS_DB_KEY_ENV)
+    )
+    try:
+        return connect_user_store(args.db, cipher_key=cipher_key)
+    except UserSourceError as exc:
+        raise SystemExit(str(exc)) from exc
+
+
 def _hash_password(password: str, rounds: int) -> str:
     if not 4 <= rounds <= 31:
         raise SystemExit("--rounds debe estar entre 4 y 31")
@@ -212,9 +370,55 @@ def _main(argv: list[str] | None = None) -> int:
         print(hashed)
         return 0
 
+    if args.command in {"init", "add", "remove", "list", "import"}:
+        with closing(_open_store(args)) as connection:
+            return _run_store_command(args, connection)
+
     parser.error("Comando desconocido")
     return 1
 
 
+def _run_store_command(args: argparse.Namespace, connection) -> int:
+    table = f'"{USERS_TABLE}"'
+    if args.command == "init":
+        print(f"Base de usuarios lista en {args.db}")
+        return 0
+
+    if args.command == "add":
+        password = args.password if args.password is not None else _prompt_password()
+        upsert_users(connection, [(args.username, _hash_password(password, rounds=args.rounds))])
+        print(f"Usuario '{args.username}' guardado")
+        return 0
+
+    if args.command == "remove":
+        with connection:
+            removed = connection.execute(
+                f"DELETE FROM {table} WHERE username = ?", (args.username,)
+            ).rowcount
+        if not removed:
+            print(f"El usuario '{args.username}' no existe", file=sys.stderr)
+            return 1
+        print(f"Usuario '{args.username}' eliminado")
+        return 0
+
+    if args.command == "list":
+        for (username,) in connection.execute(f"SELECT username FROM {table} ORDER BY username"):
+            print(username)
+        return 0
+
+    source = Path(args.source).expanduser()
+    if not source.is_file():
+        raise SystemExit(f"No se encontró el archivo '{source}'")
+    try:
+        written = upsert_users(
+            connection, _read_user_records(source), replace=not args.keep_existing
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    total = connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+    print(f"{written} usuarios importados ({total} en total)")
+    return 0
+
+
 if __name__ == "__main__":
     raise SystemExit(_main(sys.argv[1:]))
@@ -31,7 +31,7 @@ import click
 import urllib.request
 
 from sqliteplus.utils.rich_compat import Console, Panel, Syntax, Table, Text, box
-from sqliteplus.utils.json_serialization import normalize_json_value as _normalize_json_value
+from sqliteplus.utils.json_serialization import build_row_normalizer as _build_row_normalizer
 
 from sqliteplus.utils.constants import DEFAULT_DB_PATH, resolve_default_db_path
 from sqliteplus.utils.sqliteplus_sync import (
@@ -666,10 +666,7 @@ def fetch(
     )
 
     if output.lower() == "json":
-        json_ready_rows = [
-            tuple(_normalize_json_value(value) for value in row)
-            for row in displayed_rows
-        ]
+        json_ready_rows = _build_row_normalizer(columns, sample_rows=displayed_rows)(displayed_rows)
         if not normalized_columns:
             payload = [list(row) for row in json_ready_rows]
         elif has_duplicate_column_names:
@@ -851,10 +848,10 @@ def export_csv(ctx, table_name, output_file, db_path, overwrite):
 @click.option(
     "--format",
     "export_format",
-    type=click.Choice(["json", "csv"], case_sensitive=False),
+    type=click.Choice(["json", "csv", "parquet", "arrow"], case_sensitive=False),
     default="json",
     show_default=True,
-    help="Formato de exportación del resultado.",
+    help="Formato de exportación del resultado (parquet y arrow requieren pyarrow).",
 )
 @click.option(
     "--limit",
@@ -885,59 +882,563 @@ def export_query(ctx, export_format, limit, overwrite, output_file, query):
 
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    db = SQLitePlus(
-        db_path=ctx.obj.get("db_path"),
+    if export_format.lower() in {"parquet", "arrow"}:
+        replicator = SQLiteReplication(
+            db_path=ctx.obj.get("db_path"),
+            cipher_key=ctx.obj.get("cipher_key"),
+        )
+        try:
+            replicator.export_query(
+                sql,
+                path,
+                format=export_format.lower(),
+                limit=limit,
+                overwrite=True,
+            )
+        except (ValueError, FileNotFoundError, sqlite3.Error, RuntimeError) as exc:
+            raise click.ClickException(str(exc)) from exc
+    else:
+        db = SQLitePlus(
+            db_path=ctx.obj.get("db_path"),
+            cipher_key=ctx.obj.get("cipher_key"),
+        )
+
+        try:
+            columns, rows = db.fetch_query_with_columns(sql)
+        except (SQLitePlusCipherError, SQLitePlusQueryError) as exc:
+            raise click.ClickException(str(exc)) from exc
+
+        if limit is not None:
+            rows = rows[:limit]
+
+        normalized_columns, has_duplicate_column_names = _normalize_column_names(
+            columns,
+            rows,
+            placeholder_template="columna_{index}",
+        )
+
+        if export_format.lower() == "json":
+            json_ready_rows = _build_row_normalizer(columns, sample_rows=rows)(rows)
+
+            if not normalized_columns:
+                payload = [list(row) for row in json_ready_rows]
+            elif has_duplicate_column_names:
+                payload = {
+                    "columns": normalized_columns,
+                    "rows": [list(row) for row in json_ready_rows],
+                }
+            else:
+                payload = [
+                    {normalized_columns[idx]: row[idx] for idx in range(len(row))}
+                    for row in json_ready_rows
+                ]
+            path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        else:
+            with path.open("w", encoding="utf-8", newline="") as file_handle:
+                writer = csv.writer(file_handle)
+                if normalized_columns:
+                    writer.writerow(normalized_columns)
+                for row in rows:
+                    writer.writerow(["" if value is None else value for value in row])
+
+    ctx.obj["console"].print(
+        Panel.fit(
+            Text(
+                f"Consulta exportada en formato {export_format.upper()} a {path}.",
+                style="bold green",
+            ),
+            title="Exportación completada",
+            border_style="green",
+        )
+    )
+
+
+@click.command(
+    name="export-incremental",
+    help="Exporta solo las filas nuevas desde la última ejecución (marca de agua por destino).",
+)
+@click.argument("table_name")
+@click.argument("output_file")
+@click.option(
+    "--key",
+    default="rowid",
+    show_default=True,
+    help="Clave incremental: rowid o una columna creciente como updated_at.",
+)
+@click.option(
+    "--target",
+    default="default",
+    show_default=True,
+    help="Nombre del consumidor; cada destino mantiene su propia marca de agua.",
+)
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["csv", "json", "parquet", "arrow"], case_sensitive=False),
+    default="csv",
+    show_default=True,
+    help="Formato del archivo generado (parquet y arrow requieren pyarrow).",
+)
+@click.option(
+    "--reset",
+    is_flag=True,
+    default=False,
+    help="Descarta la marca guardada y exporta la tabla completa.",
+)
+@click.option(
+    "--db-path",
+    default=None,
+    show_default=False,
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=str),
+    help="Ruta específica de la base que quieres exportar (por defecto usa la global).",
+)
+@click.option(
+    "--overwrite/--no-overwrite",
+    default=False,
+    help="Permite sobrescribir el archivo de salida si ya existe.",
+)
+@click.pass_context
+def export_incremental(ctx, table_name, output_file, key, target, export_format, reset, db_path, overwrite):
+    """Exporta los cambios de una tabla desde la última marca de agua."""
+
+    replicator = SQLiteReplication(
+        db_path=db_path or ctx.obj.get("db_path"),
         cipher_key=ctx.obj.get("cipher_key"),
     )
+    try:
+        if reset:
+            replicator.reset_watermark(table_name, target)
+        result = replicator.export_incremental(
+            table_name,
+            output_file,
+            key=key,
+            target=target,
+            format=export_format.lower(),
+            overwrite=overwrite,
+        )
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="table_name/--key") from exc
+    except (FileExistsError, FileNotFoundError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    except sqlite3.Error as exc:
+        raise click.ClickException(str(exc)) from exc
+    except (SQLitePlusCipherError, RuntimeError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    ctx.obj["console"].print(
+        Panel.fit(
+            Text(
+                f"{result.rows} filas nuevas de {table_name} exportadas a {result.path}\n"
+                f"Marca de agua ({result.key}): {result.previous_watermark} → {result.watermark}",
+                style="bold green",
+            ),
+            title="Exportación incremental completada",
+            border_style="green",
+        )
+    )
+
+
+@click.command(
+    name="export-db",
+    help="Exporta varias tablas (o la base completa) en paralelo a un directorio.",
+)
+@click.argument(
+    "output_dir",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=str),
+)
+@click.option(
+    "--table",
+    "tables",
+    multiple=True,
+    help="Tabla a exportar. Repite la opción para varias; por defecto exporta todas.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(1),
+    default=None,
+    help="Número de hilos lectores (por defecto min(8, núcleos disponibles)).",
+)
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(["csv", "json", "parquet", "arrow"], case_sensitive=False),
+    default="csv",
+    show_default=True,
+    help="Formato de los archivos generados (parquet y arrow requieren pyarrow).",
+)
+@click.option(
+    "--snapshot/--no-snapshot",
+    default=True,
+    show_default=True,
+    help="Lee todas las tablas desde una instantánea para obtener un volcado coherente.",
+)
+@click.option(
+    "--db-path",
+    default=None,
+    show_default=False,
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=str),
+    help="Ruta específica de la base que quieres exportar (por defecto usa la global).",
+)
+@click.option(
+    "--overwrite/--no-overwrite",
+    default=False,
+    help="Permite sobrescribir los archivos de salida si ya existen.",
+)
+@click.pass_context
+def export_db(ctx, output_dir, tables, workers, export_format, snapshot, db_path, overwrite):
+    """Exporta tablas en paralelo mostrando el progreso por tabla."""
+
+    console_obj = ctx.obj["console"]
+    resolved_db_path = db_path or ctx.obj.get("db_path")
+    replicator = SQLiteReplication(
+        db_path=resolved_db_path,
+        cipher_key=ctx.obj.get("cipher_key"),
+    )
+
+    def _report(result):
+        if result.ok:
+            console_obj.print(
+                Text(f"✔ {result.table}: {result.rows} filas en {result.seconds:.2f}s", style="green")
+            )
+        else:
+            console_obj.print(Text(f"✖ {result.table}: {result.error}", style="bold red"))
 
     try:
-        columns, rows = db.fetch_query_with_columns(sql)
-    except (SQLitePlusCipherError, SQLitePlusQueryError) as exc:
+        results = replicator.export_database(
+            output_dir,
+            tables=list(tables) or None,
+            workers=workers,
+            format=export_format.lower(),
+            overwrite=overwrite,
+            consistent=snapshot,
+            progress=_report,
+        )
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--table") from exc
+    except (FileExistsError, FileNotFoundError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    except sqlite3.Error as exc:
+        raise click.ClickException(str(exc)) from exc
+    except (SQLitePlusCipherError, RuntimeError) as exc:
         raise click.ClickException(str(exc)) from exc
 
-    if limit is not None:
-        rows = rows[:limit]
+    if not results:
+        console_obj.print(
+            Panel.fit(
+                Text("No se encontraron tablas para exportar.", style="bold yellow"),
+                title="Sin resultados",
+                border_style="yellow",
+            )
+        )
+        return
 
-    normalized_columns, has_duplicate_column_names = _normalize_column_names(
-        columns,
-        rows,
-        placeholder_template="columna_{index}",
+    summary = Table(title="Tablas exportadas", header_style="bold cyan", box=box.SQUARE)
+    summary.add_column("Tabla", style="bold")
+    summary.add_column("Filas", justify="right")
+    summary.add_column("Segundos", justify="right")
+    summary.add_column("Archivo")
+    for result in results:
+        summary.add_row(
+            result.table,
+            str(result.rows) if result.ok else "-",
+            f"{result.seconds:.2f}",
+            result.path or "error",
+        )
+    console_obj.print(summary)
+
+    failed = [result for result in results if not result.ok]
+    if failed:
+        raise click.ClickException(
+            "No se pudieron exportar las tablas: "
+            + ", ".join(result.table for result in failed)
+        )
+
+    total_rows = sum(result.rows for result in results)
+    console_obj.print(
+        Panel.fit(
+            Text(
+                f"{len(results)} tablas ({total_rows} filas) exportadas a {output_dir}",
+                style="bold green",
+            ),
+            title="Exportación completada",
+            border_style="green",
+        )
     )
 
-    if export_format.lower() == "json":
-        json_ready_rows = [
-            tuple(_normalize_json_value(value) for value in row)
-            for row in rows
-        ]
 
-        if not normalized_columns:
-            payload = [list(row) for row in json_ready_rows]
-        elif has_duplicate_column_names:
-            payload = {
-                "columns": normalized_columns,
-                "rows": [list(row) for row in json_ready_rows],
-            }
+def _parse_column_types(values: Iterable[str]) -> dict[str, str]:
+    column_types: dict[str, str] = {}
+    for item in values:
+        name, separator, declared = item.partition(":")
+        if not separator or not name.strip() or not declared.strip():
+            raise click.BadParameter(
+                f"Formato inválido '{item}'. Usa columna:TIPO, por ejemplo edad:INTEGER.",
+                param_hint="--column",
+            )
+        column_types[name.strip()] = declared.strip()
+    return column_types
+
+
+@click.command(
+    name="import",
+    help="Carga masiva de un archivo CSV o NDJSON en una tabla.",
+)
+@click.argument("table_name")
+@click.argument(
+    "source_file",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True, path_type=str),
+)
+@click.option(
+    "--format",
+    "import_format",
+    type=click.Choice(["auto", "csv", "ndjson"], case_sensitive=False),
+    default="auto",
+    show_default=True,
+    help="Formato del archivo; 'auto' lo deduce de la extensión (.ndjson/.jsonl o CSV).",
+)
+@click.option(
+    "--column",
+    "columns",
+    multiple=True,
+    help="Tipo de una columna como nombre:TIPO. Las no indicadas se infieren del archivo.",
+)
+@click.option("--delimiter", default=",", show_default=True, help="Separador de campos del CSV.")
+@click.option(
+    "--batch-size",
+    type=click.IntRange(1),
+    default=5000,
+    show_default=True,
+    help="Filas enviadas en cada executemany.",
+)
+@click.option(
+    "--commit-every",
+    type=click.IntRange(1),
+    default=None,
+    help="Confirma cada N filas (por defecto toda la carga es una única transacción).",
+)
+@click.option(
+    "--create/--no-create",
+    default=True,
+    show_default=True,
+    help="Crea la tabla si no existe.",
+)
+@click.option(
+    "--defer-indexes/--keep-indexes",
+    default=True,
+    show_default=True,
+    help="Elimina los índices no únicos durante la carga y los recrea al final.",
+)
+@click.option(
+    "--db-path",
+    default=None,
+    show_default=False,
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=str),
+    help="Ruta específica de la base destino (por defecto usa la global).",
+)
+@click.pass_context
+def import_data(
+    ctx,
+    table_name,
+    source_file,
+    import_format,
+    columns,
+    delimiter,
+    batch_size,
+    commit_every,
+    create,
+    defer_indexes,
+    db_path,
+):
+    """Importa un archivo CSV o NDJSON mostrando el rendimiento obtenido."""
+
+    column_types = _parse_column_types(columns)
+    import_format = import_format.lower()
+    if import_format == "auto":
+        suffix = Path(source_file).suffix.lower()
+        import_format = "ndjson" if suffix in {".ndjson", ".jsonl"} else "csv"
+
+    replicator = SQLiteReplication(
+        db_path=db_path or ctx.obj.get("db_path"),
+        cipher_key=ctx.obj.get("cipher_key"),
+    )
+    options = {
+        "column_types": column_types or None,
+        "create": create,
+        "batch_size": batch_size,
+        "commit_every": commit_every,
+        "defer_indexes": defer_indexes,
+    }
+    try:
+        if import_format == "ndjson":
+            result = replicator.import_ndjson(table_name, source_file, **options)
         else:
-            payload = [
-                {normalized_columns[idx]: row[idx] for idx in range(len(row))}
-                for row in json_ready_rows
-            ]
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    else:
-        with path.open("w", encoding="utf-8", newline="") as file_handle:
-            writer = csv.writer(file_handle)
-            if normalized_columns:
-                writer.writerow(normalized_columns)
-            for row in rows:
-                writer.writerow(["" if value is None else value for value in row])
+            result = replicator.import_csv(table_name, source_file, delimiter=delimiter, **options)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    except (FileNotFoundError, sqlite3.Error) as exc:
+        raise click.ClickException(str(exc)) from exc
+    except (SQLitePlusCipherError, RuntimeError) as exc:
+        raise click.ClickException(str(exc)) from exc
 
+    action = "creada" if result.created else "existente"
     ctx.obj["console"].print(
         Panel.fit(
             Text(
-                f"Consulta exportada en formato {export_format.upper()} a {path}.",
+                f"{result.rows} filas cargadas en la tabla {action} {table_name} "
+                f"en {result.seconds:.2f}s ({result.rows_per_second:,.0f} filas/s)",
                 style="bold green",
             ),
-            title="Exportación completada",
+            title="Importación completada",
+            border_style="green",
+        )
+    )
+
+
+_CDC_DB_PATH_OPTION = click.option(
+    "--db-path",
+    default=None,
+    show_default=False,
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=str),
+    help="Ruta específica de la base (por defecto usa la global).",
+)
+
+
+def _cdc_replicator(ctx, db_path):
+    return SQLiteReplication(
+        db_path=db_path or ctx.obj.get("db_path"),
+        cipher_key=ctx.obj.get("cipher_key"),
+    )
+
+
+def _run_cdc(action):
+    try:
+        return action()
+    except ValueError as exc:
+        raise click.BadParameter(str(exc)) from exc
+    except (FileNotFoundError, sqlite3.Error) as exc:
+        raise click.ClickException(str(exc)) from exc
+    except (SQLitePlusCipherError, RuntimeError) as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+@click.group(name="cdc", help="Captura de cambios (CDC) mediante triggers y lectura incremental del registro.")
+def cdc():
+    """Agrupa los comandos del registro de cambios."""
+
+
+@cdc.command(name="enable", help="Instala los triggers de captura en las tablas indicadas.")
+@click.argument("tables", nargs=-1, required=True)
+@click.option(
+    "--retention",
+    type=click.IntRange(1),
+    default=100_000,
+    show_default=True,
+    help="Número de cambios que se conservan; los más antiguos se compactan automáticamente.",
+)
+@_CDC_DB_PATH_OPTION
+@click.pass_context
+def cdc_enable(ctx, tables, retention, db_path):
+    replicator = _cdc_replicator(ctx, db_path)
+    enabled = _run_cdc(lambda: replicator.enable_change_capture(tables, retention_rows=retention))
+    ctx.obj["console"].print(
+        Panel.fit(
+            Text(f"Captura de cambios activa en: {', '.join(enabled)}", style="bold green"),
+            title="CDC activado",
+            border_style="green",
+        )
+    )
+
+
+@cdc.command(name="disable", help="Retira los triggers de captura de las tablas indicadas.")
+@click.argument("tables", nargs=-1, required=True)
+@click.option("--purge", is_flag=True, default=False, help="Borra también los cambios ya registrados.")
+@_CDC_DB_PATH_OPTION
+@click.pass_context
+def cdc_disable(ctx, tables, purge, db_path):
+    replicator = _cdc_replicator(ctx, db_path)
+    _run_cdc(lambda: replicator.disable_change_capture(tables, purge=purge))
+    ctx.obj["console"].print(
+        Panel.fit(
+            Text(f"Captura de cambios desactivada en: {', '.join(tables)}", style="bold yellow"),
+            title="CDC desactivado",
+            border_style="yellow",
+        )
+    )
+
+
+@cdc.command(name="read", help="Muestra los cambios con secuencia mayor que --since.")
+@click.option("--since", type=click.IntRange(0), default=0, show_default=True, help="Última secuencia procesada.")
+@click.option(
+    "--limit",
+    type=click.IntRange(1, 10_000),
+    default=1000,
+    show_default=True,
+    help="Cambios por lote.",
+)
+@click.option("--table", "tables", multiple=True, help="Filtra por tabla (repetible).")
+@click.option("--all", "read_all", is_flag=True, default=False, help="Recorre todos los lotes pendientes.")
+@click.option("--json", "as_json", is_flag=True, default=False, help="Emite un objeto JSON por cambio (NDJSON).")
+@_CDC_DB_PATH_OPTION
+@click.pass_context
+def cdc_read(ctx, since, limit, tables, read_all, as_json, db_path):
+    replicator = _cdc_replicator(ctx, db_path)
+    console_obj = ctx.obj["console"]
+    changes = []
+    truncated = False
+    while True:
+        batch = _run_cdc(
+            lambda since=since: replicator.read_changes(since, limit=limit, tables=list(tables) or None)
+        )
+        truncated = truncated or batch.truncated
+        changes.extend(batch.changes)
+        since = batch.last_seq
+        if not (read_all and batch.has_more):
+            break
+
+    if as_json:
+        for change in changes:
+            click.echo(json.dumps(change.as_dict(), ensure_ascii=False))
+    else:
+        table = Table(title="Cambios registrados", header_style="bold cyan", box=box.SQUARE)
+        table.add_column("Seq", justify="right")
+        table.add_column("Tabla", style="bold")
+        table.add_column("Operación", style="magenta")
+        table.add_column("Rowid", justify="right")
+        table.add_column("Datos", overflow="fold")
+        for change in changes:
+            table.add_row(
+                str(change.seq),
+                change.table,
+                change.operation,
+                "-" if change.rowid is None else str(change.rowid),
+                json.dumps(change.data, ensure_ascii=False) if change.data is not None else "NULL",
+            )
+        console_obj.print(table)
+        console_obj.print(Text(f"Última secuencia: {since}", style="bold"))
+    if truncated:
+        click.echo(
+            "Aviso: parte de los cambios solicitados ya se compactó; resincroniza la tabla completa.",
+            err=True,
+        )
+
+
+@cdc.command(name="compact", help="Elimina cambios ya consumidos del registro.")
+@click.option("--up-to", "up_to_seq", type=click.IntRange(0), default=None, help="Borra hasta esta secuencia inclusive.")
+@click.option("--older-than", type=click.FloatRange(0), default=None, help="Borra los cambios con más de N segundos.")
+@click.option("--keep-last", type=click.IntRange(0), default=None, help="Conserva solo los N cambios más recientes.")
+@_CDC_DB_PATH_OPTION
+@click.pass_context
+def cdc_compact(ctx, up_to_seq, older_than, keep_last, db_path):
+    replicator = _cdc_replicator(ctx, db_path)
+    removed = _run_cdc(
+        lambda: replicator.compact_changes(
+            up_to_seq=up_to_seq, older_than=older_than, keep_last=keep_last
+        )
+    )
+    ctx.obj["console"].print(
+        Panel.fit(
+            Text(f"{removed} cambios eliminados del registro", style="bold green"),
+            title="Compactación completada",
             border_style="green",
         )
     )
@@ -982,6 +1483,70 @@ def backup(ctx, db_path):
     )
 
 
+@click.command(help="Replica la base en varios destinos leyendo el origen una sola vez.")
+@click.argument(
+    "targets",
+    nargs=-1,
+    required=True,
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=str),
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Número de destinos escritos en paralelo (por defecto hasta 8).",
+)
+@click.option(
+    "--db-path",
+    default=None,
+    show_default=False,
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=str),
+    help="Ruta específica de la base a replicar (por defecto usa la global).",
+)
+@click.pass_context
+def replicate(ctx, targets, workers, db_path):
+    """Replica la base en todos los destinos y resume el resultado de cada uno."""
+    resolved_db_path = db_path or ctx.obj.get("db_path")
+    if not Path(resolved_db_path).exists():
+        raise click.ClickException(f"No se encontró la base de datos origen: {resolved_db_path}")
+
+    replicator = SQLiteReplication(
+        db_path=resolved_db_path,
+        cipher_key=ctx.obj.get("cipher_key"),
+    )
+    try:
+        results = replicator.replicate_to_many(targets, workers=workers)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    console_obj = ctx.obj["console"]
+    summary = Table(title="Réplicas", header_style="bold cyan", box=box.SQUARE)
+    summary.add_column("Destino", style="bold")
+    summary.add_column("Segundos", justify="right")
+    summary.add_column("Resultado")
+    for result in results:
+        summary.add_row(
+            result.target,
+            f"{result.seconds:.2f}",
+            result.strategy if result.ok else f"error: {result.error}",
+        )
+    console_obj.print(summary)
+
+    failed = [result for result in results if not result.ok]
+    if failed:
+        raise click.ClickException(
+            "No se pudo replicar en: " + ", ".join(result.target for result in failed)
+        )
+
+    console_obj.print(
+        Panel.fit(
+            Text(f"Base replicada en {len(results)} destinos.", style="bold green"),
+            title="Replicación completada",
+            border_style="green",
+        )
+    )
+
+
 @click.command(name="list-tables", help="Muestra las tablas disponibles y su número de filas.")
 @click.option(
     "--include-views/--exclude-views",
@@ -1947,7 +2512,12 @@ cli.add_command(execute)
 cli.add_command(fetch)
 cli.add_command(export_csv)
 cli.add_command(export_query)
+cli.add_command(export_incremental)
+cli.add_command(export_db)
+cli.add_command(import_data)
+cli.add_command(cdc)
 cli.add_command(backup)
+cli.add_command(replicate)
 cli.add_command(list_tables)
 cli.add_command(describe_table)
 cli.add_command(database_info)
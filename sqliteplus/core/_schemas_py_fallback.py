@@ -249,3 +249,22 @@ def _py_normalized_columns(columns: Dict[str, str]) -> Dict[str, str]:
         sanitized_columns[normalized_name] = " ".join(normalized_parts)
 
     return sanitized_columns
+
+
+def _py_build_row_params(rows, raw_keys: tuple, source_keys: tuple) -> list[tuple]:
+    """Convierte ``rows`` en tuplas de parámetros tras comprobar que comparten columnas.
+
+    ``raw_keys`` son las claves de la primera fila (ya validadas) y ``source_keys``
+    las claves de las que sale cada parámetro, en el orden de las columnas.
+    """
+
+    expected_keys = set(raw_keys)
+    params: list[tuple] = []
+    append = params.append
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise TypeError(f"La fila {index} debe ser un objeto JSON")
+        if row.keys() != expected_keys:
+            raise ValueError(f"La fila {index} no tiene las mismas columnas que la primera")
+        append(tuple([row[key] for key in source_keys]))
+    return params
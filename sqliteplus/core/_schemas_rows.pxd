@@ -0,0 +1,7 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: initializedcheck=False
+# cython: cdivision=True
+
+cpdef list build_row_params(object rows, tuple raw_keys, tuple source_keys)
@@ -0,0 +1,50 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: initializedcheck=False
+# cython: cdivision=True
+"""Validación en Cython de lotes de filas con las mismas columnas."""
+
+from cpython.dict cimport PyDict_Contains, PyDict_GetItem
+from cpython.object cimport PyObject
+from cpython.ref cimport Py_INCREF
+from cpython.tuple cimport PyTuple_New, PyTuple_SET_ITEM
+
+
+cpdef list build_row_params(object rows, tuple raw_keys, tuple source_keys):
+    """Convierte ``rows`` en tuplas de parámetros tras comprobar que comparten columnas.
+
+    ``raw_keys`` son las claves de la primera fila (ya validadas) y ``source_keys``
+    las claves de las que sale cada parámetro, en el orden de las columnas.
+    """
+
+    cdef Py_ssize_t expected_size = len(raw_keys)
+    cdef Py_ssize_t width = len(source_keys)
+    cdef Py_ssize_t index = 0
+    cdef Py_ssize_t position
+    cdef list params = []
+    cdef object row
+    cdef dict row_dict
+    cdef object key
+    cdef tuple values
+    cdef PyObject* value
+
+    for row in rows:
+        if not isinstance(row, dict):
+            raise TypeError(f"La fila {index} debe ser un objeto JSON")
+        row_dict = <dict>row
+        if len(row_dict) != expected_size:
+            raise ValueError(f"La fila {index} no tiene las mismas columnas que la primera")
+        for key in raw_keys:
+            if not PyDict_Contains(row_dict, key):
+                raise ValueError(f"La fila {index} no tiene las mismas columnas que la primera")
+
+        values = PyTuple_New(width)
+        for position in range(width):
+            value = PyDict_GetItem(row_dict, source_keys[position])
+            Py_INCREF(<object>value)
+            PyTuple_SET_ITEM(values, position, <object>value)
+        params.append(values)
+        index += 1
+
+    return params
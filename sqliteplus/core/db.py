@@ -10,6 +10,7 @@ import weakref
 import aiosqlite
 
 from fastapi import HTTPException
+from sqliteplus.core.settings import get_settings
 from sqliteplus.utils.crypto_sqlite import (
     GENERIC_SECURITY_ERROR_MESSAGE,
     SQLitePlusCipherError,
@@ -24,15 +25,6 @@ _INITIALIZED_DATABASES: set[str] = set()
 _LIVE_MANAGERS = weakref.WeakSet()
 
 
-def _is_truthy(value: str | None) -> bool:
-    if value is None:
-        return False
-    normalized = value.strip().lower()
-    if not normalized:
-        return False
-    return normalized not in {"0", "false", "no", "off"}
-
-
 class AsyncDatabaseManager:
     """
     Gestor de bases de datos SQLite asíncrono con `aiosqlite`.
@@ -49,10 +41,11 @@ class AsyncDatabaseManager:
         Cuando es ``True`` se elimina la base de datos existente antes de
         inicializarla de nuevo. Este override manual se recomienda únicamente
         para pruebas o migraciones controladas. Además del valor pasado explícitamente, el
-        gestor vuelve a comprobar en cada creación de conexión las variables
-        ``PYTEST_CURRENT_TEST``, ``SQLITEPLUS_ENV`` y ``SQLITEPLUS_FORCE_RESET``
-        para decidir si debe borrar el archivo, evitando residuos incluso si el
-        gestor global ya está instanciado.
+        gestor vuelve a comprobar en cada creación de conexión
+        ``PYTEST_CURRENT_TEST`` y los valores ``SQLITEPLUS_ENV`` y
+        ``SQLITEPLUS_FORCE_RESET`` de la configuración vigente
+        (``get_settings()``) para decidir si debe borrar el archivo, evitando
+        residuos incluso si el gestor global ya está instanciado.
     """
 
     def __init__(
@@ -70,7 +63,7 @@ class AsyncDatabaseManager:
         self._creation_lock = None  # Candado para inicialización perezosa de conexiones
         self._creation_lock_loop = None  # Bucle asociado al candado de creación
         if require_encryption is None:
-            self.require_encryption = os.getenv("SQLITE_DB_KEY") is not None
+            self.require_encryption = get_settings().db_key is not None
         else:
             self.require_encryption = require_encryption
         self._auto_reset_detection = reset_on_init is None
@@ -82,12 +75,11 @@ class AsyncDatabaseManager:
         self._register_instance()
 
     def _is_force_reset_active(self) -> bool:
-        force_reset_enabled = _is_truthy(os.getenv("SQLITEPLUS_FORCE_RESET"))
-        if not force_reset_enabled:
+        settings = get_settings()
+        if not settings.force_reset:
             return False
 
-        sqliteplus_env = os.getenv("SQLITEPLUS_ENV", "").strip().lower()
-        in_safe_environment = bool(os.getenv("PYTEST_CURRENT_TEST")) or sqliteplus_env == "test"
+        in_safe_environment = bool(os.getenv("PYTEST_CURRENT_TEST")) or settings.environment == "test"
         if in_safe_environment:
             return True
 
@@ -190,7 +182,7 @@ class AsyncDatabaseManager:
                                     canonical_name,
                                     exc,
                                 )
-                raw_encryption_key = os.getenv("SQLITE_DB_KEY")
+                raw_encryption_key = get_settings().db_key
                 # No hacemos strip() para permitir claves con espacios, salvo que sea solo espacios
                 if raw_encryption_key is not None and raw_encryption_key.strip() == "":
                     encryption_key = ""
@@ -262,6 +254,25 @@ class AsyncDatabaseManager:
             await conn.commit()
             return cursor.lastrowid
 
+    async def execute_many(self, db_name, query, seq_of_params):
+        """
+        Ejecuta una consulta de escritura con varios juegos de parámetros en una
+        sola transacción y devuelve el número de filas afectadas.
+        """
+        normalized = self._normalize_db_name(db_name)
+        conn = await self.get_connection(db_name, _normalized=normalized)
+        canonical_name, _ = normalized
+        lock = self.locks[canonical_name]
+
+        async with lock:
+            try:
+                cursor = await conn.executemany(query, seq_of_params)
+            except Exception:
+                await conn.rollback()
+                raise
+            await conn.commit()
+            return cursor.rowcount
+
     async def fetch_query_with_columns(self, db_name, query, params=()):
         """Ejecuta una consulta de lectura y retorna también los nombres de columna."""
 
@@ -1,8 +1,10 @@
 import os
 import re
-from typing import Any, ClassVar, Dict
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, ClassVar
 
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, PrivateAttr, field_validator, model_validator
 
 from sqliteplus.core._schemas_constants import (
     ALLOWED_BASE_TYPES,
@@ -14,6 +16,7 @@ from sqliteplus.core._schemas_constants import (
     DEFAULT_EXPR_STRING_PATTERN,
     SQLITE_IDENTIFIER_PATTERN,
 )
+from sqliteplus.core._schemas_py_fallback import _py_build_row_params
 
 
 SQLITEPLUS_DISABLE_CYTHON = os.getenv("SQLITEPLUS_DISABLE_CYTHON", "").lower() in {
@@ -60,21 +63,27 @@ if not DISABLE_CYTHON_SPEEDUPS:
         from sqliteplus.core import _schemas_columns
     except ImportError:  # pragma: no cover - la ausencia también se comprueba
         _schemas_columns = None
+
+    try:  # pragma: no cover - la rama rápida se valida aparte
+        from sqliteplus.core import _schemas_rows
+    except ImportError:  # pragma: no cover - la ausencia también se comprueba
+        _schemas_rows = None
 else:  # pragma: no cover - se valida forzando la ruta lenta en pruebas
     _schemas_fast = None
     _schemas_columns = None
+    _schemas_rows = None
 
 HAS_CYTHON_SPEEDUPS = all(
     module is not None for module in (_schemas_fast, _schemas_columns, _schemas_api)
 )
 
 if _schemas_fast is not None:
-    is_valid_sqlite_identifier = _schemas_fast.is_valid_sqlite_identifier
+    _is_valid_sqlite_identifier_impl = _schemas_fast.is_valid_sqlite_identifier
     _has_balanced_parentheses_impl = _schemas_fast.has_balanced_parentheses
     _strip_enclosing_parentheses_impl = _schemas_fast.strip_enclosing_parentheses
     _parse_function_call_impl = _schemas_fast.parse_function_call
 else:
-    is_valid_sqlite_identifier = _py_is_valid_sqlite_identifier
+    _is_valid_sqlite_identifier_impl = _py_is_valid_sqlite_identifier
     _has_balanced_parentheses_impl = _py_has_balanced_parentheses
     _strip_enclosing_parentheses_impl = _py_strip_enclosing_parentheses
     _parse_function_call_impl = _py_parse_function_call
@@ -86,6 +95,67 @@ else:
     _normalize_columns_impl = _py_normalized_columns
     _is_safe_default_expr_impl = _py_is_safe_default_expr
 
+if _schemas_rows is not None:
+    _build_row_params_impl = _schemas_rows.build_row_params
+else:
+    _build_row_params_impl = _py_build_row_params
+
+
+# Las mismas tablas y columnas se validan en cada petición. Las cachés envuelven
+# la implementación elegida (Cython o Python), así que ambos modos devuelven lo
+# mismo y los errores no se memorizan: se vuelven a calcular y a lanzar.
+IDENTIFIER_CACHE_SIZE = 4096
+COLUMNS_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
+def _cached_is_valid_identifier(identifier: str) -> bool:
+    return bool(_is_valid_sqlite_identifier_impl(identifier))
+
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
+def _cached_escape_identifier(identifier: str) -> str | None:
+    sanitized = identifier.strip()
+    if not sanitized or not _cached_is_valid_identifier(sanitized):
+        return None
+    return sanitized.replace('"', '""')
+
+
+@lru_cache(maxsize=COLUMNS_CACHE_SIZE)
+def _cached_insert_columns(raw_keys: tuple) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Sanea las claves de un payload de inserción: columnas y clave de origen de cada una.
+
+    Si dos claves coinciden tras ``strip()`` gana la última, como al construir un ``dict``.
+    """
+
+    sources: dict[str, str] = {}
+    for column in raw_keys:
+        if not isinstance(column, str):
+            raise TypeError("Los nombres de columna deben ser cadenas de texto")
+
+        normalized_column = column.strip()
+        if not normalized_column:
+            raise ValueError("Los nombres de columna no pueden estar vacíos")
+
+        if not is_valid_sqlite_identifier(normalized_column):
+            raise ValueError(f"Nombre de columna inválido: {column}")
+
+        sources[normalized_column] = column
+    return tuple(sources), tuple(sources.values())
+
+
+@lru_cache(maxsize=COLUMNS_CACHE_SIZE)
+def _cached_normalized_columns(items: tuple[tuple[str, str], ...]) -> tuple[tuple[str, str], ...]:
+    return tuple(_normalize_columns_impl(dict(items)).items())
+
+
+def is_valid_sqlite_identifier(identifier: str) -> bool:
+    """Indica si ``identifier`` es un identificador SQLite aceptado (con caché LRU)."""
+
+    if type(identifier) is not str:
+        return bool(_is_valid_sqlite_identifier_impl(identifier))
+    return _cached_is_valid_identifier(identifier)
+
 
 def escape_sqlite_identifier(identifier: str) -> str:
     """Valida y escapa un identificador SQLite para uso seguro en consultas.
@@ -94,6 +164,10 @@ def escape_sqlite_identifier(identifier: str) -> str:
     is_valid_sqlite_identifier y escapa las comillas dobles para su uso
     dentro de identificadores delimitados (ej. "tabla").
     """
+    escaped = _cached_escape_identifier(identifier) if type(identifier) is str else None
+    if escaped is not None:
+        return escaped
+
     sanitized = identifier.strip()
     if not sanitized:
         raise ValueError("El identificador no puede estar vacío.")
@@ -104,6 +178,57 @@ def escape_sqlite_identifier(identifier: str) -> str:
     return sanitized.replace('"', '""')
 
 
+def get_schema_cache_stats() -> dict[str, dict[str, int]]:
+    """Devuelve aciertos, fallos y ocupación de las cachés de validación."""
+
+    stats: dict[str, dict[str, int]] = {}
+    for name, cached in (
+        ("identifiers", _cached_is_valid_identifier),
+        ("escaped_identifiers", _cached_escape_identifier),
+        ("normalized_columns", _cached_normalized_columns),
+        ("insert_columns", _cached_insert_columns),
+    ):
+        info = cached.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return stats
+
+
+def clear_schema_caches() -> None:
+    """Vacía las cachés de validación y reinicia sus contadores."""
+
+    _cached_is_valid_identifier.cache_clear()
+    _cached_escape_identifier.cache_clear()
+    _cached_normalized_columns.cache_clear()
+    _cached_insert_columns.cache_clear()
+
+
+def validate_insert_rows(rows: Sequence[dict[str, Any]]) -> tuple[list[str], list[tuple]]:
+    """Valida un lote de filas con las mismas columnas y devuelve sus parámetros.
+
+    Las columnas de la primera fila se validan una sola vez (con caché); del resto
+    solo se comprueba que tengan exactamente las mismas claves. Devuelve las
+    columnas saneadas y una tupla de valores por fila en ese orden, lista para
+    ``executemany``.
+    """
+
+    if not rows:
+        raise ValueError("Se requiere al menos una fila para insertar datos")
+    first_row = rows[0]
+    if not isinstance(first_row, dict):
+        raise TypeError("La fila 0 debe ser un objeto JSON")
+    if not first_row:
+        raise ValueError("Se requiere al menos un par columna/valor para insertar datos")
+
+    raw_keys = tuple(first_row)
+    columns, source_keys = _cached_insert_columns(raw_keys)
+    return list(columns), _build_row_params_impl(rows, raw_keys, source_keys)
+
+
 class CreateTableSchema(BaseModel):
     """Esquema recibido al crear una tabla.
 
@@ -121,7 +246,7 @@ class CreateTableSchema(BaseModel):
     ``DEFAULT``.
     """
 
-    columns: Dict[str, str]
+    columns: dict[str, str]
 
     _column_name_pattern: ClassVar[re.Pattern[str]] = SQLITE_IDENTIFIER_PATTERN
     _allowed_base_types: ClassVar[set[str]] = ALLOWED_BASE_TYPES
@@ -132,9 +257,14 @@ class CreateTableSchema(BaseModel):
     _default_expr_disallowed_tokens: ClassVar[tuple[str, ...]] = DEFAULT_EXPR_DISALLOWED_TOKENS
     _default_expr_disallowed_keywords: ClassVar[tuple[str, ...]] = DEFAULT_EXPR_DISALLOWED_KEYWORDS
 
-    def normalized_columns(self) -> Dict[str, str]:
+    def normalized_columns(self) -> dict[str, str]:
         """Valida y normaliza los nombres y tipos de columna permitidos."""
-        return _normalize_columns_impl(self.columns)
+        try:
+            items = tuple(self.columns.items())
+            hash(items)
+        except TypeError:
+            return _normalize_columns_impl(self.columns)
+        return dict(_cached_normalized_columns(items))
 
     @classmethod
     def _is_safe_default_expr(cls, expr: str) -> bool:
@@ -170,11 +300,11 @@ class CreateTableSchema(BaseModel):
 class InsertDataSchema(BaseModel):
     """Esquema utilizado para insertar datos en una tabla existente."""
 
-    values: Dict[str, Any]
+    values: dict[str, Any]
 
     @model_validator(mode="before")
     @classmethod
-    def ensure_values_key(cls, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def ensure_values_key(cls, payload: dict[str, Any]) -> dict[str, Any]:
         """Permite aceptar payloads planos y normalizarlos bajo la clave 'values'."""
 
         if isinstance(payload, dict) and "values" not in payload:
@@ -183,22 +313,31 @@ class InsertDataSchema(BaseModel):
 
     @field_validator("values")
     @classmethod
-    def validate_values(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+    def validate_values(cls, values: dict[str, Any]) -> dict[str, Any]:
         if not values:
             raise ValueError("Se requiere al menos un par columna/valor para insertar datos")
 
-        sanitized_values: Dict[str, Any] = {}
-        for column, value in values.items():
-            if not isinstance(column, str):
-                raise TypeError("Los nombres de columna deben ser cadenas de texto")
+        columns, source_keys = _cached_insert_columns(tuple(values))
+        return {column: values[source] for column, source in zip(columns, source_keys)}
+
+
+class InsertRowsSchema(BaseModel):
+    """Esquema para insertar varias filas con las mismas columnas en una sola petición."""
+
+    rows: list[dict[str, Any]]
 
-            normalized_column = column.strip()
-            if not normalized_column:
-                raise ValueError("Los nombres de columna no pueden estar vacíos")
+    _columns: list[str] = PrivateAttr(default_factory=list)
+    _params: list[tuple] = PrivateAttr(default_factory=list)
 
-            if not is_valid_sqlite_identifier(normalized_column):
-                raise ValueError(f"Nombre de columna inválido: {column}")
+    @model_validator(mode="after")
+    def validate_rows(self) -> "InsertRowsSchema":
+        self._columns, self._params = validate_insert_rows(self.rows)
+        return self
 
-            sanitized_values[normalized_column] = value
+    @property
+    def columns(self) -> list[str]:
+        return self._columns
 
-        return sanitized_values
+    @property
+    def params(self) -> list[tuple]:
+        return self._params
@@ -0,0 +1,210 @@
+"""Instantánea inmutable de la configuración leída del entorno.
+
+Las rutas calientes (conexiones, verificación de JWT, resolución de la IP
+cliente y servicio de usuarios) consultan ``get_settings()`` en lugar de
+``os.getenv``: el entorno se lee y se interpreta una sola vez y cada petición
+trabaja con una única instantánea coherente. ``reload_settings()`` publica una
+instantánea nueva con una sola asignación, ya sea a demanda o al recibir
+``SIGHUP`` (ver ``install_sighup_reload``).
+
+El entorno de un proceso en marcha no puede cambiarse desde fuera, así que la
+recarga solo aplica cambios que vengan del archivo indicado en
+``SQLITEPLUS_SETTINGS_FILE``: líneas ``CLAVE=valor`` que se vuelven a leer en
+cada recarga y prevalecen sobre las variables del entorno.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_USERS_POLL_INTERVAL = 1.0
+_SETTINGS_FILE_ENV = "SQLITEPLUS_SETTINGS_FILE"
+
+
+def _is_truthy(value: str | None) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _parse_poll_interval(raw_value: str | None) -> float:
+    if raw_value is None or not raw_value.strip():
+        return _DEFAULT_USERS_POLL_INTERVAL
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        return _DEFAULT_USERS_POLL_INTERVAL
+
+
+def _read_settings_file(path: str) -> dict[str, str]:
+    """Interpreta un archivo ``CLAVE=valor`` al estilo ``.env``.
+
+    Ignora líneas vacías y comentarios (``#``), admite el prefijo ``export`` y
+    quita las comillas simples o dobles que rodeen el valor. Lanza ``OSError``
+    si no puede leerse y ``ValueError`` si una línea no tiene ``=``.
+    """
+
+    values: dict[str, str] = {}
+    with open(os.path.expanduser(path), encoding="utf-8") as handle:
+        for lineno, raw_line in enumerate(handle, start=1):
+            line = raw_line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("export "):
+                line = line.removeprefix("export ").lstrip()
+            key, sep, value = line.partition("=")
+            key = key.strip()
+            if not sep or not key:
+                raise ValueError(f"{path}:{lineno}: se esperaba 'CLAVE=valor'")
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in {"'", '"'}:
+                value = value[1:-1]
+            values[key] = value
+    return values
+
+
+def _load_environment(environ: Mapping[str, str] | None = None) -> Mapping[str, str]:
+    env = os.environ if environ is None else environ
+    settings_file = (env.get(_SETTINGS_FILE_ENV) or "").strip()
+    if not settings_file:
+        return env
+    return {**env, **_read_settings_file(settings_file)}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Valores de configuración ya interpretados.
+
+    Los campos de texto conservan el valor original de la variable (``None`` si
+    no está definida) para que cada módulo mantenga sus propias validaciones y
+    mensajes de error.
+    """
+
+    secret_key: str | None = None
+    jwt_issuer: str | None = None
+    jwt_audience: str | None = None
+    jwt_strict_claims: bool = False
+    db_key: str | None = None
+    force_reset: bool = False
+    environment: str = ""
+    trusted_proxies: str | None = None
+    users_db: str | None = None
+    users_db_key: str | None = None
+    users_file: str | None = None
+    users_poll_interval: float = _DEFAULT_USERS_POLL_INTERVAL
+    allow_weak_users_file_perms: bool = False
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] | None = None) -> Settings:
+        env = os.environ if environ is None else environ
+        force_reset = (env.get("SQLITEPLUS_FORCE_RESET") or "").strip().lower()
+        return cls(
+            secret_key=env.get("SECRET_KEY"),
+            jwt_issuer=env.get("JWT_ISSUER"),
+            jwt_audience=env.get("JWT_AUDIENCE"),
+            jwt_strict_claims=_is_truthy(env.get("JWT_STRICT_CLAIMS")),
+            db_key=env.get("SQLITE_DB_KEY"),
+            force_reset=bool(force_reset) and force_reset not in {"0", "false", "no", "off"},
+            environment=env.get("SQLITEPLUS_ENV", "").strip().lower(),
+            trusted_proxies=env.get("TRUSTED_PROXIES"),
+            users_db=env.get("SQLITEPLUS_USERS_DB") or None,
+            users_db_key=env.get("SQLITEPLUS_USERS_DB_KEY"),
+            users_file=env.get("SQLITEPLUS_USERS_FILE"),
+            users_poll_interval=_parse_poll_interval(env.get("SQLITEPLUS_USERS_POLL_INTERVAL")),
+            allow_weak_users_file_perms=env.get("SQLITEPLUS_ALLOW_WEAK_USERS_FILE_PERMS") == "1",
+        )
+
+    @property
+    def users_source(self) -> tuple[str | None, str | None]:
+        return (self.users_db, self.users_file)
+
+
+_current_settings: Settings | None = None
+_follow_environment = False
+_sighup_installed = False
+
+
+def get_settings() -> Settings:
+    """Devuelve la instantánea vigente, cargándola la primera vez."""
+
+    if _follow_environment:
+        return Settings.from_env(_load_environment())
+    settings = _current_settings
+    if settings is None:
+        settings = reload_settings()
+    return settings
+
+
+def reload_settings(environ: Mapping[str, str] | None = None) -> Settings:
+    """Relee el entorno y ``SQLITEPLUS_SETTINGS_FILE`` y publica la nueva instantánea.
+
+    La publicación es una sola asignación, así que no necesita cerrojo y puede
+    invocarse desde un manejador de señales. Si el archivo no puede leerse o
+    interpretarse se propaga el error y la instantánea vigente no cambia.
+    """
+
+    global _current_settings
+    settings = Settings.from_env(_load_environment(environ))
+    _current_settings = settings
+    return settings
+
+
+def follow_environment(enabled: bool = True) -> None:
+    """Hace que ``get_settings()`` relea el entorno en cada llamada.
+
+    Pensado para pruebas que modifican variables sobre la marcha; en producción
+    se usa la instantánea y ``reload_settings()``.
+    """
+
+    global _follow_environment
+    _follow_environment = enabled
+    if not enabled:
+        reload_settings()
+
+
+def install_sighup_reload() -> bool:
+    """Recarga la configuración al recibir ``SIGHUP``.
+
+    Solo tiene efecto si ``SQLITEPLUS_SETTINGS_FILE`` apunta a un archivo: es la
+    única fuente que puede cambiar sin reiniciar el proceso. Si el archivo no es
+    válido se registra el error y se mantiene la instantánea anterior.
+
+    Devuelve ``False`` si la plataforma no tiene ``SIGHUP`` o si no se llama
+    desde el hilo principal. El manejador previo, si lo hay, se sigue invocando.
+    """
+
+    global _sighup_installed
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+        return False
+    if _sighup_installed:
+        return True
+
+    previous = signal.getsignal(signal.SIGHUP)
+
+    def _handle_sighup(signum, frame) -> None:
+        try:
+            reload_settings()
+        except (OSError, ValueError) as exc:
+            logger.error("No se pudo recargar la configuración tras SIGHUP: %s", exc)
+        else:
+            logger.info("Configuración recargada tras SIGHUP")
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGHUP, _handle_sighup)
+    _sighup_installed = True
+    return True
+
+
+__all__ = [
+    "Settings",
+    "follow_environment",
+    "get_settings",
+    "install_sighup_reload",
+    "reload_settings",
+]
@@ -17,14 +17,19 @@ if __name__ == "__main__" and __package__ in {None, ""}:
 
 from sqliteplus import __version__
 from sqliteplus.api.endpoints import router
+from sqliteplus.api.rate_limit_middleware import install_data_rate_limiter
+from sqliteplus.auth.password_pool import password_pool
 from sqliteplus.core.db import db_manager
+from sqliteplus.core.settings import install_sighup_reload
 from sqliteplus.utils.profiling import install_api_profiler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    install_sighup_reload()
     yield
     await db_manager.close_connections()
+    password_pool.shutdown()
 
 
 app = FastAPI(
@@ -36,4 +41,5 @@ app = FastAPI(
 
 # Registrar endpoints
 app.include_router(router)
+install_data_rate_limiter(app)
 install_api_profiler(app)
@@ -0,0 +1,6 @@
+# cython: language_level=3
+# cython: wraparound=False
+# cython: initializedcheck=False
+# cython: cdivision=True
+
+cpdef list normalize_rows(object rows, tuple plan, object fallback, bint allow_bytes=*)
@@ -0,0 +1,46 @@
+# cython: language_level=3
+# cython: wraparound=False
+# cython: initializedcheck=False
+# cython: cdivision=True
+"""Aplicación en Cython del plan de conversión de filas a JSON."""
+
+
+cdef inline bint _is_json_native(object value, bint allow_bytes):
+    cdef type value_type = type(value)
+    return (
+        value is None
+        or value_type is str
+        or value_type is int
+        or value_type is float
+        or value_type is bool
+        or (allow_bytes and value_type is bytes)
+    )
+
+
+cpdef list normalize_rows(object rows, tuple plan, object fallback, bint allow_bytes=False):
+    """Copia cada fila a una lista y convierte solo las columnas de ``plan``.
+
+    ``plan`` contiene pares ``(posición, conversor)``. Si tras convertir queda
+    algún valor no nativo de JSON (o ``bytes`` con ``allow_bytes``), la fila
+    entera pasa por ``fallback``.
+    """
+
+    cdef list normalized = []
+    cdef list values
+    cdef tuple step
+    cdef Py_ssize_t position
+    cdef object row
+    cdef object value
+
+    for row in rows:
+        values = list(row)
+        for step in plan:
+            position = step[0]
+            values[position] = step[1](values[position])
+        for value in values:
+            if not _is_json_native(value, allow_bytes):
+                values = [fallback(item) for item in values]
+                break
+        normalized.append(values)
+
+    return normalized
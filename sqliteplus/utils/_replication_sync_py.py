@@ -3,10 +3,11 @@ from __future__ import annotations
 import csv
 import logging
 import os
-import shutil
 import sqlite3
 import sys
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from pathlib import Path
+from typing import Any
 
 from sqliteplus.core.schemas import is_valid_sqlite_identifier, escape_sqlite_identifier
 from sqliteplus.utils.constants import (
@@ -14,6 +15,19 @@ from sqliteplus.utils.constants import (
     PACKAGE_DB_PATH,
     resolve_default_db_path,
 )
+from sqliteplus.utils.bulk_export import (
+    TableExportResult,
+    export_database,
+    export_query,
+    export_table,
+)
+from sqliteplus.utils import bulk_import, change_log, incremental_export, replication_fanout
+from sqliteplus.utils.bulk_import import ImportResult
+from sqliteplus.utils.change_log import ChangeBatch
+from sqliteplus.utils.file_copy import copy_file_fast
+from sqliteplus.utils.export_session import ExportSession
+from sqliteplus.utils.incremental_export import IncrementalExportResult
+from sqliteplus.utils.replication_fanout import ReplicaResult
 from sqliteplus.utils.sqliteplus_sync import apply_cipher_key, SQLitePlusCipherError
 
 logger = logging.getLogger(__name__)
@@ -108,6 +122,288 @@ class SQLiteReplication:
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Error al exportar datos: {e}") from e
 
+    def export_table(
+        self,
+        table_name: str,
+        output_file: str | os.PathLike[str],
+        format: str = "csv",
+        overwrite: bool = False,
+    ) -> str:
+        """Exporta una tabla a CSV, JSON, Parquet o Arrow IPC y devuelve la ruta final."""
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        output_path = Path(output_file).expanduser().resolve()
+        try:
+            rows = export_table(
+                self.db_path,
+                table_name,
+                output_path,
+                export_format=format,
+                cipher_key=source_key,
+                overwrite=overwrite,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+        logger.info("Exportadas %d filas en formato %s a %s", rows, format, output_path)
+        return str(output_path)
+
+    def export_query(
+        self,
+        query: str,
+        output_file: str | os.PathLike[str],
+        format: str = "csv",
+        params: Sequence[object] = (),
+        limit: int | None = None,
+        overwrite: bool = False,
+    ) -> str:
+        """Exporta el resultado de una consulta de solo lectura y devuelve la ruta final."""
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        output_path = Path(output_file).expanduser().resolve()
+        try:
+            rows = export_query(
+                self.db_path,
+                query,
+                output_path,
+                export_format=format,
+                params=params,
+                limit=limit,
+                cipher_key=source_key,
+                overwrite=overwrite,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+        logger.info("Exportadas %d filas en formato %s a %s", rows, format, output_path)
+        return str(output_path)
+
+    def export_incremental(
+        self,
+        table_name: str,
+        output_file: str | os.PathLike[str],
+        key: str = "rowid",
+        target: str | None = None,
+        format: str = "csv",
+        overwrite: bool = False,
+        since: Any = None,
+        persist: bool = True,
+    ) -> IncrementalExportResult:
+        """Exporta solo las filas nuevas desde la última marca de agua de ``target``.
+
+        Con ``persist=False`` se parte de ``since`` y no se guarda ninguna marca.
+        """
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return incremental_export.export_incremental(
+                self.db_path,
+                table_name,
+                output_file,
+                key=key,
+                target=target,
+                since=since,
+                persist=persist,
+                export_format=format,
+                cipher_key=source_key,
+                overwrite=overwrite,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+    def reset_watermark(self, table_name: str, target: str | None = None) -> bool:
+        """Olvida la marca de agua para que la próxima exportación sea completa."""
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return incremental_export.reset_watermark(
+                self.db_path, table_name, target, cipher_key=source_key
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+
+    def export_session(self, immutable: bool = False) -> ExportSession:
+        """Abre una sesión que exporta varias tablas o consultas desde una misma instantánea.
+
+        Úsala como gestor de contexto; ``immutable`` solo es seguro con archivos
+        que no cambian mientras la sesión está abierta.
+        """
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        session = ExportSession(self.db_path, cipher_key=source_key, immutable=immutable)
+        try:
+            return session.open()
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+    def export_database(
+        self,
+        output_dir: str | os.PathLike[str],
+        tables: Iterable[str] | None = None,
+        workers: int | None = None,
+        format: str = "csv",
+        overwrite: bool = False,
+        consistent: bool = True,
+        progress: Callable[[TableExportResult], None] | None = None,
+    ) -> list[TableExportResult]:
+        """Exporta varias tablas (o todas) en paralelo desde una misma instantánea."""
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return export_database(
+                self.db_path,
+                output_dir,
+                tables=tables,
+                workers=workers,
+                export_format=format,
+                cipher_key=source_key,
+                overwrite=overwrite,
+                consistent=consistent,
+                progress=progress,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+    def import_csv(
+        self,
+        table_name: str,
+        source_file: str | os.PathLike[str],
+        column_types: Mapping[str, str] | None = None,
+        create: bool = True,
+        delimiter: str = ",",
+        batch_size: int = bulk_import.INSERT_BATCH_SIZE,
+        commit_every: int | None = None,
+        defer_indexes: bool = True,
+        progress: Callable[[int], None] | None = None,
+    ) -> ImportResult:
+        """Carga un CSV con encabezados en ``table_name`` mediante inserciones por lotes."""
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return bulk_import.import_csv(
+                self.db_path,
+                table_name,
+                source_file,
+                column_types=column_types,
+                create=create,
+                delimiter=delimiter,
+                batch_size=batch_size,
+                commit_every=commit_every,
+                defer_indexes=defer_indexes,
+                cipher_key=source_key,
+                progress=progress,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al importar datos: {e}") from e
+
+    def import_ndjson(
+        self,
+        table_name: str,
+        source_file: str | os.PathLike[str],
+        column_types: Mapping[str, str] | None = None,
+        create: bool = True,
+        batch_size: int = bulk_import.INSERT_BATCH_SIZE,
+        commit_every: int | None = None,
+        defer_indexes: bool = True,
+        progress: Callable[[int], None] | None = None,
+    ) -> ImportResult:
+        """Carga un archivo NDJSON (un objeto por línea) en ``table_name``."""
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return bulk_import.import_ndjson(
+                self.db_path,
+                table_name,
+                source_file,
+                column_types=column_types,
+                create=create,
+                batch_size=batch_size,
+                commit_every=commit_every,
+                defer_indexes=defer_indexes,
+                cipher_key=source_key,
+                progress=progress,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al importar datos: {e}") from e
+
+    def enable_change_capture(
+        self, tables: Iterable[str], retention_rows: int = change_log.DEFAULT_RETENTION_ROWS
+    ) -> list[str]:
+        """Instala los triggers de captura de cambios en ``tables``."""
+
+        return self._with_change_log(
+            change_log.enable_change_capture, tables, retention_rows=retention_rows
+        )
+
+    def disable_change_capture(self, tables: Iterable[str], purge: bool = False) -> None:
+        """Retira los triggers de captura; con ``purge`` borra también sus cambios."""
+
+        return self._with_change_log(change_log.disable_change_capture, tables, purge=purge)
+
+    def read_changes(
+        self, since: int = 0, limit: int = 1000, tables: Iterable[str] | None = None
+    ) -> ChangeBatch:
+        """Lee un lote de cambios con secuencia mayor que ``since``."""
+
+        return self._with_change_log(change_log.read_changes, since, limit=limit, tables=tables)
+
+    def compact_changes(
+        self,
+        up_to_seq: int | None = None,
+        older_than: float | None = None,
+        keep_last: int | None = None,
+    ) -> int:
+        """Compacta el registro de cambios y devuelve cuántos se eliminaron."""
+
+        return self._with_change_log(
+            change_log.compact_changes,
+            up_to_seq=up_to_seq,
+            older_than=older_than,
+            keep_last=keep_last,
+        )
+
+    def _with_change_log(self, func, *args, **kwargs):
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return func(self.db_path, *args, cipher_key=source_key, **kwargs)
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error en el registro de cambios: {e}") from e
+
     def backup_database(self):
         """Crea una copia de seguridad de la base de datos."""
         backup_file = self.backup_dir / f"backup_{self._get_timestamp()}.db"
@@ -180,6 +476,26 @@ class SQLiteReplication:
         except Exception as e:
             raise RuntimeError(f"Error en la replicación: {e}") from e
 
+    def replicate_to_many(
+        self,
+        targets: Iterable[str | os.PathLike[str]],
+        workers: int | None = None,
+    ) -> list[ReplicaResult]:
+        """Replica la base en varios destinos leyendo el origen una sola vez.
+
+        Devuelve un resultado por destino; los fallos individuales no detienen
+        al resto y quedan en ``error``.
+        """
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return replication_fanout.replicate_to_many(
+                self.db_path, targets, workers=workers, cipher_key=source_key
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except Exception as e:
+            raise RuntimeError(f"Error en la replicación: {e}") from e
+
     def _get_timestamp(self):
         """Genera un timestamp para los nombres de archivo."""
         import datetime
@@ -196,23 +512,13 @@ class SQLiteReplication:
         base_target = Path(target_path)
         copied_files: list[str] = []
 
-        buf = bytearray(1024 * 1024)
-        mv = memoryview(buf)
-
         for suffix in ("-wal", "-shm"):
             src_file = base_source.with_name(base_source.name + suffix)
             if src_file.exists():
                 dest_file = base_target.with_name(base_target.name + suffix)
                 if dest_file.exists():
                     dest_file.unlink()
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                with src_file.open("rb") as src, dest_file.open("wb") as dest:
-                    while True:
-                        read_bytes = src.readinto(buf)
-                        if read_bytes == 0:
-                            break
-                        dest.write(mv[:read_bytes])
-                shutil.copystat(src_file, dest_file, follow_symlinks=True)
+                copy_file_fast(src_file, dest_file)
                 copied_files.append(str(dest_file))
 
         return copied_files
@@ -250,8 +556,7 @@ class SQLiteReplication:
                 f"No se pudo copiar la base de datos {source}: el archivo no existe"
             )
 
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, destination)
+        copy_file_fast(source, destination)
         self._copy_wal_and_shm(source, destination)
 
     @staticmethod
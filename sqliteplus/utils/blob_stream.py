@@ -0,0 +1,200 @@
+"""Lectura incremental de valores BLOB para servirlos por tramos.
+
+``open_blob`` abre una conexión propia de solo lectura, comprueba que la fila
+existe y que el valor es un BLOB (o texto) y devuelve un ``BlobReader`` con su
+tamaño. Los datos se leen por tramos de ``BLOB_CHUNK_SIZE`` bytes:
+
+* con ``Connection.blobopen`` (Python 3.11+), E/S incremental de SQLite que
+  solo toca las páginas del tramo pedido;
+* en intérpretes anteriores, con ``substr(CAST(col AS BLOB), ?, ?)``, que
+  mantiene acotada la memoria de Python aunque SQLite relea el valor entero en
+  cada llamada; por eso esta ruta usa tramos de ``FALLBACK_CHUNK_SIZE``.
+
+Toda la lectura ocurre dentro de una transacción de lectura, de modo que los
+tramos salen de la misma versión de la fila aunque otro proceso la modifique.
+``parse_byte_range`` interpreta la cabecera HTTP ``Range``.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+
+from sqliteplus.core.schemas import escape_sqlite_identifier
+from sqliteplus.utils.sqliteplus_sync import SQLitePlusCipherError, apply_cipher_key
+
+BLOB_CHUNK_SIZE = 64 * 1024
+FALLBACK_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobNotFoundError(LookupError):
+    """La fila no existe o el valor de la columna es ``NULL``."""
+
+
+class UnsatisfiableRangeError(ValueError):
+    """El rango pedido queda fuera del valor."""
+
+
+class BlobReader:
+    """Lector por tramos de un único valor BLOB sobre una conexión propia."""
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        table_name: str,
+        column: str,
+        rowid: int,
+        *,
+        use_blobopen: bool | None = None,
+    ) -> None:
+        self._connection = connection
+        self._lock = threading.Lock()
+        self._closed = False
+        self._blob = None
+        escaped_table = escape_sqlite_identifier(table_name)
+        escaped_column = escape_sqlite_identifier(column)
+        self._chunk_query = (
+            f'SELECT substr(CAST("{escaped_column}" AS BLOB), ?, ?) FROM "{escaped_table}" WHERE rowid = ?'
+        )
+        self._rowid = rowid
+
+        connection.execute("BEGIN")
+        # Se comprueba la columna antes de consultarla: SQLite trataría un nombre
+        # entre comillas dobles que no existe como un literal de texto.
+        columns = {
+            str(info[1]).lower() for info in connection.execute(f'PRAGMA table_info("{escaped_table}")')
+        }
+        if not columns:
+            raise sqlite3.OperationalError(f"no such table: {table_name}")
+        if column.lower() not in columns:
+            raise sqlite3.OperationalError(f"no such column: {column}")
+
+        row = connection.execute(
+            f'SELECT typeof("{escaped_column}"), length(CAST("{escaped_column}" AS BLOB)) '
+            f'FROM "{escaped_table}" WHERE rowid = ?',
+            (rowid,),
+        ).fetchone()
+        if row is None:
+            raise BlobNotFoundError(f"Fila {rowid} no encontrada")
+        value_type, size = row
+        if value_type == "null":
+            raise BlobNotFoundError(f"La columna '{column}' no tiene valor en la fila {rowid}")
+        if value_type not in {"blob", "text"}:
+            raise ValueError(f"La columna '{column}' no contiene un BLOB en la fila {rowid}")
+        self.size: int = size
+
+        if use_blobopen is None:
+            use_blobopen = hasattr(connection, "blobopen")
+        if use_blobopen:
+            self._blob = connection.blobopen(table_name, column, rowid, readonly=True)
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Lee hasta ``length`` bytes a partir de ``offset``."""
+
+        with self._lock:
+            if self._closed:
+                raise ValueError("El lector de BLOB está cerrado")
+            if self._blob is not None:
+                self._blob.seek(offset)
+                return self._blob.read(length)
+            row = self._connection.execute(self._chunk_query, (offset + 1, length, self._rowid)).fetchone()
+            return row[0] if row is not None and row[0] is not None else b""
+
+    def iter_range(self, start: int, stop: int, chunk_size: int = BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        """Recorre ``[start, stop)`` por tramos y cierra el lector al terminar."""
+
+        if self._blob is None:
+            chunk_size = max(chunk_size, FALLBACK_CHUNK_SIZE)
+        try:
+            offset = start
+            while offset < stop:
+                chunk = self.read(offset, min(chunk_size, stop - offset))
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                if self._blob is not None:
+                    self._blob.close()
+            finally:
+                self._connection.close()
+
+
+def open_blob(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    column: str,
+    rowid: int,
+    *,
+    cipher_key: str | None = None,
+    use_blobopen: bool | None = None,
+) -> BlobReader:
+    """Abre el valor ``table_name.column`` de la fila ``rowid`` para leerlo por tramos.
+
+    Lanza ``BlobNotFoundError`` si la fila no existe o el valor es ``NULL``,
+    ``ValueError`` si no es un BLOB ni texto y ``sqlite3.OperationalError`` si
+    la tabla o la columna no existen.
+    """
+
+    connection = sqlite3.connect(os.fspath(db_path), check_same_thread=False)
+    try:
+        apply_cipher_key(connection, cipher_key)
+        connection.execute("PRAGMA query_only = ON")
+        return BlobReader(connection, table_name, column, rowid, use_blobopen=use_blobopen)
+    except (SQLitePlusCipherError, sqlite3.Error, LookupError, ValueError):
+        connection.close()
+        raise
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Interpreta ``Range: bytes=...`` y devuelve ``(inicio, fin)`` inclusivos.
+
+    Devuelve ``None`` si no hay cabecera, si no es de bytes, si es inválida o si
+    pide varios rangos: en esos casos se sirve el valor completo, como permite
+    RFC 9110. Lanza ``UnsatisfiableRangeError`` si el rango queda fuera.
+    """
+
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first.isdigit() or last.isdigit()):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise UnsatisfiableRangeError(header)
+        return max(0, size - suffix), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise UnsatisfiableRangeError(header)
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+__all__ = [
+    "BLOB_CHUNK_SIZE",
+    "FALLBACK_CHUNK_SIZE",
+    "BlobNotFoundError",
+    "BlobReader",
+    "UnsatisfiableRangeError",
+    "open_blob",
+    "parse_byte_range",
+]
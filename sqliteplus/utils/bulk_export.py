@@ -0,0 +1,500 @@
+"""Exportación masiva de tablas SQLite en paralelo.
+
+``export_database`` vuelca varias tablas (o la base completa) a un directorio
+usando un *pool* de hilos. Cada tabla se lee desde su propia conexión de solo
+lectura; ``sqlite3`` libera el GIL mientras avanza el cursor, de modo que las
+lecturas de distintas tablas se solapan.
+
+Los formatos disponibles se registran en ``EXPORT_FORMATS``: CSV y JSON siempre,
+y Parquet/Arrow IPC cuando ``pyarrow`` está instalado (ver
+:mod:`sqliteplus.utils.columnar_export`).
+
+Para que todas las tablas reflejen el mismo estado de la base, por defecto cada
+hilo trabaja con una conexión que mantiene abierta una transacción de lectura y
+todas ellas se fijan en la misma instantánea (ver ``_open_pinned_readers``); no
+se copia la base. Con ``consistent=False`` cada tabla abre su propia conexión,
+a costa de poder observar escrituras concurrentes entre tablas.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import AbstractContextManager, closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote
+
+from sqliteplus.core.schemas import escape_sqlite_identifier
+from sqliteplus.utils.columnar_export import (
+    COLUMNAR_FORMATS,
+    declared_column_types,
+    pyarrow_available,
+    write_arrow,
+    write_parquet,
+)
+from sqliteplus.utils.constants import INTERNAL_TABLE_PREFIX
+from sqliteplus.utils.crypto_sqlite import SQLitePlusCipherError, apply_cipher_key
+from sqliteplus.utils.json_serialization import build_row_normalizer
+
+logger = logging.getLogger(__name__)
+
+FETCH_BATCH_SIZE = 1024
+_UNSAFE_FILENAME_CHARS = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+
+
+@dataclass(frozen=True)
+class TableExportResult:
+    """Resultado de exportar una tabla dentro de ``export_database``."""
+
+    table: str
+    path: str | None
+    rows: int
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def write_csv(
+    cursor: sqlite3.Cursor,
+    output_path: Path,
+    *,
+    batch_size: int = FETCH_BATCH_SIZE,
+    declared_types: Sequence[str | None] | None = None,
+) -> int:
+    """Escribe el resultado del cursor como CSV con encabezados y devuelve las filas."""
+
+    column_names = [desc[0] for desc in cursor.description or []]
+    total = 0
+    with output_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(column_names)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            writer.writerows(rows)
+            total += len(rows)
+    return total
+
+
+def write_json(
+    cursor: sqlite3.Cursor,
+    output_path: Path,
+    *,
+    batch_size: int = FETCH_BATCH_SIZE,
+    declared_types: Sequence[str | None] | None = None,
+) -> int:
+    """Escribe el resultado como un arreglo JSON de objetos sin materializarlo en memoria."""
+
+    column_names = [desc[0] for desc in cursor.description or []]
+    total = 0
+    with output_path.open("w", encoding="utf-8") as handle:
+        handle.write("[")
+        separator = "\n"
+        normalize_rows = None
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            if normalize_rows is None:
+                # El plan de conversión se decide con el primer lote y sirve para el resto.
+                normalize_rows = build_row_normalizer(cursor.description, declared_types, rows)
+            for values in normalize_rows(rows):
+                record = dict(zip(column_names, values))
+                handle.write(separator)
+                handle.write(json.dumps(record, ensure_ascii=False))
+                separator = ",\n"
+            total += len(rows)
+        handle.write("\n]\n" if total else "]\n")
+    return total
+
+
+RowWriter = Callable[..., int]
+
+# Formato -> (extensión del archivo, función que vuelca un cursor a disco).
+EXPORT_FORMATS: dict[str, tuple[str, RowWriter]] = {
+    "csv": (".csv", write_csv),
+    "json": (".json", write_json),
+    "parquet": (".parquet", write_parquet),
+    "arrow": (".arrow", write_arrow),
+}
+
+
+def resolve_export_format(export_format: str) -> tuple[str, RowWriter]:
+    """Devuelve la extensión y el escritor asociados a ``export_format``."""
+
+    normalized = (export_format or "").strip().lower()
+    if normalized not in EXPORT_FORMATS:
+        available = ", ".join(sorted(EXPORT_FORMATS))
+        raise ValueError(
+            f"Formato de exportación no soportado: {export_format}. Usa uno de: {available}"
+        )
+    if normalized in COLUMNAR_FORMATS and not pyarrow_available():
+        raise RuntimeError(
+            f"El formato {normalized} requiere el paquete opcional 'pyarrow'. "
+            "Instálalo con: pip install \"sqliteplus-enhanced[arrow]\""
+        )
+    return EXPORT_FORMATS[normalized]
+
+
+def list_user_tables(connection: sqlite3.Connection) -> list[str]:
+    """Lista las tablas de usuario (sin vistas ni tablas internas de SQLite o SQLitePlus)."""
+
+    cursor = connection.execute(
+        """
+        SELECT name
+        FROM sqlite_master
+        WHERE type = 'table'
+          AND name NOT LIKE 'sqlite_%'
+          AND substr(name, 1, ?) <> ?
+        ORDER BY lower(name)
+        """,
+        (len(INTERNAL_TABLE_PREFIX), INTERNAL_TABLE_PREFIX),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def table_filename(table_name: str, extension: str) -> str:
+    """Genera un nombre de archivo seguro para la tabla indicada."""
+
+    sanitized = _UNSAFE_FILENAME_CHARS.sub("_", table_name.strip()) or "tabla"
+    return f"{sanitized}{extension}"
+
+
+def connect_read_only(db_path: str | os.PathLike[str], cipher_key: str | None) -> sqlite3.Connection:
+    """Abre ``db_path`` en modo ``mode=ro`` y aplica la clave SQLCipher si existe."""
+
+    uri = f"file:{quote(str(Path(db_path).resolve()))}?mode=ro"
+    connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    try:
+        apply_cipher_key(connection, cipher_key)
+    except SQLitePlusCipherError:
+        connection.close()
+        raise
+    return connection
+
+
+def _open_pinned_readers(
+    db_path: str, count: int, cipher_key: str | None
+) -> list[sqlite3.Connection]:
+    """Abre ``count`` conexiones de lectura fijadas en la misma instantánea.
+
+    Mientras se abren, una conexión auxiliar retiene el bloqueo de escritura
+    (``BEGIN IMMEDIATE``) para que ningún ``COMMIT`` se cuele entre la primera
+    y la última; después lo suelta y los escritores continúan. Si el archivo
+    es de solo lectura no hace falta el bloqueo: nadie puede escribir en él.
+    """
+
+    readers: list[sqlite3.Connection] = []
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as gate:
+        apply_cipher_key(gate, cipher_key)
+        try:
+            gate.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as exc:
+            if "readonly" not in str(exc).lower():
+                raise
+        try:
+            for _ in range(count):
+                conn = connect_read_only(db_path, cipher_key)
+                readers.append(conn)
+                conn.isolation_level = None
+                conn.execute("BEGIN")
+                # ``BEGIN`` es diferido: la instantánea se fija con la primera lectura.
+                conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        except BaseException:
+            for conn in readers:
+                conn.close()
+            raise
+        finally:
+            if gate.in_transaction:
+                gate.execute("ROLLBACK")
+    return readers
+
+
+ConnectionSource = Callable[[], AbstractContextManager[sqlite3.Connection]]
+
+
+def _export_one(
+    acquire: ConnectionSource,
+    table_name: str,
+    output_path: Path,
+    writer: RowWriter,
+) -> TableExportResult:
+    start = time.perf_counter()
+    try:
+        escaped = escape_sqlite_identifier(table_name)
+        with acquire() as conn:
+            declared = declared_column_types(conn, escaped)
+            cursor = conn.execute(f'SELECT * FROM "{escaped}"')
+            try:
+                rows = writer(
+                    cursor,
+                    output_path,
+                    declared_types=[declared.get(desc[0]) for desc in cursor.description],
+                )
+            finally:
+                cursor.close()
+    except Exception as exc:  # noqa: BLE001 - se reporta por tabla
+        logger.warning("Fallo al exportar la tabla %s: %s", table_name, exc)
+        try:
+            output_path.unlink()
+        except OSError:
+            pass
+        return TableExportResult(
+            table=table_name,
+            path=None,
+            rows=0,
+            seconds=time.perf_counter() - start,
+            error=str(exc),
+        )
+    return TableExportResult(
+        table=table_name,
+        path=str(output_path),
+        rows=rows,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _plan_outputs(tables: Sequence[str], output_dir: Path, extension: str) -> dict[str, Path]:
+    planned: dict[str, Path] = {}
+    used_names: set[str] = set()
+    for table in tables:
+        filename = table_filename(table, extension)
+        stem = filename[: -len(extension)] if extension else filename
+        counter = 1
+        while filename.casefold() in used_names:
+            counter += 1
+            filename = f"{stem}_{counter}{extension}"
+        used_names.add(filename.casefold())
+        planned[table] = output_dir / filename
+    return planned
+
+
+class LimitedCursor:
+    """Envuelve un cursor para que ``fetchmany`` no supere ``limit`` filas."""
+
+    def __init__(self, cursor: sqlite3.Cursor, limit: int) -> None:
+        self._cursor = cursor
+        self._remaining = limit
+        self.description = cursor.description
+
+    def fetchmany(self, size: int) -> list:
+        if self._remaining <= 0:
+            return []
+        rows = self._cursor.fetchmany(min(size, self._remaining))
+        self._remaining -= len(rows)
+        return rows
+
+
+def prepare_output_path(output_path: str | os.PathLike[str], overwrite: bool) -> Path:
+    """Resuelve la ruta de salida, respeta ``overwrite`` y crea el directorio padre."""
+
+    path = Path(output_path).expanduser().resolve()
+    if path.exists() and not overwrite:
+        raise FileExistsError(
+            f"El archivo de salida ya existe: {path}. Usa --overwrite para reemplazarlo."
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def export_table(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    output_path: str | os.PathLike[str],
+    *,
+    export_format: str = "csv",
+    cipher_key: str | None = None,
+    overwrite: bool = False,
+) -> int:
+    """Exporta una tabla en el formato indicado y devuelve el número de filas."""
+
+    escaped = escape_sqlite_identifier(table_name)
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"No se encontró la base de datos origen: {db_path}")
+    _, writer = resolve_export_format(export_format)
+    path = prepare_output_path(output_path, overwrite)
+
+    with closing(connect_read_only(db_path, cipher_key)) as conn:
+        declared = declared_column_types(conn, escaped)
+        cursor = conn.execute(f'SELECT * FROM "{escaped}"')
+        return writer(
+            cursor,
+            path,
+            declared_types=[declared.get(desc[0]) for desc in cursor.description],
+        )
+
+
+def export_query(
+    db_path: str | os.PathLike[str],
+    query: str,
+    output_path: str | os.PathLike[str],
+    *,
+    export_format: str = "csv",
+    params: Sequence[object] = (),
+    limit: int | None = None,
+    cipher_key: str | None = None,
+    overwrite: bool = False,
+) -> int:
+    """Exporta el resultado de una consulta de lectura y devuelve el número de filas.
+
+    La conexión se abre en ``mode=ro``, de modo que cualquier intento de
+    escritura falla en SQLite. Las columnas no tienen tipo declarado, así que
+    los formatos columnares infieren el esquema del primer lote.
+    """
+
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"No se encontró la base de datos origen: {db_path}")
+    _, writer = resolve_export_format(export_format)
+    path = prepare_output_path(output_path, overwrite)
+
+    with closing(connect_read_only(db_path, cipher_key)) as conn:
+        cursor = conn.execute(query, tuple(params))
+        if cursor.description is None:
+            raise ValueError("La consulta no devuelve filas para exportar")
+        source = cursor if limit is None else LimitedCursor(cursor, limit)
+        return writer(source, path)
+
+
+def export_database(
+    db_path: str | os.PathLike[str],
+    output_dir: str | os.PathLike[str],
+    *,
+    tables: Iterable[str] | None = None,
+    workers: int | None = None,
+    export_format: str = "csv",
+    cipher_key: str | None = None,
+    overwrite: bool = False,
+    consistent: bool = True,
+    progress: Callable[[TableExportResult], None] | None = None,
+) -> list[TableExportResult]:
+    """Exporta varias tablas en paralelo a ``output_dir``.
+
+    Devuelve un :class:`TableExportResult` por tabla (en el orden solicitado).
+    Los fallos de una tabla no detienen al resto: quedan reflejados en
+    ``error``. ``progress`` se invoca desde el hilo llamante cada vez que una
+    tabla termina.
+
+    Con ``consistent=True`` cada worker mantiene una transacción de lectura
+    abierta sobre la misma instantánea hasta el final de la exportación. No se
+    escribe ninguna copia de la base: en modo WAL los escritores siguen
+    confirmando, pero el *checkpoint* no puede reciclar el ``-wal`` mientras
+    tanto y este crece con lo que se escriba durante la exportación; con el
+    journal clásico los escritores esperan a que termine.
+    """
+
+    source = Path(db_path)
+    if not source.exists():
+        raise FileNotFoundError(f"No se encontró la base de datos origen: {source}")
+
+    extension, writer = resolve_export_format(export_format)
+    max_workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+    if max_workers < 1:
+        raise ValueError("El número de workers debe ser mayor o igual que 1")
+
+    destination = Path(output_dir).expanduser().resolve()
+    destination.mkdir(parents=True, exist_ok=True)
+
+    readers: list[sqlite3.Connection] = []
+    try:
+        if consistent:
+            readers = _open_pinned_readers(str(source), max_workers, cipher_key)
+            available = list_user_tables(readers[0])
+        else:
+            with closing(connect_read_only(source, cipher_key)) as conn:
+                available = list_user_tables(conn)
+
+        if tables is None:
+            selected = available
+        else:
+            selected = []
+            known = set(available)
+            for table in tables:
+                escape_sqlite_identifier(table)
+                name = table.strip()
+                if name not in known:
+                    raise ValueError(f"La tabla '{name}' no existe en la base de datos")
+                if name not in selected:
+                    selected.append(name)
+
+        planned = _plan_outputs(selected, destination, extension)
+        if not overwrite:
+            existing = [str(path) for path in planned.values() if path.exists()]
+            if existing:
+                raise FileExistsError(
+                    "Los archivos de salida ya existen: "
+                    f"{', '.join(existing)}. Usa --overwrite para reemplazarlos."
+                )
+
+        if consistent:
+            idle: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+            for conn in readers:
+                idle.put(conn)
+
+            @contextmanager
+            def acquire() -> Iterator[sqlite3.Connection]:
+                # Hay tantas conexiones como workers, así que nunca se espera.
+                conn = idle.get()
+                try:
+                    yield conn
+                finally:
+                    idle.put(conn)
+
+        else:
+
+            def acquire() -> AbstractContextManager[sqlite3.Connection]:
+                return closing(connect_read_only(source, cipher_key))
+
+        results: dict[str, TableExportResult] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sqliteplus-export") as pool:
+            futures = {
+                pool.submit(_export_one, acquire, table, planned[table], writer): table
+                for table in selected
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if progress is not None:
+                    progress(result)
+    finally:
+        for conn in readers:
+            conn.close()
+
+    ordered = [results[table] for table in selected]
+    logger.info(
+        "Exportadas %d tablas (%d con errores) en %s",
+        len(ordered),
+        sum(1 for item in ordered if not item.ok),
+        destination,
+    )
+    return ordered
+
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "FETCH_BATCH_SIZE",
+    "LimitedCursor",
+    "TableExportResult",
+    "connect_read_only",
+    "export_database",
+    "export_query",
+    "export_table",
+    "list_user_tables",
+    "prepare_output_path",
+    "resolve_export_format",
+    "table_filename",
+    "write_csv",
+    "write_json",
+]
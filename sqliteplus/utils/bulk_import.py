@@ -0,0 +1,435 @@
+"""Carga masiva de archivos CSV y NDJSON en tablas SQLite.
+
+Los archivos se leen en *streaming* y las filas se insertan por lotes con
+``executemany`` dentro de transacciones grandes. Durante la carga se relaja
+``PRAGMA synchronous`` (se restaura al terminar) y los índices secundarios no
+únicos de la tabla destino se eliminan y se recrean al final, que es mucho más
+barato que mantenerlos fila a fila.
+
+Si la tabla no existe se crea con los tipos indicados en ``column_types`` o,
+en su defecto, con los inferidos a partir de las primeras filas del archivo.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from sqliteplus.core.schemas import CreateTableSchema, escape_sqlite_identifier
+from sqliteplus.utils.crypto_sqlite import apply_cipher_key
+
+logger = logging.getLogger(__name__)
+
+INSERT_BATCH_SIZE = 5000
+INFER_SAMPLE_ROWS = 1000
+IMPORT_FORMATS: tuple[str, ...] = ("csv", "ndjson")
+
+_NUMERIC_AFFINITIES = ("INTEGER", "REAL", "NUMERIC")
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    """Resumen de una carga masiva."""
+
+    table: str
+    rows: int
+    seconds: float
+    created: bool
+    column_types: dict[str, str]
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def _infer_text_type(values: Iterable[str | None]) -> str:
+    inferred = "INTEGER"
+    seen = False
+    for value in values:
+        if value is None or value == "":
+            continue
+        seen = True
+        if len(value) > 1 and value[0] == "0" and value[1].isdigit():
+            # Códigos con ceros a la izquierda (postales, teléfonos) se conservan como texto.
+            return "TEXT"
+        if inferred == "INTEGER":
+            try:
+                int(value)
+                continue
+            except ValueError:
+                inferred = "REAL"
+        try:
+            float(value)
+        except ValueError:
+            return "TEXT"
+    return inferred if seen else "TEXT"
+
+
+def _infer_json_type(values: Iterable[Any]) -> str:
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, int):
+            kinds.add("INTEGER")
+        elif isinstance(value, float):
+            kinds.add("REAL")
+        else:
+            return "TEXT"
+    if not kinds:
+        return "TEXT"
+    return "INTEGER" if kinds == {"INTEGER"} else "REAL"
+
+
+def _declared_affinity(declared_type: str) -> str:
+    normalized = (declared_type or "").upper()
+    if "INT" in normalized:
+        return "INTEGER"
+    if "CHAR" in normalized or "CLOB" in normalized or "TEXT" in normalized:
+        return "TEXT"
+    if not normalized or "BLOB" in normalized:
+        return "BLOB"
+    if "REAL" in normalized or "FLOA" in normalized or "DOUB" in normalized:
+        return "REAL"
+    return "NUMERIC"
+
+
+def _validate_column_names(names: Sequence[str]) -> list[str]:
+    cleaned = []
+    for index, name in enumerate(names, start=1):
+        name = (name or "").strip()
+        if not name:
+            raise ValueError(f"La columna {index} del archivo no tiene nombre")
+        escape_sqlite_identifier(name)
+        if name in cleaned:
+            raise ValueError(f"La columna '{name}' aparece repetida en el archivo")
+        cleaned.append(name)
+    return cleaned
+
+
+def _existing_columns(conn: sqlite3.Connection, escaped_table: str) -> dict[str, str]:
+    rows = conn.execute(f'PRAGMA table_info("{escaped_table}")').fetchall()
+    return {row[1]: row[2] or "" for row in rows}
+
+
+def _deferrable_indexes(conn: sqlite3.Connection, table_name: str) -> list[tuple[str, str]]:
+    """Índices explícitos no únicos de la tabla (nombre, SQL de creación)."""
+
+    rows = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table_name,),
+    ).fetchall()
+    unique = {
+        row[1]
+        for row in conn.execute(
+            f'PRAGMA index_list("{escape_sqlite_identifier(table_name)}")'
+        ).fetchall()
+        if row[2]
+    }
+    return [(name, sql) for name, sql in rows if name not in unique]
+
+
+def _load(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    column_names: list[str],
+    sample: list[Sequence[Any]],
+    remaining: Iterator[Sequence[Any]],
+    infer: Callable[[Iterable[Any]], str],
+    *,
+    column_types: Mapping[str, str] | None,
+    create: bool,
+    batch_size: int,
+    commit_every: int | None,
+    defer_indexes: bool,
+    cipher_key: str | None,
+    progress: Callable[[int], None] | None,
+    convert_row: Callable[[Sequence[Any], list[bool]], tuple],
+) -> ImportResult:
+    escaped_table = escape_sqlite_identifier(table_name)
+    if batch_size < 1:
+        raise ValueError("batch_size debe ser mayor o igual que 1")
+    if commit_every is not None and commit_every < 1:
+        raise ValueError("commit_every debe ser mayor o igual que 1")
+
+    requested_types = {name: value for name, value in (column_types or {}).items()}
+    unknown = set(requested_types) - set(column_names)
+    if unknown:
+        raise ValueError(
+            "Se indicaron tipos para columnas ausentes en el archivo: " + ", ".join(sorted(unknown))
+        )
+
+    start = time.perf_counter()
+    with closing(sqlite3.connect(str(db_path), isolation_level=None)) as conn:
+        apply_cipher_key(conn, cipher_key)
+        existing = _existing_columns(conn, escaped_table)
+        created = False
+        if existing:
+            missing = [name for name in column_names if name not in existing]
+            if missing:
+                raise ValueError(
+                    f"La tabla '{table_name}' no tiene las columnas: {', '.join(missing)}"
+                )
+            final_types = {name: existing[name] for name in column_names}
+        elif not create:
+            raise ValueError(f"La tabla '{table_name}' no existe en la base de datos")
+        else:
+            final_types = {}
+            for index, name in enumerate(column_names):
+                declared = requested_types.get(name)
+                if declared is None:
+                    declared = infer(row[index] for row in sample)
+                final_types[name] = declared
+            # Los tipos acaban en el CREATE TABLE: se validan igual que en el endpoint
+            # ``create_table`` (tipos base y restricciones permitidas).
+            final_types = CreateTableSchema(columns=final_types).normalized_columns()
+            definitions = ", ".join(
+                f'"{escape_sqlite_identifier(name)}" {final_types[name]}' for name in column_names
+            )
+            created = True
+
+        # Las celdas vacías de columnas numéricas se cargan como NULL.
+        nullable_empty = [
+            _declared_affinity(final_types[name]) in _NUMERIC_AFFINITIES for name in column_names
+        ]
+        placeholders = ", ".join("?" for _ in column_names)
+        quoted_columns = ", ".join(f'"{escape_sqlite_identifier(name)}"' for name in column_names)
+        insert_sql = f'INSERT INTO "{escaped_table}" ({quoted_columns}) VALUES ({placeholders})'
+
+        previous_sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+        conn.execute("PRAGMA synchronous=OFF")
+        dropped: list[tuple[str, str]] = []
+        total = 0
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if created:
+                    conn.execute(f'CREATE TABLE "{escaped_table}" ({definitions})')
+                elif defer_indexes:
+                    dropped = _deferrable_indexes(conn, table_name)
+                    for index_name, _ in dropped:
+                        conn.execute(f'DROP INDEX "{escape_sqlite_identifier(index_name)}"')
+
+                pending = 0
+                rows_iter = itertools.chain(sample, remaining)
+                while True:
+                    batch = [
+                        convert_row(row, nullable_empty)
+                        for row in itertools.islice(rows_iter, batch_size)
+                    ]
+                    if not batch:
+                        break
+                    conn.executemany(insert_sql, batch)
+                    total += len(batch)
+                    pending += len(batch)
+                    if commit_every is not None and pending >= commit_every:
+                        conn.execute("COMMIT")
+                        conn.execute("BEGIN IMMEDIATE")
+                        pending = 0
+                    if progress is not None:
+                        progress(total)
+
+                for _, index_sql in dropped:
+                    conn.execute(index_sql)
+                dropped = []
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        finally:
+            if dropped:
+                # Si se confirmaron lotes intermedios los índices ya no están; se recrean.
+                existing_indexes = {
+                    row[0]
+                    for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+                }
+                for index_name, index_sql in dropped:
+                    if index_name not in existing_indexes:
+                        conn.execute(index_sql)
+            conn.execute(f"PRAGMA synchronous={int(previous_sync)}")
+
+    seconds = time.perf_counter() - start
+    result = ImportResult(
+        table=table_name,
+        rows=total,
+        seconds=seconds,
+        created=created,
+        column_types=final_types,
+    )
+    logger.info(
+        "Importadas %d filas en '%s' en %.2fs (%.0f filas/s)",
+        total,
+        table_name,
+        seconds,
+        result.rows_per_second,
+    )
+    return result
+
+
+def _csv_row_converter(width: int) -> Callable[[Sequence[Any], list[bool]], tuple]:
+    def convert(row: Sequence[Any], nullable_empty: list[bool]) -> tuple:
+        if len(row) != width:
+            raise ValueError(f"Se esperaban {width} columnas y la fila tiene {len(row)}: {row!r}")
+        return tuple(
+            None if value == "" and nullable_empty[idx] else value for idx, value in enumerate(row)
+        )
+
+    return convert
+
+
+def _json_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _json_row_converter(row: Sequence[Any], nullable_empty: list[bool]) -> tuple:
+    return tuple(_json_cell(value) for value in row)
+
+
+def import_csv(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    source: str | os.PathLike[str],
+    *,
+    column_types: Mapping[str, str] | None = None,
+    create: bool = True,
+    delimiter: str = ",",
+    encoding: str = "utf-8-sig",
+    batch_size: int = INSERT_BATCH_SIZE,
+    commit_every: int | None = None,
+    defer_indexes: bool = True,
+    cipher_key: str | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> ImportResult:
+    """Importa un CSV con encabezados en ``table_name``.
+
+    ``commit_every`` confirma la transacción cada N filas; por defecto la carga
+    completa es atómica.
+    """
+
+    source_path = Path(source)
+    if not source_path.exists():
+        raise FileNotFoundError(f"No se encontró el archivo a importar: {source_path}")
+
+    with source_path.open("r", encoding=encoding, newline="") as handle:
+        reader = csv.reader(handle, delimiter=delimiter)
+        try:
+            header = next(reader)
+        except StopIteration:
+            raise ValueError(f"El archivo {source_path} está vacío") from None
+        column_names = _validate_column_names(header)
+        sample = list(itertools.islice(reader, INFER_SAMPLE_ROWS))
+        return _load(
+            db_path,
+            table_name,
+            column_names,
+            sample,
+            reader,
+            _infer_text_type,
+            column_types=column_types,
+            create=create,
+            batch_size=batch_size,
+            commit_every=commit_every,
+            defer_indexes=defer_indexes,
+            cipher_key=cipher_key,
+            progress=progress,
+            convert_row=_csv_row_converter(len(column_names)),
+        )
+
+
+def import_ndjson(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    source: str | os.PathLike[str],
+    *,
+    column_types: Mapping[str, str] | None = None,
+    create: bool = True,
+    encoding: str = "utf-8",
+    batch_size: int = INSERT_BATCH_SIZE,
+    commit_every: int | None = None,
+    defer_indexes: bool = True,
+    cipher_key: str | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> ImportResult:
+    """Importa un archivo NDJSON (un objeto JSON por línea) en ``table_name``.
+
+    Las columnas se toman de las claves presentes en las primeras líneas; los
+    objetos y listas anidados se guardan como texto JSON.
+    """
+
+    source_path = Path(source)
+    if not source_path.exists():
+        raise FileNotFoundError(f"No se encontró el archivo a importar: {source_path}")
+
+    with source_path.open("r", encoding=encoding) as handle:
+
+        def _records() -> Iterator[dict[str, Any]]:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"JSON inválido en la línea {line_number}: {exc}") from exc
+                if isinstance(record, dict):
+                    yield record
+                    continue
+                raise ValueError(f"La línea {line_number} no contiene un objeto JSON")
+
+        records = _records()
+        sample_records = list(itertools.islice(records, INFER_SAMPLE_ROWS))
+        if not sample_records:
+            raise ValueError(f"El archivo {source_path} está vacío")
+
+        ordered_keys: dict[str, None] = {}
+        for record in sample_records:
+            ordered_keys.update(dict.fromkeys(record))
+        column_names = _validate_column_names(list(ordered_keys))
+        known = set(column_names)
+
+        def _as_row(record: dict[str, Any]) -> tuple:
+            extra = record.keys() - known
+            if extra:
+                raise ValueError(
+                    "Claves no presentes en las primeras líneas del archivo: "
+                    + ", ".join(sorted(extra))
+                )
+            return tuple(record.get(name) for name in column_names)
+
+        return _load(
+            db_path,
+            table_name,
+            column_names,
+            [_as_row(record) for record in sample_records],
+            (_as_row(record) for record in records),
+            _infer_json_type,
+            column_types=column_types,
+            create=create,
+            batch_size=batch_size,
+            commit_every=commit_every,
+            defer_indexes=defer_indexes,
+            cipher_key=cipher_key,
+            progress=progress,
+            convert_row=_json_row_converter,
+        )
+
+
+__all__ = [
+    "IMPORT_FORMATS",
+    "INSERT_BATCH_SIZE",
+    "ImportResult",
+    "import_csv",
+    "import_ndjson",
+]
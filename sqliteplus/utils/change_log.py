@@ -0,0 +1,440 @@
+"""Captura de cambios (CDC) basada en *triggers*.
+
+``enable_change_capture`` instala tres *triggers* (INSERT, UPDATE y DELETE) en
+cada tabla seleccionada. Cada uno anota el cambio en la tabla interna
+``_sqliteplus_changes``, cuya columna ``seq`` es ``INTEGER PRIMARY KEY
+AUTOINCREMENT``. Así la secuencia crece de forma monótona y nunca reutiliza
+valores, ni siquiera después de compactar.
+
+Cada registro guarda la operación (``I``, ``U`` o ``D``), el ``rowid`` y un
+objeto JSON con la fila nueva. En los borrados solo se guardan las columnas de
+la clave primaria. Los BLOB se representan como ``hex:<hexadecimal>``.
+
+La compactación automática es otro *trigger* sobre el propio registro: cada
+``COMPACT_EVERY`` cambios elimina los que exceden ``retention_rows``. Un
+consumidor que se queda atrás más allá de esa ventana lo detecta con
+``ChangeBatch.truncated`` y debe resincronizar la tabla completa.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from sqliteplus.core.schemas import escape_sqlite_identifier
+from sqliteplus.utils.constants import INTERNAL_TABLE_PREFIX
+from sqliteplus.utils.crypto_sqlite import apply_cipher_key
+
+CHANGES_TABLE = f"{INTERNAL_TABLE_PREFIX}changes"
+TRACKED_TABLE = f"{INTERNAL_TABLE_PREFIX}cdc_tables"
+STATE_TABLE = f"{INTERNAL_TABLE_PREFIX}cdc_state"
+DEFAULT_RETENTION_ROWS = 100_000
+COMPACT_EVERY = 1000
+MAX_BATCH_SIZE = 10_000
+
+_OPERATIONS = {"I": "insert", "U": "update", "D": "delete"}
+_EPOCH_SQL = "(julianday('now') - 2440587.5) * 86400.0"
+_PAIRS_PER_CALL = 60
+
+
+@dataclass(frozen=True)
+class Change:
+    """Cambio individual registrado en el log."""
+
+    seq: int
+    table: str
+    operation: str
+    rowid: int | None
+    data: dict[str, Any] | None
+    changed_at: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "table": self.table,
+            "operation": self.operation,
+            "rowid": self.rowid,
+            "data": self.data,
+            "changed_at": self.changed_at,
+        }
+
+
+@dataclass(frozen=True)
+class ChangeBatch:
+    """Lote de cambios devuelto por :func:`read_changes`."""
+
+    changes: list[Change] = field(default_factory=list)
+    last_seq: int = 0
+    has_more: bool = False
+    truncated: bool = False
+
+
+def _connect(db_path: str | os.PathLike[str], cipher_key: str | None) -> sqlite3.Connection:
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"No se encontró la base de datos: {db_path}")
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    try:
+        apply_cipher_key(conn, cipher_key)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def _trigger_name(table_name: str, suffix: str) -> str:
+    return escape_sqlite_identifier(f"{INTERNAL_TABLE_PREFIX}cdc_{suffix}_{table_name}")
+
+
+def _ensure_log(conn: sqlite3.Connection, retention_rows: int) -> None:
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{CHANGES_TABLE}" (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op TEXT NOT NULL,
+            row_id INTEGER,
+            data TEXT,
+            changed_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{TRACKED_TABLE}" (
+            table_name TEXT PRIMARY KEY,
+            enabled_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{STATE_TABLE}" (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            compacted_through INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute(f'INSERT OR IGNORE INTO "{STATE_TABLE}" (id, compacted_through) VALUES (1, 0)')
+    # La retención se incrusta en el trigger: reinstalarlo es la forma de cambiarla.
+    compact_trigger = escape_sqlite_identifier(f"{INTERNAL_TABLE_PREFIX}cdc_compact")
+    conn.execute(f'DROP TRIGGER IF EXISTS "{compact_trigger}"')
+    conn.execute(
+        f"""
+        CREATE TRIGGER "{compact_trigger}"
+        AFTER INSERT ON "{CHANGES_TABLE}"
+        WHEN NEW.seq % {COMPACT_EVERY} = 0
+        BEGIN
+            DELETE FROM "{CHANGES_TABLE}" WHERE seq <= NEW.seq - {int(retention_rows)};
+            UPDATE "{STATE_TABLE}"
+            SET compacted_through = max(compacted_through, NEW.seq - {int(retention_rows)})
+            WHERE id = 1;
+        END
+        """
+    )
+
+
+def _json_value(ref: str, column: str) -> str:
+    quoted = f'{ref}."{escape_sqlite_identifier(column)}"'
+    # json_object() no admite BLOB: se codifican en hexadecimal.
+    return f"CASE WHEN typeof({quoted}) = 'blob' THEN 'hex:' || hex({quoted}) ELSE {quoted} END"
+
+
+def _json_object(ref: str, columns: Iterable[str]) -> str:
+    columns = list(columns)
+    # SQLite limita las funciones a 127 argumentos: las tablas anchas se
+    # completan encadenando json_insert() por bloques.
+    head, rest = columns[:_PAIRS_PER_CALL], columns[_PAIRS_PER_CALL:]
+    expression = "json_object({})".format(
+        ", ".join(f"{_sql_literal(column)}, {_json_value(ref, column)}" for column in head)
+    )
+    for start in range(0, len(rest), _PAIRS_PER_CALL):
+        chunk = rest[start : start + _PAIRS_PER_CALL]
+        pairs = ", ".join(
+            f"{_sql_literal(_json_path(column))}, {_json_value(ref, column)}" for column in chunk
+        )
+        expression = f"json_insert({expression}, {pairs})"
+    return expression
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _json_path(column: str) -> str:
+    return '$."' + column.replace('"', '\\"') + '"'
+
+
+def _install_triggers(conn: sqlite3.Connection, table_name: str) -> None:
+    escaped = escape_sqlite_identifier(table_name)
+    info = conn.execute(f'PRAGMA table_info("{escaped}")').fetchall()
+    if not info:
+        raise ValueError(f"La tabla '{table_name}' no existe en la base de datos")
+    try:
+        conn.execute(f'SELECT rowid FROM "{escaped}" LIMIT 0')
+    except sqlite3.OperationalError as exc:
+        raise ValueError(
+            f"La tabla '{table_name}' no tiene rowid (WITHOUT ROWID) y no admite captura de cambios"
+        ) from exc
+
+    columns = [row[1] for row in info]
+    pk_columns = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]]
+    literal = table_name.replace("'", "''")
+    insert = (
+        f'INSERT INTO "{CHANGES_TABLE}" (table_name, op, row_id, data, changed_at) '
+    )
+
+    statements = {
+        "ins": (
+            "AFTER INSERT",
+            f"{insert}VALUES ('{literal}', 'I', NEW.rowid, {_json_object('NEW', columns)}, {_EPOCH_SQL});",
+        ),
+        "upd": (
+            "AFTER UPDATE",
+            # Si cambia el rowid se registra también el borrado de la fila anterior.
+            (
+                f"{insert}SELECT '{literal}', 'D', OLD.rowid, "
+                f"{_json_object('OLD', pk_columns) if pk_columns else 'NULL'}, {_EPOCH_SQL} "
+                "WHERE OLD.rowid IS NOT NEW.rowid;\n"
+                f"{insert}VALUES ('{literal}', 'U', NEW.rowid, {_json_object('NEW', columns)}, {_EPOCH_SQL});"
+            ),
+        ),
+        "del": (
+            "AFTER DELETE",
+            (
+                f"{insert}VALUES ('{literal}', 'D', OLD.rowid, "
+                f"{_json_object('OLD', pk_columns) if pk_columns else 'NULL'}, {_EPOCH_SQL});"
+            ),
+        ),
+    }
+    for suffix, (timing, body) in statements.items():
+        trigger = _trigger_name(table_name, suffix)
+        conn.execute(f'DROP TRIGGER IF EXISTS "{trigger}"')
+        conn.execute(
+            f'CREATE TRIGGER "{trigger}" {timing} ON "{escaped}" FOR EACH ROW BEGIN\n{body}\nEND'
+        )
+
+
+def _drop_triggers(conn: sqlite3.Connection, table_name: str) -> None:
+    for suffix in ("ins", "upd", "del"):
+        conn.execute(f'DROP TRIGGER IF EXISTS "{_trigger_name(table_name, suffix)}"')
+
+
+def enable_change_capture(
+    db_path: str | os.PathLike[str],
+    tables: Iterable[str],
+    *,
+    retention_rows: int = DEFAULT_RETENTION_ROWS,
+    cipher_key: str | None = None,
+) -> list[str]:
+    """Activa la captura de cambios en ``tables`` y devuelve las tablas registradas.
+
+    Es idempotente: volver a llamarla reinstala los *triggers*, lo que también
+    sirve para incorporar columnas añadidas después de activarla.
+    """
+
+    if retention_rows < 1:
+        raise ValueError("retention_rows debe ser mayor o igual que 1")
+    names = [table.strip() for table in tables]
+    for name in names:
+        escape_sqlite_identifier(name)
+        if name.startswith(INTERNAL_TABLE_PREFIX):
+            raise ValueError(f"No se puede activar la captura en la tabla interna '{name}'")
+    if not names:
+        raise ValueError("Indica al menos una tabla")
+
+    with closing(_connect(db_path, cipher_key)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _ensure_log(conn, retention_rows)
+            for name in names:
+                _install_triggers(conn, name)
+                conn.execute(
+                    f'INSERT OR IGNORE INTO "{TRACKED_TABLE}" (table_name, enabled_at) VALUES (?, ?)',
+                    (name, time.time()),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return names
+
+
+def disable_change_capture(
+    db_path: str | os.PathLike[str],
+    tables: Iterable[str],
+    *,
+    purge: bool = False,
+    cipher_key: str | None = None,
+) -> None:
+    """Elimina los *triggers* de ``tables``; con ``purge`` borra también sus cambios."""
+
+    names = [table.strip() for table in tables]
+    for name in names:
+        escape_sqlite_identifier(name)
+    with closing(_connect(db_path, cipher_key)) as conn:
+        if not _log_exists(conn):
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for name in names:
+                _drop_triggers(conn, name)
+                conn.execute(f'DELETE FROM "{TRACKED_TABLE}" WHERE table_name = ?', (name,))
+                if purge:
+                    conn.execute(f'DELETE FROM "{CHANGES_TABLE}" WHERE table_name = ?', (name,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _log_exists(conn: sqlite3.Connection) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CHANGES_TABLE,)
+        ).fetchone()
+        is not None
+    )
+
+
+def tracked_tables(db_path: str | os.PathLike[str], *, cipher_key: str | None = None) -> list[str]:
+    """Tablas con captura de cambios activa."""
+
+    with closing(_connect(db_path, cipher_key)) as conn:
+        if not _log_exists(conn):
+            return []
+        rows = conn.execute(f'SELECT table_name FROM "{TRACKED_TABLE}" ORDER BY table_name')
+        return [row[0] for row in rows]
+
+
+def read_changes(
+    db_path: str | os.PathLike[str],
+    since: int = 0,
+    *,
+    limit: int = 1000,
+    tables: Iterable[str] | None = None,
+    cipher_key: str | None = None,
+) -> ChangeBatch:
+    """Devuelve hasta ``limit`` cambios con ``seq`` mayor que ``since``.
+
+    ``last_seq`` es el valor a usar como ``since`` en la siguiente llamada.
+    """
+
+    if since < 0:
+        raise ValueError("since debe ser mayor o igual que 0")
+    if not 1 <= limit <= MAX_BATCH_SIZE:
+        raise ValueError(f"limit debe estar entre 1 y {MAX_BATCH_SIZE}")
+    table_filter = sorted({table.strip() for table in tables}) if tables else []
+
+    with closing(_connect(db_path, cipher_key)) as conn:
+        if not _log_exists(conn):
+            return ChangeBatch(last_seq=since)
+        conn.execute("BEGIN")
+        try:
+            compacted_through = conn.execute(
+                f'SELECT compacted_through FROM "{STATE_TABLE}" WHERE id = 1'
+            ).fetchone()[0]
+            sql = (
+                f'SELECT seq, table_name, op, row_id, data, changed_at FROM "{CHANGES_TABLE}" '
+                "WHERE seq > ?"
+            )
+            params: list[Any] = [since]
+            if table_filter:
+                sql += f" AND table_name IN ({', '.join('?' for _ in table_filter)})"
+                params.extend(table_filter)
+            sql += " ORDER BY seq LIMIT ?"
+            params.append(limit + 1)
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.execute("COMMIT")
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = [
+        Change(
+            seq=row[0],
+            table=row[1],
+            operation=_OPERATIONS.get(row[2], row[2]),
+            rowid=row[3],
+            data=json.loads(row[4]) if row[4] is not None else None,
+            changed_at=row[5],
+        )
+        for row in rows
+    ]
+    return ChangeBatch(
+        changes=changes,
+        last_seq=changes[-1].seq if changes else since,
+        has_more=has_more,
+        truncated=since < compacted_through,
+    )
+
+
+def compact_changes(
+    db_path: str | os.PathLike[str],
+    *,
+    up_to_seq: int | None = None,
+    older_than: float | None = None,
+    keep_last: int | None = None,
+    cipher_key: str | None = None,
+) -> int:
+    """Elimina cambios ya consumidos y devuelve cuántos se borraron.
+
+    ``up_to_seq`` borra hasta esa secuencia inclusive, ``older_than`` los
+    anteriores a esa antigüedad en segundos y ``keep_last`` conserva solo los N
+    más recientes. Se pueden combinar; se borra la unión.
+    """
+
+    if up_to_seq is None and older_than is None and keep_last is None:
+        raise ValueError("Indica up_to_seq, older_than o keep_last")
+    conditions: list[str] = []
+    params: list[Any] = []
+    if up_to_seq is not None:
+        conditions.append("seq <= ?")
+        params.append(up_to_seq)
+    if older_than is not None:
+        conditions.append("changed_at < ?")
+        params.append(time.time() - older_than)
+    if keep_last is not None:
+        if keep_last < 0:
+            raise ValueError("keep_last debe ser mayor o igual que 0")
+        conditions.append(f'seq <= (SELECT coalesce(max(seq), 0) FROM "{CHANGES_TABLE}") - ?')
+        params.append(keep_last)
+
+    with closing(_connect(db_path, cipher_key)) as conn:
+        if not _log_exists(conn):
+            return 0
+        where = " OR ".join(conditions)
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            newest_removed = conn.execute(
+                f'SELECT max(seq) FROM "{CHANGES_TABLE}" WHERE {where}', params
+            ).fetchone()[0]
+            if newest_removed is None:
+                return 0
+            cursor = conn.execute(f'DELETE FROM "{CHANGES_TABLE}" WHERE {where}', params)
+            conn.execute(
+                f'UPDATE "{STATE_TABLE}" SET compacted_through = max(compacted_through, ?) WHERE id = 1',
+                (newest_removed,),
+            )
+        return cursor.rowcount
+
+
+__all__ = [
+    "CHANGES_TABLE",
+    "COMPACT_EVERY",
+    "DEFAULT_RETENTION_ROWS",
+    "MAX_BATCH_SIZE",
+    "Change",
+    "ChangeBatch",
+    "compact_changes",
+    "disable_change_capture",
+    "enable_change_capture",
+    "read_changes",
+    "tracked_tables",
+]
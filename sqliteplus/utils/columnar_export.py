@@ -0,0 +1,312 @@
+"""Escritores columnares (Parquet y Arrow IPC) basados en ``pyarrow``.
+
+``pyarrow`` es una dependencia opcional (extra ``arrow``); se importa de forma
+perezosa para que el resto de exportaciones funcione sin ella. Las filas se
+leen del cursor con ``fetchmany`` y se convierten lote a lote en
+``RecordBatch``, por lo que el consumo de memoria depende del tamaño del lote y
+no del de la tabla.
+
+El esquema se deriva de los tipos declarados de las columnas siguiendo las
+reglas de afinidad de SQLite. Las columnas sin tipo declarado o con afinidad
+``NUMERIC`` (``NUMERIC``, ``DECIMAL``, ``JSON``, expresiones de una consulta...)
+se infieren a partir del primer lote. Como SQLite no impone los tipos, un lote
+posterior puede traer valores que no caben en el tipo elegido: esa columna se
+ensancha (``int64`` → ``float64`` o → ``string``) y lo ya escrito se reescribe
+con el esquema nuevo, de modo que la exportación nunca falla por los datos.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import sqlite3
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+FETCH_BATCH_SIZE = 8192
+COLUMNAR_FORMATS: tuple[str, ...] = ("parquet", "arrow")
+
+
+def pyarrow_available() -> bool:
+    """Indica si ``pyarrow`` puede importarse en el entorno actual."""
+
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError(
+            "La exportación a Parquet/Arrow requiere el paquete opcional 'pyarrow'. "
+            "Instálalo con: pip install \"sqliteplus-enhanced[arrow]\""
+        ) from exc
+    return pyarrow
+
+
+def arrow_type_for_declared(declared_type: str | None, pa: Any = None):
+    """Traduce un tipo declarado de SQLite a un tipo Arrow.
+
+    Devuelve ``None`` cuando no hay tipo declarado o la afinidad es ``NUMERIC``
+    y el tipo debe inferirse de los valores guardados.
+    """
+
+    if not declared_type or not declared_type.strip():
+        return None
+    pa = pa or _require_pyarrow()
+    normalized = declared_type.upper()
+    if "BOOL" in normalized:
+        return pa.bool_()
+    # Reglas de afinidad de https://sqlite.org/datatype3.html#determination_of_column_affinity
+    if "INT" in normalized:
+        return pa.int64()
+    if "CHAR" in normalized or "CLOB" in normalized or "TEXT" in normalized:
+        return pa.string()
+    if "BLOB" in normalized:
+        return pa.binary()
+    if "REAL" in normalized or "FLOA" in normalized or "DOUB" in normalized:
+        return pa.float64()
+    if "DATE" in normalized or "TIME" in normalized:
+        # SQLite guarda fechas como texto ISO 8601; se conservan tal cual.
+        return pa.string()
+    # Afinidad NUMERIC: puede contener enteros, reales o texto (JSON, DECIMAL...).
+    return None
+
+
+def declared_column_types(connection: sqlite3.Connection, escaped_table: str) -> dict[str, str]:
+    """Obtiene ``{columna: tipo declarado}`` de una tabla ya escapada."""
+
+    cursor = connection.execute(f'PRAGMA table_info("{escaped_table}")')
+    return {row[1]: row[2] or "" for row in cursor.fetchall()}
+
+
+def _coerce_values(pa: Any, values: Sequence[Any], arrow_type: Any) -> list[Any] | None:
+    if pa.types.is_string(arrow_type):
+        # SQLite permite guardar números en columnas TEXT: se convierten a texto.
+        return [
+            value if value is None or isinstance(value, str)
+            else bytes(value).decode("utf-8", "replace") if isinstance(value, (bytes, memoryview))
+            else str(value)
+            for value in values
+        ]
+    if pa.types.is_binary(arrow_type):
+        return [
+            value if value is None or isinstance(value, bytes)
+            else bytes(value) if isinstance(value, memoryview)
+            else str(value).encode("utf-8")
+            for value in values
+        ]
+    if pa.types.is_boolean(arrow_type) and all(
+        value is None or isinstance(value, (int, float)) for value in values
+    ):
+        # Los booleanos de SQLite se almacenan como 0/1.
+        return [None if value is None else bool(value) for value in values]
+    return None
+
+
+def _column_array(pa: Any, values: Sequence[Any], arrow_type: Any):
+    """Convierte ``values`` a ``arrow_type``; devuelve ``None`` si no caben."""
+
+    if pa.types.is_integer(arrow_type) and any(isinstance(value, float) for value in values):
+        # ``pa.array`` truncaría los reales en silencio.
+        return None
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        pass
+    coerced = _coerce_values(pa, values, arrow_type)
+    if coerced is None:
+        return None
+    try:
+        return pa.array(coerced, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        return None
+
+
+def _widen_type(pa: Any, arrow_type: Any, values: Sequence[Any]):
+    if (
+        pa.types.is_integer(arrow_type)
+        and any(isinstance(value, float) for value in values)
+        and all(value is None or isinstance(value, (int, float)) for value in values)
+    ):
+        return pa.float64()
+    return pa.string()
+
+
+def _infer_type(pa: Any, values: Sequence[Any]):
+    try:
+        inferred = pa.array(values).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        return pa.string()
+    if pa.types.is_null(inferred):
+        return pa.string()
+    return inferred
+
+
+def _batch_arrays(pa: Any, columns: Sequence[Sequence[Any]], arrow_types: list[Any]) -> tuple[list[Any], bool]:
+    """Convierte un lote columna a columna ensanchando ``arrow_types`` si hace falta.
+
+    Devuelve los arreglos y si alguna columna cambió de tipo.
+    """
+
+    arrays = []
+    widened = False
+    for idx, values in enumerate(columns):
+        array = _column_array(pa, values, arrow_types[idx])
+        while array is None:
+            arrow_types[idx] = _widen_type(pa, arrow_types[idx], values)
+            widened = True
+            array = _column_array(pa, values, arrow_types[idx])
+        arrays.append(array)
+    return arrays, widened
+
+
+def _write_batches(
+    cursor: sqlite3.Cursor,
+    output_path: Path,
+    open_sink: Callable[[Any, Path, Any], Any],
+    read_back: Callable[[Any, Path], Iterator[Any]],
+    *,
+    batch_size: int,
+    declared_types: Sequence[str | None] | None,
+) -> int:
+    pa = _require_pyarrow()
+    column_names = [desc[0] for desc in cursor.description or []]
+    declared = list(declared_types) if declared_types is not None else [None] * len(column_names)
+    arrow_types = [arrow_type_for_declared(decl, pa) for decl in declared]
+
+    rows = cursor.fetchmany(batch_size)
+    columns = list(zip(*rows)) if rows else [()] * len(column_names)
+    arrow_types = [
+        arrow_type if arrow_type is not None else _infer_type(pa, columns[idx])
+        for idx, arrow_type in enumerate(arrow_types)
+    ]
+
+    def _schema():
+        return pa.schema(
+            [pa.field(name, arrow_type) for name, arrow_type in zip(column_names, arrow_types)]
+        )
+
+    # El primer lote puede ensanchar tipos antes de fijar el esquema del archivo.
+    arrays, _ = _batch_arrays(pa, columns, arrow_types)
+    schema = _schema()
+    sink = open_sink(pa, output_path, schema)
+    total = 0
+    try:
+        while rows:
+            sink.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            total += len(rows)
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            arrays, widened = _batch_arrays(pa, list(zip(*rows)), arrow_types)
+            if widened:
+                schema = _schema()
+                previous, sink = sink, None
+                previous.close()
+                sink = _rewrite_with_schema(pa, output_path, schema, open_sink, read_back)
+    finally:
+        if sink is not None:
+            sink.close()
+    return total
+
+
+def _rewrite_with_schema(
+    pa: Any,
+    output_path: Path,
+    schema: Any,
+    open_sink: Callable[[Any, Path, Any], Any],
+    read_back: Callable[[Any, Path], Iterator[Any]],
+):
+    """Reescribe lo ya exportado con ``schema`` y devuelve el *sink* abierto."""
+
+    staging = output_path.with_name(f".{output_path.name}.widen")
+    os.replace(output_path, staging)
+    sink = open_sink(pa, output_path, schema)
+    try:
+        with closing(read_back(pa, staging)) as batches:
+            for batch in batches:
+                sink.write_table(pa.Table.from_batches([batch]).cast(schema))
+    except BaseException:
+        sink.close()
+        raise
+    finally:
+        staging.unlink()
+    return sink
+
+
+def _open_parquet(pa: Any, path: Path, schema: Any):
+    import pyarrow.parquet as pq
+
+    return pq.ParquetWriter(str(path), schema, compression="zstd")
+
+
+def _read_parquet(pa: Any, path: Path) -> Iterator[Any]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(str(path))
+    try:
+        yield from parquet_file.iter_batches(batch_size=FETCH_BATCH_SIZE)
+    finally:
+        parquet_file.close()
+
+
+def _open_arrow(pa: Any, path: Path, schema: Any):
+    return pa.ipc.new_file(str(path), schema)
+
+
+def _read_arrow(pa: Any, path: Path) -> Iterator[Any]:
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index)
+
+
+def write_parquet(
+    cursor: sqlite3.Cursor,
+    output_path: Path,
+    *,
+    batch_size: int = FETCH_BATCH_SIZE,
+    declared_types: Sequence[str | None] | None = None,
+) -> int:
+    """Escribe el resultado del cursor como Parquet y devuelve las filas escritas."""
+
+    return _write_batches(
+        cursor,
+        Path(output_path),
+        _open_parquet,
+        _read_parquet,
+        batch_size=batch_size,
+        declared_types=declared_types,
+    )
+
+
+def write_arrow(
+    cursor: sqlite3.Cursor,
+    output_path: Path,
+    *,
+    batch_size: int = FETCH_BATCH_SIZE,
+    declared_types: Sequence[str | None] | None = None,
+) -> int:
+    """Escribe el resultado del cursor en formato de archivo Arrow IPC."""
+
+    return _write_batches(
+        cursor,
+        Path(output_path),
+        _open_arrow,
+        _read_arrow,
+        batch_size=batch_size,
+        declared_types=declared_types,
+    )
+
+
+__all__ = [
+    "COLUMNAR_FORMATS",
+    "arrow_type_for_declared",
+    "declared_column_types",
+    "pyarrow_available",
+    "write_arrow",
+    "write_parquet",
+]
@@ -12,6 +12,10 @@ PACKAGE_DB_PATH = _PACKAGE_ROOT / "databases" / "database.db"
 # preservar la compatibilidad con código existente y la ayuda del CLI.
 DEFAULT_DB_PATH = str(_RELATIVE_DB_PATH)
 
+# Prefijo de las tablas de estado que SQLitePlus crea dentro de las bases de
+# usuario (marcas de agua de exportación, registro de cambios, etc.).
+INTERNAL_TABLE_PREFIX = "_sqliteplus_"
+
 
 def resolve_default_db_path(*, prefer_package: bool = True) -> Path:
     """Devuelve la ruta predeterminada considerando el contexto de ejecución.
@@ -29,4 +33,9 @@ def resolve_default_db_path(*, prefer_package: bool = True) -> Path:
     return local_candidate
 
 
-__all__ = ["DEFAULT_DB_PATH", "PACKAGE_DB_PATH", "resolve_default_db_path"]
+__all__ = [
+    "DEFAULT_DB_PATH",
+    "INTERNAL_TABLE_PREFIX",
+    "PACKAGE_DB_PATH",
+    "resolve_default_db_path",
+]
@@ -0,0 +1,174 @@
+"""Sesiones de exportación sobre una única transacción de lectura.
+
+``export_to_csv`` y ``export_table`` abren una conexión por llamada, así que
+exportar varias tablas seguidas puede observar estados distintos de la base
+si otro proceso escribe entre medias. :class:`ExportSession` abre una sola
+conexión de solo lectura (``mode=ro``), ejecuta ``BEGIN`` y fuerza la lectura
+inicial para fijar la instantánea. Todas las tablas y consultas exportadas
+dentro de la sesión ven ese mismo estado.
+
+En modo WAL los escritores no se bloquean mientras la sesión está abierta; lo
+único que se retrasa es el *checkpoint* de las páginas posteriores a la
+instantánea. Con el journal clásico (``DELETE``/``TRUNCATE``) la sesión
+mantiene un bloqueo compartido y los escritores esperan a que termine.
+
+``immutable=True`` añade ``immutable=1`` a la URI: SQLite no toma bloqueos ni
+consulta el WAL. Úsalo solo con archivos que no cambian (copias, instantáneas,
+medios de solo lectura); en una base viva se ignorarían los cambios que aún
+estén en el ``-wal``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+from collections.abc import Sequence
+from pathlib import Path
+from urllib.parse import quote
+
+from sqliteplus.core.schemas import escape_sqlite_identifier
+from sqliteplus.utils.bulk_export import (
+    LimitedCursor,
+    list_user_tables,
+    prepare_output_path,
+    resolve_export_format,
+)
+from sqliteplus.utils.columnar_export import declared_column_types
+from sqliteplus.utils.crypto_sqlite import SQLitePlusCipherError, apply_cipher_key
+
+logger = logging.getLogger(__name__)
+
+
+class ExportSession:
+    """Exporta tablas y consultas desde una misma instantánea de la base.
+
+    Se usa como gestor de contexto::
+
+        with ExportSession("datos.db") as session:
+            session.export_table("clientes", "clientes.csv")
+            session.export_query("SELECT * FROM pedidos WHERE total > ?", "pedidos.json",
+                                 export_format="json", params=(100,))
+
+    La conexión pertenece al hilo que abre la sesión.
+    """
+
+    def __init__(
+        self,
+        db_path: str | os.PathLike[str],
+        *,
+        cipher_key: str | None = None,
+        immutable: bool = False,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.cipher_key = cipher_key
+        self.immutable = immutable
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._conn is not None
+
+    def open(self) -> ExportSession:
+        """Abre la conexión y fija la instantánea. Es idempotente."""
+
+        if self._conn is not None:
+            return self
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"No se encontró la base de datos origen: {self.db_path}")
+
+        uri = f"file:{quote(str(self.db_path.resolve()))}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        conn = sqlite3.connect(uri, uri=True, isolation_level=None)
+        try:
+            apply_cipher_key(conn, self.cipher_key)
+            conn.execute("BEGIN")
+            # ``BEGIN`` es diferido: la instantánea se fija con la primera lectura.
+            conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        except (sqlite3.Error, SQLitePlusCipherError):
+            conn.close()
+            raise
+        self._conn = conn
+        logger.debug("Sesión de exportación abierta sobre %s", self.db_path)
+        return self
+
+    def close(self) -> None:
+        """Termina la transacción de lectura y cierra la conexión."""
+
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+        finally:
+            conn.close()
+
+    def __enter__(self) -> ExportSession:
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("La sesión de exportación no está abierta")
+        return self._conn
+
+    def tables(self) -> list[str]:
+        """Lista las tablas de usuario visibles en la instantánea."""
+
+        return list_user_tables(self._connection())
+
+    def export_table(
+        self,
+        table_name: str,
+        output_path: str | os.PathLike[str],
+        *,
+        export_format: str = "csv",
+        overwrite: bool = False,
+    ) -> int:
+        """Exporta una tabla de la instantánea y devuelve el número de filas."""
+
+        escaped = escape_sqlite_identifier(table_name)
+        _, writer = resolve_export_format(export_format)
+        conn = self._connection()
+        declared = declared_column_types(conn, escaped)
+        if not declared:
+            raise ValueError(f"La tabla '{table_name}' no existe en la base de datos")
+        path = prepare_output_path(output_path, overwrite)
+        cursor = conn.execute(f'SELECT * FROM "{escaped}"')
+        return writer(
+            cursor,
+            path,
+            declared_types=[declared.get(desc[0]) for desc in cursor.description],
+        )
+
+    def export_query(
+        self,
+        query: str,
+        output_path: str | os.PathLike[str],
+        *,
+        export_format: str = "csv",
+        params: Sequence[object] = (),
+        limit: int | None = None,
+        overwrite: bool = False,
+    ) -> int:
+        """Exporta el resultado de una consulta de lectura dentro de la instantánea."""
+
+        _, writer = resolve_export_format(export_format)
+        conn = self._connection()
+        path = prepare_output_path(output_path, overwrite)
+        cursor = conn.execute(query, tuple(params))
+        if not conn.in_transaction:
+            # Un ``COMMIT``/``ROLLBACK`` en la consulta liberaría la instantánea.
+            self.close()
+            raise ValueError("La consulta terminó la transacción de lectura de la sesión")
+        if cursor.description is None:
+            raise ValueError("La consulta no devuelve filas para exportar")
+        source = cursor if limit is None else LimitedCursor(cursor, limit)
+        return writer(source, path)
+
+
+__all__ = ["ExportSession"]
@@ -0,0 +1,175 @@
+"""Copia de archivos asistida por el kernel para los helpers de replicación.
+
+Los archivos WAL/SHM y las copias locales de la base pueden alcanzar varios
+gigabytes. En lugar de mover cada byte por un búfer de Python se intentan, en
+orden, las primitivas que ofrece el sistema operativo:
+
+* ``reflink``: clonado *copy-on-write* (``FICLONE``) en Btrfs, XFS, etc.
+* ``copy_file_range``: copia dentro del kernel sin pasar por espacio de usuario.
+* ``sendfile``: transferencia entre descriptores gestionada por el kernel.
+* ``userspace``: bucle portable con un búfer reutilizable de 1 MiB.
+
+Cada estrategia que no esté soportada por la plataforma o por el sistema de
+archivos se descarta y se prueba la siguiente, de modo que la última opción
+siempre está disponible.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO
+
+COPY_STRATEGIES: tuple[str, ...] = ("reflink", "copy_file_range", "sendfile", "userspace")
+
+_BUFFER_SIZE = 1024 * 1024
+_MAX_CHUNK = 1 << 30
+_FICLONE = 0x40049409  # _IOW(0x94, 9, int) en Linux
+
+# Errores que indican que la primitiva no es aplicable y que debe probarse otra.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EPERM,
+    errno.EBADF,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+    getattr(errno, "ETXTBSY", errno.EINVAL),
+}
+
+_IS_LINUX = sys.platform.startswith("linux")
+
+
+def available_copy_strategies() -> tuple[str, ...]:
+    """Devuelve las estrategias que la plataforma actual puede intentar."""
+
+    strategies: list[str] = []
+    if _IS_LINUX:
+        strategies.append("reflink")
+    if hasattr(os, "copy_file_range"):
+        strategies.append("copy_file_range")
+    if _IS_LINUX and hasattr(os, "sendfile"):
+        strategies.append("sendfile")
+    strategies.append("userspace")
+    return tuple(strategies)
+
+
+def _copy_reflink(src: BinaryIO, dest: BinaryIO, size: int) -> None:
+    import fcntl
+
+    fcntl.ioctl(dest.fileno(), _FICLONE, src.fileno())
+
+
+def _copy_with_copy_file_range(src: BinaryIO, dest: BinaryIO, size: int) -> None:
+    src_fd = src.fileno()
+    dest_fd = dest.fileno()
+    copied = 0
+    while copied < size:
+        sent = os.copy_file_range(src_fd, dest_fd, min(size - copied, _MAX_CHUNK))
+        if sent == 0:
+            break
+        copied += sent
+
+
+def _copy_with_sendfile(src: BinaryIO, dest: BinaryIO, size: int) -> None:
+    src_fd = src.fileno()
+    dest_fd = dest.fileno()
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dest_fd, src_fd, offset, min(size - offset, _MAX_CHUNK))
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _copy_userspace(src: BinaryIO, dest: BinaryIO, size: int) -> None:
+    buf = bytearray(_BUFFER_SIZE)
+    mv = memoryview(buf)
+    while True:
+        read_bytes = src.readinto(buf)
+        if not read_bytes:
+            break
+        dest.write(mv[:read_bytes])
+
+
+_IMPLEMENTATIONS = {
+    "reflink": _copy_reflink,
+    "copy_file_range": _copy_with_copy_file_range,
+    "sendfile": _copy_with_sendfile,
+    "userspace": _copy_userspace,
+}
+
+
+def _rewind(src: BinaryIO, dest: BinaryIO) -> None:
+    """Deja ambos archivos listos para reintentar con otra estrategia."""
+
+    src.seek(0)
+    dest.seek(0)
+    dest.truncate(0)
+
+
+def copy_file_fast(
+    source: str | os.PathLike[str],
+    destination: str | os.PathLike[str],
+    *,
+    strategies: Iterable[str] | None = None,
+    copy_metadata: bool = True,
+) -> str:
+    """Copia ``source`` en ``destination`` con la estrategia más eficiente disponible.
+
+    ``strategies`` permite fijar el orden de preferencia (útil en benchmarks y
+    pruebas). La copia en espacio de usuario se añade siempre como último
+    recurso. Devuelve el nombre de la estrategia que completó la copia.
+
+    Como ``shutil.copy2``, lanza ``shutil.SameFileError`` si ``source`` y
+    ``destination`` son el mismo archivo, en lugar de truncarlo.
+    """
+
+    available = available_copy_strategies()
+    if strategies is None:
+        ordered = list(available)
+    else:
+        requested = list(strategies)
+        unknown = [name for name in requested if name not in COPY_STRATEGIES]
+        if unknown:
+            raise ValueError(f"Estrategias de copia desconocidas: {', '.join(unknown)}")
+        ordered = [name for name in requested if name in available]
+    if "userspace" not in ordered:
+        ordered.append("userspace")
+
+    src_path = Path(source)
+    dest_path = Path(destination)
+    if dest_path.exists() and os.path.samefile(src_path, dest_path):
+        raise shutil.SameFileError(f"{os.fspath(src_path)!r} y {os.fspath(dest_path)!r} son el mismo archivo")
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    used = "userspace"
+    with src_path.open("rb") as src, dest_path.open("wb") as dest:
+        size = os.fstat(src.fileno()).st_size
+        for index, name in enumerate(ordered):
+            if index:
+                _rewind(src, dest)
+            try:
+                _IMPLEMENTATIONS[name](src, dest, size)
+            except OSError as exc:
+                if name == "userspace" or exc.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                continue
+            if name != "userspace" and os.fstat(dest.fileno()).st_size != size:
+                # Copia incompleta (p. ej. archivos de procfs); se reintenta con otra vía.
+                continue
+            used = name
+            break
+
+    if copy_metadata:
+        shutil.copystat(src_path, dest_path, follow_symlinks=True)
+    return used
+
+
+__all__ = ["COPY_STRATEGIES", "available_copy_strategies", "copy_file_fast"]
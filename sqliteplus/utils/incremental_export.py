@@ -0,0 +1,347 @@
+"""Exportación incremental basada en marcas de agua (*watermarks*).
+
+Cada ejecución exporta solo las filas cuya clave es mayor que la última marca
+y devuelve la nueva marca. La clave puede ser el ``rowid`` o una columna que
+crezca de forma monótona (por ejemplo ``updated_at``).
+
+Hay dos formas de llevar la marca:
+
+* Persistida (``persist=True``, la de la CLI y ``SQLiteReplication``): se guarda
+  por par (tabla, destino) en la tabla interna ``_sqliteplus_export_watermarks``
+  de la propia base, solo después de escribir el archivo completo. Si algo falla
+  antes, la siguiente ejecución vuelve a exportar esas filas (semántica
+  *at-least-once* respecto al archivo en disco).
+* Sin estado (``persist=False``, la del endpoint de la API): la marca de partida
+  llega en ``since`` y no se escribe nada en la base. El cliente guarda el token
+  de ``encode_watermark`` y solo lo sustituye cuando ha recibido el archivo
+  entero; si la descarga falla, repetir la petición con el token anterior
+  devuelve las mismas filas.
+
+La lectura del máximo y de las filas se hace dentro de una misma transacción
+de lectura. Con una columna como ``updated_at``, las filas confirmadas más
+tarde pero con un valor igual o inferior a la última marca no se detectan. Usa
+valores estrictamente crecientes (o el ``rowid`` para tablas de solo inserción).
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqliteplus.core.schemas import escape_sqlite_identifier
+from sqliteplus.utils.bulk_export import connect_read_only, resolve_export_format
+from sqliteplus.utils.columnar_export import declared_column_types
+from sqliteplus.utils.constants import INTERNAL_TABLE_PREFIX
+from sqliteplus.utils.crypto_sqlite import apply_cipher_key
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_TABLE = f"{INTERNAL_TABLE_PREFIX}export_watermarks"
+DEFAULT_TARGET = "default"
+ROWID_KEYS = frozenset({"rowid", "_rowid_", "oid"})
+_MAX_TARGET_LENGTH = 200
+
+
+@dataclass(frozen=True)
+class IncrementalExportResult:
+    """Resultado de una exportación incremental."""
+
+    table: str
+    target: str | None
+    key: str
+    path: str
+    rows: int
+    previous_watermark: Any
+    watermark: Any
+
+
+def _ensure_state_table(conn: sqlite3.Connection) -> None:
+    # ``watermark`` no declara tipo para conservar enteros, reales o texto tal cual.
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS "{WATERMARK_TABLE}" (
+            table_name TEXT NOT NULL,
+            target TEXT NOT NULL,
+            key_column TEXT NOT NULL,
+            watermark,
+            rows_exported INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (table_name, target)
+        )
+        """
+    )
+
+
+def _normalize_target(target: str | None) -> str:
+    normalized = (target or DEFAULT_TARGET).strip()
+    if not normalized or len(normalized) > _MAX_TARGET_LENGTH:
+        raise ValueError(
+            f"El destino debe tener entre 1 y {_MAX_TARGET_LENGTH} caracteres"
+        )
+    return normalized
+
+
+def _state_table_exists(conn: sqlite3.Connection) -> bool:
+    return (
+        conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (WATERMARK_TABLE,)
+        ).fetchone()
+        is not None
+    )
+
+
+def encode_watermark(key: str, value: Any) -> str:
+    """Codifica clave y marca en un token opaco apto para cabeceras y URLs.
+
+    El token conserva el tipo de la marca (entero, real, texto o BLOB), de modo
+    que la comparación en SQLite es la misma que con la marca original.
+    """
+
+    payload: dict[str, Any] = {"k": key}
+    if isinstance(value, bytes):
+        payload["b"] = base64.b64encode(value).decode("ascii")
+    else:
+        payload["v"] = value
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_watermark(token: str) -> tuple[str, Any]:
+    """Devuelve ``(clave, marca)`` a partir de un token de ``encode_watermark``."""
+
+    try:
+        raw = base64.urlsafe_b64decode(token.strip() + "=" * (-len(token.strip()) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        key = payload["k"]
+        value = base64.b64decode(payload["b"]) if "b" in payload else payload["v"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Token de marca de agua inválido") from exc
+    if isinstance(key, str) and not isinstance(value, (dict, list, bool)):
+        return key, value
+    raise ValueError("Token de marca de agua inválido")
+
+
+def _resolve_key(conn: sqlite3.Connection, escaped_table: str, table_name: str, key: str) -> tuple[str, str]:
+    """Devuelve (nombre normalizado, expresión SQL) para la clave incremental."""
+
+    columns = declared_column_types(conn, escaped_table)
+    if not columns:
+        raise ValueError(f"La tabla '{table_name}' no existe en la base de datos")
+    normalized = (key or "rowid").strip()
+    if normalized.lower() in ROWID_KEYS and normalized not in columns:
+        return "rowid", "rowid"
+    if normalized not in columns:
+        raise ValueError(f"La columna '{normalized}' no existe en la tabla '{table_name}'")
+    return normalized, f'"{escape_sqlite_identifier(normalized)}"'
+
+
+def get_watermark(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    target: str | None = None,
+    *,
+    cipher_key: str | None = None,
+) -> Any:
+    """Devuelve la marca registrada para ``table_name``/``target`` o ``None``.
+
+    Abre la base en solo lectura: si nunca se ha guardado una marca no crea la
+    tabla de estado.
+    """
+
+    target_name = _normalize_target(target)
+    with closing(connect_read_only(db_path, cipher_key)) as conn:
+        if not _state_table_exists(conn):
+            return None
+        row = conn.execute(
+            f'SELECT watermark FROM "{WATERMARK_TABLE}" WHERE table_name = ? AND target = ?',
+            (table_name, target_name),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def reset_watermark(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    target: str | None = None,
+    *,
+    cipher_key: str | None = None,
+) -> bool:
+    """Elimina la marca para que la siguiente exportación sea completa."""
+
+    target_name = _normalize_target(target)
+    with closing(sqlite3.connect(str(db_path))) as conn:
+        apply_cipher_key(conn, cipher_key)
+        if not _state_table_exists(conn):
+            return False
+        with conn:
+            cursor = conn.execute(
+                f'DELETE FROM "{WATERMARK_TABLE}" WHERE table_name = ? AND target = ?',
+                (table_name, target_name),
+            )
+    return cursor.rowcount > 0
+
+
+def export_incremental(
+    db_path: str | os.PathLike[str],
+    table_name: str,
+    output_path: str | os.PathLike[str],
+    *,
+    key: str = "rowid",
+    target: str | None = None,
+    since: Any = None,
+    persist: bool = True,
+    export_format: str = "csv",
+    cipher_key: str | None = None,
+    overwrite: bool = False,
+) -> IncrementalExportResult:
+    """Exporta las filas nuevas de ``table_name`` desde la última marca.
+
+    Con ``persist=True`` la marca de partida es la guardada para ``target`` y la
+    nueva se guarda al terminar. Con ``persist=False`` se parte de ``since``
+    (``None`` exporta todo), la base se abre en solo lectura y ``target`` se
+    ignora: quien llama conserva la marca devuelta.
+    """
+
+    escaped_table = escape_sqlite_identifier(table_name)
+    if persist:
+        if since is not None:
+            raise ValueError("'since' solo se admite en exportaciones sin estado (persist=False)")
+        target_name: str | None = _normalize_target(target)
+    else:
+        target_name = None
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"No se encontró la base de datos origen: {db_path}")
+    _, writer = resolve_export_format(export_format)
+
+    destination = Path(output_path).expanduser().resolve()
+    if destination.exists() and not overwrite:
+        raise FileExistsError(
+            f"El archivo de salida ya existe: {destination}. Usa --overwrite para reemplazarlo."
+        )
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination.with_name(f".{destination.name}.partial")
+
+    if persist:
+        conn = sqlite3.connect(str(db_path), isolation_level=None)
+        try:
+            apply_cipher_key(conn, cipher_key)
+        except BaseException:
+            conn.close()
+            raise
+    else:
+        conn = connect_read_only(db_path, cipher_key)
+        conn.isolation_level = None
+
+    with closing(conn):
+        if persist:
+            _ensure_state_table(conn)
+        key_name, key_expr = _resolve_key(conn, escaped_table, table_name, key)
+
+        previous = since
+        if persist:
+            state = conn.execute(
+                f'SELECT key_column, watermark FROM "{WATERMARK_TABLE}" WHERE table_name = ? AND target = ?',
+                (table_name, target_name),
+            ).fetchone()
+            if state is not None:
+                if state[0] != key_name:
+                    raise ValueError(
+                        f"El destino '{target_name}' usa la clave '{state[0]}' para '{table_name}'. "
+                        "Reinicia la marca para cambiar de clave."
+                    )
+                previous = state[1]
+
+        where = f"{key_expr} IS NOT NULL" if previous is None else f"{key_expr} > ?"
+        params: tuple = () if previous is None else (previous,)
+        declared = declared_column_types(conn, escaped_table)
+
+        # Máximo y filas se leen en la misma instantánea.
+        conn.execute("BEGIN")
+        try:
+            new_mark = conn.execute(
+                f'SELECT max({key_expr}) FROM "{escaped_table}" WHERE {where}', params
+            ).fetchone()[0]
+            if new_mark is None:
+                cursor = conn.execute(f'SELECT * FROM "{escaped_table}" WHERE 0')
+            else:
+                cursor = conn.execute(
+                    f'SELECT * FROM "{escaped_table}" WHERE {where} AND {key_expr} <= ? '
+                    f"ORDER BY {key_expr}",
+                    params + (new_mark,),
+                )
+            try:
+                rows = writer(
+                    cursor,
+                    partial,
+                    declared_types=[declared.get(desc[0]) for desc in cursor.description],
+                )
+            except BaseException:
+                partial.unlink(missing_ok=True)
+                raise
+        finally:
+            conn.execute("COMMIT")
+
+        os.replace(partial, destination)
+
+        watermark = previous if new_mark is None else new_mark
+        if persist and new_mark is not None:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    f"""
+                    INSERT INTO "{WATERMARK_TABLE}"
+                        (table_name, target, key_column, watermark, rows_exported, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (table_name, target) DO UPDATE SET
+                        watermark = excluded.watermark,
+                        rows_exported = rows_exported + excluded.rows_exported,
+                        updated_at = excluded.updated_at
+                    """,
+                    (
+                        table_name,
+                        target_name,
+                        key_name,
+                        new_mark,
+                        rows,
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+
+    logger.info(
+        "Exportación incremental de '%s' para '%s': %d filas (marca %r -> %r)",
+        table_name,
+        target_name or "cliente",
+        rows,
+        previous,
+        watermark,
+    )
+    return IncrementalExportResult(
+        table=table_name,
+        target=target_name,
+        key=key_name,
+        path=str(destination),
+        rows=rows,
+        previous_watermark=previous,
+        watermark=watermark,
+    )
+
+
+__all__ = [
+    "DEFAULT_TARGET",
+    "WATERMARK_TABLE",
+    "IncrementalExportResult",
+    "decode_watermark",
+    "encode_watermark",
+    "export_incremental",
+    "get_watermark",
+    "reset_watermark",
+]
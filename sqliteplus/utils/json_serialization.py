@@ -3,11 +3,30 @@
 from __future__ import annotations
 
 import base64
+import itertools
 import math
+import os
+from collections.abc import Callable, Iterable, Sequence
 from datetime import date, datetime, time
 from decimal import Decimal
 from typing import Any
 
+if os.getenv("SQLITEPLUS_DISABLE_CYTHON", "").lower() in {"1", "true", "yes"}:
+    _json_rows = None
+else:
+    try:  # pragma: no cover - la ruta acelerada se valida aparte
+        from sqliteplus.utils import _json_rows
+    except ImportError:  # pragma: no cover - ausencia comprobada en pruebas
+        _json_rows = None
+
+# Tipos que ``json.dumps`` serializa tal cual y que SQLite devuelve por defecto.
+_JSON_NATIVE_TYPES = frozenset({type(None), bool, int, float, str})
+# Los formatos binarios (MessagePack) transportan además los bytes sin codificar.
+_BINARY_NATIVE_TYPES = _JSON_NATIVE_TYPES | {bytes}
+_BLOB_TYPES = frozenset({bytes, bytearray, memoryview})
+_TEMPORAL_TYPES = frozenset({datetime, date, time})
+DEFAULT_SAMPLE_ROWS = 256
+
 
 def normalize_json_value(value: Any) -> Any:
     """Convierte valores complejos en representaciones compatibles con JSON."""
@@ -34,4 +53,164 @@ def normalize_json_value(value: Any) -> Any:
     return value
 
 
-__all__ = ["normalize_json_value"]
+def normalize_binary_value(value: Any) -> Any:
+    """Como ``normalize_json_value`` pero conserva los binarios como ``bytes``."""
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return normalize_json_value(value)
+
+
+def _blob_to_json(value: Any) -> Any:
+    if type(value) is bytes:
+        return "base64:" + base64.b64encode(value).decode("ascii")
+    return normalize_json_value(value)
+
+
+def _temporal_to_json(value: Any) -> Any:
+    if type(value) in _TEMPORAL_TYPES:
+        return value.isoformat()
+    return normalize_json_value(value)
+
+
+_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "blob": _blob_to_json,
+    "decimal": normalize_json_value,
+    "temporal": _temporal_to_json,
+    "mixed": normalize_json_value,
+}
+_BINARY_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "decimal": normalize_binary_value,
+    "temporal": normalize_binary_value,
+    "mixed": normalize_binary_value,
+}
+
+
+def _py_normalize_rows(
+    rows: Iterable[Sequence[Any]],
+    plan: tuple[tuple[int, Callable[[Any], Any]], ...],
+    fallback: Callable[[Any], Any],
+    allow_bytes: bool = False,
+) -> list[list[Any]]:
+    native_types = _BINARY_NATIVE_TYPES if allow_bytes else _JSON_NATIVE_TYPES
+    normalized = []
+    for row in rows:
+        values = list(row)
+        for position, convert in plan:
+            values[position] = convert(values[position])
+        if not native_types.issuperset(map(type, values)):
+            values = [fallback(value) for value in values]
+        normalized.append(values)
+    return normalized
+
+
+_normalize_rows_impl = _json_rows.normalize_rows if _json_rows is not None else _py_normalize_rows
+
+
+class RowNormalizer:
+    """Aplica un plan de conversión por columna a lotes de filas.
+
+    Solo las columnas con tipo ``blob``, ``decimal``, ``temporal`` o ``mixed``
+    pasan por un conversor; el resto se copia sin tocar. Si una fila trae en
+    otra columna un valor que JSON no admite (SQLite no impone tipos), esa fila
+    se normaliza entera con ``normalize_json_value``, de modo que el resultado
+    es siempre el mismo que convertir celda a celda.
+
+    Con ``binary=True`` el resultado es el de ``normalize_binary_value``: las
+    columnas ``blob`` conservan sus ``bytes`` y no se recorren, y el resto de
+    columnas del plan se convierten con ``normalize_binary_value``.
+    """
+
+    __slots__ = ("_fallback", "_native_types", "_plan", "binary", "kinds")
+
+    def __init__(self, kinds: Sequence[str | None], *, binary: bool = False) -> None:
+        self.kinds = tuple(kinds)
+        self.binary = binary
+        converters = _BINARY_CONVERTERS if binary else _CONVERTERS
+        self._plan = tuple(
+            (position, converters[kind])
+            for position, kind in enumerate(self.kinds)
+            if kind is not None and not (binary and kind == "blob")
+        )
+        self._fallback = normalize_binary_value if binary else normalize_json_value
+        self._native_types = _BINARY_NATIVE_TYPES if binary else _JSON_NATIVE_TYPES
+
+    @property
+    def converted_columns(self) -> tuple[int, ...]:
+        return tuple(position for position, _ in self._plan)
+
+    def __call__(self, rows: Iterable[Sequence[Any]]) -> list[list[Any]]:
+        return _normalize_rows_impl(rows, self._plan, self._fallback, self.binary)
+
+    def columns(self, rows: Iterable[Sequence[Any]]) -> list[list[Any]]:
+        """Devuelve los valores ya normalizados agrupados por columna.
+
+        Transpone las filas una sola vez y convierte cada columna del plan de
+        una pasada; el resto de columnas solo se comprueba por tipo.
+        """
+
+        columns = [list(column) for column in zip(*rows)]
+        if not columns:
+            return [[] for _ in self.kinds]
+
+        converters = dict(self._plan)
+        for position, values in enumerate(columns):
+            convert = converters.get(position)
+            if convert is not None:
+                values[:] = map(convert, values)
+            if not self._native_types.issuperset(map(type, values)):
+                values[:] = map(self._fallback, values)
+        return columns
+
+
+def _column_kind(declared: str | None, seen_types: set[type]) -> str | None:
+    declared_blob = bool(declared) and "BLOB" in declared.upper()
+    if not seen_types:
+        return "blob" if declared_blob else None
+    if seen_types <= _BLOB_TYPES:
+        return "blob"
+    if declared_blob:
+        return "mixed"
+    if seen_types <= _TEMPORAL_TYPES:
+        return "temporal"
+    if seen_types == {Decimal}:
+        return "decimal"
+    return "mixed"
+
+
+def build_row_normalizer(
+    description: Sequence[Any] | None,
+    declared_types: Sequence[str | None] | None = None,
+    sample_rows: Sequence[Sequence[Any]] = (),
+    *,
+    sample_size: int = DEFAULT_SAMPLE_ROWS,
+    binary: bool = False,
+) -> RowNormalizer:
+    """Decide qué columnas necesitan conversión a partir del primer lote.
+
+    ``description`` puede ser ``cursor.description`` o la lista de nombres de
+    columna; solo se usa su longitud. Las columnas declaradas ``BLOB`` se
+    convierten siempre y el resto según los tipos vistos en las primeras
+    ``sample_size`` filas de ``sample_rows``. ``binary=True`` prepara el plan
+    para formatos que admiten ``bytes`` (ver ``RowNormalizer``).
+    """
+
+    sample = list(itertools.islice(sample_rows, sample_size))
+    width = len(description) if description else (len(sample[0]) if sample else 0)
+    declared = list(declared_types or ())
+    declared.extend([None] * (width - len(declared)))
+
+    kinds = []
+    for position in range(width):
+        seen_types = {type(row[position]) for row in sample if position < len(row)}
+        kinds.append(_column_kind(declared[position], seen_types - _JSON_NATIVE_TYPES))
+    return RowNormalizer(kinds, binary=binary)
+
+
+__all__ = [
+    "DEFAULT_SAMPLE_ROWS",
+    "RowNormalizer",
+    "build_row_normalizer",
+    "normalize_binary_value",
+    "normalize_json_value",
+]
@@ -0,0 +1,174 @@
+"""Replicación de una base hacia varios destinos leyendo el origen una sola vez.
+
+La API de *backup* de SQLite solo admite un destino por operación, de modo que
+replicar en N réplicas con ``replicate_database`` lee el origen N veces. Aquí
+se toma una única instantánea con la API de *backup* (``pages=-1``: un solo
+paso bajo un único bloqueo de lectura). Después, la instantánea se reparte a
+todos los destinos en paralelo con :func:`copy_file_fast`, que usa *reflink*,
+``copy_file_range`` o ``sendfile`` cuando están disponibles.
+
+Un destino nuevo se escribe en un archivo temporal junto a él y se mueve a su
+sitio con un ``os.replace`` atómico; nadie puede tenerlo abierto todavía. Un
+destino que ya existe puede tener lectores, así que no se sustituye el archivo
+(conservarían el *inode* viejo y perderían su ``-wal``/``-shm``): la
+instantánea se vuelca con la API de *backup* sobre una conexión al propio
+destino, respetando sus bloqueos. En modo WAL los lectores abiertos terminan su
+transacción con los datos anteriores y las siguientes ven la réplica nueva; con
+el journal clásico, un lector a mitad de transacción retrasa la escritura
+hasta ``timeout`` y, si no termina, ese destino falla. Un destino que falla no
+afecta al resto: su error queda en :class:`ReplicaResult`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqliteplus.utils.crypto_sqlite import apply_cipher_key
+from sqliteplus.utils.file_copy import copy_file_fast
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReplicaResult:
+    """Resultado de replicar en un destino concreto."""
+
+    target: str
+    path: str | None
+    seconds: float
+    strategy: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _take_snapshot(source: Path, snapshot: Path, cipher_key: str | None) -> None:
+    with closing(sqlite3.connect(str(source))) as source_conn:
+        apply_cipher_key(source_conn, cipher_key)
+        with closing(sqlite3.connect(str(snapshot))) as snapshot_conn:
+            apply_cipher_key(snapshot_conn, cipher_key)
+            source_conn.backup(snapshot_conn, pages=-1)
+
+
+def _backup_into(snapshot: Path, target: Path, cipher_key: str | None, timeout: float) -> str | None:
+    """Vuelca la instantánea sobre un destino existente con la API de *backup*.
+
+    Devuelve ``None`` si el destino no es una base SQLite legible: nadie puede
+    estar leyéndolo como tal y basta con sustituir el archivo.
+    """
+
+    with closing(sqlite3.connect(str(snapshot))) as snapshot_conn:
+        apply_cipher_key(snapshot_conn, cipher_key)
+        with closing(sqlite3.connect(str(target), timeout=timeout)) as target_conn:
+            apply_cipher_key(target_conn, cipher_key)
+            try:
+                snapshot_conn.backup(target_conn, pages=-1)
+            except sqlite3.OperationalError:
+                raise
+            except sqlite3.DatabaseError:
+                return None
+    return "backup"
+
+
+def _install_replica(
+    snapshot: Path, target: Path, cipher_key: str | None, timeout: float
+) -> ReplicaResult:
+    start = time.perf_counter()
+    partial: Path | None = None
+    try:
+        strategy = _backup_into(snapshot, target, cipher_key, timeout) if target.exists() else None
+        if strategy is None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, partial_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".partial", dir=target.parent)
+            os.close(fd)
+            partial = Path(partial_name)
+            strategy = copy_file_fast(snapshot, partial, copy_metadata=False)
+            # Sin base legible no puede haber lectores: unos ``-wal``/``-shm``
+            # huérfanos se aplicarían sobre la réplica nueva.
+            for suffix in ("-wal", "-shm"):
+                target.with_name(target.name + suffix).unlink(missing_ok=True)
+            os.replace(partial, target)
+    except Exception as exc:  # noqa: BLE001 - se reporta por destino
+        logger.warning("Fallo al replicar en %s: %s", target, exc)
+        if partial is not None:
+            partial.unlink(missing_ok=True)
+        return ReplicaResult(
+            target=str(target),
+            path=None,
+            seconds=time.perf_counter() - start,
+            error=str(exc),
+        )
+    return ReplicaResult(
+        target=str(target),
+        path=str(target),
+        seconds=time.perf_counter() - start,
+        strategy=strategy,
+    )
+
+
+def replicate_to_many(
+    db_path: str | os.PathLike[str],
+    targets: Iterable[str | os.PathLike[str]],
+    *,
+    workers: int | None = None,
+    cipher_key: str | None = None,
+    timeout: float = 5.0,
+) -> list[ReplicaResult]:
+    """Replica ``db_path`` en todos los ``targets`` a partir de una única lectura.
+
+    Devuelve un resultado por destino, en el mismo orden recibido. ``timeout``
+    es la espera máxima, en segundos, por los bloqueos de un destino existente.
+    """
+
+    source = Path(db_path)
+    if not source.exists():
+        raise FileNotFoundError(f"No se encontró la base de datos origen: {source}")
+
+    resolved: list[Path] = []
+    for target in targets:
+        path = Path(target).expanduser().resolve()
+        if path == source.resolve():
+            raise ValueError(f"El destino coincide con la base de origen: {path}")
+        if path not in resolved:
+            resolved.append(path)
+    if not resolved:
+        raise ValueError("Indica al menos un destino de replicación")
+
+    max_workers = workers if workers is not None else min(8, len(resolved))
+    if max_workers < 1:
+        raise ValueError("El número de workers debe ser mayor o igual que 1")
+
+    # La instantánea vive junto al primer destino para aprovechar reflink.
+    snapshot_dir = resolved[0].parent
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix=".sqliteplus-fanout-", dir=snapshot_dir) as tmp:
+        snapshot = Path(tmp) / "snapshot.db"
+        _take_snapshot(source, snapshot, cipher_key)
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sqliteplus-replica"
+        ) as pool:
+            results = list(
+                pool.map(lambda target: _install_replica(snapshot, target, cipher_key, timeout), resolved)
+            )
+
+    logger.info(
+        "Replicación de %s en %d destinos (%d con errores)",
+        source,
+        len(results),
+        sum(1 for item in results if not item.ok),
+    )
+    return results
+
+
+__all__ = ["ReplicaResult", "replicate_to_many"]
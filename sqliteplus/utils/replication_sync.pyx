@@ -11,17 +11,20 @@ cimport cython
 import csv
 import logging
 import os
-import shutil
 import sqlite3
 import sys
 from pathlib import Path
 
-from sqliteplus.core.schemas import is_valid_sqlite_identifier
+from sqliteplus.core.schemas import escape_sqlite_identifier, is_valid_sqlite_identifier
 from sqliteplus.utils.constants import (
     DEFAULT_DB_PATH,
     PACKAGE_DB_PATH,
     resolve_default_db_path,
 )
+from sqliteplus.utils.bulk_export import export_database, export_query, export_table
+from sqliteplus.utils.export_session import ExportSession
+from sqliteplus.utils import bulk_import, change_log, incremental_export, replication_fanout
+from sqliteplus.utils.file_copy import copy_file_fast
 from sqliteplus.utils.sqliteplus_sync import apply_cipher_key, SQLitePlusCipherError
 
 logger = logging.getLogger(__name__)
@@ -129,6 +132,273 @@ cdef class SQLiteReplication:
         except SQLitePlusCipherError as exc:
             raise RuntimeError(str(exc)) from exc
 
+    def export_table(self, table_name, output_file, format="csv", overwrite=False):
+        """Exporta una tabla a CSV, JSON, Parquet o Arrow IPC y devuelve la ruta final."""
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        output_path = Path(output_file).expanduser().resolve()
+        try:
+            rows = export_table(
+                self.db_path,
+                table_name,
+                output_path,
+                export_format=format,
+                cipher_key=source_key,
+                overwrite=overwrite,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+        logger.info("Exportadas %d filas en formato %s a %s", rows, format, output_path)
+        return str(output_path)
+
+    def export_query(
+        self,
+        query,
+        output_file,
+        format="csv",
+        params=(),
+        limit=None,
+        overwrite=False,
+    ):
+        """Exporta el resultado de una consulta de solo lectura y devuelve la ruta final."""
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        output_path = Path(output_file).expanduser().resolve()
+        try:
+            rows = export_query(
+                self.db_path,
+                query,
+                output_path,
+                export_format=format,
+                params=params,
+                limit=limit,
+                cipher_key=source_key,
+                overwrite=overwrite,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+        logger.info("Exportadas %d filas en formato %s a %s", rows, format, output_path)
+        return str(output_path)
+
+    def export_incremental(
+        self,
+        table_name,
+        output_file,
+        key="rowid",
+        target=None,
+        format="csv",
+        overwrite=False,
+        since=None,
+        persist=True,
+    ):
+        """Exporta solo las filas nuevas desde la última marca de agua de ``target``.
+
+        Con ``persist=False`` se parte de ``since`` y no se guarda ninguna marca.
+        """
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return incremental_export.export_incremental(
+                self.db_path,
+                table_name,
+                output_file,
+                key=key,
+                target=target,
+                since=since,
+                persist=persist,
+                export_format=format,
+                cipher_key=source_key,
+                overwrite=overwrite,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+    def reset_watermark(self, table_name, target=None):
+        """Olvida la marca de agua para que la próxima exportación sea completa."""
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return incremental_export.reset_watermark(
+                self.db_path, table_name, target, cipher_key=source_key
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+
+    def export_session(self, immutable=False):
+        """Abre una sesión que exporta varias tablas o consultas desde una misma instantánea.
+
+        Úsala como gestor de contexto; ``immutable`` solo es seguro con archivos
+        que no cambian mientras la sesión está abierta.
+        """
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        session = ExportSession(self.db_path, cipher_key=source_key, immutable=immutable)
+        try:
+            return session.open()
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+    def export_database(
+        self,
+        output_dir,
+        tables=None,
+        workers=None,
+        format="csv",
+        overwrite=False,
+        consistent=True,
+        progress=None,
+    ):
+        """Exporta varias tablas (o todas) en paralelo desde una misma instantánea."""
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return export_database(
+                self.db_path,
+                output_dir,
+                tables=tables,
+                workers=workers,
+                export_format=format,
+                cipher_key=source_key,
+                overwrite=overwrite,
+                consistent=consistent,
+                progress=progress,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al exportar datos: {e}") from e
+
+    def import_csv(
+        self,
+        table_name,
+        source_file,
+        column_types=None,
+        create=True,
+        delimiter=",",
+        batch_size=bulk_import.INSERT_BATCH_SIZE,
+        commit_every=None,
+        defer_indexes=True,
+        progress=None,
+    ):
+        """Carga un CSV con encabezados en ``table_name`` mediante inserciones por lotes."""
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return bulk_import.import_csv(
+                self.db_path,
+                table_name,
+                source_file,
+                column_types=column_types,
+                create=create,
+                delimiter=delimiter,
+                batch_size=batch_size,
+                commit_every=commit_every,
+                defer_indexes=defer_indexes,
+                cipher_key=source_key,
+                progress=progress,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al importar datos: {e}") from e
+
+    def import_ndjson(
+        self,
+        table_name,
+        source_file,
+        column_types=None,
+        create=True,
+        batch_size=bulk_import.INSERT_BATCH_SIZE,
+        commit_every=None,
+        defer_indexes=True,
+        progress=None,
+    ):
+        """Carga un archivo NDJSON (un objeto por línea) en ``table_name``."""
+
+        try:
+            escape_sqlite_identifier(table_name)
+        except ValueError as exc:
+            raise ValueError(f"Nombre de tabla inválido: {table_name}") from exc
+
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return bulk_import.import_ndjson(
+                self.db_path,
+                table_name,
+                source_file,
+                column_types=column_types,
+                create=create,
+                batch_size=batch_size,
+                commit_every=commit_every,
+                defer_indexes=defer_indexes,
+                cipher_key=source_key,
+                progress=progress,
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error al importar datos: {e}") from e
+
+    def enable_change_capture(self, tables, retention_rows=change_log.DEFAULT_RETENTION_ROWS):
+        """Instala los triggers de captura de cambios en ``tables``."""
+
+        return self._with_change_log(
+            change_log.enable_change_capture, tables, retention_rows=retention_rows
+        )
+
+    def disable_change_capture(self, tables, purge=False):
+        """Retira los triggers de captura; con ``purge`` borra también sus cambios."""
+
+        return self._with_change_log(change_log.disable_change_capture, tables, purge=purge)
+
+    def read_changes(self, since=0, limit=1000, tables=None):
+        """Lee un lote de cambios con secuencia mayor que ``since``."""
+
+        return self._with_change_log(change_log.read_changes, since, limit=limit, tables=tables)
+
+    def compact_changes(self, up_to_seq=None, older_than=None, keep_last=None):
+        """Compacta el registro de cambios y devuelve cuántos se eliminaron."""
+
+        return self._with_change_log(
+            change_log.compact_changes,
+            up_to_seq=up_to_seq,
+            older_than=older_than,
+            keep_last=keep_last,
+        )
+
+    def _with_change_log(self, func, *args, **kwargs):
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return func(self.db_path, *args, cipher_key=source_key, **kwargs)
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error en el registro de cambios: {e}") from e
+
     cpdef str backup_database(self):
         """Crea una copia de seguridad de la base de datos."""
         cdef object backup_file = Path(self.backup_dir) / f"backup_{self._get_timestamp()}.db"
@@ -185,6 +455,22 @@ cdef class SQLiteReplication:
         except Exception as e:
             raise RuntimeError(f"Error en la replicación: {e}") from e
 
+    def replicate_to_many(self, targets, workers=None):
+        """Replica la base en varios destinos leyendo el origen una sola vez.
+
+        Devuelve un resultado por destino; los fallos individuales no detienen
+        al resto y quedan en ``error``.
+        """
+        source_key = self.cipher_key if self.cipher_key and self.cipher_key.strip() else None
+        try:
+            return replication_fanout.replicate_to_many(
+                self.db_path, targets, workers=workers, cipher_key=source_key
+            )
+        except SQLitePlusCipherError as exc:
+            raise RuntimeError(str(exc)) from exc
+        except Exception as e:
+            raise RuntimeError(f"Error en la replicación: {e}") from e
+
     cpdef object _get_timestamp(self):
         """Genera un timestamp para los nombres de archivo."""
         import datetime
@@ -214,9 +500,6 @@ cdef class SQLiteReplication:
         cdef object base_target = Path(target_path)
         cdef list copied_files = []
         cdef str suffix
-        cdef Py_ssize_t read_bytes
-        buf = bytearray(1024 * 1024)
-        mv = memoryview(buf)
 
         for suffix in ("-wal", "-shm"):
             src_file = base_source.with_name(base_source.name + suffix)
@@ -224,14 +507,7 @@ cdef class SQLiteReplication:
                 dest_file = base_target.with_name(base_target.name + suffix)
                 if dest_file.exists():
                     dest_file.unlink()
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                with src_file.open("rb") as src, dest_file.open("wb") as dest:
-                    while True:
-                        read_bytes = src.readinto(buf)
-                        if read_bytes == 0:
-                            break
-                        dest.write(mv[:read_bytes])
-                shutil.copystat(src_file, dest_file, follow_symlinks=True)
+                copy_file_fast(src_file, dest_file)
                 copied_files.append(str(dest_file))
 
         return copied_files
@@ -268,8 +544,7 @@ cdef class SQLiteReplication:
                 f"No se pudo copiar la base de datos {source}: el archivo no existe"
             )
 
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, destination)
+        copy_file_fast(source, destination)
         self._copy_wal_and_shm(source, destination)
         return None
 
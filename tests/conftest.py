@@ -15,11 +15,21 @@ from httpx import AsyncClient, ASGITransport
 
 if "SECRET_KEY" not in os.environ:
     os.environ["SECRET_KEY"] = secrets.token_urlsafe(32)
+# Sin inotify, las pruebas esperan detectar cambios del archivo de usuarios al instante.
+os.environ.setdefault("SQLITEPLUS_USERS_POLL_INTERVAL", "0")
+
+from sqliteplus.core.settings import follow_environment
+
+# Las pruebas cambian variables con ``monkeypatch`` sobre la marcha: se relee el entorno
+# en cada consulta en lugar de usar la instantánea de producción.
+follow_environment(True)
 
 from sqliteplus.main import app  # Importa desde la nueva estructura
 from sqliteplus.core.db import db_manager
 
 from sqliteplus.auth.users import reset_user_service_cache
+from sqliteplus.auth.jwt import reset_jwt_cache
+from sqliteplus.auth.password_pool import reset_password_pool
 from sqliteplus.auth.rate_limit import reset_login_rate_limiter
 
 MODULES_TO_RELOAD = (
@@ -65,6 +75,20 @@ def configure_user_store():
     reset_user_service_cache()
 
 
+@pytest.fixture(autouse=True, scope="function")
+def reset_verified_token_cache():
+    reset_jwt_cache()
+    yield
+    reset_jwt_cache()
+
+
+@pytest.fixture(autouse=True, scope="function")
+def reset_password_pool_state():
+    reset_password_pool(max_workers=4, max_queue=32, queue_timeout=5.0)
+    yield
+    reset_password_pool(max_workers=4, max_queue=32, queue_timeout=5.0)
+
+
 @pytest.fixture(autouse=True, scope="function")
 def reset_auth_rate_limit_state():
     reset_login_rate_limiter(
@@ -128,6 +152,7 @@ def speedup_variants(monkeypatch):
         for stub_module in (
             "sqliteplus.core._schemas_fast",
             "sqliteplus.core._schemas_columns",
+            "sqliteplus.core._schemas_rows",
         ):
             sys.modules.pop(stub_module, None)
 
@@ -139,6 +164,7 @@ def speedup_variants(monkeypatch):
     for stub_module in (
         "sqliteplus.core._schemas_fast",
         "sqliteplus.core._schemas_columns",
+        "sqliteplus.core._schemas_rows",
     ):
         sys.modules.pop(stub_module, None)
     _reload_speedup_modules()
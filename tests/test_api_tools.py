@@ -1,3 +1,5 @@
+import sqlite3
+
 import pytest
 from httpx import AsyncClient
 
@@ -74,3 +76,123 @@ async def test_export_nonexistent_table(client: AsyncClient, auth_headers: dict)
         headers=auth_headers
     )
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_table_parquet_endpoint(client: AsyncClient, auth_headers: dict):
+    pa = pytest.importorskip("pyarrow")
+    import io
+
+    import pyarrow.parquet as pq
+
+    db_name = "test_tools_export"
+    table_name = "export_parquet"
+    await client.post(
+        f"/databases/{db_name}/create_table?table_name={table_name}",
+        json={"columns": {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "score": "REAL"}},
+        headers=auth_headers,
+    )
+    await client.post(
+        f"/databases/{db_name}/insert?table_name={table_name}",
+        json={"values": {"name": "Alice", "score": 95.5}},
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        f"/databases/{db_name}/export/{table_name}?format=parquet",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.schema.field("id").type == pa.int64()
+    assert table.schema.field("score").type == pa.float64()
+    assert table.column("name").to_pylist() == ["Alice"]
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(client: AsyncClient, auth_headers: dict):
+    response = await client.get(
+        "/databases/test_tools_export/export/export_test?format=xml",
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_incremental_endpoint(client: AsyncClient, auth_headers: dict):
+    db_name = "test_tools_export"
+    table_name = "export_incremental"
+    await client.post(
+        f"/databases/{db_name}/create_table?table_name={table_name}",
+        json={"columns": {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}},
+        headers=auth_headers,
+    )
+    for name in ("a", "b"):
+        await client.post(
+            f"/databases/{db_name}/insert?table_name={table_name}",
+            json={"values": {"name": name}},
+            headers=auth_headers,
+        )
+    url = f"/databases/{db_name}/export/{table_name}?incremental=true&key=id"
+
+    first = await client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.headers["x-sqliteplus-rows"] == "2"
+    token = first.headers["x-sqliteplus-watermark"]
+    assert token
+
+    await client.post(
+        f"/databases/{db_name}/insert?table_name={table_name}",
+        json={"values": {"name": "c"}},
+        headers=auth_headers,
+    )
+    second = await client.get(url + f"&since={token}&format=json", headers=auth_headers)
+    assert second.status_code == 200
+    assert second.json() == [{"id": 3, "name": "c"}]
+
+    # El servidor no guarda la marca: si la descarga anterior se perdió, repetir
+    # la petición con el mismo token devuelve las mismas filas.
+    retry = await client.get(url + f"&since={token}&format=json", headers=auth_headers)
+    assert retry.json() == [{"id": 3, "name": "c"}]
+    assert retry.headers["x-sqliteplus-watermark"] == second.headers["x-sqliteplus-watermark"]
+
+    from sqliteplus.api import endpoints
+    from sqliteplus.utils.incremental_export import WATERMARK_TABLE
+
+    with sqlite3.connect(endpoints.db_manager.get_database_path(db_name)) as conn:
+        assert conn.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name = ?", (WATERMARK_TABLE,)
+        ).fetchone() == (0,)
+
+
+@pytest.mark.asyncio
+async def test_export_incremental_endpoint_rejects_foreign_tokens(client: AsyncClient, auth_headers: dict):
+    from sqliteplus.utils.incremental_export import encode_watermark
+
+    db_name = "test_tools_export"
+    table_name = "export_incremental_tokens"
+    await client.post(
+        f"/databases/{db_name}/create_table?table_name={table_name}",
+        json={"columns": {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}},
+        headers=auth_headers,
+    )
+    base = f"/databases/{db_name}/export/{table_name}"
+
+    invalid = await client.get(base + "?incremental=true&since=no-es-un-token", headers=auth_headers)
+    other_key = await client.get(
+        base + f"?incremental=true&key=name&since={encode_watermark('id', 2)}", headers=auth_headers
+    )
+    not_incremental = await client.get(base + f"?since={encode_watermark('id', 2)}", headers=auth_headers)
+    target = await client.get(base + "?incremental=true&target=cli", headers=auth_headers)
+
+    assert invalid.status_code == 400
+    assert other_key.status_code == 400
+    assert not_incremental.status_code == 400
+    # ``target`` ya no existe en la API: no puede mover la marca de otro consumidor.
+    assert target.status_code == 200
+    from sqliteplus.api import endpoints
+    from sqliteplus.utils.incremental_export import get_watermark
+
+    assert get_watermark(endpoints.db_manager.get_database_path(db_name), table_name, "cli") is None
@@ -17,7 +17,15 @@ import jwt
 import bcrypt
 
 from sqliteplus.main import app
-from sqliteplus.auth.jwt import ALGORITHM, generate_jwt, get_secret_key, verify_jwt
+from sqliteplus.auth.jwt import (
+    ALGORITHM,
+    VerifiedTokenCache,
+    generate_jwt,
+    get_jwt_cache_metrics,
+    get_secret_key,
+    reset_jwt_cache,
+    verify_jwt,
+)
 from sqliteplus.auth.rate_limit import (
     get_login_rate_limit_metrics,
     reset_login_rate_limiter,
@@ -29,6 +37,15 @@ from sqliteplus.auth.users import (
     UserSourceError,
 )
 import sqliteplus.auth.users as users_module
+from sqliteplus.auth import file_watch
+from sqliteplus.auth.password_pool import (
+    PasswordPoolSaturatedError,
+    PasswordPoolTimeoutError,
+    PasswordVerificationPool,
+    get_password_pool_metrics,
+    password_pool,
+    reset_password_pool,
+)
 
 TOKEN_PATH = app.url_path_for("login")
 
@@ -100,6 +117,72 @@ async def test_login_hides_users_backend_error_details(monkeypatch):
     assert "backend" not in detail.lower()
 
 
+class _BlockingCredentials:
+    def __init__(self):
+        import threading
+
+        self.release = threading.Event()
+
+    def verify_credentials(self, username, password):
+        self.release.wait(5)
+        return password == "ok"
+
+
+@pytest.mark.asyncio
+async def test_password_pool_caps_concurrency_and_times_out_queued_requests():
+    pool = PasswordVerificationPool(max_workers=1, max_queue=1, queue_timeout=0.05)
+    service = _BlockingCredentials()
+    try:
+        running = asyncio.create_task(pool.verify(service, "admin", "ok"))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(pool.verify(service, "admin", "ok"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordPoolSaturatedError):
+            await pool.verify(service, "admin", "ok")
+        with pytest.raises(PasswordPoolTimeoutError):
+            await queued
+        metrics = pool.metrics_snapshot()
+        assert (metrics["running"], metrics["saturation"]) == (1, 0.5)
+
+        service.release.set()
+        assert await running is True
+    finally:
+        service.release.set()
+        pool.shutdown()
+
+    metrics = pool.metrics_snapshot()
+    assert metrics["rejected_total"] == 1
+    assert metrics["timed_out_total"] == 1
+    assert metrics["peak_in_flight"] == 2
+    assert metrics["in_flight"] == 0
+    assert metrics["latency_ms"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_password_pool_is_saturated():
+    reset_password_pool(max_workers=1, max_queue=0)
+    blocker = _BlockingCredentials()
+    holder = asyncio.create_task(password_pool.verify(blocker, "x", "y"))
+    await asyncio.sleep(0.01)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            res = await ac.post(TOKEN_PATH, data={"username": "admin", "password": "admin"})
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == "1"
+        assert get_password_pool_metrics()["rejected_total"] == 1
+    finally:
+        blocker.release.set()
+        await holder
+        reset_password_pool(max_queue=32)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        res = await ac.post(TOKEN_PATH, data={"username": "admin", "password": "admin"})
+    assert res.status_code == 200
+    assert get_password_pool_metrics()["completed_total"] == 1
+
+
 @pytest.mark.asyncio
 async def test_protected_endpoint_requires_subject_claim():
     token_without_sub = jwt.encode(
@@ -215,6 +298,46 @@ def test_jwt_valid_token_with_strict_claims(monkeypatch):
     assert subject == "admin"
 
 
+def test_verify_jwt_caches_verified_tokens_until_secret_rotation(monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", secrets.token_urlsafe(32))
+    reset_jwt_cache(max_entries=8)
+    token = generate_jwt("admin")
+
+    assert verify_jwt(token) == "admin"
+    decode_calls = []
+    original_decode = jwt.decode
+    monkeypatch.setattr(
+        jwt, "decode", lambda *args, **kwargs: decode_calls.append(1) or original_decode(*args, **kwargs)
+    )
+    assert verify_jwt(token) == "admin"
+    assert decode_calls == []
+    metrics = get_jwt_cache_metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["size"]) == (1, 1, 1)
+
+    monkeypatch.setenv("SECRET_KEY", secrets.token_urlsafe(32))
+    with pytest.raises(HTTPException) as excinfo:
+        verify_jwt(token)
+    assert excinfo.value.status_code == 401
+    assert decode_calls == [1]
+    assert get_jwt_cache_metrics()["invalidations"] == 1
+
+
+def test_verified_token_cache_expires_and_evicts_entries():
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.put("a", "cfg", "alice", expires_at=100.0)
+    cache.put("b", "cfg", "bob", expires_at=200.0)
+
+    assert cache.get("a", "cfg", now=50.0) == "alice"
+    cache.put("c", "cfg", "carol", expires_at=200.0)
+    assert cache.get("b", "cfg", now=50.0) is None
+    assert cache.get("a", "cfg", now=100.0) is None
+    assert cache.metrics_snapshot()["evictions"] == 1
+
+    disabled = VerifiedTokenCache(max_entries=0)
+    disabled.put("a", "cfg", "alice", expires_at=100.0)
+    assert disabled.get("a", "cfg", now=0.0) is None
+
+
 def _write_users_file(path, password: str, *, timestamp_offset: float = 0.0) -> None:
     hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
     path.write_text(json.dumps({"admin": hashed_password}), encoding="utf-8")
@@ -287,6 +410,54 @@ def test_reload_user_service_force_refresh(tmp_path, monkeypatch):
     assert reloaded_service.verify_credentials("admin", "changed-pass")
 
 
+def test_user_service_hot_path_skips_filesystem_until_file_is_replaced(tmp_path, monkeypatch):
+    users_file = tmp_path / "users.json"
+    _write_users_file(users_file, "old-secret", timestamp_offset=1)
+    monkeypatch.setenv("SQLITEPLUS_USERS_FILE", str(users_file))
+    monkeypatch.setenv("SQLITEPLUS_USERS_POLL_INTERVAL", "3600")
+    reset_user_service_cache()
+
+    service = get_user_service()
+
+    def _no_provider():
+        raise AssertionError("la ruta caliente no debe reconstruir el proveedor")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(users_module, "JsonFileUserProvider", _no_provider)
+        assert all(get_user_service() is service for _ in range(5))
+
+    replacement = tmp_path / "users.json.tmp"
+    _write_users_file(replacement, "new-secret", timestamp_offset=2)
+    os.replace(replacement, users_file)
+
+    if isinstance(users_module._watcher, file_watch.InotifyFileWatcher):
+        refreshed = get_user_service()
+        assert refreshed is not service
+        assert refreshed.verify_credentials("admin", "new-secret")
+    else:
+        # Con sondeo, el cambio se detecta al vencer el intervalo.
+        assert get_user_service() is service
+
+
+def test_polling_file_watcher_throttles_stat_calls(tmp_path, monkeypatch):
+    users_file = tmp_path / "users.json"
+    _write_users_file(users_file, "a", timestamp_offset=1)
+    watcher = file_watch.PollingFileWatcher(users_file, poll_interval=3600)
+    assert watcher.has_changes()
+    watcher.mark_synced(file_watch.file_signature(users_file))
+
+    _write_users_file(users_file, "b", timestamp_offset=2)
+    assert not watcher.has_changes()
+
+    watcher.poll_interval = 0
+    assert watcher.has_changes()
+
+    monkeypatch.setattr(file_watch.sys, "platform", "darwin")
+    fallback = file_watch.create_file_watcher([users_file], poll_interval=2)
+    assert isinstance(fallback, file_watch.PollingFileWatcher)
+    assert fallback.poll_interval == 2
+
+
 @pytest.mark.skipif(os.name != "posix", reason="La verificación de permisos aplica solo en POSIX")
 def test_user_service_accepts_secure_users_file_permissions(tmp_path, monkeypatch):
     users_file = tmp_path / "users.json"
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+
+import pytest
+
+from sqliteplus.utils.blob_stream import (
+    BlobNotFoundError,
+    UnsatisfiableRangeError,
+    open_blob,
+    parse_byte_range,
+)
+
+DB_NAME = "test_db_api"
+TABLE_NAME = "logs"
+PAYLOAD = os.urandom(300_000)
+
+
+def test_parse_byte_range_follows_rfc_9110():
+    assert parse_byte_range(None, 100) is None
+    assert parse_byte_range("bytes=0-9", 100) == (0, 9)
+    assert parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert parse_byte_range("bytes=-10", 100) == (90, 99)
+    assert parse_byte_range("bytes=-500", 100) == (0, 99)
+    assert parse_byte_range("bytes=50-5000", 100) == (50, 99)
+    for ignored in ("items=0-1", "bytes=0-1,5-6", "bytes=9-1", "bytes=a-b", "bytes=-"):
+        assert parse_byte_range(ignored, 100) is None
+    for unsatisfiable in ("bytes=100-", "bytes=-0"):
+        with pytest.raises(UnsatisfiableRangeError):
+            parse_byte_range(unsatisfiable, 100)
+
+
+@pytest.mark.parametrize("use_blobopen", [True, False])
+def test_blob_reader_streams_in_chunks(tmp_path, use_blobopen):
+    db_path = tmp_path / "adjuntos.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE adjuntos (id INTEGER PRIMARY KEY, datos BLOB, nota TEXT, n INTEGER)")
+        conn.execute("INSERT INTO adjuntos VALUES (1, ?, 'ñandú', 7)", (PAYLOAD,))
+        conn.execute("INSERT INTO adjuntos VALUES (2, NULL, NULL, NULL)")
+
+    reader = open_blob(db_path, "adjuntos", "datos", 1, use_blobopen=use_blobopen)
+    assert reader.size == len(PAYLOAD)
+    chunks = list(reader.iter_range(1000, 250_000, chunk_size=64 * 1024))
+    if use_blobopen:
+        assert max(len(chunk) for chunk in chunks) == 64 * 1024
+    assert b"".join(chunks) == PAYLOAD[1000:250_000]
+    with pytest.raises(ValueError, match="cerrado"):
+        reader.read(0, 1)
+
+    text = open_blob(db_path, "adjuntos", "nota", 1, use_blobopen=use_blobopen)
+    assert b"".join(text.iter_range(0, text.size)) == "ñandú".encode()
+
+    with pytest.raises(BlobNotFoundError, match="Fila 3"):
+        open_blob(db_path, "adjuntos", "datos", 3, use_blobopen=use_blobopen)
+    with pytest.raises(BlobNotFoundError, match="no tiene valor"):
+        open_blob(db_path, "adjuntos", "datos", 2, use_blobopen=use_blobopen)
+    with pytest.raises(ValueError, match="no contiene un BLOB"):
+        open_blob(db_path, "adjuntos", "n", 1, use_blobopen=use_blobopen)
+    with pytest.raises(sqlite3.OperationalError, match="no such column"):
+        open_blob(db_path, "adjuntos", "falta", 1, use_blobopen=use_blobopen)
+
+
+@pytest.mark.asyncio
+async def test_blob_endpoint_supports_range_requests(client, auth_headers):
+    from sqliteplus.api import endpoints
+
+    res_create = await client.post(
+        f"/databases/{DB_NAME}/create_table",
+        params={"table_name": TABLE_NAME},
+        json={"columns": {"id": "INTEGER PRIMARY KEY", "payload": "BLOB", "level": "INTEGER"}},
+        headers=auth_headers,
+    )
+    assert res_create.status_code == 200
+    await endpoints.db_manager.execute_many(
+        DB_NAME, f"INSERT INTO {TABLE_NAME} (payload, level) VALUES (?, ?)", [(PAYLOAD, 1)]
+    )
+    url = f"/databases/{DB_NAME}/blob/{TABLE_NAME}/payload/1"
+
+    full = await client.get(url, headers=auth_headers)
+    assert full.status_code == 200
+    assert full.headers["content-type"] == "application/octet-stream"
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-length"] == str(len(PAYLOAD))
+    assert full.content == PAYLOAD
+
+    partial = await client.get(url, headers={**auth_headers, "Range": "bytes=100000-100099"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 100000-100099/{len(PAYLOAD)}"
+    assert partial.content == PAYLOAD[100000:100100]
+
+    tail = await client.get(url, headers={**auth_headers, "Range": "bytes=-10"})
+    assert tail.status_code == 206 and tail.content == PAYLOAD[-10:]
+
+    beyond = await client.get(url, headers={**auth_headers, "Range": f"bytes={len(PAYLOAD)}-"})
+    assert beyond.status_code == 416
+    assert beyond.headers["content-range"] == f"bytes */{len(PAYLOAD)}"
+
+    assert (await client.get(f"/databases/{DB_NAME}/blob/{TABLE_NAME}/payload/2", headers=auth_headers)).status_code == 404
+    assert (await client.get(f"/databases/{DB_NAME}/blob/{TABLE_NAME}/level/1", headers=auth_headers)).status_code == 400
+    assert (await client.get(f"/databases/{DB_NAME}/blob/no_existe/payload/1", headers=auth_headers)).status_code == 404
+    assert (await client.get(f"/databases/{DB_NAME}/blob/{TABLE_NAME}/pay;load/1", headers=auth_headers)).status_code == 400
+    assert (await client.get(url)).status_code == 401
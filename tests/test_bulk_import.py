@@ -0,0 +1,191 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sqliteplus.cli import cli
+from sqliteplus.utils.replication_sync import SQLiteReplication
+
+
+def _write_csv(path: Path, rows: int = 12) -> None:
+    lines = ["id,name,score,zip"]
+    lines += [f"{i},user {i},{i * 1.5},0{i:04d}" for i in range(rows)]
+    lines.append(f"{rows},,,")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_import_csv_creates_table_with_inferred_types(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "people.csv"
+    _write_csv(source)
+    progress = []
+
+    result = SQLiteReplication(db_path=str(db_path)).import_csv(
+        "people", source, batch_size=5, progress=progress.append
+    )
+
+    assert result.created
+    assert result.rows == 13
+    assert result.column_types == {"id": "INTEGER", "name": "TEXT", "score": "REAL", "zip": "TEXT"}
+    assert progress == [5, 10, 13]
+    assert result.rows_per_second > 0
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT typeof(id), score, zip FROM people WHERE id = 2").fetchone() == (
+            "integer",
+            3.0,
+            "00002",
+        )
+        assert conn.execute("SELECT score, name FROM people WHERE id = 12").fetchone() == (None, "")
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+
+
+def test_import_csv_into_existing_table_recreates_deferred_indexes(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "people.csv"
+    _write_csv(source, rows=3)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE people (id INTEGER, name TEXT, score REAL, zip TEXT, extra TEXT)")
+        conn.execute("CREATE INDEX idx_people_name ON people(name)")
+        conn.execute("CREATE UNIQUE INDEX idx_people_id ON people(id)")
+
+    result = SQLiteReplication(db_path=str(db_path)).import_csv(
+        "people", source, column_types={"score": "TEXT"}
+    )
+
+    assert not result.created
+    assert result.column_types["score"] == "REAL"
+    with sqlite3.connect(db_path) as conn:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert indexes == {"idx_people_name", "idx_people_id"}
+        assert conn.execute("SELECT COUNT(*) FROM people").fetchone()[0] == 4
+
+
+def test_import_csv_is_atomic_by_default(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "broken.csv"
+    source.write_text("id,name\n1,a\n2,b\n3\n", encoding="utf-8")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER, name TEXT)")
+        conn.execute("CREATE INDEX idx_items_name ON items(name)")
+
+    replicator = SQLiteReplication(db_path=str(db_path))
+    with pytest.raises(ValueError, match="Se esperaban 2 columnas"):
+        replicator.import_csv("items", source, batch_size=1)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_items_name'"
+        ).fetchone()[0] == 1
+
+    with pytest.raises(ValueError):
+        replicator.import_csv("items", source, batch_size=1, commit_every=1)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_items_name'"
+        ).fetchone()[0] == 1
+
+
+def test_import_ndjson_infers_types_and_serializes_nested_values(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "events.ndjson"
+    records = [
+        {"id": 1, "ok": True, "ratio": 1, "tags": ["a"]},
+        {"id": 2, "ok": False, "ratio": 0.5, "meta": {"k": 1}},
+        {"id": 3, "ratio": None},
+    ]
+    source.write_text("\n".join(json.dumps(r) for r in records) + "\n\n", encoding="utf-8")
+
+    result = SQLiteReplication(db_path=str(db_path)).import_ndjson("events", source)
+
+    assert result.rows == 3
+    assert result.column_types == {
+        "id": "INTEGER",
+        "ok": "INTEGER",
+        "ratio": "REAL",
+        "tags": "TEXT",
+        "meta": "TEXT",
+    }
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT id, ok, tags, meta FROM events ORDER BY id").fetchall()
+    assert rows == [(1, 1, '["a"]', None), (2, 0, None, '{"k": 1}'), (3, None, None, None)]
+
+
+def test_import_rejects_invalid_identifiers_and_missing_tables(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "people.csv"
+    _write_csv(source, rows=1)
+    replicator = SQLiteReplication(db_path=str(db_path))
+
+    with pytest.raises(ValueError, match="Nombre de tabla inválido"):
+        replicator.import_csv("", source)
+    with pytest.raises(ValueError, match="no existe"):
+        replicator.import_csv("people", source, create=False)
+
+
+def test_import_cli_reports_throughput(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "people.jsonl"
+    source.write_text('{"id": 1, "age": "41"}\n{"id": 2, "age": "38"}\n', encoding="utf-8")
+
+    result = CliRunner().invoke(
+        cli,
+        ["import", "people", str(source), "--column", "age:INTEGER", "--db-path", str(db_path)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Importación completada" in result.output
+    assert "filas/s" in result.output
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT typeof(age) FROM people").fetchone() == ("integer",)
+
+
+def test_import_cli_rejects_malformed_column_types(tmp_path):
+    source = tmp_path / "people.csv"
+    _write_csv(source, rows=1)
+
+    result = CliRunner().invoke(
+        cli,
+        ["import", "people", str(source), "--column", "age", "--db-path", str(tmp_path / "x.db")],
+    )
+
+    assert result.exit_code != 0
+    assert "columna:TIPO" in result.output
+
+
+def test_import_rejects_column_types_outside_create_table_rules(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "people.csv"
+    _write_csv(source, rows=1)
+    replicator = SQLiteReplication(db_path=str(db_path))
+
+    with pytest.raises(ValueError, match="Tipo de dato no permitido"):
+        replicator.import_csv("people", source, column_types={"id": "INTEGER, injected TEXT DEFAULT 'pwn'"})
+
+    result = replicator.import_csv("people", source, column_types={"name": "text not null default 'Sin Nombre'"})
+
+    assert result.column_types["name"] == "TEXT NOT NULL DEFAULT 'Sin Nombre'"
+    with sqlite3.connect(db_path) as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(people)")]
+        default = conn.execute("SELECT dflt_value FROM pragma_table_info('people') WHERE name = 'name'").fetchone()
+    assert columns == ["id", "name", "score", "zip"]
+    assert default == ("'Sin Nombre'",)
+
+
+def test_import_cli_rejects_injected_column_type(tmp_path):
+    db_path = tmp_path / "import.db"
+    source = tmp_path / "people.csv"
+    _write_csv(source, rows=1)
+
+    result = CliRunner().invoke(
+        cli,
+        ["import", "people", str(source), "--column", "id:INTEGER, evil TEXT", "--db-path", str(db_path)],
+    )
+
+    assert result.exit_code != 0
+    assert "Tipo de dato no permitido" in result.output
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT count(*) FROM sqlite_master WHERE name = 'people'").fetchone() == (0,)
@@ -0,0 +1,165 @@
+import json
+import sqlite3
+
+import pytest
+from click.testing import CliRunner
+from httpx import AsyncClient
+
+from sqliteplus.cli import cli
+from sqliteplus.utils import change_log
+from sqliteplus.utils.replication_sync import SQLiteReplication
+
+
+def _prepare(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, payload BLOB)")
+        conn.execute("CREATE TABLE other (value TEXT)")
+    replicator = SQLiteReplication(db_path=str(db_path))
+    replicator.enable_change_capture(["items", "other"])
+    return replicator
+
+
+def test_triggers_record_inserts_updates_and_deletes(tmp_path):
+    db_path = tmp_path / "cdc.db"
+    replicator = _prepare(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO items (name, payload) VALUES ('a', x'00ff')")
+        conn.execute("UPDATE items SET name = 'b' WHERE id = 1")
+        conn.execute("UPDATE items SET id = 7 WHERE id = 1")
+        conn.execute("DELETE FROM items")
+        conn.execute("INSERT INTO other VALUES ('x')")
+
+    batch = replicator.read_changes()
+
+    summary = [(c.seq, c.table, c.operation, c.rowid) for c in batch.changes]
+    assert summary == [
+        (1, "items", "insert", 1),
+        (2, "items", "update", 1),
+        (3, "items", "delete", 1),
+        (4, "items", "update", 7),
+        (5, "items", "delete", 7),
+        (6, "other", "insert", 1),
+    ]
+    assert batch.changes[0].data == {"id": 1, "name": "a", "payload": "hex:00FF"}
+    assert batch.changes[4].data == {"id": 7}
+    assert batch.changes[5].data == {"value": "x"}
+    assert (batch.last_seq, batch.has_more, batch.truncated) == (6, False, False)
+
+
+def test_read_changes_in_batches_with_table_filter(tmp_path):
+    db_path = tmp_path / "cdc.db"
+    replicator = _prepare(db_path)
+    with sqlite3.connect(db_path) as conn:
+        for index in range(5):
+            conn.execute("INSERT INTO items (name) VALUES (?)", (f"n{index}",))
+            conn.execute("INSERT INTO other VALUES (?)", (f"v{index}",))
+
+    first = replicator.read_changes(0, limit=2, tables=["items"])
+    assert [c.data["name"] for c in first.changes] == ["n0", "n1"]
+    assert first.has_more
+    second = replicator.read_changes(first.last_seq, limit=10, tables=["items"])
+    assert [c.data["name"] for c in second.changes] == ["n2", "n3", "n4"]
+    assert not second.has_more
+    assert replicator.read_changes(second.last_seq).changes[-1].seq == 10
+
+
+def test_automatic_and_manual_compaction_flag_truncated_readers(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_log, "COMPACT_EVERY", 4)
+    db_path = tmp_path / "cdc.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    replicator = SQLiteReplication(db_path=str(db_path))
+    replicator.enable_change_capture(["items"], retention_rows=3)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany("INSERT INTO items (name) VALUES (?)", [(str(i),) for i in range(9)])
+
+    batch = replicator.read_changes(0)
+    # En la secuencia 8 el trigger conserva solo las 3 últimas (6, 7, 8) más la 9.
+    assert [c.seq for c in batch.changes] == [6, 7, 8, 9]
+    assert batch.truncated
+    assert not replicator.read_changes(5).truncated
+
+    assert replicator.compact_changes(up_to_seq=7) == 2
+    assert replicator.read_changes(6).truncated
+    assert replicator.compact_changes(keep_last=1) == 1
+    assert [c.seq for c in replicator.read_changes(0).changes] == [9]
+
+    replicator.disable_change_capture(["items"], purge=True)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('after')")
+    assert replicator.read_changes(0).changes == []
+    assert change_log.tracked_tables(db_path) == []
+
+
+def test_enable_rejects_unknown_and_internal_tables(tmp_path):
+    db_path = tmp_path / "cdc.db"
+    replicator = _prepare(db_path)
+
+    with pytest.raises(ValueError, match="no existe"):
+        replicator.enable_change_capture(["missing"])
+    with pytest.raises(ValueError, match="interna"):
+        replicator.enable_change_capture([change_log.CHANGES_TABLE])
+    with pytest.raises(FileNotFoundError):
+        SQLiteReplication(db_path=str(tmp_path / "nope.db")).read_changes()
+
+
+def test_cdc_cli_enable_read_and_compact(tmp_path):
+    db_path = tmp_path / "cdc.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["cdc", "enable", "items", "--db-path", str(db_path)])
+    assert result.exit_code == 0, result.output
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany("INSERT INTO items (name) VALUES (?)", [("a",), ("b",), ("c",)])
+
+    result = runner.invoke(
+        cli, ["cdc", "read", "--since", "1", "--limit", "1", "--all", "--json", "--db-path", str(db_path)]
+    )
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [(line["seq"], line["data"]["name"]) for line in lines] == [(2, "b"), (3, "c")]
+
+    result = runner.invoke(cli, ["cdc", "compact", "--up-to", "2", "--db-path", str(db_path)])
+    assert result.exit_code == 0, result.output
+    assert "2 cambios eliminados" in result.output
+
+
+@pytest.mark.asyncio
+async def test_changes_endpoint_returns_batches(client: AsyncClient, auth_headers: dict):
+    from sqliteplus.core.db import db_manager
+
+    db_name = "test_tools_export"
+    table_name = "cdc_items"
+    await client.post(
+        f"/databases/{db_name}/create_table?table_name={table_name}",
+        json={"columns": {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}},
+        headers=auth_headers,
+    )
+    db_path = db_manager.get_database_path(db_name)
+    replicator = SQLiteReplication(db_path=str(db_path))
+    replicator.disable_change_capture([table_name], purge=True)
+    replicator.enable_change_capture([table_name])
+    start = replicator.read_changes(0, limit=10_000).last_seq
+    for name in ("a", "b"):
+        await client.post(
+            f"/databases/{db_name}/insert?table_name={table_name}",
+            json={"values": {"name": name}},
+            headers=auth_headers,
+        )
+
+    response = await client.get(
+        f"/databases/{db_name}/changes?since={start}&limit=1&table={table_name}",
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["has_more"] is True
+    assert [change["data"]["name"] for change in payload["changes"]] == ["a"]
+    assert payload["last_seq"] == payload["changes"][0]["seq"] > start
+
+    invalid = await client.get(f"/databases/{db_name}/changes?since=-1", headers=auth_headers)
+    assert invalid.status_code == 422
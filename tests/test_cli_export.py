@@ -1,6 +1,7 @@
 import base64
 import json
 import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 from click.testing import CliRunner
@@ -386,6 +387,97 @@ def test_backup_and_replication_preserve_wal_changes(tmp_path):
     assert values == [("desde_wal",)]
 
 
+def test_replicate_to_many_writes_every_target_from_wal_source(tmp_path):
+    db_path = tmp_path / "wal_source.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL;").fetchone()
+    conn.execute("CREATE TABLE data (id INTEGER PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO data (value) VALUES ('desde_wal')")
+    conn.commit()
+
+    first = tmp_path / "a" / "replica.db"
+    second = tmp_path / "b" / "replica.db"
+    second.parent.mkdir()
+    second.write_bytes(b"contenido viejo")
+    Path(str(second) + "-wal").write_bytes(b"wal obsoleto")
+
+    try:
+        results = SQLiteReplication(db_path=str(db_path)).replicate_to_many(
+            [first, second, first], workers=2
+        )
+    finally:
+        conn.close()
+
+    assert [result.target for result in results] == [str(first), str(second)]
+    assert all(result.ok and result.strategy for result in results)
+    assert not Path(str(second) + "-wal").exists()
+    for replica in (first, second):
+        with sqlite3.connect(replica) as replica_conn:
+            assert replica_conn.execute("SELECT value FROM data").fetchall() == [("desde_wal",)]
+    assert not list(tmp_path.glob("a/.sqliteplus-fanout-*"))
+
+
+@pytest.mark.parametrize("journal_mode", ["wal", "delete"])
+def test_replicate_to_many_keeps_open_replica_readers_consistent(tmp_path, journal_mode):
+    db_path = tmp_path / "source.db"
+    _prepare_database(db_path)
+    replica = tmp_path / "replica.db"
+    with closing(sqlite3.connect(replica)) as setup:
+        setup.execute(f"PRAGMA journal_mode={journal_mode}")
+        setup.execute("CREATE TABLE stale (id INTEGER)")
+        setup.execute("INSERT INTO stale VALUES (1)")
+        setup.commit()
+
+    reader = sqlite3.connect(replica)
+    try:
+        assert reader.execute("SELECT count(*) FROM stale").fetchone() == (1,)
+        results = SQLiteReplication(db_path=str(db_path)).replicate_to_many([replica])
+
+        assert results[0].ok, results[0].error
+        assert results[0].strategy == "backup"
+        # El lector sigue en el mismo archivo y ve la réplica nueva, no el inode viejo.
+        assert reader.execute("SELECT count(*) FROM valid_table").fetchone() == (2,)
+        assert reader.execute("SELECT count(*) FROM sqlite_master WHERE name = 'stale'").fetchone() == (0,)
+        assert reader.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+    finally:
+        reader.close()
+
+
+def test_replicate_to_many_reports_failures_per_target(tmp_path):
+    db_path = tmp_path / "source.db"
+    _prepare_database(db_path)
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("x")
+    good = tmp_path / "good.db"
+    replicator = SQLiteReplication(db_path=str(db_path))
+
+    results = replicator.replicate_to_many([good, blocker / "replica.db"])
+
+    assert results[0].ok
+    assert not results[1].ok and results[1].path is None
+    with sqlite3.connect(good) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM valid_table").fetchone()[0] == 2
+
+    with pytest.raises(RuntimeError, match="coincide con la base de origen"):
+        replicator.replicate_to_many([db_path])
+    with pytest.raises(RuntimeError, match="No se encontró"):
+        SQLiteReplication(db_path=str(tmp_path / "missing.db")).replicate_to_many([good])
+
+
+def test_replicate_cli_summarizes_targets(tmp_path):
+    db_path = tmp_path / "source.db"
+    _prepare_database(db_path)
+    targets = [tmp_path / "r1.db", tmp_path / "r2.db"]
+
+    result = CliRunner().invoke(
+        cli, ["replicate", *map(str, targets), "--workers", "2", "--db-path", str(db_path)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Replicación completada" in result.output
+    assert all(target.exists() for target in targets)
+
+
 def test_backup_database_reuses_cipher_key(tmp_path, monkeypatch):
         key = "clave-secreta"
         calls = []
@@ -499,3 +591,359 @@ def test_export_to_csv_accepts_spaces_and_dash(tmp_path):
 
     assert output_spaces.exists()
     assert output_dash.exists()
+
+
+def _prepare_multi_table_database(db_path: Path):
+    _prepare_database(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE "order items" (sku TEXT, qty INTEGER, payload BLOB)')
+        conn.executemany(
+            'INSERT INTO "order items" VALUES (?, ?, ?)',
+            [("A-1", 3, b"\x00\x01"), ("B-2", 5, None)],
+        )
+        conn.execute("CREATE TABLE empty_table (id INTEGER)")
+        conn.execute("CREATE VIEW names AS SELECT name FROM valid_table")
+
+
+def test_export_database_exports_all_tables_in_parallel(tmp_path):
+    db_path = tmp_path / "multi.db"
+    _prepare_multi_table_database(db_path)
+    output_dir = tmp_path / "dump"
+    seen = []
+
+    results = SQLiteReplication(db_path=str(db_path)).export_database(
+        output_dir, workers=3, format="json", progress=lambda result: seen.append(result.table)
+    )
+
+    assert [result.table for result in results] == ["empty_table", "order items", "valid_table"]
+    assert sorted(seen) == sorted(result.table for result in results)
+    assert all(result.ok for result in results)
+    assert json.loads((output_dir / "empty_table.json").read_text(encoding="utf-8")) == []
+    items = json.loads((output_dir / "order items.json").read_text(encoding="utf-8"))
+    assert items[0] == {"sku": "A-1", "qty": 3, "payload": "base64:" + base64.b64encode(b"\x00\x01").decode()}
+    assert items[1]["payload"] is None
+    assert not any(path.name.startswith(".sqliteplus-snapshot-") for path in output_dir.iterdir())
+
+
+def test_export_database_snapshot_ignores_later_writes(tmp_path, monkeypatch):
+    from sqliteplus.utils import bulk_export
+
+    db_path = tmp_path / "multi.db"
+    _prepare_multi_table_database(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+    original_export_one = bulk_export._export_one
+
+    def _export_after_concurrent_write(*args, **kwargs):
+        # En WAL el escritor no se bloquea aunque los lectores sigan abiertos.
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO valid_table (name) VALUES ('Carol')")
+        return original_export_one(*args, **kwargs)
+
+    monkeypatch.setattr(bulk_export, "_export_one", _export_after_concurrent_write)
+    output_dir = tmp_path / "dump"
+    results = SQLiteReplication(db_path=str(db_path)).export_database(
+        output_dir, tables=["valid_table", "order items"], workers=2, format="json"
+    )
+
+    assert [result.rows for result in results] == [2, 2]
+    assert sorted(path.name for path in output_dir.iterdir()) == ["order items.json", "valid_table.json"]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT count(*) FROM valid_table").fetchone()[0] == 4
+
+
+def test_export_db_cli_filters_tables_and_protects_outputs(tmp_path):
+    db_path = tmp_path / "multi.db"
+    _prepare_multi_table_database(db_path)
+    output_dir = tmp_path / "dump"
+    args = [
+        "export-db",
+        str(output_dir),
+        "--table",
+        "valid_table",
+        "--table",
+        "order items",
+        "--workers",
+        "2",
+        "--db-path",
+        str(db_path),
+    ]
+
+    runner = CliRunner()
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 0, result.output
+    assert "Exportación completada" in result.output
+    assert sorted(path.name for path in output_dir.iterdir()) == ["order items.csv", "valid_table.csv"]
+    lines = (output_dir / "valid_table.csv").read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "id,name" and len(lines) == 3
+
+    repeated = runner.invoke(cli, args)
+    assert repeated.exit_code != 0
+    assert "ya existen" in repeated.output
+
+    assert runner.invoke(cli, args + ["--overwrite", "--no-snapshot"]).exit_code == 0
+
+
+def test_export_db_cli_rejects_unknown_table(tmp_path):
+    db_path = tmp_path / "multi.db"
+    _prepare_multi_table_database(db_path)
+
+    result = CliRunner().invoke(
+        cli,
+        ["export-db", str(tmp_path / "dump"), "--table", "missing", "--db-path", str(db_path)],
+    )
+
+    assert result.exit_code != 0
+    assert "no existe" in result.output
+
+
+def test_export_table_parquet_uses_declared_types(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    db_path = tmp_path / "typed.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE metrics (id INTEGER, label VARCHAR(20), value DOUBLE, raw BLOB, flag BOOLEAN)"
+        )
+        conn.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+            [(i, 7 if i == 3 else f"m{i}", i / 2, b"\x01", i % 2) for i in range(5)] + [(None,) * 5],
+        )
+
+    output = SQLiteReplication(db_path=str(db_path)).export_table(
+        "metrics", tmp_path / "metrics.parquet", format="parquet"
+    )
+
+    table = pq.read_table(output)
+    assert [field.type for field in table.schema] == [
+        pa.int64(), pa.string(), pa.float64(), pa.binary(), pa.bool_(),
+    ]
+    assert table.num_rows == 6
+    assert table.column("label").to_pylist()[3] == "7"
+    assert table.column("id").to_pylist()[-1] is None
+
+
+def test_export_database_columnar_handles_loosely_typed_columns(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    db_path = tmp_path / "loose.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE docs (id INTEGER, body JSON, amount NUMERIC, qty INTEGER, extra)")
+        conn.executemany(
+            "INSERT INTO docs VALUES (?, ?, ?, ?, ?)",
+            [
+                (1, '{"a": 1}', 10, 3, 1),
+                (2, "[1, 2]", 2.5, "n/a", "texto"),
+                (3, None, None, None, b"\x00"),
+            ],
+        )
+
+    results = SQLiteReplication(db_path=str(db_path)).export_database(tmp_path / "dump", format="parquet")
+    arrow_path = SQLiteReplication(db_path=str(db_path)).export_table(
+        "docs", tmp_path / "docs.arrow", format="arrow"
+    )
+
+    assert results[0].ok, results[0].error
+    with pa.memory_map(arrow_path) as source:
+        assert pa.ipc.open_file(source).read_all().num_rows == 3
+    table = pq.read_table(tmp_path / "dump" / "docs.parquet")
+    assert table.schema.field("body").type == pa.string()
+    assert table.schema.field("amount").type == pa.float64()
+    assert table.column("body").to_pylist() == ['{"a": 1}', "[1, 2]", None]
+    assert table.column("qty").to_pylist() == ["3", "n/a", None]
+    assert table.column("extra").to_pylist() == ["1", "texto", "\x00"]
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_columnar_writer_widens_column_found_in_later_batch(tmp_path, export_format):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from sqliteplus.utils.columnar_export import write_arrow, write_parquet
+
+    db_path = tmp_path / "mixed.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE mixed (n, v)")
+        conn.executemany(
+            "INSERT INTO mixed VALUES (?, ?)",
+            [(1, 1), (2, 2), (3.5, 3), (4, "cuatro"), (5, 5)],
+        )
+        cursor = conn.execute("SELECT n, v FROM mixed ORDER BY rowid")
+        writer = write_parquet if export_format == "parquet" else write_arrow
+        output = tmp_path / f"mixed.{export_format}"
+        rows = writer(cursor, output, batch_size=2)
+
+    if export_format == "parquet":
+        table = pq.read_table(output)
+    else:
+        with pa.memory_map(str(output)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    assert rows == 5
+    assert table.schema.field("n").type == pa.float64()
+    assert table.schema.field("v").type == pa.string()
+    assert table.column("n").to_pylist() == [1.0, 2.0, 3.5, 4.0, 5.0]
+    assert table.column("v").to_pylist() == ["1", "2", "3", "cuatro", "5"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["mixed.db", output.name])
+
+
+def test_export_query_arrow_in_small_batches(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow as pa
+
+    from sqliteplus.utils.columnar_export import write_arrow
+
+    db_path = tmp_path / "multi.db"
+    _prepare_multi_table_database(db_path)
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.execute("SELECT id, upper(name) AS shout FROM valid_table ORDER BY id")
+        rows = write_arrow(cursor, tmp_path / "q.arrow", batch_size=1)
+
+    with pa.memory_map(str(tmp_path / "q.arrow")) as source:
+        reader = pa.ipc.open_file(source)
+        assert reader.num_record_batches == 2
+        table = reader.read_all()
+    assert rows == 2
+    assert table.column("shout").to_pylist() == ["ALICE", "BOB"]
+
+
+def test_export_query_cli_parquet_respects_limit(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    db_path = tmp_path / "multi.db"
+    _prepare_multi_table_database(db_path)
+    output = tmp_path / "out.parquet"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--db-path",
+            str(db_path),
+            "export-query",
+            "--format",
+            "parquet",
+            "--limit",
+            "1",
+            str(output),
+            "SELECT * FROM valid_table",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert pq.read_table(output).column("name").to_pylist() == ["Alice"]
+
+
+def test_columnar_formats_require_pyarrow(tmp_path, monkeypatch):
+    from sqliteplus.utils import bulk_export
+
+    monkeypatch.setattr(bulk_export, "pyarrow_available", lambda: False)
+    db_path = tmp_path / "multi.db"
+    _prepare_multi_table_database(db_path)
+
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        SQLiteReplication(db_path=str(db_path)).export_database(tmp_path / "dump", format="arrow")
+
+
+def test_export_incremental_tracks_watermark_per_target(tmp_path):
+    db_path = tmp_path / "events.db"
+    _prepare_database(db_path)
+    replicator = SQLiteReplication(db_path=str(db_path))
+
+    first = replicator.export_incremental("valid_table", tmp_path / "a1.csv")
+    assert (first.rows, first.previous_watermark, first.watermark) == (2, None, 2)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO valid_table (name) VALUES ('Carol')")
+
+    second = replicator.export_incremental("valid_table", tmp_path / "a2.json", format="json")
+    assert (second.rows, second.watermark) == (1, 3)
+    assert json.loads((tmp_path / "a2.json").read_text(encoding="utf-8")) == [{"id": 3, "name": "Carol"}]
+
+    other = replicator.export_incremental("valid_table", tmp_path / "b1.csv", target="warehouse")
+    assert other.rows == 3
+
+    empty = replicator.export_incremental("valid_table", tmp_path / "a3.csv")
+    assert (empty.rows, empty.watermark) == (0, 3)
+    assert (tmp_path / "a3.csv").read_text(encoding="utf-8").splitlines() == ["id,name"]
+
+    assert replicator.reset_watermark("valid_table")
+    assert replicator.export_incremental("valid_table", tmp_path / "a4.csv").rows == 3
+
+
+def test_export_incremental_by_column_and_key_mismatch(tmp_path):
+    db_path = tmp_path / "events.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (sku TEXT, updated_at TEXT)")
+        conn.executemany(
+            "INSERT INTO items VALUES (?, ?)",
+            [("a", "2024-01-02"), ("b", "2024-01-01"), ("c", None)],
+        )
+    replicator = SQLiteReplication(db_path=str(db_path))
+
+    result = replicator.export_incremental("items", tmp_path / "1.csv", key="updated_at")
+    assert result.rows == 2
+    assert result.watermark == "2024-01-02"
+    lines = (tmp_path / "1.csv").read_text(encoding="utf-8").splitlines()
+    assert lines[1:] == ["b,2024-01-01", "a,2024-01-02"]
+
+    with pytest.raises(ValueError, match="usa la clave 'updated_at'"):
+        replicator.export_incremental("items", tmp_path / "2.csv")
+    with pytest.raises(ValueError, match="no existe"):
+        replicator.export_incremental("items", tmp_path / "3.csv", key="missing", target="x")
+
+    dump = replicator.export_database(tmp_path / "dump")
+    assert [item.table for item in dump] == ["items"]
+
+
+def test_export_incremental_without_state_leaves_database_untouched(tmp_path):
+    from sqliteplus.utils.incremental_export import (
+        WATERMARK_TABLE,
+        decode_watermark,
+        encode_watermark,
+        get_watermark,
+        reset_watermark,
+    )
+
+    db_path = tmp_path / "events.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (sku, payload BLOB)")
+        conn.executemany("INSERT INTO items VALUES (?, ?)", [(1, b"\x01"), (2, b"\x02"), ("x", b"\x03")])
+    replicator = SQLiteReplication(db_path=str(db_path))
+
+    assert get_watermark(db_path, "items") is None
+    assert reset_watermark(db_path, "items") is False
+    first = replicator.export_incremental("items", tmp_path / "1.csv", key="sku", persist=False, since=1)
+    with pytest.raises(ValueError, match="persist=False"):
+        replicator.export_incremental("items", tmp_path / "2.csv", since=1)
+
+    assert (first.rows, first.target, first.watermark) == (2, None, "x")
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name = ?", (WATERMARK_TABLE,)
+        ).fetchone() == (0,)
+    for value in (2, 2.5, "x", b"\x00\xff"):
+        assert decode_watermark(encode_watermark("sku", value)) == ("sku", value)
+    with pytest.raises(ValueError, match="inválido"):
+        decode_watermark(encode_watermark("sku", 1)[:-2])
+
+
+def test_export_incremental_cli(tmp_path):
+    db_path = tmp_path / "events.db"
+    _prepare_database(db_path)
+    runner = CliRunner()
+    base = ["export-incremental", "valid_table", "--db-path", str(db_path), "--target", "nightly"]
+
+    result = runner.invoke(cli, base[:2] + [str(tmp_path / "1.csv")] + base[2:])
+    assert result.exit_code == 0, result.output
+    assert "2 filas nuevas" in result.output
+
+    result = runner.invoke(cli, base[:2] + [str(tmp_path / "2.csv")] + base[2:])
+    assert result.exit_code == 0, result.output
+    assert "0 filas nuevas" in result.output
+
+    result = runner.invoke(cli, base[:2] + [str(tmp_path / "3.csv")] + base[2:] + ["--reset"])
+    assert result.exit_code == 0, result.output
+    assert "2 filas nuevas" in result.output
@@ -0,0 +1,115 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from sqliteplus.api.rate_limit_middleware import (
+    DataRateLimitMiddleware,
+    install_data_rate_limiter,
+    parse_route_limits,
+    parse_token_bucket_rule,
+)
+from sqliteplus.auth.jwt import generate_jwt
+from sqliteplus.auth.rate_limit_store import InMemoryRateLimitStore
+from sqliteplus.main import app
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def test_parse_route_limits_validates_rules():
+    rule = parse_token_bucket_rule("30/m:5")
+    assert rule.rate == pytest.approx(0.5)
+    assert rule.burst == 5
+    assert parse_token_bucket_rule("2/s").burst == 2
+
+    routes = parse_route_limits('{"default": {"ip": "10/s"}, "export": {"subject": "1/h"}}')
+    assert routes["default"].ip.rate == 10
+    assert routes["export"].subject.rate == pytest.approx(1 / 3600)
+    assert routes["export"].ip is None
+
+    for raw, message in (
+        ('{"fetch": {"ip": "10 por segundo"}}', "Regla de límite inválida"),
+        ('{"fetch": {"ip": "0/s"}}', "fichas > 0"),
+        ('{"listar": {"ip": "1/s"}}', "Ruta desconocida"),
+        ('{"fetch": {"tenant": "1/s"}}', "Ámbitos desconocidos"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            parse_route_limits(raw)
+
+    for raw, message in (
+        ("[]", "debe ser un objeto JSON"),
+        ('{"fetch": "1/s"}', "deben ser un objeto JSON"),
+    ):
+        with pytest.raises(TypeError, match=message):
+            parse_route_limits(raw)
+
+
+@pytest.mark.asyncio
+async def test_middleware_limits_each_database_and_ip_separately():
+    middleware = DataRateLimitMiddleware(
+        _ok_app,
+        routes=parse_route_limits('{"default": {"database": "2/m"}, "fetch": {"ip": "3/m"}}'),
+        store=InMemoryRateLimitStore(),
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=middleware), base_url="http://test") as ac:
+        statuses = [(await ac.post("/databases/equipo/a/insert")).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+        assert (await ac.post("/databases/otra/insert")).status_code == 200
+        assert (await ac.get("/databases/equipo/a/fetch")).status_code == 200
+        assert (await ac.get("/health")).status_code == 200
+
+        await ac.get("/databases/otra/fetch")
+        await ac.get("/databases/otra/fetch")
+        limited = await ac.get("/databases/tercera/fetch")
+
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "20"
+    assert limited.json()["scope"] == "ip"
+    assert middleware.metrics_snapshot() == {
+        "allowed_total": 6,
+        "limited_total": 2,
+        "limited_by_scope": {"subject": 0, "ip": 1, "database": 1},
+    }
+
+
+@pytest.mark.asyncio
+async def test_middleware_limits_authenticated_subjects_on_real_endpoints():
+    limited_app = DataRateLimitMiddleware(
+        app,
+        routes=parse_route_limits('{"fetch": {"subject": "2/h"}}'),
+        store=InMemoryRateLimitStore(),
+    )
+    alice = {"Authorization": f"Bearer {generate_jwt('alice')}"}
+    bob = {"Authorization": f"Bearer {generate_jwt('bob')}"}
+    params = {"table_name": "no_existe"}
+
+    async with AsyncClient(transport=ASGITransport(app=limited_app), base_url="http://test") as ac:
+        for _ in range(2):
+            response = await ac.get("/databases/test_db_api/fetch", params=params, headers=alice)
+            assert response.status_code != 429
+        blocked = await ac.get("/databases/test_db_api/fetch", params=params, headers=alice)
+        other_user = await ac.get("/databases/test_db_api/fetch", params=params, headers=bob)
+        anonymous = await ac.get("/databases/test_db_api/fetch", params=params)
+
+    assert blocked.status_code == 429
+    assert int(blocked.headers["Retry-After"]) == 1800
+    assert other_user.status_code != 429
+    assert anonymous.status_code == 401
+
+
+def test_install_data_rate_limiter_reads_environment(monkeypatch):
+    target = FastAPI()
+    monkeypatch.delenv("SQLITEPLUS_DATA_RATE_LIMITS", raising=False)
+    install_data_rate_limiter(target)
+    assert not target.user_middleware
+
+    monkeypatch.setenv("SQLITEPLUS_DATA_RATE_LIMITS", '{"default": {"ip": "5/s"}}')
+    install_data_rate_limiter(target)
+    assert target.user_middleware[0].cls is DataRateLimitMiddleware
+
+    monkeypatch.setenv("SQLITEPLUS_DATA_RATE_LIMITS", "{no es json")
+    with pytest.raises(RuntimeError, match="SQLITEPLUS_DATA_RATE_LIMITS no es válida"):
+        install_data_rate_limiter(FastAPI())
@@ -0,0 +1,85 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from sqliteplus.utils.export_session import ExportSession
+from sqliteplus.utils.replication_sync import SQLiteReplication
+
+
+def _prepare_wal_database(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL;").fetchone()
+    conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, total REAL)")
+    conn.execute("CREATE TABLE lines (order_id INTEGER, sku TEXT)")
+    conn.execute("INSERT INTO orders (total) VALUES (10), (20)")
+    conn.execute("INSERT INTO lines VALUES (1, 'a'), (2, 'b')")
+    conn.commit()
+    return conn
+
+
+def test_session_exports_every_table_from_the_same_snapshot(tmp_path):
+    db_path = tmp_path / "wal.db"
+    writer = _prepare_wal_database(db_path)
+    replicator = SQLiteReplication(db_path=str(db_path))
+
+    try:
+        with replicator.export_session() as session:
+            assert session.export_table("orders", tmp_path / "orders.csv") == 2
+            # El escritor no espera a la sesión: confirma sin tiempo de espera.
+            writer.execute("PRAGMA busy_timeout = 0")
+            writer.execute("INSERT INTO orders (total) VALUES (30)")
+            writer.execute("INSERT INTO lines VALUES (3, 'c')")
+            writer.commit()
+            assert session.export_table("lines", tmp_path / "lines.csv") == 2
+            rows = session.export_query(
+                "SELECT id, total FROM orders WHERE total > ?",
+                tmp_path / "big.json",
+                export_format="json",
+                params=(5,),
+            )
+            assert rows == 2
+            assert session.tables() == ["lines", "orders"]
+        assert not session.active
+    finally:
+        writer.close()
+
+    with (tmp_path / "lines.csv").open(encoding="utf-8", newline="") as handle:
+        assert list(csv.reader(handle)) == [["order_id", "sku"], ["1", "a"], ["2", "b"]]
+    assert json.loads((tmp_path / "big.json").read_text(encoding="utf-8")) == [
+        {"id": 1, "total": 10.0},
+        {"id": 2, "total": 20.0},
+    ]
+    with replicator.export_session() as session:
+        assert session.export_table("lines", tmp_path / "lines.csv", overwrite=True) == 3
+
+
+def test_session_rejects_statements_that_end_the_snapshot(tmp_path):
+    db_path = tmp_path / "wal.db"
+    _prepare_wal_database(db_path).close()
+
+    session = ExportSession(db_path).open()
+    with pytest.raises(ValueError, match="no existe"):
+        session.export_table("missing", tmp_path / "missing.csv")
+    with pytest.raises(ValueError, match="terminó la transacción"):
+        session.export_query("COMMIT", tmp_path / "commit.csv")
+    assert not session.active
+    with pytest.raises(RuntimeError, match="no está abierta"):
+        session.export_table("orders", tmp_path / "orders.csv")
+
+
+def test_immutable_session_reads_static_files(tmp_path):
+    db_path = tmp_path / "static.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (value TEXT)")
+        conn.execute("INSERT INTO items VALUES ('x')")
+    conn.close()
+
+    with ExportSession(db_path, immutable=True) as session:
+        assert session.export_query("SELECT value FROM items", tmp_path / "items.csv", limit=1) == 1
+        with pytest.raises(sqlite3.OperationalError):
+            session.export_query("INSERT INTO items VALUES ('y') RETURNING value", tmp_path / "w.csv")
+
+    with pytest.raises(FileNotFoundError):
+        SQLiteReplication(db_path=str(tmp_path / "missing.db")).export_session()
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from sqliteplus.api import responses
+from sqliteplus.api.endpoints import _normalize_rows_response, router
+from sqliteplus.api.responses import FastJSONResponse, select_json_backend
+
+
+@pytest.fixture
+def restore_backend():
+    active = responses.get_json_backend()
+    yield
+    select_json_backend(active)
+
+
+def _available_backends() -> list[str]:
+    available = []
+    for backend in responses.JSON_BACKENDS:
+        try:
+            responses._ENCODER_FACTORIES[backend]()
+        except ImportError:
+            continue
+        available.append(backend)
+    return available
+
+
+def test_backends_match_stdlib_for_normalized_rows(restore_backend):
+    payload = _normalize_rows_response(
+        ["id", "nombre", "precio", "foto", "activo"],
+        [
+            (1, "añadido ☃ \"comillas\"", 1.5, b"\x00\xff", True),
+            (2**63 - 1, "", -0.1, None, False),
+            (-(2**63), "línea\nnueva", 1e16, memoryview(b"abc"), None),
+        ],
+    )
+    expected = json.loads(json.dumps(payload, ensure_ascii=False))
+
+    for backend in _available_backends():
+        assert select_json_backend(backend) == backend
+        body = FastJSONResponse(payload).body
+        assert json.loads(body) == expected, backend
+        assert "añadido" in body.decode("utf-8")
+
+
+def test_select_json_backend_validates_names(restore_backend, monkeypatch):
+    assert router.default_response_class is FastJSONResponse
+    with pytest.raises(ValueError, match="Codificador JSON desconocido"):
+        select_json_backend("ujson")
+
+    def _missing():
+        raise ImportError("no instalado")
+
+    monkeypatch.setitem(responses._ENCODER_FACTORIES, "orjson", _missing)
+    monkeypatch.setitem(responses._ENCODER_FACTORIES, "msgspec", _missing)
+    with pytest.raises(RuntimeError, match="'orjson' no está instalado"):
+        select_json_backend("orjson")
+
+    monkeypatch.setenv("SQLITEPLUS_JSON_BACKEND", "auto")
+    assert select_json_backend() == "json"
+    assert responses.dumps_json({"a": [1, None]}) == b'{"a":[1,null]}'
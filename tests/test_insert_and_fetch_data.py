@@ -49,3 +49,93 @@ async def test_insert_into_missing_table_returns_404(client, auth_headers):
 
     assert res_insert.status_code == 404
     assert res_insert.json()["detail"] == f"Tabla '{missing_table}' no encontrada"
+
+
+@pytest.mark.asyncio
+async def test_insert_many_inserts_rows_atomically(client, auth_headers):
+    res_create = await client.post(
+        f"/databases/{DB_NAME}/create_table",
+        params={"table_name": TABLE_NAME},
+        json={"columns": {"id": "INTEGER PRIMARY KEY", "msg": "TEXT UNIQUE", "level": "INTEGER"}},
+        headers=auth_headers,
+    )
+    assert res_create.status_code == 200
+
+    rows = [{" msg": f"mensaje {index}", "level": index} for index in range(50)]
+    res_insert = await client.post(
+        f"/databases/{DB_NAME}/insert_many?table_name={TABLE_NAME}",
+        json={"rows": rows},
+        headers=auth_headers,
+    )
+    assert res_insert.status_code == 200
+    assert res_insert.json()["row_count"] == 50
+
+    mismatched = await client.post(
+        f"/databases/{DB_NAME}/insert_many?table_name={TABLE_NAME}",
+        json={"rows": [{"msg": "a", "level": 1}, {"msg": "b"}]},
+        headers=auth_headers,
+    )
+    assert mismatched.status_code == 422
+    assert "La fila 1 no tiene las mismas columnas" in str(mismatched.json()["detail"])
+
+    duplicated = await client.post(
+        f"/databases/{DB_NAME}/insert_many?table_name={TABLE_NAME}",
+        json={"rows": [{"msg": "nuevo", "level": 1}, {"msg": "mensaje 3", "level": 2}]},
+        headers=auth_headers,
+    )
+    assert duplicated.status_code == 409
+
+    res_fetch = await client.get(f"/databases/{DB_NAME}/fetch?table_name={TABLE_NAME}", headers=auth_headers)
+    fetched = res_fetch.json()["rows"]
+    assert len(fetched) == 50
+    assert not any("nuevo" in str(row) for row in fetched)
+
+
+@pytest.mark.asyncio
+async def test_fetch_negotiates_columnar_and_msgpack_formats(client, auth_headers, monkeypatch):
+    from sqliteplus.api import endpoints
+
+    res_create = await client.post(
+        f"/databases/{DB_NAME}/create_table",
+        params={"table_name": TABLE_NAME},
+        json={"columns": {"id": "INTEGER PRIMARY KEY", "msg": "TEXT", "payload": "BLOB"}},
+        headers=auth_headers,
+    )
+    assert res_create.status_code == 200
+    await endpoints.db_manager.execute_many(
+        DB_NAME,
+        f"INSERT INTO {TABLE_NAME} (msg, payload) VALUES (?, ?)",
+        [("uno", b"\x00\x01\x02"), ("dos", None)],
+    )
+    url = f"/databases/{DB_NAME}/fetch?table_name={TABLE_NAME}"
+
+    default = await client.get(url, headers=auth_headers)
+    assert default.headers["content-type"] == "application/json"
+    assert default.headers["vary"] == "Accept"
+    assert default.json()["rows"] == [[1, "uno", "base64:AAEC"], [2, "dos", None]]
+
+    columnar = await client.get(
+        url, headers={**auth_headers, "Accept": "application/vnd.sqliteplus.columnar+json, */*;q=0.1"}
+    )
+    assert columnar.headers["content-type"] == "application/vnd.sqliteplus.columnar+json"
+    assert columnar.json() == {
+        "columns": ["id", "msg", "payload"],
+        "data": {"id": [1, 2], "msg": ["uno", "dos"], "payload": ["base64:AAEC", None]},
+    }
+    assert (await client.get(f"{url}&format=columnar", headers=auth_headers)).json() == columnar.json()
+    assert (await client.get(f"{url}&format=xml", headers=auth_headers)).status_code == 400
+
+    monkeypatch.setattr(endpoints, "msgpack_available", lambda: False)
+    unavailable = await client.get(f"{url}&format=msgpack", headers=auth_headers)
+    assert unavailable.status_code == 501
+    fallback = await client.get(url, headers={**auth_headers, "Accept": "application/msgpack"})
+    assert fallback.headers["content-type"] == "application/json"
+    monkeypatch.undo()
+
+    msgpack = pytest.importorskip("msgpack")
+    packed = await client.get(url, headers={**auth_headers, "Accept": "application/json;q=0.5, application/msgpack"})
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(packed.content) == {
+        "columns": ["id", "msg", "payload"],
+        "rows": [[1, "uno", b"\x00\x01\x02"], [2, "dos", None]],
+    }
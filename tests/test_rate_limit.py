@@ -1,8 +1,19 @@
+import ipaddress
+import random
+
+import pytest
 from starlette.requests import Request
 
-from sqliteplus.api.client_ip import get_client_ip
+from sqliteplus.api.client_ip import get_client_ip, get_trusted_proxy_matcher
+from sqliteplus.auth import rate_limit_store
 from sqliteplus.auth.rate_limit import LoginRateLimiter
-from sqliteplus.auth.rate_limit_store import InMemoryRateLimitStore
+from sqliteplus.auth.rate_limit_store import (
+    AsyncRedisRateLimitStore,
+    InMemoryRateLimitStore,
+    RedisRateLimitStore,
+    SQLiteRateLimitStore,
+    ThreadedAsyncRateLimitStore,
+)
 
 
 def test_rate_limiter_prunes_inactive_states():
@@ -150,6 +161,238 @@ def test_shared_store_exposes_consistent_metrics_snapshot():
     assert metrics["blocked_requests_total"] == 0
 
 
+def test_in_memory_store_expires_only_due_states_from_heap():
+    store = InMemoryRateLimitStore()
+    limiter = LoginRateLimiter(
+        max_attempts=3,
+        window_seconds=8,
+        base_block_seconds=50,
+        max_block_seconds=50,
+        state_ttl_seconds=10,
+        store=store,
+    )
+
+    for index in range(1000):
+        limiter.register_failure(ip=f"80.0.{index // 256}.{index % 256}", username=None, now=float(index))
+    for now in (1000.0, 1001.0, 1001.5):
+        limiter.register_failure(ip="81.0.0.1", username=None, now=now)
+    limiter.register_success(ip="80.0.3.230", username=None, now=1002.0)
+
+    assert not hasattr(store._ip_states["81.0.0.1"], "__dict__")
+    assert limiter.is_blocked(ip="81.0.0.1", username=None, now=1003.0)
+
+    # Solo vencen las IPs sin actividad desde hace más de ``state_ttl_seconds``.
+    limiter.is_blocked(ip="noise", username=None, now=1005.5)
+    assert set(store._ip_states) == {"80.0.3.228", "80.0.3.229", "80.0.3.230", "80.0.3.231", "81.0.0.1"}
+
+    limiter.is_blocked(ip="noise", username=None, now=1030.0)
+    assert set(store._ip_states) == {"81.0.0.1"}
+    limiter.is_blocked(ip="noise", username=None, now=1060.0)
+    assert not store._ip_states and not store._ip_expiry
+
+
+def test_in_memory_store_evicts_least_recently_seen_unblocked_states():
+    store = InMemoryRateLimitStore()
+    limiter = LoginRateLimiter(
+        max_attempts=2,
+        base_block_seconds=100,
+        max_block_seconds=100,
+        max_states=3,
+        store=store,
+    )
+
+    limiter.register_failure(ip="90.0.0.1", username=None, now=1.0)
+    limiter.register_failure(ip="90.0.0.1", username=None, now=2.0)
+    limiter.register_failure(ip="90.0.0.2", username=None, now=3.0)
+    limiter.register_failure(ip="90.0.0.3", username=None, now=4.0)
+    limiter.is_blocked(ip="90.0.0.2", username=None, now=5.0)
+    limiter.register_failure(ip="90.0.0.4", username=None, now=6.0)
+    limiter.is_blocked(ip="noise", username=None, now=7.0)
+
+    # El bloqueado se conserva aunque sea el más antiguo; sale el menos usado recientemente.
+    assert list(store._ip_states) == ["90.0.0.1", "90.0.0.2", "90.0.0.4"]
+    limiter.register_failure(ip="90.0.0.2", username=None, now=8.0)
+    assert limiter.is_blocked(ip="90.0.0.2", username=None, now=9.0)
+
+
+def _sqlite_limiter(db_path, **kwargs):
+    store = SQLiteRateLimitStore(db_path, prune_interval=0)
+    return LoginRateLimiter(store=store, **kwargs), store
+
+
+def test_sqlite_store_shares_blocks_between_connections(tmp_path):
+    db_path = tmp_path / "rate_limit.db"
+    limiter_a, store_a = _sqlite_limiter(db_path, max_attempts=2, base_block_seconds=5, max_block_seconds=20)
+    limiter_b, store_b = _sqlite_limiter(db_path, max_attempts=2, base_block_seconds=5, max_block_seconds=20)
+    try:
+        limiter_a.register_failure(ip="30.0.0.1", username="erin", now=1.0)
+        limiter_b.register_failure(ip="30.0.0.1", username="erin", now=2.0)
+        assert limiter_a.is_blocked(ip="30.0.0.1", username=None, now=6.9)
+        assert not limiter_b.is_blocked(ip="30.0.0.1", username="erin", now=7.1)
+
+        # La segunda penalización duplica el bloqueo, igual que en memoria.
+        limiter_b.register_failure(ip="30.0.0.2", username="erin", now=8.0)
+        limiter_a.register_failure(ip="30.0.0.3", username="erin", now=9.0)
+        assert limiter_b.is_blocked(ip="30.0.0.9", username="erin", now=18.9)
+
+        limiter_a.register_success(ip="30.0.0.9", username="erin", now=19.0)
+        assert not limiter_b.is_blocked(ip="30.0.0.9", username="erin", now=19.1)
+
+        metrics = limiter_b.metrics_snapshot()
+        assert metrics["failed_attempts_total"] == 4
+        assert metrics["rate_limit_triggered_total"] == 2
+        assert metrics["blocked_requests_total"] == 2
+        assert metrics["failed_by_user"] == {"erin": 4}
+    finally:
+        store_a.close()
+        store_b.close()
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_sqlite_store_matches_in_memory_pruning(tmp_path, backend):
+    kwargs = {
+        "max_attempts": 2,
+        "window_seconds": 10,
+        "base_block_seconds": 20,
+        "max_block_seconds": 20,
+        "state_ttl_seconds": 1,
+        "metrics_ttl_seconds": 15,
+        "max_metrics_keys": 2,
+    }
+    if backend == "sqlite":
+        limiter, _ = _sqlite_limiter(tmp_path / "rate_limit.db", **kwargs)
+    else:
+        limiter = LoginRateLimiter(store=InMemoryRateLimitStore(), **kwargs)
+
+    for index, ip in enumerate(["50.0.0.1", "50.0.0.2", "50.0.0.3"]):
+        limiter.register_failure(ip=ip, username=None, now=1.0 + index)
+    limiter.register_failure(ip="50.0.0.3", username="frank", now=4.0)
+
+    metrics = limiter.metrics_snapshot()
+    assert metrics["failed_by_ip"] == {"50.0.0.2": 1, "50.0.0.3": 2}
+    assert metrics["metrics_dropped_total"] == 1
+    assert limiter.is_blocked(ip="50.0.0.3", username=None, now=5.0)
+
+    limiter.is_blocked(ip="noise", username=None, now=14.5)
+    metrics = limiter.metrics_snapshot()
+    assert (metrics["ip_states_size"], metrics["user_states_size"]) == (1, 0)
+
+    limiter.is_blocked(ip="noise", username=None, now=40.0)
+    metrics = limiter.metrics_snapshot()
+    assert (metrics["ip_states_size"], metrics["user_states_size"]) == (0, 0)
+    assert metrics["metrics_ip_size"] == 0
+
+
+@pytest.fixture
+def fake_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    commands: list[str] = []
+    execute_command = client.execute_command
+
+    def counting_execute_command(*args, **kwargs):
+        commands.append(str(args[0]).upper())
+        return execute_command(*args, **kwargs)
+
+    client.execute_command = counting_execute_command
+    yield client, commands, server
+    client.flushall()
+
+
+def test_redis_store_uses_one_round_trip_per_operation(fake_redis):
+    client, commands, _ = fake_redis
+    store = RedisRateLimitStore(client=client)
+    limiter = LoginRateLimiter(max_attempts=2, base_block_seconds=5, max_block_seconds=20, store=store)
+
+    limiter.register_failure(ip="60.0.0.1", username="gina", now=1.0)
+    commands.clear()
+    limiter.register_failure(ip="60.0.0.1", username="gina", now=2.0)
+    assert limiter.is_blocked(ip="60.0.0.1", username=None, now=6.9)
+    limiter.register_success(ip="60.0.0.2", username="gina", now=7.0)
+    assert commands == ["EVALSHA", "EVALSHA", "EVALSHA"]
+
+    assert not limiter.is_blocked(ip="60.0.0.2", username="gina", now=7.1)
+    limiter.register_failure(ip="60.0.0.1", username=None, now=8.0)
+    limiter.register_failure(ip="60.0.0.1", username=None, now=9.0)
+    assert limiter.is_blocked(ip="60.0.0.1", username=None, now=18.9)
+
+    metrics = limiter.metrics_snapshot()
+    assert metrics["failed_attempts_total"] == 4
+    assert metrics["failed_attempts_user_total"] == 2
+    assert metrics["rate_limit_triggered_total"] == 2
+    assert metrics["blocked_requests_total"] == 2
+    assert (metrics["ip_states_size"], metrics["user_states_size"]) == (1, 1)
+    assert metrics["failed_by_ip"] == {"60.0.0.1": 4}
+
+
+def test_redis_store_caps_metrics_and_resets_with_scan(fake_redis):
+    client, commands, _ = fake_redis
+    client.set("otra:app:clave", "1")
+    store = RedisRateLimitStore(client=client, scan_count=2)
+    limiter = LoginRateLimiter(max_attempts=10, max_metrics_keys=3, store=store)
+
+    for index in range(5):
+        limiter.register_failure(ip=f"70.0.0.{index}", username=f"user{index}", now=1.0 + index)
+
+    metrics = limiter.metrics_snapshot()
+    assert sorted(metrics["failed_by_ip"]) == ["70.0.0.2", "70.0.0.3", "70.0.0.4"]
+    assert metrics["metrics_dropped_total"] == 4
+
+    commands.clear()
+    limiter.reset()
+    assert "KEYS" not in commands and "SCAN" in commands
+    assert client.keys("*") == ["otra:app:clave"]
+
+
+@pytest.mark.asyncio
+async def test_async_limiter_uses_in_memory_store_without_thread_hop(monkeypatch, tmp_path):
+    async def no_thread_hop(*args, **kwargs):
+        pytest.fail("el almacén en memoria no debe saltar a otro hilo")
+
+    monkeypatch.setattr(rate_limit_store.asyncio, "to_thread", no_thread_hop)
+    limiter = LoginRateLimiter(max_attempts=2, base_block_seconds=10, max_block_seconds=10)
+    limiter.reset(store=InMemoryRateLimitStore())
+
+    await limiter.register_failure_async(ip="100.0.0.1", username="hugo", now=1.0)
+    limiter.register_failure(ip="100.0.0.1", username="hugo", now=2.0)
+    assert await limiter.is_blocked_async(ip="100.0.0.9", username="hugo", now=3.0)
+    await limiter.register_success_async(ip="100.0.0.9", username="hugo", now=4.0)
+    assert not limiter.is_blocked(ip="100.0.0.9", username="hugo", now=5.0)
+    assert (await limiter.metrics_snapshot_async())["blocked_requests_total"] == 1
+
+    sqlite_store = SQLiteRateLimitStore(tmp_path / "rate_limit.db")
+    assert isinstance(sqlite_store.as_async(), ThreadedAsyncRateLimitStore)
+    sqlite_store.close()
+
+
+@pytest.mark.asyncio
+async def test_async_redis_store_shares_state_with_sync_store(fake_redis):
+    fakeredis = pytest.importorskip("fakeredis")
+    client, _, server = fake_redis
+    async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    limiter = LoginRateLimiter(
+        max_attempts=2,
+        base_block_seconds=5,
+        max_block_seconds=5,
+        store=RedisRateLimitStore(client=client),
+        async_store=AsyncRedisRateLimitStore(client=async_client),
+    )
+
+    await limiter.register_failure_async(ip="110.0.0.1", username="iris", now=1.0)
+    await limiter.register_failure_async(ip="110.0.0.1", username="iris", now=2.0)
+    assert limiter.is_blocked(ip="110.0.0.1", username=None, now=3.0)
+    assert await limiter.is_blocked_async(ip="110.0.0.2", username="iris", now=3.0)
+
+    metrics = await limiter.metrics_snapshot_async()
+    assert metrics == limiter.metrics_snapshot()
+    assert (metrics["ip_states_size"], metrics["blocked_requests_total"]) == (1, 2)
+
+    await limiter._async_store.reset()
+    assert client.keys("*") == []
+
+
 def _build_request(*, client_host: str, headers: list[tuple[bytes, bytes]] | None = None) -> Request:
     scope = {
         "type": "http",
@@ -197,3 +440,29 @@ def test_client_ip_prioritizes_forwarded_header_over_xff(monkeypatch):
     )
 
     assert get_client_ip(request) == "198.51.100.9"
+
+
+def test_trusted_proxy_matcher_matches_linear_scan_and_follows_config(monkeypatch):
+    rng = random.Random(7)
+    ranges = [f"{rng.randrange(1, 224)}.{rng.randrange(256)}.0.0/{rng.randrange(12, 25)}" for _ in range(2000)]
+    ranges += ["2606:4700::/32", "2400:cb00::/32", "10.0.0.0/8", "10.1.0.0/16"]
+    monkeypatch.setenv("TRUSTED_PROXIES", ",".join(ranges))
+
+    matcher = get_trusted_proxy_matcher()
+    assert get_trusted_proxy_matcher() is matcher
+    networks = [ipaddress.ip_network(value, strict=False) for value in ranges]
+    candidates = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(2000)]
+    candidates += ["10.255.255.255", "11.0.0.0", "2606:4700::1", "2606:4701::1", "no-es-ip", "unknown"]
+    for candidate in candidates:
+        try:
+            expected = any(ipaddress.ip_address(candidate) in network for network in networks)
+        except ValueError:
+            expected = False
+        assert matcher.contains(candidate) is expected
+
+    request = _build_request(client_host="10.9.8.7", headers=[(b"x-forwarded-for", b"198.51.100.7")])
+    assert get_client_ip(request) == "198.51.100.7"
+
+    monkeypatch.setenv("TRUSTED_PROXIES", "192.0.2.1")
+    assert get_trusted_proxy_matcher() is not matcher
+    assert get_client_ip(request) == "10.9.8.7"
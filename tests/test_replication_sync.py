@@ -1,9 +1,12 @@
+import errno
+import os
+import shutil
 import sqlite3
 from pathlib import Path
 
 import pytest
 
-from sqliteplus.utils import replication_sync
+from sqliteplus.utils import file_copy, replication_sync
 from sqliteplus.utils.constants import DEFAULT_DB_PATH
 
 
@@ -57,3 +60,59 @@ def test_replication_fails_when_package_source_is_missing(tmp_path, monkeypatch)
 
     with pytest.raises(FileNotFoundError):
         replication_sync.SQLiteReplication(db_path=str(package_db))
+
+
+@pytest.mark.parametrize("strategy", file_copy.COPY_STRATEGIES)
+def test_copy_file_fast_produces_identical_copies(tmp_path, strategy):
+    source = tmp_path / "origen.db-wal"
+    payload = os.urandom(3 * 1024 * 1024 + 123)
+    source.write_bytes(payload)
+    destination = tmp_path / "destino" / "copia.db-wal"
+
+    used = file_copy.copy_file_fast(source, destination, strategies=[strategy])
+
+    assert used in file_copy.available_copy_strategies()
+    if strategy not in file_copy.available_copy_strategies():
+        assert used == "userspace"
+    assert destination.read_bytes() == payload
+    assert destination.stat().st_mtime == pytest.approx(source.stat().st_mtime)
+
+
+def test_copy_file_fast_falls_back_when_kernel_copy_is_unsupported(tmp_path, monkeypatch):
+    source = tmp_path / "origen.db"
+    source.write_bytes(b"x" * 4096)
+    destination = tmp_path / "copia.db"
+
+    def _unsupported(*_args, **_kwargs):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(file_copy.os, "copy_file_range", _unsupported, raising=False)
+    monkeypatch.setattr(file_copy.os, "sendfile", _unsupported, raising=False)
+    monkeypatch.setitem(file_copy._IMPLEMENTATIONS, "reflink", _unsupported)
+
+    used = file_copy.copy_file_fast(source, destination)
+
+    assert used == "userspace"
+    assert destination.read_bytes() == b"x" * 4096
+
+
+def test_copy_file_fast_rejects_unknown_strategies(tmp_path):
+    source = tmp_path / "origen.db"
+    source.write_bytes(b"datos")
+
+    with pytest.raises(ValueError):
+        file_copy.copy_file_fast(source, tmp_path / "copia.db", strategies=["teleport"])
+
+
+def test_copy_file_fast_refuses_to_copy_a_file_onto_itself(tmp_path):
+    source = tmp_path / "origen.db"
+    payload = os.urandom(1000)
+    source.write_bytes(payload)
+    hard_link = tmp_path / "enlace.db"
+    os.link(source, hard_link)
+
+    for destination in (source, hard_link):
+        with pytest.raises(shutil.SameFileError):
+            file_copy.copy_file_fast(source, destination)
+
+    assert source.read_bytes() == payload
@@ -0,0 +1,122 @@
+import dataclasses
+import os
+import secrets
+import signal
+
+import pytest
+from starlette.requests import Request
+
+import sqliteplus.core.settings as settings_module
+from sqliteplus.api.client_ip import get_client_ip
+from sqliteplus.auth.jwt import generate_jwt, verify_jwt
+from sqliteplus.core.settings import Settings, follow_environment, get_settings, reload_settings
+
+
+@pytest.fixture
+def snapshot_settings():
+    follow_environment(False)
+    yield
+    follow_environment(True)
+
+
+def _request(client_host: str, headers: list[tuple[bytes, bytes]]) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (client_host, 1)})
+
+
+def test_settings_snapshot_is_immutable_until_reloaded(snapshot_settings, monkeypatch):
+    monkeypatch.setenv("TRUSTED_PROXIES", "203.0.113.10")
+    monkeypatch.setenv("JWT_STRICT_CLAIMS", "yes")
+    monkeypatch.setenv("SQLITEPLUS_USERS_POLL_INTERVAL", "no-numérico")
+    settings = reload_settings()
+
+    assert get_settings() is settings
+    assert settings.jwt_strict_claims is True
+    assert settings.users_poll_interval == 1.0
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.trusted_proxies = None
+
+    monkeypatch.setenv("TRUSTED_PROXIES", "192.0.2.1")
+    request = _request("203.0.113.10", [(b"x-forwarded-for", b"198.51.100.7")])
+    assert get_settings() is settings
+    assert get_client_ip(request) == "198.51.100.7"
+
+    reloaded = reload_settings()
+    assert reloaded is not settings
+    assert reloaded.trusted_proxies == "192.0.2.1"
+    assert get_client_ip(request) == "203.0.113.10"
+
+
+def test_hot_paths_do_not_read_environment(snapshot_settings, monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", secrets.token_urlsafe(32))
+    monkeypatch.delenv("JWT_STRICT_CLAIMS", raising=False)
+    reload_settings()
+    token = generate_jwt("alice")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("no debe releer el entorno")
+
+    monkeypatch.setattr(Settings, "from_env", classmethod(_fail))
+    assert verify_jwt(token) == "alice"
+    assert get_client_ip(_request("198.51.100.1", [])) == "198.51.100.1"
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="requiere SIGHUP")
+def test_sighup_reloads_settings(snapshot_settings, monkeypatch):
+    previous = signal.getsignal(signal.SIGHUP)
+    monkeypatch.setattr(settings_module, "_sighup_installed", False)
+    try:
+        assert settings_module.install_sighup_reload()
+        monkeypatch.setenv("SQLITEPLUS_ENV", "Staging")
+        assert get_settings().environment != "staging"
+
+        os.kill(os.getpid(), signal.SIGHUP)
+
+        assert get_settings().environment == "staging"
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+
+
+def test_settings_file_overrides_environment_on_reload(snapshot_settings, monkeypatch, tmp_path):
+    settings_file = tmp_path / "sqliteplus.env"
+    settings_file.write_text(
+        "# configuración recargable\nexport SQLITEPLUS_ENV=Staging\nTRUSTED_PROXIES='10.0.0.0/8'\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("SQLITEPLUS_SETTINGS_FILE", str(settings_file))
+    monkeypatch.setenv("SQLITEPLUS_ENV", "production")
+    monkeypatch.setenv("JWT_STRICT_CLAIMS", "yes")
+
+    settings = reload_settings()
+    assert settings.environment == "staging"
+    assert settings.trusted_proxies == "10.0.0.0/8"
+    assert settings.jwt_strict_claims is True
+
+    settings_file.write_text("SQLITEPLUS_ENV=Testing\n", encoding="utf-8")
+    assert reload_settings().environment == "testing"
+
+    settings_file.write_text("SQLITEPLUS_ENV\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="CLAVE=valor"):
+        reload_settings()
+    assert get_settings().environment == "testing"
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="requiere SIGHUP")
+def test_sighup_rereads_settings_file_and_keeps_snapshot_on_errors(snapshot_settings, monkeypatch, tmp_path):
+    settings_file = tmp_path / "sqliteplus.env"
+    settings_file.write_text("SQLITEPLUS_ENV=staging\n", encoding="utf-8")
+    monkeypatch.setenv("SQLITEPLUS_SETTINGS_FILE", str(settings_file))
+    reload_settings()
+    previous = signal.getsignal(signal.SIGHUP)
+    monkeypatch.setattr(settings_module, "_sighup_installed", False)
+    try:
+        assert settings_module.install_sighup_reload()
+
+        settings_file.write_text("SQLITEPLUS_ENV=testing\n", encoding="utf-8")
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert get_settings().environment == "testing"
+
+        settings_file.unlink()
+        os.kill(os.getpid(), signal.SIGHUP)
+        assert get_settings().environment == "testing"
+    finally:
+        signal.signal(signal.SIGHUP, previous)
@@ -116,3 +116,135 @@ def test_replication_exports_identical_results(speedup_variants, tmp_path):
     with fallback_sync.sqlite3.connect(new_target) as conn:
         rows = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
     assert rows == 4
+
+
+def test_schema_caches_match_uncached_impl_across_variants(speedup_variants):
+    cython_schemas, _, _ = speedup_variants(force_fallback=False)
+    fallback_schemas, _, _ = speedup_variants(force_fallback=True)
+
+    valid_names = {"tabla1": "tabla1", " _tabla2 ": "_tabla2"}
+    invalid_names = ["otra;tabla", "a/*b", "tabla\x07", "", "   "]
+    columns = {" id ": "integer primary key", "nombre": "text not null default 'x'"}
+
+    results = []
+    for module in (cython_schemas, fallback_schemas):
+        module.clear_schema_caches()
+        for _ in range(3):
+            for name, escaped in valid_names.items():
+                assert module.is_valid_sqlite_identifier(name) == bool(module._is_valid_sqlite_identifier_impl(name))
+                assert module.escape_sqlite_identifier(name) == escaped
+            for name in invalid_names:
+                assert module.is_valid_sqlite_identifier(name) is False
+                with pytest.raises(ValueError):
+                    module.escape_sqlite_identifier(name)
+
+            normalized = module.CreateTableSchema(columns=columns).normalized_columns()
+            assert normalized == module._normalize_columns_impl(columns)
+            # El resultado es una copia: mutarlo no contamina la caché.
+            normalized["mutado"] = "TEXT"
+
+        # Los errores no se memorizan: cada intento vuelve a validar y a fallar.
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                module.CreateTableSchema(columns={"id": "INTEGER; DROP TABLE x"}).normalized_columns()
+
+        stats = module.get_schema_cache_stats()
+        assert stats["normalized_columns"] == {
+            "hits": 2,
+            "misses": 3,
+            "size": 1,
+            "max_size": module.COLUMNS_CACHE_SIZE,
+        }
+        assert stats["escaped_identifiers"]["size"] == len(valid_names) + len(invalid_names)
+        results.append(stats)
+
+    assert results[0] == results[1]
+
+
+def test_batch_insert_validation_matches_per_row_schema(speedup_variants):
+    cython_schemas, _, _ = speedup_variants(force_fallback=False)
+    fallback_schemas, _, _ = speedup_variants(force_fallback=True)
+
+    rows = [{" user_id ": index, "comment": f"texto {index}", "score": index / 2} for index in range(20)]
+    rows[5] = {"score": 2.5, "comment": "otro orden", " user_id ": 5}
+    expected_rows = [fallback_schemas.InsertDataSchema(values=row).values for row in rows]
+
+    for module in (cython_schemas, fallback_schemas):
+        columns, params = module.validate_insert_rows(rows)
+        assert columns == ["user_id", "comment", "score"]
+        assert [dict(zip(columns, values)) for values in params] == expected_rows
+
+        with pytest.raises(ValueError, match="La fila 2 no tiene las mismas columnas"):
+            module.validate_insert_rows(rows[:2] + [{"user_id": 1, "comment": "x", "score": 1}])
+        with pytest.raises(TypeError, match="La fila 1 debe ser un objeto JSON"):
+            module.validate_insert_rows(rows[:1] + [["no", "es", "objeto"]])
+        with pytest.raises(ValueError, match="Nombre de columna inválido"):
+            module.validate_insert_rows([{"col;umna": 1}])
+        with pytest.raises(ValueError, match="al menos una fila"):
+            module.validate_insert_rows([])
+
+
+def test_row_normalizer_matches_per_cell_normalization(tmp_path):
+    from datetime import date
+    from decimal import Decimal
+
+    from sqliteplus.utils import json_serialization
+
+    with sqlite3.connect(tmp_path / "ancha.db") as conn:
+        conn.execute("CREATE TABLE ancha (id INTEGER, nombre TEXT, foto BLOB, precio NUMERIC, alta TEXT)")
+        conn.executemany(
+            "INSERT INTO ancha VALUES (?, ?, ?, ?, ?)",
+            [(index, f"fila {index}", bytes([index % 256]) * 3, index / 4, None) for index in range(600)],
+        )
+        # SQLite no impone tipos: un BLOB en una columna INTEGER fuera de la muestra.
+        conn.execute("UPDATE ancha SET id = x'00ff' WHERE id = 500")
+        cursor = conn.execute("SELECT * FROM ancha")
+        rows = cursor.fetchall()
+        description = cursor.description
+
+    rows[3] = rows[3][:3] + (Decimal("1.25"), date(2024, 5, 1))
+    rows[400] = rows[400][:3] + (Decimal("NaN"), "2024-05-01")
+
+    normalizer = json_serialization.build_row_normalizer(
+        description, ["INTEGER", "TEXT", "BLOB", "NUMERIC", "TEXT"], rows
+    )
+    assert normalizer.kinds == (None, None, "blob", "decimal", "temporal")
+    assert normalizer.converted_columns == (2, 3, 4)
+
+    expected = [[json_serialization.normalize_json_value(value) for value in row] for row in rows]
+    assert normalizer(rows) == expected
+    assert json_serialization.build_row_normalizer(description)(rows) == expected
+
+    implementations = [json_serialization._py_normalize_rows]
+    try:
+        from sqliteplus.utils import _json_rows
+    except ImportError:
+        pass
+    else:
+        implementations.append(_json_rows.normalize_rows)
+    for implementation in implementations:
+        assert implementation(rows, normalizer._plan, json_serialization.normalize_json_value) == expected
+    assert normalizer.columns(rows) == [list(column) for column in zip(*expected)]
+
+    binary = json_serialization.build_row_normalizer(description, sample_rows=rows, binary=True)
+    assert binary.converted_columns == (3, 4)
+    expected_binary = [[json_serialization.normalize_binary_value(value) for value in row] for row in rows]
+    assert binary(rows) == expected_binary
+    assert binary.columns(rows) == [list(column) for column in zip(*expected_binary)]
+
+
+def test_binary_row_normalizer_keeps_bytes_in_converted_columns():
+    from datetime import date
+    from decimal import Decimal
+
+    from sqliteplus.utils import json_serialization
+
+    sample = [(Decimal("1.5"), date(2024, 5, 1), Decimal(2)), (None, None, date(2024, 1, 1))]
+    rows = [*sample, (b"ab", b"cd", b"ef"), (Decimal("3.25"), date(2024, 5, 2), "texto")]
+    normalizer = json_serialization.build_row_normalizer(["precio", "alta", "mezcla"], sample_rows=sample, binary=True)
+    assert normalizer.kinds == ("decimal", "temporal", "mixed")
+
+    expected = [[json_serialization.normalize_binary_value(value) for value in row] for row in rows]
+    assert expected[2] == [b"ab", b"cd", b"ef"]
+    assert normalizer(rows) == expected
+    assert normalizer.columns(rows) == [list(column) for column in zip(*expected)]
@@ -0,0 +1,93 @@
+import json
+import sqlite3
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import sqliteplus.auth.users as users_module
+from sqliteplus.auth.providers import SQLiteUserProvider, UserSourceError
+from sqliteplus.auth.users import get_user_service, reset_user_service_cache
+from sqliteplus.main import app
+
+
+def _hash(password: str) -> str:
+    return users_module._hash_password(password, rounds=4)
+
+
+@pytest.fixture
+def users_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "users.db"
+    monkeypatch.setenv("SQLITEPLUS_USERS_DB", str(db_path))
+    monkeypatch.delenv("SQLITEPLUS_USERS_DB_KEY", raising=False)
+    assert users_module._main(["init"]) == 0
+    reset_user_service_cache()
+    yield db_path
+    reset_user_service_cache()
+
+
+def test_cli_manages_users_in_sqlite_store(users_db, tmp_path, capsys):
+    assert users_module._main(["add", "alice", "s3creta", "--rounds", "4"]) == 0
+
+    source = tmp_path / "users.json"
+    source.write_text(json.dumps({"bob": _hash("b"), "alice": _hash("otra")}), encoding="utf-8")
+    assert users_module._main(["import", str(source), "--keep-existing"]) == 0
+    assert "1 usuarios importados (2 en total)" in capsys.readouterr().out
+
+    csv_source = tmp_path / "users.csv"
+    csv_source.write_text(f"username,password_hash\ncarol,{_hash('c')}\n", encoding="utf-8")
+    assert users_module._main(["import", str(csv_source)]) == 0
+    assert users_module._main(["remove", "bob"]) == 0
+    assert users_module._main(["remove", "bob"]) == 1
+    capsys.readouterr()
+
+    assert users_module._main(["list"]) == 0
+    assert capsys.readouterr().out.split() == ["alice", "carol"]
+    assert get_user_service().verify_credentials("alice", "s3creta")
+
+
+def test_import_rejects_plain_text_passwords_atomically(users_db, tmp_path):
+    source = tmp_path / "users.json"
+    source.write_text(json.dumps({"ok": _hash("x"), "bad": "contraseña"}), encoding="utf-8")
+
+    with pytest.raises(SystemExit, match="no es un hash bcrypt"):
+        users_module._main(["import", str(source)])
+
+    with sqlite3.connect(users_db) as conn:
+        assert conn.execute("SELECT count(*) FROM users").fetchone()[0] == 0
+
+
+def test_sqlite_provider_uses_point_lookups_and_sees_changes(users_db, monkeypatch):
+    service = get_user_service()
+    assert isinstance(service.users, users_module.ProviderUserMapping)
+    assert not service.verify_credentials("dave", "pw")
+
+    monkeypatch.setattr(
+        SQLiteUserProvider, "get_users", lambda self: pytest.fail("no debe cargar todos los usuarios")
+    )
+    users_module._main(["add", "dave", "pw", "--rounds", "4"])
+
+    assert get_user_service() is service
+    assert service.verify_credentials("dave", "pw")
+    assert service.users.get("nadie") is None
+
+
+def test_sqlite_provider_requires_initialized_store(tmp_path):
+    empty = tmp_path / "empty.db"
+    sqlite3.connect(empty).close()
+
+    with pytest.raises(UserSourceError, match="no contiene la tabla"):
+        SQLiteUserProvider(empty)
+    with pytest.raises(UserSourceError, match="no existe"):
+        SQLiteUserProvider(tmp_path / "missing.db")
+
+
+@pytest.mark.asyncio
+async def test_login_authenticates_against_sqlite_store(users_db):
+    users_module._main(["add", "erin", "clave-erin", "--rounds", "4"])
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        ok = await ac.post(app.url_path_for("login"), data={"username": "erin", "password": "clave-erin"})
+        bad = await ac.post(app.url_path_for("login"), data={"username": "erin", "password": "otra"})
+
+    assert ok.status_code == 200
+    assert bad.status_code == 401
@@ -0,0 +1,203 @@
+"""Benchmark de la normalización de filas a JSON en tablas anchas.
+
+Crea una tabla SQLite en memoria con ``--columns`` columnas (enteros, reales y
+texto, más una columna ``BLOB`` y otra de fechas cada ``--special-every``) y
+compara la conversión celda a celda con ``normalize_json_value`` frente al plan
+por columna de ``build_row_normalizer``, que solo toca las columnas que lo
+necesitan. Indica además qué bucle del plan está activo (Cython o Python).
+
+``--responses N`` mide en su lugar la serialización de la respuesta de
+``/fetch`` con N filas (100k por defecto): la ruta previa de FastAPI
+(``jsonable_encoder`` y ``JSONResponse``) frente a ``FastJSONResponse`` con cada
+codificador instalado (``orjson``, ``msgspec`` o ``json``).
+
+``--formats N`` compara los formatos negociables de ``/fetch`` (JSON por filas,
+JSON columnar y MessagePack si está instalado) con N filas: tiempo de
+construcción y serialización, tamaño del cuerpo y tamaño comprimido con gzip.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import sqlite3
+import sys
+import time
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from sqliteplus.api import responses
+from sqliteplus.api.endpoints import (
+    _binary_rows_response,
+    _columnar_rows_response,
+    _normalize_rows_response,
+)
+from sqliteplus.utils import json_serialization
+from sqliteplus.utils.json_serialization import (
+    build_row_normalizer,
+    normalize_json_value,
+)
+
+_PLAIN_TYPES = ("INTEGER", "REAL", "TEXT")
+
+
+def _declared_types(columns: int, special_every: int) -> list[str]:
+    declared = []
+    for index in range(columns):
+        if special_every and index % special_every == special_every - 1:
+            declared.append("BLOB" if (index // special_every) % 2 == 0 else "TIMESTAMP")
+        else:
+            declared.append(_PLAIN_TYPES[index % len(_PLAIN_TYPES)])
+    return declared
+
+
+def _value(declared: str, row: int, start: datetime):
+    if declared == "INTEGER":
+        return row
+    if declared == "REAL":
+        return row / 7
+    if declared == "TEXT":
+        return f"texto {row}"
+    if declared == "BLOB":
+        return row.to_bytes(4, "little") * 4
+    return start + timedelta(seconds=row)
+
+
+def _load_rows(rows: int, declared: list[str]) -> tuple[list[str], list[tuple]]:
+    conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+    try:
+        columns = ", ".join(f"c{index} {kind}" for index, kind in enumerate(declared))
+        conn.execute(f"CREATE TABLE ancha ({columns})")
+        placeholders = ", ".join("?" for _ in declared)
+        start = datetime(2024, 1, 1)
+        conn.executemany(
+            f"INSERT INTO ancha VALUES ({placeholders})",
+            ([_value(kind, row, start) for kind in declared] for row in range(rows)),
+        )
+        cursor = conn.execute("SELECT * FROM ancha")
+        return [desc[0] for desc in cursor.description], cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _run_responses(names: list[str], rows: list[tuple], repeat: int) -> None:
+    payload = _normalize_rows_response(names, rows)
+    baseline = _best_of(repeat, lambda: JSONResponse(jsonable_encoder(payload)).body)
+    size = len(JSONResponse(payload).body)
+    print(f"respuesta                {len(rows)} filas x {len(names)} columnas, {size / 1e6:.1f} MB")
+    print(f"jsonable_encoder + json  {baseline * 1e3:>10.1f} ms")
+
+    active = responses.get_json_backend()
+    try:
+        for backend in responses.JSON_BACKENDS:
+            try:
+                responses.select_json_backend(backend)
+            except RuntimeError:
+                print(f"FastJSONResponse {backend:<8}  (no instalado)")
+                continue
+            elapsed = _best_of(repeat, lambda: responses.FastJSONResponse(payload).body)
+            print(f"FastJSONResponse {backend:<8}{elapsed * 1e3:>9.1f} ms   x{baseline / elapsed:.1f}")
+    finally:
+        responses.select_json_backend(active)
+
+
+def _run_formats(names: list[str], rows: list[tuple], repeat: int) -> None:
+    builders = [
+        ("json (filas)", lambda: responses.FastJSONResponse(_normalize_rows_response(names, rows)).body),
+        ("json columnar", lambda: responses.FastJSONResponse(_columnar_rows_response(names, rows)).body),
+    ]
+    if responses.msgpack_available():
+        builders.append(("msgpack", lambda: responses.MsgPackResponse(_binary_rows_response(names, rows)).body))
+    else:
+        print("msgpack                  (no instalado)")
+
+    print(f"respuesta                {len(rows)} filas x {len(names)} columnas, codificador {responses.get_json_backend()}")
+    for label, build in builders:
+        body = build()
+        elapsed = _best_of(repeat, build)
+        compressed = len(gzip.compress(body, compresslevel=6))
+        print(
+            f"{label:<24} {elapsed * 1e3:>10.1f} ms   {len(body) / 1e6:>8.2f} MB   gzip {compressed / 1e6:>8.2f} MB"
+        )
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compara la normalización celda a celda con el plan por columna")
+    parser.add_argument("--rows", type=int, default=20_000, help="Filas de la tabla (por defecto 20000)")
+    parser.add_argument("--columns", type=int, default=100, help="Columnas de la tabla (por defecto 100)")
+    parser.add_argument(
+        "--special-every",
+        type=int,
+        default=10,
+        help="Una de cada N columnas es BLOB o fecha (0 para ninguna; por defecto 10)",
+    )
+    parser.add_argument(
+        "--responses",
+        type=int,
+        nargs="?",
+        const=100_000,
+        help="Mide la serialización de la respuesta de /fetch con N filas (por defecto 100k)",
+    )
+    parser.add_argument(
+        "--formats",
+        type=int,
+        nargs="?",
+        const=100_000,
+        help="Compara JSON por filas, JSON columnar y MessagePack con N filas (por defecto 100k)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones; se informa la mejor (por defecto 3)")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+    declared = _declared_types(args.columns, args.special_every)
+    if args.responses:
+        names, rows = _load_rows(args.responses, declared)
+        _run_responses(names, rows, args.repeat)
+        return 0
+    if args.formats:
+        names, rows = _load_rows(args.formats, declared)
+        _run_formats(names, rows, args.repeat)
+        return 0
+
+    names, rows = _load_rows(args.rows, declared)
+    cells = args.rows * args.columns
+
+    normalizer = build_row_normalizer(names, declared, rows)
+    if normalizer(rows) != [[normalize_json_value(value) for value in row] for row in rows]:
+        print("El plan no coincide con la conversión celda a celda", file=sys.stderr)
+        return 1
+
+    per_cell = _best_of(args.repeat, lambda: [[normalize_json_value(value) for value in row] for row in rows])
+    planned = _best_of(args.repeat, lambda: normalizer(rows))
+    loop = "Cython" if json_serialization._json_rows is not None else "Python"
+
+    print(f"tabla                    {args.rows} filas x {args.columns} columnas, {len(normalizer.converted_columns)} con conversión")
+    print(f"celda a celda            {per_cell * 1e3:>10.1f} ms   {per_cell * 1e9 / cells:>8.1f} ns/celda")
+    print(
+        f"plan por columna ({loop:<6}) {planned * 1e3:>7.1f} ms   {planned * 1e9 / cells:>8.1f} ns/celda"
+        f"   x{per_cell / planned:.1f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
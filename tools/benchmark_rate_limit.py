@@ -0,0 +1,229 @@
+"""Benchmark de los almacenes del *rate limit* de ``/token``.
+
+Simula un ataque de fuerza bruta repartido entre ``--keys`` IPs: cada operación
+consulta ``is_blocked`` y registra un fallo, y de vez en cuando un éxito. Se
+compara ``InMemoryRateLimitStore`` con ``SQLiteRateLimitStore`` (una base WAL
+temporal, o la indicada con ``--db-path``) y se reportan operaciones por
+segundo, latencia p50/p95 y el número de estados retenidos al final.
+
+Con ``--processes`` mayor que 1 el almacén SQLite se ejercita desde varios
+procesos a la vez sobre el mismo archivo, como lo harían varios *workers*.
+
+``--stuffing-ips N`` simula en su lugar un ataque de *credential stuffing*: N
+IPs distintas (1M por defecto en ese modo) fallan una vez cada una contra el
+almacén en memoria. Se mide el coste por intento con todos los estados vivos,
+la memoria retenida por estado y lo que tarda la purga, repartida en lotes
+entre las peticiones siguientes, cuando vencen todos.
+
+``--middleware N`` mide el sobrecoste por petición de
+``DataRateLimitMiddleware`` con cubos por IP y por base de datos frente a la
+misma aplicación ASGI sin middleware.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqliteplus.api.rate_limit_middleware import (
+    DataRateLimitMiddleware,
+    parse_route_limits,
+)
+from sqliteplus.auth.rate_limit_store import (
+    InMemoryRateLimitStore,
+    RateLimitConfig,
+    RateLimitStore,
+    SQLiteRateLimitStore,
+)
+
+_CONFIG = RateLimitConfig(max_attempts=5, window_seconds=60, state_ttl_seconds=300, max_metrics_keys=1024)
+
+
+def _run_ops(store: RateLimitStore, *, keys: int, ops: int, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    now = time.time()
+    for index in range(ops):
+        key = rng.randrange(keys)
+        ip = f"10.{key >> 16 & 255}.{key >> 8 & 255}.{key & 255}"
+        user = f"user{key}"
+        current = now + index * 0.001
+        started = time.perf_counter()
+        if not store.is_blocked(ip=ip, username=user, config=_CONFIG, now=current):
+            if index % 20:
+                store.register_failure(ip=ip, username=user, config=_CONFIG, now=current)
+            else:
+                store.register_success(ip=ip, username=user, config=_CONFIG, now=current)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _sqlite_worker(args: tuple[str, int, int, int]) -> list[float]:
+    db_path, keys, ops, seed = args
+    store = SQLiteRateLimitStore(db_path)
+    try:
+        return _run_ops(store, keys=keys, ops=ops, seed=seed)
+    finally:
+        store.close()
+
+
+def _run_stuffing(ips: int) -> None:
+    store = InMemoryRateLimitStore()
+    config = RateLimitConfig(max_attempts=5, window_seconds=60, state_ttl_seconds=300)
+    now = time.time()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    for index in range(ips):
+        ip = f"{index >> 24 & 255}.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+        store.register_failure(ip=ip, username=None, config=config, now=now + index * 1e-4)
+    wall = time.perf_counter() - started
+    rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    if sys.platform == "darwin":
+        rss_kib //= 1024
+
+    states = store.metrics_snapshot(config=config, now=now)["ip_states_size"]
+    print(f"intentos                 {ips / wall:>12,.0f} ops/s   {wall * 1e6 / ips:>8.2f} µs/intento")
+    print(f"memoria retenida         {rss_kib * 1024 / max(1, int(states)):>12,.0f} bytes/estado ({states} estados)")
+
+    later = now + ips * 1e-4 + 3600
+    calls = 0
+    slowest = 0.0
+    started = time.perf_counter()
+    while store.metrics_snapshot(config=config, now=later)["ip_states_size"]:
+        call_started = time.perf_counter()
+        store.is_blocked(ip="0.0.0.0", username=None, config=config, now=later)
+        slowest = max(slowest, time.perf_counter() - call_started)
+        calls += 1
+    wall = time.perf_counter() - started
+    print(f"purga de caducados       {wall * 1e3:>12,.1f} ms        {calls} peticiones, la más lenta {slowest * 1e3:.2f} ms")
+
+    started = time.perf_counter()
+    for _ in range(10_000):
+        store.is_blocked(ip="0.0.0.0", username=None, config=config, now=later)
+    wall = time.perf_counter() - started
+    print(f"consulta tras la purga   {wall * 1e6 / 10_000:>12.2f} µs")
+
+
+async def _noop_app(scope, receive, send) -> None:
+    return None
+
+
+async def _drive(app, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message) -> None:
+        return None
+
+    started = time.perf_counter()
+    for index in range(requests):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": f"/databases/db{index % 16}/fetch",
+            "headers": [],
+            "query_string": b"",
+            "client": (f"10.0.{index >> 8 & 255}.{index & 255}", 1234),
+        }
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+def _run_middleware(requests: int) -> None:
+    middleware = DataRateLimitMiddleware(
+        _noop_app,
+        routes=parse_route_limits('{"default": {"ip": "1000/s", "database": "100000/s"}}'),
+        store=InMemoryRateLimitStore(),
+    )
+    baseline = asyncio.run(_drive(_noop_app, requests))
+    limited = asyncio.run(_drive(middleware, requests))
+    overhead = (limited - baseline) * 1e6 / requests
+    print(f"sin middleware           {baseline * 1e6 / requests:>12.2f} µs/petición")
+    print(f"con middleware           {limited * 1e6 / requests:>12.2f} µs/petición   (+{overhead:.2f} µs)")
+    print(f"rechazadas               {middleware.metrics_snapshot()['limited_total']:>12}")
+
+
+def _report(label: str, latencies: list[float], wall: float, states: int) -> None:
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1e6
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6
+    print(
+        f"{label:<24} {len(ordered) / wall:>12,.0f} ops/s   "
+        f"p50 {p50:>8.1f} µs   p95 {p95:>8.1f} µs   estados {states:>8}"
+    )
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compara los almacenes en memoria y SQLite del rate limit")
+    parser.add_argument("--ops", type=int, default=20_000, help="Operaciones por proceso (por defecto 20000)")
+    parser.add_argument("--keys", type=int, default=5_000, help="Claves distintas simuladas (por defecto 5000)")
+    parser.add_argument("--processes", type=int, default=1, help="Procesos que comparten la base SQLite")
+    parser.add_argument("--db-path", type=Path, help="Base SQLite a usar en lugar de una temporal")
+    parser.add_argument(
+        "--stuffing-ips",
+        type=int,
+        nargs="?",
+        const=1_000_000,
+        help="Simula un ataque desde N IPs distintas contra el almacén en memoria (por defecto 1M)",
+    )
+    parser.add_argument(
+        "--middleware",
+        type=int,
+        nargs="?",
+        const=100_000,
+        help="Mide el sobrecoste por petición del middleware de límites de datos (por defecto 100k)",
+    )
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.stuffing_ips:
+        _run_stuffing(args.stuffing_ips)
+        return 0
+    if args.middleware:
+        _run_middleware(args.middleware)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="sqliteplus-rate-limit-") as tmp_dir:
+        db_path = args.db_path or Path(tmp_dir) / "rate_limit.db"
+
+        memory = InMemoryRateLimitStore()
+        started = time.perf_counter()
+        latencies = _run_ops(memory, keys=args.keys, ops=args.ops, seed=0)
+        wall = time.perf_counter() - started
+        states = memory.metrics_snapshot(config=_CONFIG, now=time.time())["ip_states_size"]
+        _report("memoria", latencies, wall, int(states))
+
+        sqlite_store = SQLiteRateLimitStore(db_path)
+        sqlite_store.reset()
+        processes = max(1, args.processes)
+        jobs = [(str(db_path), args.keys, args.ops, seed) for seed in range(processes)]
+        started = time.perf_counter()
+        if processes == 1:
+            latencies = _sqlite_worker(jobs[0])
+        else:
+            with multiprocessing.get_context("spawn").Pool(processes) as pool:
+                latencies = [value for chunk in pool.map(_sqlite_worker, jobs) for value in chunk]
+        wall = time.perf_counter() - started
+        states = sqlite_store.metrics_snapshot(config=_CONFIG, now=time.time())["ip_states_size"]
+        sqlite_store.close()
+        _report(f"sqlite ({processes} proc.)", latencies, wall, int(states))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
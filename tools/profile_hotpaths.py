@@ -26,6 +26,7 @@ from sqliteplus.core.schemas import (  # noqa: E402 - import después del sys.pa
     CreateTableSchema,
     InsertDataSchema,
     is_valid_sqlite_identifier,
+    validate_insert_rows,
 )
 
 SCHEMAS_PATH = (REPO_ROOT / "sqliteplus" / "core" / "schemas.py").resolve()
@@ -91,6 +92,33 @@ def scenario_insert_payloads(iterations: int) -> None:
         InsertDataSchema(values=payload)
 
 
+BATCH_ROWS = 1000
+
+
+def _batch_rows() -> list[dict[str, object]]:
+    return [
+        {" user_id ": index, "comment": f"comentario {index}", "score": index / 4, "tags": "a,b"}
+        for index in range(BATCH_ROWS)
+    ]
+
+
+def scenario_insert_rows_per_row(iterations: int) -> None:
+    """Valida un lote de filas con ``InsertDataSchema`` fila a fila (referencia)."""
+
+    rows = _batch_rows()
+    for _ in range(max(1, iterations // 20)):
+        for row in rows:
+            InsertDataSchema(values=row)
+
+
+def scenario_insert_rows_batch(iterations: int) -> None:
+    """Valida el mismo lote con ``validate_insert_rows``: columnas una vez y claves por fila."""
+
+    rows = _batch_rows()
+    for _ in range(max(1, iterations // 20)):
+        validate_insert_rows(rows)
+
+
 def scenario_identifier_checks(iterations: int) -> None:
     """Valida identificadores variados para medir el costo del regex y filtros."""
 
@@ -114,6 +142,8 @@ SCENARIOS: dict[str, Callable[[int], None]] = {
     "normalize_columns": scenario_normalize_columns,
     "default_expressions": scenario_default_expressions,
     "insert_payloads": scenario_insert_payloads,
+    "insert_rows_per_row": scenario_insert_rows_per_row,
+    "insert_rows_batch": scenario_insert_rows_batch,
     "identifier_checks": scenario_identifier_checks,
 }
 